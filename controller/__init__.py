@@ -1,4 +1,6 @@
 # Import các controller classes
 from .tcp_controller import TCPController
+from .framing import FRAMING_LINE, FRAMING_LENGTH_PREFIXED
+from .timer_wheel import TimerWheel
 
-__all__ = ['TCPController']
\ No newline at end of file
+__all__ = ['TCPController', 'FRAMING_LINE', 'FRAMING_LENGTH_PREFIXED', 'TimerWheel']
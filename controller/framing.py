@@ -0,0 +1,140 @@
+"""
+Message framing for the TCP controller
+
+Turns a byte stream into complete messages without building intermediate
+strings: bytes are appended to one bytearray, message boundaries are found
+with bytearray.find / header reads, and consumed bytes are dropped once per
+recv instead of once per message.
+
+Two wire formats:
+  - FRAMING_LINE: UTF-8 text terminated by '\\n' (what the Pico sends)
+  - FRAMING_LENGTH_PREFIXED: 4-byte big-endian payload length + payload
+"""
+
+import logging
+import struct
+from typing import List, Union
+
+logger = logging.getLogger(__name__)
+
+FRAMING_LINE = 'line'
+FRAMING_LENGTH_PREFIXED = 'length_prefixed'
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Messages longer than this are dropped (protects against a peer that never sends '\n')
+DEFAULT_MAX_MESSAGE_SIZE = 64 * 1024
+
+
+class LineFramer:
+    """Newline-delimited UTF-8 messages"""
+
+    mode = FRAMING_LINE
+
+    def __init__(self, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE):
+        self._buffer = bytearray()
+        self._scan_from = 0  # Bytes before this offset are known to hold no '\n'
+        self.max_message_size = max_message_size
+        self.dropped = 0
+
+    def feed(self, data: BytesLike) -> List[str]:
+        """Append received bytes and return every complete message"""
+        buffer = self._buffer
+        buffer += data
+        messages = []
+        start = 0
+        view = memoryview(buffer)
+        try:
+            while True:
+                end = buffer.find(b'\n', max(start, self._scan_from))
+                if end < 0:
+                    break
+                line = bytes(view[start:end])
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                messages.append(line.decode('utf-8', errors='replace'))
+                start = end + 1
+                self._scan_from = start
+        finally:
+            view.release()
+
+        if start:
+            del buffer[:start]
+        self._scan_from = len(buffer)
+        if len(buffer) > self.max_message_size:
+            logger.warning(f"LineFramer: Dropping {len(buffer)} bytes without newline")
+            buffer.clear()
+            self._scan_from = 0
+            self.dropped += 1
+        return messages
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._scan_from = 0
+
+    @staticmethod
+    def encode(message: str) -> bytes:
+        return (message + '\n').encode('utf-8')
+
+
+class LengthPrefixedFramer:
+    """4-byte big-endian length header followed by a UTF-8 payload"""
+
+    mode = FRAMING_LENGTH_PREFIXED
+    HEADER = struct.Struct('>I')
+
+    def __init__(self, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE):
+        self._buffer = bytearray()
+        self.max_message_size = max_message_size
+        self.dropped = 0
+
+    def feed(self, data: BytesLike) -> List[str]:
+        buffer = self._buffer
+        buffer += data
+        messages = []
+        start = 0
+        header_size = self.HEADER.size
+        view = memoryview(buffer)
+        try:
+            while len(buffer) - start >= header_size:
+                (length,) = self.HEADER.unpack_from(buffer, start)
+                if length > self.max_message_size:
+                    # Stream is out of sync; nothing after this point can be trusted
+                    logger.error(f"LengthPrefixedFramer: Invalid length {length}, resetting stream")
+                    start = len(buffer)
+                    self.dropped += 1
+                    break
+                end = start + header_size + length
+                if end > len(buffer):
+                    break
+                messages.append(bytes(view[start + header_size:end]).decode('utf-8', errors='replace'))
+                start = end
+        finally:
+            view.release()
+
+        if start:
+            del buffer[:start]
+        return messages
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def reset(self) -> None:
+        self._buffer.clear()
+
+    @classmethod
+    def encode(cls, message: str) -> bytes:
+        payload = message.encode('utf-8')
+        return cls.HEADER.pack(len(payload)) + payload
+
+
+def make_framer(mode: str = FRAMING_LINE, max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE):
+    """Framer instance for a framing mode name"""
+    if mode == FRAMING_LENGTH_PREFIXED:
+        return LengthPrefixedFramer(max_message_size)
+    if mode == FRAMING_LINE:
+        return LineFramer(max_message_size)
+    raise ValueError(f"Unknown framing mode: {mode}")
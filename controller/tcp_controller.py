@@ -1,4 +1,5 @@
 import logging
+import selectors
 import socket
 import json
 import threading
@@ -6,11 +7,15 @@ import time
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 from typing import Optional, Dict, Any
 
+from .framing import FRAMING_LINE, make_framer
+
 class TCPController(QObject):
     # Signals for UI updates
     connection_status_changed = pyqtSignal(bool, str)  # connected, status message
     message_received = pyqtSignal(str)  # message from device
     
+    RECV_BUFFER_SIZE = 4096
+    
     def __init__(self):
         super().__init__()
         self._socket: Optional[socket.socket] = None
@@ -28,6 +33,13 @@ class TCPController(QObject):
         # Set this to a callable to enable direct trigger path
         self.on_trigger_callback = None  # Optional callback for trigger messages
         
+        # Wire framing (see controller/framing.py) and selector wakeup pipe
+        self.framing = FRAMING_LINE
+        self._framer = make_framer(self.framing)
+        self._wakeup_recv: Optional[socket.socket] = None
+        self._wakeup_send: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        
     @pyqtSlot(str, str)
     def connect(self, ip: str, port: str) -> bool:
         """
@@ -61,22 +73,26 @@ class TCPController(QObject):
                 
             # Create new socket
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            # ✅ OPTIMIZATION: Reduce timeout from 30s to 5s for faster trigger response
-            # This improves latency without affecting reliability
-            self._socket.settimeout(5)  # 5 seconds timeout (was 30)
+            self._configure_socket(self._socket)
+            # Timeout only bounds the connect; afterwards the socket is non-blocking
+            self._socket.settimeout(5)
             
             # Try to connect
             logging.info(f"Attempting to connect to {ip}:{port_num}")
             self._socket.connect((ip, port_num))
+            self._socket.setblocking(False)
             logging.info(f"Successfully connected to {ip}:{port_num}")
             
             self._connected = True
             self._current_ip = ip
             self._current_port = port_num
             
-            # Start monitor thread
+            # Start monitor thread (selector loop)
+            self._framer = make_framer(self.framing)
+            self._wakeup_recv, self._wakeup_send = socket.socketpair()
+            self._wakeup_recv.setblocking(False)
             self._stop_monitor = False
-            self._monitor_thread = threading.Thread(target=self._monitor_socket)
+            self._monitor_thread = threading.Thread(target=self._monitor_socket, name="TCPControllerMonitor")
             self._monitor_thread.daemon = False  # Not daemon - keep running
             self._monitor_thread.start()
             logging.info("Monitor thread started")
@@ -110,11 +126,11 @@ class TCPController(QObject):
             return False
             
         try:
-            # Thêm newline để device biết kết thúc message
-            data = (message + '\n').encode('utf-8')
-            logging.info(f"★ Sending message: {message!r}")
-            self._socket.sendall(data)
-            logging.info(f"✓ Message sent successfully")
+            # Framer thêm newline (hoặc header độ dài) để device biết kết thúc message
+            data = self._framer.encode(message)
+            logging.debug(f"Sending message: {message!r}")
+            with self._send_lock:
+                self._send_all(data)
             return True
         except Exception as e:
             logging.error(f"Send error: {e}")
@@ -122,113 +138,109 @@ class TCPController(QObject):
             return False
             
     def _monitor_socket(self):
-        """Monitor socket for incoming data with optimized latency"""
-        buffer = ""
-        last_data_time = time.time()
-        # ✅ OPTIMIZATION: Reduce buffer timeout from 0.5s to 0.1s for faster trigger
-        BUFFER_TIMEOUT = 0.1  # Was 0.5s - faster response for triggers
-        FINAL_TIMEOUT = 1.0  # For final buffer check on timeout
-        
-        logging.info("Monitor thread started with optimized low-latency settings")
-        logging.info(f"Buffer timeout: {BUFFER_TIMEOUT}s, Socket timeout: 5s")
+        """
+        I/O loop: selector over the socket and a wakeup pipe
+
+        The socket is non-blocking; every readable event drains it with
+        recv_into into one preallocated buffer and hands the bytes to the
+        framer. Complete messages are dispatched immediately - there is no
+        timeout-based flushing of partial lines.
+        """
+        sock = self._socket
+        selector = selectors.DefaultSelector()
+        recv_buffer = bytearray(self.RECV_BUFFER_SIZE)
+        recv_view = memoryview(recv_buffer)
+        framer = self._framer
         
-        while not self._stop_monitor and self._socket:
-            try:
-                # Đọc dữ liệu
-                data = self._socket.recv(4096)  # Increased buffer size for efficiency
-                
-                if not data:
-                    # Connection closed by peer
-                    logging.warning("No data received - connection closed by device")
-                    self._handle_connection_error("Connection closed by device")
-                    break
-                
-                # Update last data time
-                last_data_time = time.time()
-                
-                # Log raw data received
-                logging.debug(f"Raw data received ({len(data)} bytes): {data!r}")
-                
-                # Decode và xử lý dữ liệu
-                try:
-                    decoded_data = data.decode('utf-8')
-                    logging.debug(f"Decoded data: {decoded_data!r}")
-                    buffer += decoded_data
-                    logging.debug(f"Current buffer: {buffer!r}")
-                except UnicodeDecodeError as e:
-                    logging.error(f"Unicode decode error: {e}, raw data: {data!r}")
-                    continue
-                
-                # ✅ OPTIMIZATION: Split lines immediately (< 1ms)
-                has_newline = '\n' in buffer
-                logging.debug(f"★ Checking buffer split: has_newline={has_newline}, buffer={buffer!r}")
-                
-                line_count = 0
-                while '\n' in buffer:
-                    line_count += 1
-                    logging.info(f"★ SPLITTING BUFFER! Iteration {line_count}")
-                    line, buffer = buffer.split('\n', 1)
-                    logging.info(f"Processing line from buffer: {line!r}, remaining: {buffer!r}")
-                    self._handle_message(line)
-                
-                # ✅ OPTIMIZATION: Fast timeout check (0.1s instead of 0.5s)
-                # If buffer has data but no newline, check timeout
-                if buffer and (time.time() - last_data_time) > BUFFER_TIMEOUT:
-                    logging.info(f"Buffer timeout ({BUFFER_TIMEOUT}s) with data: {buffer!r}")
-                    
-                    # Split buffer by newline
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        logging.info(f"Emitting line from buffer timeout: {line!r}")
-                        self._handle_message(line)
-                    
-                    # Emit remaining non-newline data
-                    if buffer:
-                        logging.info(f"Emitting remaining non-newline data: {buffer!r}")
-                        self._handle_message(buffer)
-                    
-                    buffer = ""
-                    last_data_time = time.time()
-                    
-            except socket.timeout:
-                # ✅ OPTIMIZATION: Faster timeout handling
-                current_time = time.time()
-                if buffer and (current_time - last_data_time) > FINAL_TIMEOUT:
-                    logging.info(f"Socket timeout with buffered data: {buffer!r}")
-                    
-                    # IMPORTANT: Split buffer by newline before emitting!
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        logging.info(f"Emitting line from timeout buffer: {line!r}")
-                        self._handle_message(line)
-                    
-                    # Emit remaining data if any
-                    if buffer:
-                        logging.info(f"Emitting remaining data after timeout: {buffer!r}")
-                        self._handle_message(buffer)
+        try:
+            selector.register(sock, selectors.EVENT_READ)
+            selector.register(self._wakeup_recv, selectors.EVENT_READ)
+            logging.info(f"Monitor thread started (selector, framing={framer.mode})")
+            
+            while not self._stop_monitor:
+                for key, _ in selector.select():
+                    if key.fileobj is self._wakeup_recv:
+                        self._drain_wakeup()
+                        continue
                     
-                    buffer = ""
-                    last_data_time = current_time
-                continue
-            except Exception as e:
+                    # Drain everything the kernel has for us
+                    while True:
+                        try:
+                            n = sock.recv_into(recv_buffer)
+                        except (BlockingIOError, InterruptedError):
+                            break
+                        if n == 0:
+                            logging.warning("No data received - connection closed by device")
+                            self._handle_connection_error("Connection closed by device")
+                            return
+                        for message in framer.feed(recv_view[:n]):
+                            self._handle_message(message)
+                        if n < len(recv_buffer):
+                            break
+        except Exception as e:
+            if not self._stop_monitor:
                 logging.error(f"Monitor error: {e}", exc_info=True)
                 self._handle_connection_error()
-                break
+        finally:
+            recv_view.release()
+            selector.close()
+            if framer.pending():
+                logging.debug(f"Monitor stopping, discarding {framer.pending()} bytes of partial message")
+            logging.info("Monitor thread stopped")
+    
+    def _send_all(self, data: bytes, timeout: float = 2.0):
+        """sendall for the non-blocking socket (waits for buffer space up to timeout)"""
+        view = memoryview(data)
+        deadline = time.monotonic() + timeout
+        while view:
+            try:
+                sent = self._socket.send(view)
+                view = view[sent:]
+            except (BlockingIOError, InterruptedError):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout("send timed out")
+                with selectors.DefaultSelector() as selector:
+                    selector.register(self._socket, selectors.EVENT_WRITE)
+                    selector.select(remaining)
+    
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_recv.recv(64):
+                pass
+        except (BlockingIOError, InterruptedError, OSError):
+            pass
+    
+    def _wake_monitor(self):
+        """Interrupt a select() in the monitor thread"""
+        try:
+            if self._wakeup_send:
+                self._wakeup_send.send(b'\0')
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _configure_socket(sock: socket.socket):
+        """Low-latency options: no Nagle delay, keepalive to notice a dead Pico"""
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # Linux-only keepalive tuning: first probe after 5s idle, every 2s, 3 probes
+        for name, value in (('TCP_KEEPIDLE', 5), ('TCP_KEEPINTVL', 2), ('TCP_KEEPCNT', 3)):
+            option = getattr(socket, name, None)
+            if option is not None:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, option, value)
+                except OSError:
+                    pass
+    
+    def set_framing(self, mode: str) -> None:
+        """
+        Select the wire framing (FRAMING_LINE or FRAMING_LENGTH_PREFIXED)
         
-        # Emit any remaining buffer data
-        if buffer:
-            logging.info(f"Monitor stopping, remaining buffer: {buffer!r}")
-            # Split buffer before emitting
-            while '\n' in buffer:
-                line, buffer = buffer.split('\n', 1)
-                logging.info(f"Emitting remaining line: {line!r}")
-                self._handle_message(line)
-            # Emit any non-newline data
-            if buffer:
-                logging.info(f"Emitting final data: {buffer!r}")
-                self._handle_message(buffer)
-                
-        logging.info("Monitor thread stopped with optimized settings")
+        Takes effect for the next connection; both ends must use the same mode.
+        """
+        make_framer(mode)  # Validate
+        self.framing = mode
         
     def _handle_message(self, message: str):
         """
@@ -241,26 +253,21 @@ class TCPController(QObject):
         """
         # Strip whitespace
         message = message.strip()
+        if not message:
+            return
         
-        # Log message
-        logging.info(f"_handle_message called with: {message!r}")
+        logging.debug(f"TCP message: {message!r}")
         
-        # ✅ OPTIMIZATION: Direct callback for trigger messages (< 1ms overhead)
-        # This bypasses Qt signal chain for minimum latency
-        if message and self.on_trigger_callback and 'start_rising' in message:
+        # ✅ OPTIMIZATION: Direct callback for sensor edges (start_rising/end_rising)
+        # Runs on this socket thread - bypasses the Qt signal chain entirely
+        if self.on_trigger_callback and '_rising' in message:
             try:
-                logging.info(f"★ Using direct callback for trigger: {message}")
                 self.on_trigger_callback(message)
             except Exception as e:
                 logging.error(f"Error in direct trigger callback: {e}", exc_info=True)
         
-        # Emit tin nhắn để hiển thị trong UI nếu không rỗng
-        if message:
-            logging.info(f"Emitting signal - message_received.emit({message!r})")
-            self.message_received.emit(message)
-            logging.info(f"Signal emitted successfully")
-        else:
-            logging.debug("Message is empty after strip, not emitting")
+        # Emit tin nhắn để hiển thị trong UI
+        self.message_received.emit(message)
         
     def _handle_connection_error(self, message: str = "Connection lost"):
         """Xử lý lỗi kết nối"""
@@ -272,12 +279,19 @@ class TCPController(QObject):
         """Ngắt kết nối TCP"""
         try:
             self._stop_monitor = True
-            if self._monitor_thread:
+            self._wake_monitor()
+            if self._monitor_thread and self._monitor_thread is not threading.current_thread():
                 self._monitor_thread.join(timeout=1.0)
+            self._monitor_thread = None
                 
             if self._socket:
                 self._socket.close()
                 self._socket = None
+            
+            for wakeup in (self._wakeup_recv, self._wakeup_send):
+                if wakeup:
+                    wakeup.close()
+            self._wakeup_recv = self._wakeup_send = None
                 
             self._connected = False
             self._current_ip = ""
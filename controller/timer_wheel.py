@@ -0,0 +1,184 @@
+"""
+Hashed timer wheel driven by time.monotonic_ns
+
+Used to fire delayed camera triggers at an exact moment without sleeping on
+the GUI or socket thread. Many timers can be in flight at once (closely
+spaced parts on the belt); each one records its scheduling error
+(actual fire time minus intended time).
+
+Layout: `slots` buckets of `tick_ns` each. A timer due in more than one
+revolution carries a `rounds` counter. The wheel thread only ticks while
+timers are pending, and within the due tick it sleeps/spins to the exact
+deadline before calling back.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICK_NS = 1_000_000     # 1 ms buckets
+DEFAULT_SLOTS = 512             # ~0.5 s per revolution
+# Below this remaining time the wheel thread busy-waits instead of sleeping
+SPIN_THRESHOLD_NS = 200_000
+
+
+@dataclass(order=True)
+class _Timer:
+    deadline_ns: int
+    seq: int
+    callback: Callable[..., Any] = field(compare=False)
+    args: Tuple = field(compare=False, default=())
+    rounds: int = field(compare=False, default=0)
+    cancelled: bool = field(compare=False, default=False)
+
+
+class TimerWheel:
+    """
+    Timer wheel running callbacks on its own thread
+
+    Callbacks must be short (hand work to another thread); they receive
+    their args plus the scheduling error in ns as the last argument.
+    """
+
+    def __init__(self, tick_ns: int = DEFAULT_TICK_NS, slots: int = DEFAULT_SLOTS,
+                 clock: Callable[[], int] = time.monotonic_ns):
+        self.tick_ns = max(1, int(tick_ns))
+        self.slots = max(1, int(slots))
+        self._clock = clock
+        self._wheel: List[List[_Timer]] = [[] for _ in range(self.slots)]
+        self._pending = 0
+        self._current_tick = self._clock() // self.tick_ns
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Scheduling error history (ns), newest last
+        self.errors_ns: Deque[int] = deque(maxlen=1024)
+        self.fired = 0
+        self.late_on_arrival = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def schedule_at(self, deadline_ns: int, callback: Callable[..., Any], *args) -> _Timer:
+        """Run callback(*args, error_ns) at monotonic_ns() == deadline_ns"""
+        timer = _Timer(int(deadline_ns), next(self._seq), callback, args)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("TimerWheel is stopped")
+            if self._pending == 0:
+                # Wheel was idle (not ticking): move it to the present
+                self._current_tick = self._clock() // self.tick_ns - 1
+            self._insert(timer)
+            self._pending += 1
+            self._ensure_thread()
+            self._cond.notify()
+        return timer
+
+    def schedule_in(self, delay_ns: int, callback: Callable[..., Any], *args) -> _Timer:
+        return self.schedule_at(self._clock() + int(delay_ns), callback, *args)
+
+    @staticmethod
+    def cancel(timer: _Timer) -> None:
+        timer.cancelled = True
+
+    def pending(self) -> int:
+        with self._cond:
+            return self._pending
+
+    def stop(self, timeout: float = 1.0) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        errors = list(self.errors_ns)
+        stats = {'fired': self.fired, 'pending': self.pending(), 'late_on_arrival': self.late_on_arrival}
+        if errors:
+            ordered = sorted(errors)
+            stats.update({
+                'error_mean_us': sum(errors) / len(errors) / 1000.0,
+                'error_max_us': ordered[-1] / 1000.0,
+                'error_p99_us': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] / 1000.0,
+            })
+        return stats
+
+    # ------------------------------------------------------------------
+    # Wheel internals (caller holds the condition lock)
+    # ------------------------------------------------------------------
+    def _insert(self, timer: _Timer) -> None:
+        tick = timer.deadline_ns // self.tick_ns
+        if tick <= self._current_tick:
+            # Tick already processed: fire in the next one
+            tick = self._current_tick + 1
+        if timer.deadline_ns < self._clock():
+            self.late_on_arrival += 1
+        offset = tick - self._current_tick
+        timer.rounds = (offset - 1) // self.slots
+        self._wheel[tick % self.slots].append(timer)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="TimerWheel", daemon=True)
+            self._thread.start()
+
+    def _collect_due(self) -> List[_Timer]:
+        """Advance one tick and return the timers that expire in it"""
+        self._current_tick += 1
+        bucket = self._wheel[self._current_tick % self.slots]
+        due, keep = [], []
+        for timer in bucket:
+            if timer.cancelled:
+                self._pending -= 1
+            elif timer.rounds > 0:
+                timer.rounds -= 1
+                keep.append(timer)
+            else:
+                due.append(timer)
+        self._wheel[self._current_tick % self.slots] = keep
+        self._pending -= len(due)
+        due.sort()
+        return due
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending == 0 and not self._stopped:
+                    # Idle: no ticking until schedule_at() notifies
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                next_tick_start = (self._current_tick + 1) * self.tick_ns
+                wait_ns = next_tick_start - self._clock()
+                if wait_ns > 0:
+                    self._cond.wait(wait_ns / 1e9)
+                    if self._clock() < next_tick_start:
+                        continue  # Woken by schedule(); re-evaluate
+                due = self._collect_due()
+            for timer in due:
+                self._fire(timer)
+
+    def _fire(self, timer: _Timer) -> None:
+        if timer.cancelled:
+            return
+        remaining = timer.deadline_ns - self._clock()
+        if remaining > SPIN_THRESHOLD_NS:
+            time.sleep((remaining - SPIN_THRESHOLD_NS) / 1e9)
+        while self._clock() < timer.deadline_ns:
+            pass
+        error_ns = self._clock() - timer.deadline_ns
+        self.errors_ns.append(error_ns)
+        self.fired += 1
+        try:
+            timer.callback(*timer.args, error_ns)
+        except Exception as e:
+            logger.error(f"TimerWheel: Timer callback failed: {e}", exc_info=True)
@@ -1,7 +1,26 @@
-from gui.main_window import MainWindow
-from gui.camera_view import CameraView
-from gui.tool_manager import ToolManager
-from gui.settings_manager import SettingsManager
-from gui.camera_manager import CameraManager
+# Import lười (PEP 562): import một module con (vd. gui.frame_mailbox) không
+# kéo theo toàn bộ MainWindow và các manager
+import importlib
+
+_EXPORTS = {
+    'MainWindow': 'gui.main_window',
+    'CameraView': 'gui.camera_view',
+    'ToolManager': 'gui.tool_manager',
+    'SettingsManager': 'gui.settings_manager',
+    'CameraManager': 'gui.camera_manager',
+}
 
 __all__ = ['MainWindow', 'CameraView', 'ToolManager', 'SettingsManager', 'CameraManager']
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
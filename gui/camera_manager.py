@@ -2,6 +2,7 @@ from PyQt5.QtCore import QObject, pyqtSlot, QThread, pyqtSignal, QTimer
 from PyQt5.QtWidgets import QApplication, QComboBox
 from camera.camera_stream import CameraStream
 from gui.camera_view import CameraView
+from gui.display_governor import DEFAULT_UI_FPS, DisplayGovernor, InspectionWorker
 from utils.debug_utils import conditional_print
 import logging
 import re
@@ -87,9 +88,23 @@ class CameraManager(QObject):
         
         # Trigger capture flag to prevent double job execution
         self._trigger_capturing = False
+        
+        # Display / inspection decoupling (see gui/display_governor.py)
+        self.display_governor = None
+        self.display_source = 'processed'  # 'processed' (job output) or 'raw' (camera frames)
+        self.inspection_worker = None
+        self.inspection_thread = None
+        self.inspection_max_fps = 0.0  # 0 = as fast as the pipeline runs
+        self._display_fps = 0.0
+        self._inspection_fps = 0.0
+        self._frame_age_ms = 0.0
     
     def cleanup(self):
         """Clean up camera manager resources including threads"""
+        if self.display_governor is not None:
+            self.display_governor.stop()
+        self._stop_inspection_worker()
+        
         # Wait for any running operations to complete
         if self.operation_thread and self.operation_thread.isRunning():
             self.operation_thread.wait(5000)  # Wait up to 5 seconds
@@ -173,6 +188,11 @@ class CameraManager(QObject):
             pass
         self.camera_stream.frame_ready.connect(self._on_frame_from_camera)
         
+        # Frames reach the view through the governor at the UI rate
+        self.display_governor = DisplayGovernor(self.camera_view.display_frame, DEFAULT_UI_FPS, self)
+        self.display_governor.rates_updated.connect(self.update_rates_display)
+        self.display_governor.start()
+        
         # Setup source output combo box
         self.source_output_combo = source_output_combo
         if self.source_output_combo:
@@ -192,6 +212,7 @@ class CameraManager(QObject):
         # K   t n   i signals v   slots
         self.camera_view.focus_calculated.connect(self.update_focus_value)
         self.camera_view.fps_updated.connect(self.update_fps_display)
+        self.camera_view.frame_age_updated.connect(self.update_frame_age_display)
         
         # T   t hi   n th    FPS tr  n g  c h  nh    nh preview
         self.camera_view.toggle_fps_display(False)
@@ -290,9 +311,11 @@ class CameraManager(QObject):
         return False
 
     def _on_frame_from_camera(self, frame):
-        """Handle frames from camera; run job pipeline when enabled, otherwise show raw.
+        """Handle frames from camera; queue them for inspection when the job is enabled.
 
-        Drops incoming frames while processing to keep UI responsive.
+        Display and inspection are decoupled: frames are offered to the display
+        governor (shown at its UI rate) and inspected on the inspection worker
+        at the pipeline's own rate, so slow inference never blocks the preview.
         """
         try:
             # Detect trigger capture mode - will run job but will skip subsequent live frames
@@ -316,20 +339,17 @@ class CameraManager(QObject):
                 self.job_enabled = False
             # If job execution is disabled OR we're editing Camera Source, just display raw frame
             if self._is_editing_camera_tool():
-                if self.camera_view:
-                    self.camera_view.display_frame(frame)
+                self._offer_display(frame)
                 return
             if not getattr(self, 'job_enabled', False):
-                if self.camera_view:
-                    self.camera_view.display_frame(frame)
+                self._offer_display(frame)
                 return
 
             # Ensure we have a job to run
             job_manager = getattr(self.main_window, 'job_manager', None) if hasattr(self, 'main_window') else None
             current_job = job_manager.get_current_job() if job_manager else None
             if not job_manager or not current_job or not current_job.tools:
-                if self.camera_view:
-                    self.camera_view.display_frame(frame)
+                self._offer_display(frame)
                 print(f"WARNING: No job available. job_manager={job_manager}, current_job={current_job}, tools={len(current_job.tools) if current_job else 0}")
                 return
 
@@ -337,94 +357,176 @@ class CameraManager(QObject):
             tools_list = ", ".join([f"{t.name}" for t in current_job.tools])
             conditional_print(f"DEBUG: Job has {len(current_job.tools)} tools: [{tools_list}]")
 
-            try:
-                # Build context for pipeline: include pixel_format for correct color handling
-                # Get current format from camera stream (default is RGB888)
-                import cv2
-                pixel_format = 'RGB888'  # Default - camera_stream outputs RGB888
-                if hasattr(self.camera_stream, 'get_pixel_format'):
-                    try:
-                        current_format = self.camera_stream.get_pixel_format()
-                        if current_format and current_format in ['BGR888', 'RGB888', 'XRGB8888', 'YUV420', 'NV12']:
-                            pixel_format = current_format
-                            conditional_print(f"DEBUG: [CameraManager] Using current camera format: {pixel_format}")
-                    except Exception as e:
-                        conditional_print(f"DEBUG: [CameraManager] Could not get camera format: {e}, using default RGB888")
-                
-                conditional_print(f"DEBUG: [CameraManager] Frame format: {pixel_format} for job processing")
-                
-                initial_context = {"force_save": True, "pixel_format": str(pixel_format)}
-                conditional_print(f"DEBUG: [CameraManager] RUNNING JOB PIPELINE (trigger_capturing={getattr(self, '_trigger_capturing', False)})")
-                
-                # Tính toán thời gian thực thi
-                import time as time_module
-                start_time = time_module.time()
-                processed_image, job_results = job_manager.run_current_job(frame, context=initial_context)
-                total_execution_time = time_module.time() - start_time
-                
-                conditional_print(f"DEBUG: [CameraManager] JOB PIPELINE COMPLETED in {total_execution_time:.3f}s")
-                
-                # Cập nhật executionTime label với inference time từ ONNX model
+            # Build context for pipeline: include pixel_format for correct color handling
+            # Get current format from camera stream (default is RGB888)
+            pixel_format = 'RGB888'  # Default - camera_stream outputs RGB888
+            if hasattr(self.camera_stream, 'get_pixel_format'):
                 try:
-                    if job_results and isinstance(job_results, dict):
-                        inference_time = 0.0
-                        
-                        # Priority 1: Check nested results -> Detect Tool -> data -> inference_time
-                        results_data = job_results.get('results', {})
-                        if isinstance(results_data, dict):
-                            detect_tool = results_data.get('Detect Tool', {})
-                            if isinstance(detect_tool, dict):
-                                detect_data = detect_tool.get('data', {})
-                                if isinstance(detect_data, dict) and 'inference_time' in detect_data:
-                                    inference_time = detect_data['inference_time']
-                                    logging.info(f"Found inference_time from Detect Tool: {inference_time:.3f}s")
-                        
-                        # Priority 2: Check top-level inference_time
-                        if inference_time == 0.0:
-                            inference_time = job_results.get('inference_time', 0.0)
-                            if inference_time > 0.0:
-                                logging.info(f"Found inference_time from top-level: {inference_time:.3f}s")
-                        
-                        # Priority 3: Search tool_results
-                        if inference_time == 0.0 and 'tool_results' in job_results:
-                            tool_results = job_results['tool_results']
-                            if isinstance(tool_results, dict):
-                                for tool_name, tool_result in tool_results.items():
-                                    if isinstance(tool_result, dict) and 'inference_time' in tool_result:
-                                        inference_time = tool_result['inference_time']
-                                        logging.info(f"Found inference_time from {tool_name}: {inference_time:.3f}s")
-                                        break
-                        
-                        # Fallback: Use total execution time if no inference_time found
-                        if inference_time == 0.0:
-                            inference_time = total_execution_time
-                            logging.info(f"No inference_time found, using total_execution_time: {inference_time:.3f}s")
-                        
-                        # Cập nhật executionTime label nếu có
-                        if hasattr(self, 'main_window') and self.main_window:
-                            if hasattr(self.main_window, 'executionTime') and self.main_window.executionTime:
-                                self.main_window.executionTime.display(round(inference_time, 3))
-                                conditional_print(f"DEBUG: Updated executionTime label: {inference_time:.3f}s")
-                except Exception as update_err:
-                    logging.debug(f"Could not update executionTime label: {update_err}")
-                
-                # Update execution label with OK/NG status
-                self._update_execution_label(job_results)
-                
-                if self.camera_view:
-                    self.camera_view.display_frame(processed_image if processed_image is not None else frame)
-            except Exception as e:
-                logging.getLogger(__name__).error(f"Error processing frame in job pipeline: {e}")
-                if self.camera_view:
-                    self.camera_view.display_frame(frame)
+                    current_format = self.camera_stream.get_pixel_format()
+                    if current_format and current_format in ['BGR888', 'RGB888', 'XRGB8888', 'YUV420', 'NV12']:
+                        pixel_format = current_format
+                        conditional_print(f"DEBUG: [CameraManager] Using current camera format: {pixel_format}")
+                except Exception as e:
+                    conditional_print(f"DEBUG: [CameraManager] Could not get camera format: {e}, using default RGB888")
+            
+            conditional_print(f"DEBUG: [CameraManager] Frame format: {pixel_format} for job processing")
+            
+            initial_context = {
+                "pixel_format": str(pixel_format),
+                # Lets DetectTool track parts between keyframes only on a continuous stream
+                "camera_mode": 'trigger' if trigger_capturing else (self.current_mode or 'live'),
+            }
+            # Trigger frames are parts on the belt: every one is inspected (queued);
+            # live frames are latest-wins so a slow model skips instead of lagging
+            keep = trigger_capturing or self.current_mode == 'trigger'
+            worker = self._get_inspection_worker()
+            if worker is None:
+                self._offer_display(frame)
+                return
+            worker.submit(frame, initial_context, keep=keep)
+            conditional_print(f"DEBUG: [CameraManager] Frame queued for inspection (keep={keep}, pending={worker.pending()})")
+            
+            if self.display_source == 'raw':
+                self._offer_display(frame)
         except Exception:
             # As a last resort, show the raw frame
             try:
-                if self.camera_view:
-                    self.camera_view.display_frame(frame)
+                self._offer_display(frame)
             except Exception:
                 pass
 
+    def _offer_display(self, frame):
+        """Give a frame to the display governor (newest wins, shown at the UI rate)"""
+        if self.display_governor is not None:
+            self.display_governor.submit(frame)
+        elif self.camera_view:
+            self.camera_view.display_frame(frame)
+
+    def _run_inspection_job(self, frame, context):
+        """Job pipeline entry point for the inspection worker thread"""
+        job_manager = getattr(self.main_window, 'job_manager', None) if hasattr(self, 'main_window') else None
+        if job_manager is None:
+            return frame, {"error": "No job manager"}
+        return job_manager.run_current_job(frame, context=context)
+
+    def _get_inspection_worker(self):
+        """Lazily start the inspection worker thread"""
+        if self.inspection_worker is not None:
+            return self.inspection_worker
+        try:
+            self.inspection_worker = InspectionWorker(self._run_inspection_job, max_fps=self.inspection_max_fps)
+            self.inspection_thread = QThread()
+            self.inspection_worker.moveToThread(self.inspection_thread)
+            self.inspection_thread.started.connect(self.inspection_worker.run)
+            self.inspection_worker.inspected.connect(self._on_frame_inspected)
+            self.inspection_thread.start()
+            logging.info("Inspection worker thread started")
+        except Exception as e:
+            logging.error(f"Error starting inspection worker: {e}")
+            self.inspection_worker = None
+            self.inspection_thread = None
+        return self.inspection_worker
+
+    def _stop_inspection_worker(self):
+        try:
+            if self.inspection_worker:
+                self.inspection_worker.stop()
+            if self.inspection_thread and self.inspection_thread.isRunning():
+                self.inspection_thread.quit()
+                self.inspection_thread.wait(5000)
+        except Exception as e:
+            logging.error(f"Error stopping inspection worker: {e}")
+        self.inspection_worker = None
+        self.inspection_thread = None
+
+    def _on_frame_inspected(self, frame, processed_image, job_results, total_execution_time):
+        """Job pipeline finished for a frame (GUI thread): update labels and display"""
+        try:
+            if isinstance(job_results, dict) and job_results.get('no_verdict'):
+                # Trigger frame dropped by a full queue: record its NG so verdicts stay paired in order
+                logging.warning(f"Trigger frame not inspected: {job_results.get('error')}")
+                self._update_execution_label(job_results)
+                return
+            conditional_print(f"DEBUG: [CameraManager] JOB PIPELINE COMPLETED in {total_execution_time:.3f}s")
+            
+            # Cập nhật executionTime label với inference time từ ONNX model
+            try:
+                if job_results and isinstance(job_results, dict):
+                    inference_time = 0.0
+                    
+                    # Priority 1: Check nested results -> Detect Tool -> data -> inference_time
+                    results_data = job_results.get('results', {})
+                    if isinstance(results_data, dict):
+                        detect_tool = results_data.get('Detect Tool', {})
+                        if isinstance(detect_tool, dict):
+                            detect_data = detect_tool.get('data', {})
+                            if isinstance(detect_data, dict) and 'inference_time' in detect_data:
+                                inference_time = detect_data['inference_time']
+                                logging.info(f"Found inference_time from Detect Tool: {inference_time:.3f}s")
+                    
+                    # Priority 2: Check top-level inference_time
+                    if inference_time == 0.0:
+                        inference_time = job_results.get('inference_time', 0.0)
+                        if inference_time > 0.0:
+                            logging.info(f"Found inference_time from top-level: {inference_time:.3f}s")
+                    
+                    # Priority 3: Search tool_results
+                    if inference_time == 0.0 and 'tool_results' in job_results:
+                        tool_results = job_results['tool_results']
+                        if isinstance(tool_results, dict):
+                            for tool_name, tool_result in tool_results.items():
+                                if isinstance(tool_result, dict) and 'inference_time' in tool_result:
+                                    inference_time = tool_result['inference_time']
+                                    logging.info(f"Found inference_time from {tool_name}: {inference_time:.3f}s")
+                                    break
+                    
+                    # Fallback: Use total execution time if no inference_time found
+                    if inference_time == 0.0:
+                        inference_time = total_execution_time
+                        logging.info(f"No inference_time found, using total_execution_time: {inference_time:.3f}s")
+                    
+                    # Cập nhật executionTime label nếu có
+                    if hasattr(self, 'main_window') and self.main_window:
+                        if hasattr(self.main_window, 'executionTime') and self.main_window.executionTime:
+                            self.main_window.executionTime.display(round(inference_time, 3))
+                            conditional_print(f"DEBUG: Updated executionTime label: {inference_time:.3f}s")
+            except Exception as update_err:
+                logging.debug(f"Could not update executionTime label: {update_err}")
+            
+            # Update execution label with OK/NG status
+            self._update_execution_label(job_results)
+            
+            # Boxes/labels/OK-NG are scene items over the frame, tools no longer draw into it
+            if self.camera_view is not None and hasattr(self.camera_view, 'update_result_overlay') \
+                    and isinstance(job_results, dict) and not job_results.get('skipped_frame'):
+                self.camera_view.update_result_overlay(job_results)
+            
+            if self.display_governor is not None and not (isinstance(job_results, dict) and job_results.get('skipped_frame')):
+                self.display_governor.note_inspection()
+            if self.display_source == 'processed':
+                self._offer_display(processed_image if processed_image is not None else frame)
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Error processing frame in job pipeline: {e}")
+            self._offer_display(frame)
+
+    def set_display_rate(self, fps):
+        """UI refresh rate of the camera view (frames per second)"""
+        if self.display_governor is not None:
+            self.display_governor.set_ui_fps(fps)
+
+    def set_inspection_rate(self, fps):
+        """Cap on live-mode inspections per second (0 = as fast as the pipeline)"""
+        self.inspection_max_fps = max(0.0, float(fps or 0.0))
+        if self.inspection_worker is not None:
+            self.inspection_worker.set_max_fps(self.inspection_max_fps)
+
+    def set_display_source(self, source):
+        """'processed' shows job output, 'raw' shows camera frames while inspection runs"""
+        if source not in ('processed', 'raw'):
+            logging.error(f"Unknown display source: {source}")
+            return
+        self.display_source = source
+
     def stop_camera_for_apply(self):
         """Stop camera before applying Camera Source tool to prevent conflicts"""
         logging.info("CameraManager: Stopping camera before applying Camera Source tool")
@@ -1287,6 +1389,23 @@ class CameraManager(QObject):
         if self.fps_num:
             self.fps_num.display(f"{fps_value:.1f}")
             
+    def update_frame_age_display(self, age_ms):
+        """Show frame age at display (camera -> screen latency) next to the FPS"""
+        self._frame_age_ms = age_ms
+        self._refresh_fps_tooltip()
+            
+    def update_rates_display(self, display_fps, inspection_fps):
+        """Display and inspection rates from the governor"""
+        self._display_fps = display_fps
+        self._inspection_fps = inspection_fps
+        self._refresh_fps_tooltip()
+            
+    def _refresh_fps_tooltip(self):
+        if self.fps_num:
+            self.fps_num.setToolTip(f"Display: {self._display_fps:.1f} fps | "
+                                    f"Inspection: {self._inspection_fps:.1f} fps | "
+                                    f"Frame age at display: {self._frame_age_ms:.1f} ms")
+            
     def trigger_capture(self):
         """K  ch ho   t ch   p    nh kh  ng      ng b   """
         # B    qua ki   m tra Camera Source       cho ph  p ch   p    nh
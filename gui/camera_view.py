@@ -1,19 +1,60 @@
 import logging
 from utils.debug_utils import conditional_print
 import cv2
+import math
 import time
 import threading
+from collections import deque
 import numpy as np
 from PyQt5.QtCore import Qt, pyqtSignal, QObject, QRectF, QPoint, QThread, QTimer
 from PyQt5.QtGui import QImage, QPixmap, QCursor, QPainter, QPen, QColor, QFont
 from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem
 from gui.detection_area_overlay import DetectionAreaOverlay
+from gui.frame_mailbox import FrameMailbox
+from gui.result_overlay import ResultOverlay
+from gui.review_thumbnails import ReviewThumbnailRing
+from utils.startup_profile import startup_profiler
 from utils.debug_utils import debug_print
+from tools.pixel_format import LAYOUT_RGB, convert_layout, memory_layout
 
 # Configure logging - only log to file, not console (console handled by main.py)
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# Device pixels per frame pixel at or above which the full-resolution frame is shown
+FULL_RES_DISPLAY_SCALE = 0.95
+
+
+def downsample_for_view(image, scale):
+    """
+    Resize a frame to the on-screen size before it becomes a QImage
+
+    Returns (image, applied_scale). Frames shown at (almost) 1:1 or zoomed in
+    are returned untouched with scale 1.0.
+    """
+    if image is None or not scale or scale >= FULL_RES_DISPLAY_SCALE:
+        return image, 1.0
+    h, w = image.shape[:2]
+    new_w = max(1, int(round(w * scale)))
+    new_h = max(1, int(round(h * scale)))
+    # INTER_AREA: averages the dropped pixels (no aliasing on thin edges)
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    return resized, new_w / float(w)
+
+
+def qimage_from_rgb(rgb):
+    """
+    Wrap a contiguous HxWx3 RGB array in a QImage without copying
+
+    The QImage reads the numpy buffer directly, so the array is kept alive
+    on the QImage object itself and must not be modified afterwards.
+    """
+    rgb = np.ascontiguousarray(rgb)
+    h, w = rgb.shape[:2]
+    qimage = QImage(rgb.data, w, h, rgb.strides[0], QImage.Format_RGB888)
+    qimage._numpy_buffer = rgb
+    return qimage
+
 
 class FrameHistoryWorker(QObject):
     """Worker thread for frame history processing to avoid UI blocking"""
@@ -24,101 +65,97 @@ class FrameHistoryWorker(QObject):
         self.running = True
     
     def process_frame_history(self):
-        """Process frame history updates in background thread"""
+        """Process frame history updates in background thread (wakes only on new frames)"""
+        mailbox = self.camera_view.frame_history_mailbox
+        review_due = False  # A frame arrived inside the review throttle window
         while self.running:
             try:
-                # Check if there are frames to process
-                with self.camera_view.frame_history_lock:
-                    if len(self.camera_view.frame_history_queue) > 0:
-                        # Get the latest frame
-                        frame = self.camera_view.frame_history_queue[-1]
-                        # Clear queue to only keep latest frame
-                        self.camera_view.frame_history_queue.clear()
-                        
-                        # DEBUG: Log frame being added to history
-                        logging.info(f"[FrameHistoryWorker] Adding frame to history - shape={frame.shape if frame is not None else 'None'}, history_count_before={len(self.camera_view.frame_history)}")
-                        
-                        # Add to history
-                        self.camera_view.frame_history.append(frame.copy())
-                        
-                        # Keep only last N frames
-                        if len(self.camera_view.frame_history) > self.camera_view.max_history_frames:
-                            self.camera_view.frame_history.pop(0)
-                        
-                        # DEBUG: Log history state
-                        logging.info(f"[FrameHistoryWorker] Frame added - history_count={len(self.camera_view.frame_history)}, max={self.camera_view.max_history_frames}")
-                        
-                        # Check if it's time to update review views
-                        current_time = time.time()
-                        if (current_time - self.camera_view._last_review_update) >= self.camera_view._review_update_interval:
-                            # DEBUG: Log review update trigger
-                            logging.info(f"[FrameHistoryWorker] Triggering review view update - history_count={len(self.camera_view.frame_history)}")
-                            
-                            # Schedule UI update on main thread
-                            QTimer.singleShot(0, self.camera_view._update_review_views_threaded)
-                            self.camera_view._last_review_update = current_time
+                timeout = None
+                if review_due:
+                    elapsed = time.time() - self.camera_view._last_review_update
+                    timeout = max(0.0, self.camera_view._review_update_interval - elapsed)
                 
-                # Sleep briefly to avoid busy waiting
-                time.sleep(0.033)  # ~30 FPS max processing rate
+                entry = mailbox.take(timeout)
+                if entry is None:
+                    if mailbox.closed:
+                        break
+                else:
+                    frame, _ = entry
+                    
+                    # DEBUG: Log frame being added to history
+                    logging.info(f"[FrameHistoryWorker] Adding frame to history - shape={frame.shape if frame is not None else 'None'}, history_count_before={len(self.camera_view.frame_history)}")
+                    
+                    # Render the review thumbnail once, here, at the review view size
+                    self.camera_view.frame_history.add_frame(frame)
+                    
+                    # DEBUG: Log history state
+                    logging.info(f"[FrameHistoryWorker] Frame added - history_count={len(self.camera_view.frame_history)}, max={self.camera_view.max_history_frames}")
+                    review_due = True
+                
+                # Check if it's time to update review views
+                current_time = time.time()
+                if review_due and (current_time - self.camera_view._last_review_update) >= self.camera_view._review_update_interval:
+                    # DEBUG: Log review update trigger
+                    logging.info(f"[FrameHistoryWorker] Triggering review view update - history_count={len(self.camera_view.frame_history)}")
+                    
+                    # Schedule UI update on main thread
+                    QTimer.singleShot(0, self.camera_view._update_review_views_threaded)
+                    self.camera_view._last_review_update = current_time
+                    review_due = False
                 
             except Exception as e:
                 logging.error(f"Error in frame history worker: {e}")
-                time.sleep(0.1)  # Sleep longer on error
+                time.sleep(0.1)  # Back off on error
     
     def stop(self):
         """Stop the worker"""
         self.running = False
+        self.camera_view.frame_history_mailbox.close()
 
 
 class CameraDisplayWorker(QObject):
     """Worker thread for camera frame display processing to avoid UI blocking"""
     
     # Signal to update main thread UI
-    frameProcessed = pyqtSignal(object, object)  # (qimage, frame_for_history)
+    frameProcessed = pyqtSignal(object, object, float)  # (qimage, frame_for_history, arrival time)
     
     def __init__(self, camera_view):
         super().__init__()
         self.camera_view = camera_view
         self.running = True
-        self.frame_queue = []
-        self.frame_lock = threading.Lock()
+        # Latest-wins slot: a frame not yet processed is replaced by a newer one
+        self.mailbox = FrameMailbox()
     
-    def add_frame(self, frame):
-        """Add frame to processing queue (thread-safe)"""
-        with self.frame_lock:
-            # Keep only latest frame to avoid memory buildup
-            self.frame_queue.clear()
-            self.frame_queue.append(frame.copy())
-            conditional_print(f"DEBUG: [CameraDisplayWorker.add_frame] Frame added to queue, size={len(self.frame_queue)}")
+    def add_frame(self, frame, arrived_at=None):
+        """Hand the newest frame to the worker (thread-safe, wakes it immediately)"""
+        arrived_at = time.monotonic() if arrived_at is None else arrived_at
+        self.mailbox.put(frame.copy(), arrived_at)
+        conditional_print(f"DEBUG: [CameraDisplayWorker.add_frame] Frame posted, overwritten={self.mailbox.overwritten}")
     
     def process_frames(self):
-        """Process frames in background thread"""
+        """Process frames in background thread (blocks while no frame is pending)"""
         conditional_print(f"DEBUG: [CameraDisplayWorker.process_frames] Worker thread started, running={self.running}")
         while self.running:
             try:
-                frame = None
-                with self.frame_lock:
-                    if len(self.frame_queue) > 0:
-                        frame = self.frame_queue.pop(0)
+                entry = self.mailbox.take()
+                if entry is None:
+                    break  # Mailbox closed by stop()
+                frame, arrived_at = entry
                 
-                if frame is not None:
-                    # Process frame in background thread
-                    conditional_print(f"DEBUG: [CameraDisplayWorker.process_frames] Processing frame, shape={frame.shape}")
-                    processed_qimage, frame_for_history = self._process_frame_to_qimage(frame)
-                    
-                    if processed_qimage is not None:
-                        conditional_print(f"DEBUG: [CameraDisplayWorker.process_frames] Emitting frameProcessed signal")
-                        # Emit signal to update UI on main thread
-                        self.frameProcessed.emit(processed_qimage, frame_for_history)
-                    else:
-                        conditional_print(f"DEBUG: [CameraDisplayWorker.process_frames] processed_qimage is None!")
+                # Process frame in background thread
+                conditional_print(f"DEBUG: [CameraDisplayWorker.process_frames] Processing frame, shape={frame.shape}")
+                processed_qimage, frame_for_history = self._process_frame_to_qimage(frame)
                 
-                # Sleep briefly to avoid busy waiting
-                time.sleep(0.016)  # ~60 FPS max processing rate
+                if processed_qimage is not None:
+                    conditional_print(f"DEBUG: [CameraDisplayWorker.process_frames] Emitting frameProcessed signal")
+                    # Emit signal to update UI on main thread
+                    self.frameProcessed.emit(processed_qimage, frame_for_history, arrived_at)
+                else:
+                    conditional_print(f"DEBUG: [CameraDisplayWorker.process_frames] processed_qimage is None!")
                 
             except Exception as e:
                 logging.error(f"Error in camera display worker: {e}")
-                time.sleep(0.1)  # Sleep longer on error
+                time.sleep(0.1)  # Back off on error
     
     def _process_frame_to_qimage(self, frame):
         """Process frame to QImage in background thread"""
@@ -149,65 +186,28 @@ class CameraDisplayWorker(QObject):
             
             conditional_print(f"DEBUG: [_process_frame_to_qimage] Processing with format: {pixel_format}, shape={frame_to_process.shape}")
             
-            # Handle different frame formats safely with proper color conversion
-            if len(frame_to_process.shape) == 3 and frame_to_process.shape[2] >= 3:  # Color image with channels
-                if frame_to_process.shape[2] == 4:  # 4-channel format (XRGB or XBGR)
-                    actual_format_str = str(pixel_format)
-                    
-                    # NOTE: For 4-channel formats from picamera2, use OpenCV's color conversion
-                    # This is more reliable than manual channel reordering
-                    # Picamera2 returns BGRA byte order regardless of format name
-                    
-                    if actual_format_str in ('XBGR8888', 'XRGB8888', 'BGR888', 'RGB888'):
-                        # All 4-channel picamera2 formats have BGRA byte order
-                        # Use OpenCV to convert BGRA to RGB
-                        frame_to_process = cv2.cvtColor(frame_to_process, cv2.COLOR_BGRA2RGB)
-                        debug_print(f"{actual_format_str} (4-ch): Converting BGRA->RGB with cvtColor", "[CameraDisplayWorker]")
-                    else:
-                        # Unknown format - try BGRA conversion as fallback
-                        frame_to_process = cv2.cvtColor(frame_to_process, cv2.COLOR_BGRA2RGB)
-                        debug_print(f"Unknown 4-channel format {actual_format_str}: Converting BGRA->RGB", "[CameraDisplayWorker]")
-                        
-                elif frame_to_process.shape[2] == 3:  # 3-channel format
-                    # NOTE: Picamera2 always returns data in BGR order for 3-channel
-                    # regardless of whether we request RGB888 or BGR888
-                    # So for 3-channel data, we always need to convert BGR->RGB
-                    actual_format_str = str(pixel_format)
-                    if actual_format_str in ('RGB888', 'XRGB8888', 'BGR888', 'XBGR8888'):
-                        # Picamera2 returns BGR byte order for all formats
-                        frame_to_process = cv2.cvtColor(frame_to_process, cv2.COLOR_BGR2RGB)
-                        debug_print(f"{actual_format_str}: Converting BGR->RGB (3-channel)", "[CameraDisplayWorker]")
-                    else:
-                        # Unknown format, assume BGR and convert
-                        frame_to_process = cv2.cvtColor(frame_to_process, cv2.COLOR_BGR2RGB)
-                        debug_print(f"Unknown 3-channel format {actual_format_str}, assuming BGR", "[CameraDisplayWorker]")
-            elif len(frame_to_process.shape) == 2:  # 2D frame
-                frame_to_process = cv2.cvtColor(frame_to_process, cv2.COLOR_GRAY2RGB)
-            else:
-                # Handle other formats
-                if len(frame_to_process.shape) == 3 and frame_to_process.shape[2] == 1:
-                    frame_to_process = frame_to_process.squeeze()
-                    frame_to_process = cv2.cvtColor(frame_to_process, cv2.COLOR_GRAY2RGB)
-                else:
-                    conditional_print(f"DEBUG: [_process_frame_to_qimage] Unsupported format: {frame_to_process.shape}")
-                    logging.warning("Unsupported frame format with shape: %s", frame_to_process.shape)
-                    return None, None
-            
-            # Convert to QImage
-            h, w, ch = frame_to_process.shape
-            bytes_per_line = ch * w
-            
-            # Ensure the frame is a contiguous C-order array (required for QImage)
-            # This is especially important after channel reordering with advanced indexing
-            frame_to_process = np.ascontiguousarray(frame_to_process)
-            
-            # Create QImage from processed frame
-            conditional_print(f"DEBUG: [_process_frame_to_qimage] Creating QImage: {w}x{h}, channels={ch}")
-            qimage = QImage(frame_to_process.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            
-            # Return QImage and frame for history (make copies to be thread-safe)
+            # Single conversion from the frame's actual memory layout to RGB
+            # (picamera2: 3 kênh = BGR, 4 kênh = BGRA bất kể tên format)
+            if frame_to_process.ndim == 3 and frame_to_process.shape[2] == 1:
+                frame_to_process = frame_to_process[:, :, 0]
+            if frame_to_process.ndim not in (2, 3) or (frame_to_process.ndim == 3 and frame_to_process.shape[2] not in (3, 4)):
+                conditional_print(f"DEBUG: [_process_frame_to_qimage] Unsupported format: {frame_to_process.shape}")
+                logging.warning("Unsupported frame format with shape: %s", frame_to_process.shape)
+                return None, None
+            source_frame = frame_to_process
+            # Full-resolution RGB is still needed for current_frame (job runs, history)
+            frame_to_process = convert_layout(frame_to_process, memory_layout(frame_to_process, pixel_format), LAYOUT_RGB)
+            history_frame = frame_to_process.copy() if frame_to_process is source_frame else frame_to_process
+            
+            # Resize to the on-screen size (viewport + zoom) so QImage/QPixmap and the
+            # view only handle pixels that are actually shown
+            display_rgb, scale = downsample_for_view(history_frame, getattr(self.camera_view, '_display_scale', 1.0))
+            conditional_print(f"DEBUG: [_process_frame_to_qimage] Creating QImage: {display_rgb.shape[1]}x{display_rgb.shape[0]}, scale={scale:.3f}")
+            
+            # QImage wraps the private buffer directly (no qimage.copy())
+            qimage = qimage_from_rgb(display_rgb)
             conditional_print(f"DEBUG: [_process_frame_to_qimage] QImage created successfully, isNull={qimage.isNull()}")
-            return qimage.copy(), frame_to_process.copy()
+            return qimage, history_frame
             
         except Exception as e:
             conditional_print(f"DEBUG: [_process_frame_to_qimage] ERROR: {e}")
@@ -217,6 +217,7 @@ class CameraDisplayWorker(QObject):
     def stop(self):
         """Stop the worker"""
         self.running = False
+        self.mailbox.close()
 
 
 class CameraView(QObject):
@@ -235,6 +236,9 @@ class CameraView(QObject):
     # Tín hiệu để thông báo cập nhật FPS
     fps_updated = pyqtSignal(float)
     
+    # Tuổi frame khi hiển thị (ms, trung bình động): display_frame -> pixmap in scene
+    frame_age_updated = pyqtSignal(float)
+    
     # Tín hiệu để thông báo khi area được vẽ
     area_drawn = pyqtSignal(int, int, int, int)  # x1, y1, x2, y2
     
@@ -262,6 +266,8 @@ class CameraView(QObject):
         self.rotation_angle = 0
         self.fit_on_next_frame = False
         self._zoom_changed = False     # Flag to track if zoom level was manually changed
+        self._display_scale = 1.0      # Device px per frame px, read by the display worker
+        self._last_qimage_scale = 1.0  # QImage px per frame px of last_valid_qimage
         
         # Method to get rotation angle
         def get_rotation_angle(self):
@@ -283,9 +289,16 @@ class CameraView(QObject):
         self.fps_alpha = 0.9  # Hệ số trung bình động cho FPS
         self.show_fps = True
         
-        # Frame history for review views
-        self.frame_history = []  # Store last 5 frames for review views
+        # Frame age at display (display_frame() arrival -> shown), ms
+        self.frame_age_ms = 0.0
+        self.frame_age_history = deque(maxlen=240)
+        
+        # Frame history for review views: thumbnails at review view size, oldest first
         self.max_history_frames = 5
+        self.frame_history = ReviewThumbnailRing(self.max_history_frames)
+        self._review_items = []        # One persistent QGraphicsPixmapItem per review view
+        self._review_shown = []        # (thumbnail seq, status) currently shown per view
+        self._review_label_shown = []  # Label status currently shown per view
         self.review_views = None  # Will be set by main window
         self.review_labels = None  # Will be set by main window for NG/OK status display
         self._last_review_update = 0  # Timestamp of last review update
@@ -295,8 +308,7 @@ class CameraView(QObject):
         # Threading for frame history processing
         self.frame_history_thread = None
         self.frame_history_worker = None
-        self.frame_history_queue = []
-        self.frame_history_lock = threading.Lock()
+        self.frame_history_mailbox = FrameMailbox()  # Newest frame waiting for the history worker
         self._shutdown_frame_history = False
         
         # Threading for camera display processing
@@ -337,6 +349,8 @@ class CameraView(QObject):
         self.scene = QGraphicsScene()
         self.graphics_view.setScene(self.scene)
         self.pixmap_item = None
+        # Detection/classification results as pooled scene items above the frame
+        self.result_overlay = ResultOverlay(self.scene)
         
         # Configure view properties
         self.graphics_view.setRenderHints(QPainter.SmoothPixmapTransform)
@@ -531,19 +545,39 @@ class CameraView(QObject):
             
             self._zoom_level_set_for_size = True
         
+        arrived_at = time.monotonic()
+        
         # Store raw frame for display mode switching
         self.current_raw_frame = frame.copy()
         
+        # Tell the display worker how large the frame will appear on screen
+        self._display_scale = self._target_display_scale()
+        
         # Send frame to worker thread for processing
         if self.camera_display_worker:
             conditional_print(f"DEBUG: [display_frame] Adding frame to worker queue")
-            self.camera_display_worker.add_frame(frame)
+            self.camera_display_worker.add_frame(frame, arrived_at)
         else:
             # Fallback to synchronous processing if worker not available
             conditional_print(f"DEBUG: [display_frame] Worker is None! Thread: {self.camera_display_thread}, Running: {self.camera_display_thread.isRunning() if self.camera_display_thread else 'None'}")
             logging.warning("Camera display worker not available, using synchronous processing")
             self._display_frame_sync(frame)
     
+    def _target_display_scale(self):
+        """Device pixels per frame pixel for the next frame (GUI thread)"""
+        try:
+            if self.fit_on_next_frame:
+                return 1.0  # Fit zoom unknown until fitInView runs
+            if self._zoom_changed:
+                scale = self.zoom_level
+            else:
+                transform = self.graphics_view.transform()
+                scale = math.hypot(transform.m11(), transform.m12())
+            return scale * self.graphics_view.devicePixelRatioF()
+        except Exception as e:
+            logging.error(f"Error computing display scale: {e}")
+            return 1.0
+    
     def _get_display_frame_from_raw(self, raw_frame):
         """Get display frame from raw frame based on current display mode (thread-safe)"""
         try:
@@ -634,56 +668,6 @@ class CameraView(QObject):
         except Exception as e:
             logging.error(f"Error storing processed frames: {e}")
     
-    def _draw_detection_boxes_on_pixmap(self, pixmap):
-        """
-        Draw detection bounding boxes on pixmap
-        
-        Args:
-            pixmap: QPixmap to draw on
-        """
-        try:
-            painter = QPainter(pixmap)
-            
-            # Set pen for bounding boxes
-            pen = QPen(QColor(255, 0, 0), 2)  # Red color, 2px width
-            painter.setPen(pen)
-            
-            # Set font for labels
-            font = QFont()
-            font.setPointSize(10)
-            painter.setFont(font)
-            
-            for detection in self.detection_results:
-                bbox = detection.get('bbox', [])
-                if len(bbox) >= 4:
-                    x1, y1, x2, y2 = bbox
-                    
-                    # Draw bounding box
-                    painter.drawRect(x1, y1, x2 - x1, y2 - y1)
-                    
-                    # Prepare label text
-                    class_name = detection.get('class_name', 'Unknown')
-                    confidence = detection.get('confidence', 0)
-                    label = f"{class_name}: {confidence:.2f}"
-                    
-                    # Draw label background
-                    label_rect = painter.fontMetrics().boundingRect(label)
-                    label_rect.moveTopLeft(QPoint(x1, y1 - label_rect.height() - 2))
-                    painter.fillRect(label_rect, QColor(255, 0, 0, 180))  # Semi-transparent red
-                    
-                    # Draw label text
-                    painter.setPen(QColor(255, 255, 255))  # White text
-                    painter.drawText(label_rect, Qt.AlignCenter, label)
-                    
-                    # Reset pen for next box
-                    painter.setPen(pen)
-            
-            painter.end()
-            logging.debug(f"Drew {len(self.detection_results)} detection boxes")
-            
-        except Exception as e:
-            logging.error(f"Error drawing detection boxes: {e}")
-    
     def _handle_detection_results(self, results, processed_frame):
         """
         Handle detection results and display bounding boxes
@@ -769,6 +753,43 @@ class CameraView(QObject):
             
         self.prev_frame_time = current_time
 
+    def _record_frame_age(self, age_s):
+        """Cập nhật tuổi frame lúc hiển thị (giây) và phát tín hiệu (ms)"""
+        age_ms = age_s * 1000.0
+        self.frame_age_history.append(age_ms)
+        if self.frame_age_ms > 0:
+            self.frame_age_ms = self.fps_alpha * self.frame_age_ms + (1 - self.fps_alpha) * age_ms
+        else:
+            self.frame_age_ms = age_ms
+        self.frame_age_updated.emit(self.frame_age_ms)
+    
+    def get_display_stats(self):
+        """Display pipeline statistics: frame age at display and frames skipped"""
+        ages = sorted(self.frame_age_history)
+        stats = {
+            'fps': round(self.fps, 1),
+            'frame_age_ms': round(self.frame_age_ms, 1),
+            'display_frames_skipped': self.camera_display_worker.mailbox.overwritten if self.camera_display_worker else 0,
+            'history_frames_skipped': self.frame_history_mailbox.overwritten,
+        }
+        if ages:
+            stats.update({
+                'frame_age_ms_p50': round(ages[len(ages) // 2], 1),
+                'frame_age_ms_p95': round(ages[min(len(ages) - 1, int(len(ages) * 0.95))], 1),
+                'frame_age_ms_max': round(ages[-1], 1),
+            })
+        return stats
+
+    def update_result_overlay(self, job_results):
+        """Hiển thị kết quả detect/classify của frame vừa kiểm tra dưới dạng scene items"""
+        try:
+            frame_size = None
+            if hasattr(self, '_last_frame_width') and hasattr(self, '_last_frame_height'):
+                frame_size = (self._last_frame_width, self._last_frame_height)
+            self.result_overlay.update_from_job_results(job_results or {}, frame_size)
+        except Exception as e:
+            logging.error(f"Error updating result overlay: {e}")
+
     def _show_frame_with_zoom(self):
         """
         Hiển thị frame hiện tại với mức zoom và xoay đã cài đặt
@@ -806,6 +827,8 @@ class CameraView(QObject):
                     if self.pixmap_item is not None:
                         self.scene.removeItem(self.pixmap_item)
                     self.pixmap_item = QGraphicsPixmapItem(pixmap)
+                    if self._last_qimage_scale != 1.0:
+                        self.pixmap_item.setScale(1.0 / self._last_qimage_scale)
                     self.scene.addItem(self.pixmap_item)
                     
                 # Last resort: create a blank pixmap
@@ -821,7 +844,7 @@ class CameraView(QObject):
                     self.scene.addItem(self.pixmap_item)
                 
                 # Make sure pixmap is in scene
-                self.scene.setSceneRect(self.pixmap_item.boundingRect())
+                self.scene.setSceneRect(self.pixmap_item.sceneBoundingRect())
                 
                 # Apply zoom transform but don't reset zoom level
                 self.graphics_view.resetTransform()
@@ -891,6 +914,7 @@ class CameraView(QObject):
                     
                     # Store last valid QImage for trigger mode
                     self.last_valid_qimage = qt_image.copy()
+                    self._last_qimage_scale = 1.0
                     
                     # Create pixmap from QImage
                     pixmap = QPixmap.fromImage(qt_image)
@@ -922,10 +946,10 @@ class CameraView(QObject):
                 conditional_print(f"DEBUG: [CameraView] Unexpected: No frame available in normal display path")
                 return
             
-            # Draw detection overlays if enabled
-            if 'pixmap' in locals() and self.show_detection_overlay and self.detection_results:
-                conditional_print(f"DEBUG: [CameraView] Drawing detection boxes on pixmap")
-                self._draw_detection_boxes_on_pixmap(pixmap)
+            # Detection boxes are scene items: only their geometry changes, the pixmap is not painted
+            if self.show_detection_overlay and self.detection_results:
+                conditional_print(f"DEBUG: [CameraView] Updating detection overlay items")
+                self.result_overlay.update_detections(self.detection_results)
 
             # Update the pixmap in the scene
             try:
@@ -952,6 +976,7 @@ class CameraView(QObject):
 
                     # Apply rotation angle
                     self.pixmap_item.setRotation(self.rotation_angle)
+                    self.result_overlay.set_rotation(self.rotation_angle, self.pixmap_item.sceneBoundingRect().center())
 
                     # Calculate scene rectangle to include pixmap and any detection areas
                     scene_rect = self.pixmap_item.boundingRect()
@@ -1667,6 +1692,22 @@ class CameraView(QObject):
                 
                 # Set background color
                 review_view.setStyleSheet("background-color: #2b2b2b; border: 1px solid #555;")
+        
+        # One scene + pixmap item per view, reused for every update
+        self._review_items = []
+        for review_view in review_views:
+            item = None
+            if review_view:
+                scene = review_view.scene()
+                if scene is None:
+                    scene = QGraphicsScene()
+                    review_view.setScene(scene)
+                item = QGraphicsPixmapItem()
+                scene.addItem(item)
+            self._review_items.append(item)
+        self._review_shown = [None] * len(review_views)
+        self._review_label_shown = [None] * len(review_views)
+        self._sync_review_thumbnail_size()
                 
         logging.info(f"Frame history: Connected to {len(review_views)} review views (read-only mode)")
     
@@ -1695,32 +1736,13 @@ class CameraView(QObject):
                 return
             
             # DEBUG: Log frame arrival
-            logging.info(f"[FrameHistory] New frame received: shape={frame.shape if frame is not None else 'None'}, queue_size_before={len(self.frame_history_queue)}")
-            
-            # Resize frame for history to improve memory and performance
-            import cv2
-            history_frame = frame
-            h, w = frame.shape[:2]
-            
-            # Resize frames larger than 1440x1080 for history storage
-            if h > 1080 or w > 1440:
-                aspect_ratio = w / h
-                if aspect_ratio > 1:  # Landscape
-                    new_w, new_h = 1440, int(1440 / aspect_ratio)
-                else:  # Portrait
-                    new_w, new_h = int(1080 * aspect_ratio), 1080
-                history_frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-            
-            # Add frame to queue for background processing
-            with self.frame_history_lock:
-                # Add frame to queue (keep only latest few frames in queue)
-                self.frame_history_queue.append(history_frame.copy())
-                # Limit queue size to prevent memory buildup
-                if len(self.frame_history_queue) > 3:
-                    self.frame_history_queue.pop(0)
-            
-            # DEBUG: Log queue state after add
-            logging.debug(f"[FrameHistory] Queue updated: size={len(self.frame_history_queue)}")
+            logging.info(f"[FrameHistory] New frame received: shape={frame.shape if frame is not None else 'None'}")
+            
+            # Hand the newest frame to the history worker (replaces one it has not taken yet)
+            # (frames from the display worker are private buffers that are never modified,
+            # so no copy; the worker shrinks it straight to thumbnail size)
+            self.frame_history_mailbox.put(frame)
+            logging.debug(f"[FrameHistory] Frame posted, overwritten={self.frame_history_mailbox.overwritten}")
             
         except Exception as e:
             logging.error(f"Error updating frame history: {e}")
@@ -1732,6 +1754,8 @@ class CameraView(QObject):
                 return  # Already started
             
             # Create worker and thread
+            if self.frame_history_mailbox.closed:
+                self.frame_history_mailbox = FrameMailbox()
             self.frame_history_worker = FrameHistoryWorker(self)
             self.frame_history_thread = QThread()
             
@@ -1814,7 +1838,7 @@ class CameraView(QObject):
         except Exception as e:
             logging.error(f"Error stopping camera display worker: {e}")
     
-    def _handle_processed_frame(self, qimage, frame_for_history):
+    def _handle_processed_frame(self, qimage, frame_for_history, arrived_at=None):
         """Handle processed frame from worker thread (runs on main thread)"""
         try:
             conditional_print(f"DEBUG: [_handle_processed_frame] Received processed frame, qimage is None: {qimage is None}")
@@ -1823,6 +1847,9 @@ class CameraView(QObject):
             
             # Update current frame for internal use
             self.current_frame = frame_for_history
+            # The QImage may be downsampled; scene coordinates stay in frame pixels
+            frame_width = frame_for_history.shape[1] if frame_for_history is not None else 0
+            self._last_qimage_scale = qimage.width() / float(frame_width) if frame_width else 1.0
             
             # Store last valid QImage for use in trigger mode
             if not hasattr(self, 'last_valid_qimage') or qimage is not None:
@@ -1846,6 +1873,9 @@ class CameraView(QObject):
             # Display the processed QImage
             conditional_print(f"DEBUG: [_handle_processed_frame] Calling _display_qimage")
             self._display_qimage(qimage)
+            startup_profiler.mark_once("first camera frame displayed")
+            if arrived_at is not None:
+                self._record_frame_age(time.monotonic() - arrived_at)
             
             # Calculate FPS
             self._calculate_fps()
@@ -1873,16 +1903,27 @@ class CameraView(QObject):
                 conditional_print(f"DEBUG: [_display_qimage] Creating new graphics scene")
                 scene = QGraphicsScene()
                 self.graphics_view.setScene(scene)
-            else:
-                scene.clear()
-            
-            # Add pixmap to scene
-            conditional_print(f"DEBUG: [_display_qimage] Adding pixmap to scene")
-            scene.addPixmap(pixmap)
+                self.scene = scene
+                self.result_overlay = ResultOverlay(scene)
+            
+            # Reuse the frame item: the scene is not cleared, so result overlay
+            # items and detection areas stay in place between frames
+            if self.pixmap_item is None or self.pixmap_item.scene() is not scene:
+                conditional_print(f"DEBUG: [_display_qimage] Adding pixmap item to scene")
+                self.pixmap_item = QGraphicsPixmapItem()
+                self.pixmap_item.setZValue(-1)
+                scene.addItem(self.pixmap_item)
+            pixmap_item = self.pixmap_item
+            pixmap_item.setPixmap(pixmap)
+            pixmap_item.setScale(1.0 / self._last_qimage_scale)
+            pixmap_item.setTransformationMode(Qt.TransformationMode.SmoothTransformation
+                                              if self._last_qimage_scale != 1.0
+                                              else Qt.TransformationMode.FastTransformation)
+            scene.setSceneRect(pixmap_item.sceneBoundingRect())
             
             # Apply zoom and rotation if needed
             if self.fit_on_next_frame:
-                self.graphics_view.fitInView(scene.itemsBoundingRect(), Qt.KeepAspectRatio)
+                self.graphics_view.fitInView(pixmap_item.sceneBoundingRect(), Qt.KeepAspectRatio)
                 self.fit_on_next_frame = False
             
             # The zoom level should already be applied by the zoom_in/zoom_out methods
@@ -1916,182 +1957,106 @@ class CameraView(QObject):
     def _update_review_views_threaded(self):
         """Update review views from main thread (called by worker thread)"""
         try:
-            # Make a thread-safe copy of frame history
-            with self.frame_history_lock:
-                frame_history_copy = self.frame_history.copy()
+            thumbnails = self.frame_history.snapshot()
             
             # DEBUG: Log review update being triggered
-            logging.info(f"[ReviewViewUpdate] Main thread update triggered - frame_history_count={len(frame_history_copy)}")
+            logging.info(f"[ReviewViewUpdate] Main thread update triggered - frame_history_count={len(thumbnails)}")
             
-            # Update review views with the copy
-            self._update_review_views_with_frames(frame_history_copy)
+            self._update_review_views_with_frames(thumbnails)
             
         except Exception as e:
             logging.error(f"Error in threaded review views update: {e}")
             import traceback
             traceback.print_exc()
     
+    def _sync_review_thumbnail_size(self):
+        """Make new thumbnails match the review view viewport (GUI thread)"""
+        for review_view in self.review_views or []:
+            if review_view:
+                size = review_view.viewport().size()
+                self.frame_history.set_size(size.width(), size.height())
+                return
+    
     def _update_review_views_with_frames(self, frame_history):
-        """Update review views with given frame history and update labels with NG/OK status"""
+        """
+        Update review views and labels with NG/OK status
+        
+        Args:
+            frame_history: ReviewThumbnail list, oldest first (empty list clears the views)
+        """
         try:
-            if not self.review_views or not frame_history:
-                # DEBUG: Log early return
-                if not frame_history:
-                    logging.debug(f"[ReviewViewUpdate] Early return - frame_history empty")
+            if not self.review_views:
                 return
+            self._sync_review_thumbnail_size()
             
             # Get frame status history from result manager (if available)
             frame_status_history = []
-            if hasattr(self, 'main_window') and self.main_window:
+            if frame_history and hasattr(self, 'main_window') and self.main_window:
                 result_manager = getattr(self.main_window, 'result_manager', None)
                 if result_manager:
                     frame_status_history = result_manager.get_frame_status_history()
             
-            # DEBUG: Log initial state
-            logging.info(f"[ReviewLabel] UPDATE START - frame_history count: {len(frame_history)}, status_history count: {len(frame_status_history)}")
-            
-            # Update each review view with corresponding frame from history
             # reviewView_1 = most recent, reviewView_5 = oldest
             for i, review_view in enumerate(self.review_views):
                 if not review_view:
                     continue
-                    
-                # Calculate frame index (newest to oldest)
                 frame_index = len(frame_history) - 1 - i
+                thumbnail = frame_history[frame_index] if frame_index >= 0 else None
                 
-                # DEBUG: Log position mapping
-                logging.debug(f"[ReviewLabel] Position {i+1}: frame_index={frame_index}, review_view exists={review_view is not None}")
+                # Status history: newest is at END, mapped positionally to the views
+                status_data = None
+                status_history_index = len(frame_status_history) - 1 - i
+                if thumbnail is not None and 0 <= status_history_index < len(frame_status_history):
+                    status_data = frame_status_history[status_history_index]
+                status = status_data.get('status', 'NG') if status_data else None
                 
-                if frame_index >= 0 and frame_index < len(frame_history):
-                    frame = frame_history[frame_index]
-                    self._display_frame_in_review_view(review_view, frame, i + 1)
-                    
-                    # DEBUG: Log frame info
-                    logging.info(f"[ReviewLabel] reviewLabel_{i+1} - Displaying frame #{frame_index}, shape={frame.shape if frame is not None else 'None'}")
-                    
-                    # Update corresponding label with NG/OK status
-                    if self.review_labels and i < len(self.review_labels):
-                        label = self.review_labels[i]
-                        
-                        # Get status from frame status history
-                        # Status history: newest is at END (last index)
-                        # So we need to map: i=0 (newest frame) → last status in history
-                        status = 'NG'  # Default to NG
-                        similarity = 0.0
-                        
-                        # Map frame index to status history index (reversed!)
-                        # Newest frame (i=0) should get newest status (last in list)
-                        status_history_index = len(frame_status_history) - 1 - i  # Reversed mapping
-                        
-                        if status_history_index >= 0 and status_history_index < len(frame_status_history):
-                            status_data = frame_status_history[status_history_index]
-                            status = status_data.get('status', 'NG')
-                            similarity = status_data.get('similarity', 0.0)
-                            # Update label with status and color
-                            self._update_review_label(label, status, similarity, i + 1)
-                            
-                            # DEBUG: Log status assignment
-                            logging.info(f"[ReviewLabel] reviewLabel_{i+1} - status_history_index={status_history_index}, status={status}, similarity={similarity:.2%}")
-                        else:
-                            # No corresponding status data - clear label
-                            if label:
-                                label.setText("")
-                                label.setStyleSheet("background-color: #2b2b2b; color: white; border: 1px solid #555;")
-                            
-                            # DEBUG: Log clear action
-                            logging.info(f"[ReviewLabel] reviewLabel_{i+1} - CLEARED (no status at index {status_history_index})")
-                else:
-                    # Clear review view if no frame available
-                    self._clear_review_view(review_view)
-                    
-                    # Clear corresponding label
-                    if self.review_labels and i < len(self.review_labels):
+                # Only views whose thumbnail or verdict changed are touched
+                shown = (thumbnail.seq, status) if thumbnail is not None else None
+                if i < len(self._review_shown) and self._review_shown[i] != shown:
+                    if thumbnail is None:
+                        self._clear_review_view(review_view, i)
+                    else:
+                        self._show_review_thumbnail(review_view, i, thumbnail.pixmap(status))
+                    self._review_shown[i] = shown
+                
+                if self.review_labels and i < len(self.review_labels) and i < len(self._review_label_shown):
+                    if self._review_label_shown[i] != status:
                         label = self.review_labels[i]
-                        if label:
+                        if status is not None:
+                            self._update_review_label(label, status, status_data.get('similarity', 0.0), i + 1)
+                        elif label:
                             label.setText("")
                             label.setStyleSheet("background-color: #2b2b2b; color: white; border: 1px solid #555;")
-                    
-                    # DEBUG: Log clear for out-of-range
-                    logging.debug(f"[ReviewLabel] reviewLabel_{i+1} - CLEARED (frame_index {frame_index} out of range)")
+                        self._review_label_shown[i] = status
                     
         except Exception as e:
             logging.error(f"Error updating review views with frames: {e}")
             import traceback
             traceback.print_exc()
     
-    def _display_frame_in_review_view(self, review_view, frame, view_number):
-        """Display a frame in specific review view (auto-fit, read-only)"""
+    def _show_review_thumbnail(self, review_view, index, pixmap):
+        """Put a prepared thumbnail pixmap in review view `index` (no conversion/scaling)"""
         try:
-            if frame is None or review_view is None:
-                return
-            
-            # Skip if frame is too large (performance optimization)
-            if frame.size > 1456 * 1080 * 3:  # Skip very large frames for review views
+            item = self._review_items[index] if index < len(self._review_items) else None
+            if item is None:
                 return
-            
-            # Configure review view for read-only display
-            review_view.setDragMode(review_view.NoDrag)
-            review_view.setInteractive(False)
-            review_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-            review_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-            
-            # Get or create scene for review view
-            scene = review_view.scene()
-            if scene is None:
-                scene = QGraphicsScene()
-                review_view.setScene(scene)
-            else:
-                scene.clear()
-            
-            # Resize frame for review views to improve performance
-            import cv2
-            display_frame = frame
-            h, w = frame.shape[:2]
-            if h > 240 or w > 320:  # Resize large frames for review views
-                display_frame = cv2.resize(frame, (320, 240), interpolation=cv2.INTER_LINEAR)
-                h, w = display_frame.shape[:2]
-            
-            # Convert frame to QPixmap with proper color format handling
-            if len(display_frame.shape) == 3:
-                ch = display_frame.shape[2]
-                if ch == 3:
-                    # Frame from history should already be in RGB format
-                    # Use faster image creation without copy
-                    qimg = QImage(display_frame.data, w, h, w * ch, QImage.Format_RGB888)
-                elif ch == 4:
-                    # RGBA format
-                    qimg = QImage(display_frame.data, w, h, w * ch, QImage.Format_RGBA8888)
-                else:
-                    logging.warning(f"Unsupported channel count for review view {view_number}: {ch}")
-                    return
-            elif len(display_frame.shape) == 2:
-                # Grayscale
-                qimg = QImage(display_frame.data, w, h, w, QImage.Format_Grayscale8)
-            else:
-                logging.warning(f"Unsupported frame shape for review view {view_number}: {display_frame.shape}")
-                return
-            
-            # Create pixmap and add to scene
-            pixmap = QPixmap.fromImage(qimg)
-            if pixmap.isNull():
-                return
-                
-            scene.addPixmap(pixmap)
-            
-            # Always fit image in view and maintain aspect ratio
-            review_view.fitInView(scene.itemsBoundingRect(), Qt.KeepAspectRatio)
-            
-            # Reset any zoom transformations
-            review_view.resetTransform()
-            review_view.fitInView(scene.itemsBoundingRect(), Qt.KeepAspectRatio)
-            
+            previous_size = item.pixmap().size()
+            item.setPixmap(pixmap)
+            if pixmap.size() != previous_size:
+                # Thumbnail size changed (view resized): refit once
+                review_view.scene().setSceneRect(item.boundingRect())
+                review_view.resetTransform()
+                review_view.fitInView(item, Qt.KeepAspectRatio)
         except Exception as e:
-            logging.error(f"Error displaying frame in review view {view_number}: {e}")
+            logging.error(f"Error displaying frame in review view {index + 1}: {e}")
     
-    def _clear_review_view(self, review_view):
+    def _clear_review_view(self, review_view, index=None):
         """Clear a review view"""
         try:
-            if review_view and review_view.scene():
+            item = self._review_items[index] if index is not None and index < len(self._review_items) else None
+            if item is not None:
+                item.setPixmap(QPixmap())
+            elif review_view and review_view.scene():
                 review_view.scene().clear()
         except Exception as e:
             logging.error(f"Error clearing review view: {e}")
@@ -454,7 +454,18 @@ class DetectToolManager:
             'nms_threshold': 0.45,  # Default NMS threshold
             'imgsz': 640,  # Image size for YOLO
             'detection_region': None,  # DetectTool only needs camera images
-            'detection_area': None,  # Not used by DetectTool
+            'detection_area': None,  # Only used by DetectTool in tiled mode
+            'tiled_inference': False,  # Tiled high-resolution mode for small defects
+            'tile_size': 0,  # 0 = imgsz
+            'tile_overlap': 0.2,
+            'tile_grid': None,  # Optional (cols, rows)
+            'tile_saliency_threshold': 4.0,  # Skip tiles flatter than this (0 = never skip)
+            'tracking_enabled': False,  # Live mode: track parts between keyframe detections
+            'keyframe_interval': 5,  # Full detection every N live frames
+            'track_iou_threshold': 0.3,
+            'track_min_confidence': 0.3,  # Force a keyframe when a track decays below this
+            'track_low_score': 0.1,  # Keyframe detections down to this score can extend existing tracks
+            'track_max_age': 15,  # Frames a track survives without a matching detection
             'visualize_results': True,
             'show_confidence': True,
             'show_class_names': True
@@ -0,0 +1,239 @@
+"""
+Display governor and inspection worker - Display rate decoupled from inspection
+
+Purpose:
+  - DisplayGovernor: keeps only the newest frame offered for display (raw
+    camera frame or processed job output) and hands it to the view from a
+    QTimer at a configurable UI rate. Frames nobody could see are dropped
+    before any display work is done.
+  - InspectionWorker: runs the job pipeline on its own thread at its own
+    pace. Live frames are latest-wins (a slow model skips frames instead of
+    lagging); trigger frames are queued so every part gets a verdict, in
+    order (a trigger frame over the queue limit yields a "no verdict" NG).
+  - Both rates are measured and published through rates_updated.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UI_FPS = 30.0
+DEFAULT_TRIGGER_QUEUE = 8
+RATE_ALPHA = 0.9  # Same smoothing as CameraView FPS
+
+# Result for a trigger frame dropped past the queue limit (no Result Tool -> NG)
+NO_VERDICT_RESULT = {'error': 'Trigger queue full, frame not inspected', 'no_verdict': True}
+
+
+class RateMeter:
+    """Exponentially smoothed event rate (events per second)"""
+
+    def __init__(self, alpha: float = RATE_ALPHA, clock: Callable[[], float] = time.monotonic):
+        self.alpha = alpha
+        self._clock = clock
+        self._last: Optional[float] = None
+        self.rate = 0.0
+        self.count = 0
+
+    def tick(self) -> float:
+        now = self._clock()
+        self.count += 1
+        if self._last is not None and now > self._last:
+            instant = 1.0 / (now - self._last)
+            self.rate = instant if self.rate <= 0 else self.alpha * self.rate + (1 - self.alpha) * instant
+        self._last = now
+        return self.rate
+
+    def reset(self) -> None:
+        self._last = None
+        self.rate = 0.0
+
+
+class DisplayGovernor(QObject):
+    """Shows the newest submitted frame at most ui_fps times per second (GUI thread)"""
+
+    # (display fps, inspection fps)
+    rates_updated = pyqtSignal(float, float)
+
+    def __init__(self, display_callback: Callable[[Any], None], ui_fps: float = DEFAULT_UI_FPS, parent=None):
+        super().__init__(parent)
+        self._display_callback = display_callback
+        self._lock = threading.Lock()
+        self._pending: Any = None
+        self.ui_fps = DEFAULT_UI_FPS
+        self.display_meter = RateMeter()
+        self.inspection_meter = RateMeter()
+        self.submitted = 0
+        self.displayed = 0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_tick)
+        self.set_ui_fps(ui_fps)
+
+    @property
+    def display_fps(self) -> float:
+        return self.display_meter.rate
+
+    @property
+    def inspection_fps(self) -> float:
+        return self.inspection_meter.rate
+
+    def set_ui_fps(self, fps: float) -> None:
+        """Change the display rate (frames per second, > 0)"""
+        try:
+            fps = float(fps)
+        except (TypeError, ValueError):
+            logger.error(f"DisplayGovernor: Invalid UI fps {fps!r}")
+            return
+        if fps <= 0:
+            logger.error(f"DisplayGovernor: UI fps must be > 0, got {fps}")
+            return
+        self.ui_fps = fps
+        self._timer.setInterval(max(1, int(round(1000.0 / fps))))
+
+    def start(self) -> None:
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        with self._lock:
+            self._pending = None
+
+    def submit(self, frame: Any) -> None:
+        """Offer a frame for display; replaces one not shown yet (any thread)"""
+        if frame is None:
+            return
+        with self._lock:
+            self._pending = frame
+            self.submitted += 1
+
+    def note_inspection(self) -> None:
+        """Count one finished inspection"""
+        self.inspection_meter.tick()
+        self.rates_updated.emit(self.display_fps, self.inspection_fps)
+
+    def flush(self) -> bool:
+        """Display the pending frame now (also used by the timer)"""
+        with self._lock:
+            frame, self._pending = self._pending, None
+        if frame is None:
+            return False
+        try:
+            self._display_callback(frame)
+        except Exception as e:
+            logger.error(f"DisplayGovernor: Display callback failed: {e}")
+            return False
+        self.displayed += 1
+        self.display_meter.tick()
+        self.rates_updated.emit(self.display_fps, self.inspection_fps)
+        return True
+
+    def _on_tick(self) -> None:
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'ui_fps_target': self.ui_fps,
+            'display_fps': round(self.display_fps, 1),
+            'inspection_fps': round(self.inspection_fps, 1),
+            'submitted': self.submitted,
+            'displayed': self.displayed,
+            'inspections': self.inspection_meter.count,
+        }
+
+
+class InspectionWorker(QObject):
+    """
+    Runs run_job(frame, context) -> (processed_image, job_results) off the GUI thread
+
+    Results are emitted through `inspected` (queued to the GUI thread by Qt).
+    Every trigger frame yields exactly one result, in submission order, since
+    verdicts are paired with parts in FIFO order downstream.
+    """
+
+    # (input frame, processed image, job results, execution time s)
+    inspected = pyqtSignal(object, object, object, float)
+
+    def __init__(self, run_job: Callable[[Any, Dict[str, Any]], Tuple[Any, Dict[str, Any]]],
+                 max_fps: float = 0.0, trigger_queue: int = DEFAULT_TRIGGER_QUEUE):
+        super().__init__()
+        self._run_job = run_job
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[Any, Dict[str, Any], bool]] = deque()
+        self._trigger_queue = max(1, trigger_queue)
+        self._running = True
+        self._last_start = 0.0
+        self.max_fps = 0.0
+        self.skipped_live = 0
+        self.dropped_trigger = 0
+        self.set_max_fps(max_fps)
+
+    def set_max_fps(self, fps: float) -> None:
+        """Cap the inspection rate (0 = as fast as the pipeline runs)"""
+        self.max_fps = max(0.0, float(fps or 0.0))
+
+    def submit(self, frame: Any, context: Dict[str, Any], keep: bool = False) -> None:
+        """
+        Queue a frame for inspection (any thread)
+
+        keep=False: live frame, replaces live frames still waiting.
+        keep=True: trigger frame, never removed. Past the queue limit the oldest
+        waiting trigger frame keeps its place but its image is released; it
+        then yields a NO_VERDICT_RESULT (judged NG) instead of being inspected.
+        """
+        with self._cond:
+            if not keep:
+                waiting = len(self._queue)
+                self._queue = deque(entry for entry in self._queue if entry[2])
+                self.skipped_live += waiting - len(self._queue)
+            elif sum(1 for entry in self._queue if entry[2] and entry[0] is not None) >= self._trigger_queue:
+                oldest = next(i for i, entry in enumerate(self._queue) if entry[2] and entry[0] is not None)
+                self._queue[oldest] = (None, self._queue[oldest][1], True)
+                self.dropped_trigger += 1
+                logger.warning("InspectionWorker: Trigger queue full, oldest frame will get no verdict (NG)")
+            self._queue.append((frame, context, keep))
+            self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def run(self) -> None:
+        """Worker loop (thread started signal)"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or not self._running)
+                if not self._running:
+                    return
+                wait_s = 0.0
+                if self.max_fps > 0 and not self._queue[0][2]:
+                    wait_s = self._last_start + 1.0 / self.max_fps - time.monotonic()
+                if wait_s > 0:
+                    # Rate cap: newer live frames may replace this one meanwhile
+                    self._cond.wait(wait_s)
+                    continue
+                frame, context, keep = self._queue.popleft()
+            if keep and frame is None:
+                # Dropped trigger frame: its part still gets a (NG) result, in order
+                self.inspected.emit(None, None, dict(NO_VERDICT_RESULT), 0.0)
+                continue
+            self._last_start = time.monotonic()
+            try:
+                processed_image, job_results = self._run_job(frame, context)
+            except Exception as e:
+                logger.error(f"InspectionWorker: Job pipeline failed: {e}")
+                processed_image, job_results = None, {'error': str(e)}
+            self.inspected.emit(frame, processed_image, job_results, time.monotonic() - self._last_start)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._queue.clear()
+            self._cond.notify_all()
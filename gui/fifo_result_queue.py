@@ -10,8 +10,10 @@ Purpose:
 """
 
 import logging
+import threading
+from collections import deque
 from utils.debug_utils import conditional_print
-from typing import Dict, List, Optional, Any
+from typing import Any, Deque, Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -54,19 +56,67 @@ class FIFOResultQueue:
     5. Delete/Clear → Remove rows or clear all
     
     Data structure:
-      - Maintains FIFO order of objects
-      - Each object tied to frame_id
-      - Sensor IN/OUT tracked separately
+      - _order: deque in FIFO order (deleted items are dropped lazily)
+      - _items: frame_id -> item index for O(1) lookups/updates
+      - _pending_out: deque of items still waiting for sensor OUT
+      - All access guarded by one lock (TCP monitor thread + GUI thread)
     """
     
-    def __init__(self):
+    DEFAULT_MAX_QUEUE_SIZE = 5000
+    
+    def __init__(self, max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE):
         """Initialize empty FIFO queue"""
-        self.queue: List[ResultQueueItem] = []
+        self._lock = threading.RLock()
+        self._order: Deque[ResultQueueItem] = deque()
+        self._items: Dict[int, ResultQueueItem] = {}
+        self._pending_out: Deque[ResultQueueItem] = deque()
+        self._last_done: Optional[ResultQueueItem] = None
+        self._last_done_valid = True
         self.next_frame_id = 1  # Counter for frame IDs
-        self.max_queue_size = 100  # Prevent unlimited growth
+        self.max_queue_size = max_queue_size  # Prevent unlimited growth
         
         logger.info("FIFOResultQueue initialized")
     
+    @property
+    def queue(self) -> List[ResultQueueItem]:
+        """Snapshot of live items in FIFO order"""
+        return self.get_queue_items()
+    
+    # ------------------------------------------------------------------
+    # Internal helpers (caller holds the lock)
+    # ------------------------------------------------------------------
+    def _is_live(self, item: ResultQueueItem) -> bool:
+        return self._items.get(item.frame_id) is item
+    
+    def _live_items(self) -> List[ResultQueueItem]:
+        return [item for item in self._order if self._is_live(item)]
+    
+    def _forget(self, item: ResultQueueItem) -> None:
+        """Drop an item from the indexes; deque entries are skipped lazily"""
+        self._items.pop(item.frame_id, None)
+        if self._last_done is item:
+            self._last_done = None
+            self._last_done_valid = False
+        self._compact()
+    
+    def _compact(self) -> None:
+        """Rebuild the deques once dead entries outnumber live ones"""
+        if len(self._order) > 2 * len(self._items) + 32:
+            self._order = deque(self._live_items())
+        if len(self._pending_out) > 2 * len(self._items) + 32:
+            self._pending_out = deque(i for i in self._pending_out if self._is_live(i) and i.sensor_id_out is None)
+    
+    def _mark_done(self, item: ResultQueueItem) -> None:
+        if self._last_done_valid and (self._last_done is None or item.frame_id >= self._last_done.frame_id):
+            self._last_done = item
+    
+    def _evict_overflow(self) -> None:
+        while len(self._items) > self.max_queue_size and self._order:
+            removed = self._order.popleft()
+            if self._is_live(removed):
+                self._forget(removed)
+                logger.warning(f"FIFOResultQueue: Queue exceeded max size, removed frame_id={removed.frame_id}")
+    
     def add_sensor_in_event(self, sensor_id_in: int) -> int:
         """
         Handle sensor IN event - create new frame entry
@@ -78,21 +128,22 @@ class FIFOResultQueue:
             int: Assigned frame_id for this object
         """
         try:
-            frame_id = self.next_frame_id
-            self.next_frame_id += 1
-            
-            item = ResultQueueItem(
-                frame_id=frame_id,
-                sensor_id_in=sensor_id_in,
-                timestamp_in=datetime.now()
-            )
-            
-            self.queue.append(item)
-            
-            # Check queue size
-            if len(self.queue) > self.max_queue_size:
-                removed = self.queue.pop(0)
-                logger.warning(f"FIFOResultQueue: Queue exceeded max size, removed frame_id={removed.frame_id}")
+            with self._lock:
+                frame_id = self.next_frame_id
+                self.next_frame_id += 1
+                
+                item = ResultQueueItem(
+                    frame_id=frame_id,
+                    sensor_id_in=sensor_id_in,
+                    timestamp_in=datetime.now()
+                )
+                
+                self._order.append(item)
+                self._items[frame_id] = item
+                self._pending_out.append(item)
+                
+                # Check queue size
+                self._evict_overflow()
             
             logger.debug(f"FIFOResultQueue: Added sensor IN event - frame_id={frame_id}, sensor_id_in={sensor_id_in}")
             conditional_print(f"DEBUG: [FIFOResultQueue] Sensor IN: frame_id={frame_id}, sensor_id_in={sensor_id_in}")
@@ -120,14 +171,17 @@ class FIFOResultQueue:
             bool: True if matched successfully
         """
         try:
-            # FIFO: Find FIRST (oldest) frame without sensor_out
-            # Don't use reversed() - we want the oldest frame, not the newest
-            for item in self.queue:
-                if item.sensor_id_out is None:
+            with self._lock:
+                # FIFO: oldest live frame without sensor_out (dead entries are skipped)
+                while self._pending_out:
+                    item = self._pending_out.popleft()
+                    if not self._is_live(item) or item.sensor_id_out is not None:
+                        continue
                     item.sensor_id_out = sensor_id_out
                     item.timestamp_out = datetime.now()
                     # Mark as DONE now that we have both sensor_in and sensor_out
                     item.completion_status = "DONE"
+                    self._mark_done(item)
                     logger.debug(f"FIFOResultQueue: Added sensor OUT - frame_id={item.frame_id}, sensor_id_out={sensor_id_out}, status=DONE")
                     conditional_print(f"DEBUG: [FIFOResultQueue] Sensor OUT (FIFO): frame_id={item.frame_id}, sensor_id_out={sensor_id_out}, completion=DONE")
                     return True
@@ -141,6 +195,11 @@ class FIFOResultQueue:
             conditional_print(f"DEBUG: [FIFOResultQueue] Error adding sensor OUT: {e}")
             return False
     
+    def get_item(self, frame_id: int) -> Optional[ResultQueueItem]:
+        """Get the queue item for a frame_id (O(1))"""
+        with self._lock:
+            return self._items.get(frame_id)
+    
     def set_frame_detection_data(self, frame_id: int, detection_data: Dict[str, Any]) -> bool:
         """
         Store detection/classification data for a frame
@@ -153,12 +212,14 @@ class FIFOResultQueue:
             bool: True if frame found and data stored
         """
         try:
-            for item in self.queue:
-                if item.frame_id == frame_id:
+            with self._lock:
+                item = self._items.get(frame_id)
+                if item is not None:
                     item.detection_data = detection_data
-                    logger.debug(f"FIFOResultQueue: Set detection data for frame_id={frame_id}")
-                    conditional_print(f"DEBUG: [FIFOResultQueue] Detection data stored: frame_id={frame_id}")
-                    return True
+            if item is not None:
+                logger.debug(f"FIFOResultQueue: Set detection data for frame_id={frame_id}")
+                conditional_print(f"DEBUG: [FIFOResultQueue] Detection data stored: frame_id={frame_id}")
+                return True
             
             logger.warning(f"FIFOResultQueue: Frame not found - frame_id={frame_id}")
             return False
@@ -184,17 +245,20 @@ class FIFOResultQueue:
                 logger.warning(f"FIFOResultQueue: Invalid frame status value - {status}")
                 return False
             
-            for item in self.queue:
-                if item.frame_id == frame_id:
+            with self._lock:
+                item = self._items.get(frame_id)
+                if item is not None:
                     item.frame_status = status
                     # Update completion_status: if has both sensor_in and sensor_out, mark as DONE
                     if item.sensor_id_in is not None and item.sensor_id_out is not None:
                         item.completion_status = "DONE"
+                        self._mark_done(item)
                     else:
                         item.completion_status = "PENDING"
-                    logger.debug(f"FIFOResultQueue: Set frame_status for frame_id={frame_id} - {status}")
-                    conditional_print(f"DEBUG: [FIFOResultQueue] Frame status: frame_id={frame_id}, frame_status={status}, completion={item.completion_status}")
-                    return True
+            if item is not None:
+                logger.debug(f"FIFOResultQueue: Set frame_status for frame_id={frame_id} - {status}")
+                conditional_print(f"DEBUG: [FIFOResultQueue] Frame status: frame_id={frame_id}, frame_status={status}, completion={item.completion_status}")
+                return True
             
             logger.warning(f"FIFOResultQueue: Frame not found - frame_id={frame_id}")
             return False
@@ -211,7 +275,8 @@ class FIFOResultQueue:
         Returns:
             List of ResultQueueItem objects in FIFO order
         """
-        return self.queue.copy()
+        with self._lock:
+            return self._live_items()
     
     def get_queue_as_table_data(self) -> List[Dict[str, Any]]:
         """
@@ -220,7 +285,7 @@ class FIFOResultQueue:
         Returns:
             List of dictionaries with keys: frame_id, sensor_id_in, sensor_id_out, status
         """
-        return [item.to_dict() for item in self.queue]
+        return [item.to_dict() for item in self.get_queue_items()]
     
     def get_last_done_frame(self) -> Optional[ResultQueueItem]:
         """
@@ -233,11 +298,17 @@ class FIFOResultQueue:
             ResultQueueItem if found, None otherwise
         """
         try:
-            # Find most recent DONE frame (search from end backwards)
-            for item in reversed(self.queue):
-                if item.completion_status == "DONE":
-                    logger.debug(f"FIFOResultQueue: Found last DONE frame - frame_id={item.frame_id}, status={item.frame_status}")
-                    return item
+            with self._lock:
+                if not self._last_done_valid:
+                    # The cached DONE frame was deleted: rescan once from the end
+                    self._last_done = next((i for i in reversed(self._order)
+                                            if self._is_live(i) and i.completion_status == "DONE"), None)
+                    self._last_done_valid = True
+                item = self._last_done
+            
+            if item is not None:
+                logger.debug(f"FIFOResultQueue: Found last DONE frame - frame_id={item.frame_id}, status={item.frame_status}")
+                return item
             
             logger.debug("FIFOResultQueue: No DONE frames found")
             return None
@@ -257,12 +328,14 @@ class FIFOResultQueue:
             bool: True if item found and deleted
         """
         try:
-            for i, item in enumerate(self.queue):
-                if item.frame_id == frame_id:
-                    self.queue.pop(i)
-                    logger.debug(f"FIFOResultQueue: Deleted item - frame_id={frame_id}")
-                    conditional_print(f"DEBUG: [FIFOResultQueue] Item deleted: frame_id={frame_id}")
-                    return True
+            with self._lock:
+                item = self._items.get(frame_id)
+                if item is not None:
+                    self._forget(item)
+            if item is not None:
+                logger.debug(f"FIFOResultQueue: Deleted item - frame_id={frame_id}")
+                conditional_print(f"DEBUG: [FIFOResultQueue] Item deleted: frame_id={frame_id}")
+                return True
             
             logger.warning(f"FIFOResultQueue: Frame not found for deletion - frame_id={frame_id}")
             return False
@@ -283,8 +356,12 @@ class FIFOResultQueue:
             bool: True if row found and deleted
         """
         try:
-            if 0 <= row_index < len(self.queue):
-                item = self.queue.pop(row_index)
+            with self._lock:
+                items = self._live_items()
+                item = items[row_index] if 0 <= row_index < len(items) else None
+                if item is not None:
+                    self._forget(item)
+            if item is not None:
                 logger.debug(f"FIFOResultQueue: Deleted row - row_index={row_index}, frame_id={item.frame_id}")
                 conditional_print(f"DEBUG: [FIFOResultQueue] Row deleted: row_index={row_index}, frame_id={item.frame_id}")
                 return True
@@ -305,8 +382,13 @@ class FIFOResultQueue:
             int: Number of items cleared
         """
         try:
-            count = len(self.queue)
-            self.queue.clear()
+            with self._lock:
+                count = len(self._items)
+                self._order.clear()
+                self._items.clear()
+                self._pending_out.clear()
+                self._last_done = None
+                self._last_done_valid = True
             logger.info(f"FIFOResultQueue: Queue cleared - {count} items removed")
             conditional_print(f"DEBUG: [FIFOResultQueue] Queue cleared: {count} items removed")
             return count
@@ -318,17 +400,18 @@ class FIFOResultQueue:
     
     def get_queue_size(self) -> int:
         """Get current queue size"""
-        return len(self.queue)
+        return len(self._items)
     
     def get_pending_items(self) -> List[ResultQueueItem]:
         """Get items that are still PENDING (no sensor OUT yet)"""
-        return [item for item in self.queue if item.sensor_id_out is None]
+        return [item for item in self.get_queue_items() if item.sensor_id_out is None]
     
     def get_completed_items(self) -> List[ResultQueueItem]:
         """Get items that have both sensor IN and OUT"""
-        return [item for item in self.queue if item.sensor_id_out is not None]
+        return [item for item in self.get_queue_items() if item.sensor_id_out is not None]
     
     def reset_frame_counter(self):
         """Reset frame ID counter (for new job or clear)"""
-        self.next_frame_id = 1
+        with self._lock:
+            self.next_frame_id = 1
         logger.info("FIFOResultQueue: Frame counter reset")
@@ -0,0 +1,73 @@
+"""
+FrameMailbox - Single-slot, latest-wins handoff to a worker thread
+
+Purpose:
+  - Replace list queues polled with time.sleep() in the display/history workers
+  - put() overwrites any frame the worker has not taken yet (only the newest
+    frame is worth displaying) and wakes the worker immediately
+  - take() blocks on a threading.Condition until a frame arrives, so an idle
+    worker does not wake up at all
+  - Every item carries the monotonic time it was posted, for frame-age metrics
+"""
+
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+
+class FrameMailbox:
+    """One slot guarded by a Condition; close() releases a blocked take()"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item: Any = None
+        self._posted_at = 0.0
+        self._full = False
+        self._closed = False
+        self.posted = 0
+        self.overwritten = 0  # Frames replaced before the worker took them
+
+    def put(self, item: Any, posted_at: Optional[float] = None) -> bool:
+        """Store item (replacing an untaken one); False once closed"""
+        with self._cond:
+            if self._closed:
+                return False
+            if self._full:
+                self.overwritten += 1
+            self._item = item
+            self._posted_at = time.monotonic() if posted_at is None else posted_at
+            self._full = True
+            self.posted += 1
+            self._cond.notify()
+            return True
+
+    def take(self, timeout: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """
+        Wait for the next item and return (item, posted_at)
+
+        Returns None on timeout or when the mailbox is closed.
+        """
+        with self._cond:
+            if not self._full and not self._closed:
+                self._cond.wait_for(lambda: self._full or self._closed, timeout)
+            if not self._full:
+                return None
+            item, posted_at = self._item, self._posted_at
+            self._item = None
+            self._full = False
+            return item, posted_at
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._item = None
+            self._full = False
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def pending(self) -> bool:
+        with self._cond:
+            return self._full
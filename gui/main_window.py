@@ -5,9 +5,9 @@ from PyQt5.QtWidgets import (QGraphicsView, QWidget, QStackedWidget, QComboBox,
                             QTreeView, QMainWindow, QSpinBox, QDoubleSpinBox, QTableView, QVBoxLayout,
                             QLabel, QListWidget, QShortcut)
 from PyQt5.QtGui import QKeySequence
-from PyQt5 import uic
 import os
 import logging
+from contextlib import nullcontext
 from utils.debug_utils import conditional_print
 import time
 from job.job_manager import JobManager
@@ -19,6 +19,8 @@ from gui.classification_tool_manager import ClassificationToolManager
 from gui.result_manager import ResultManager
 from gui.result_tab_manager import ResultTabManager
 from gui.workflow_view import WorkflowWidget
+from gui.ui_loader import load_main_ui
+from utils.startup_profile import startup_profiler
 
 # Configure logging - only log to file, not console (console handled by main.py)
 logger = logging.getLogger(__name__)
@@ -77,9 +79,9 @@ class MainWindow(QMainWindow):
         from gui.tcp_controller_manager import TCPControllerManager
         self.tcp_controller = TCPControllerManager(self)
         
-        # Load UI từ file .ui
-        ui_path = os.path.join(os.path.dirname(__file__), '..', 'mainUI.ui')
-        uic.loadUi(ui_path, self)
+        # Load UI: module biên dịch sẵn (gui/ui_mainwindow.py), fallback sang mainUI.ui
+        ui_source = load_main_ui(self)
+        startup_profiler.mark(f"main window UI built ({ui_source})")
         
         # Tìm và kết nối các widget chính
         self._find_widgets()
@@ -329,7 +331,7 @@ class MainWindow(QMainWindow):
                     # Tìm các widget con TCP trong controllerTab
                     self.connectButton = self.controllerTab.findChild(QPushButton, 'connectButton')
                     self.statusLabel = self.controllerTab.findChild(QLabel, 'statusLabel')
-                    self.messageList = self.controllerTab.findChild(QListWidget, 'messageListWidget')
+                    self.messageList = self.controllerTab.findChild(QListView, 'messageListWidget')
                     self.ipEdit = self.controllerTab.findChild(QLineEdit, 'ipLineEdit')
                     self.portEdit = self.controllerTab.findChild(QLineEdit, 'portLineEdit')
                     self.messageEdit = self.controllerTab.findChild(QLineEdit, 'messageLineEdit')
@@ -644,7 +646,19 @@ class MainWindow(QMainWindow):
         # Setup ResultTabManager for FIFO queue
         self.result_tab_manager.setup_ui()
         
-        # Setup DetectToolManager
+        # DetectToolManager UI (model scan) is built when the detect page is first shown
+        self._detect_tool_manager_ready = False
+        self.settingStackedWidget.currentChanged.connect(self._on_setting_page_changed)
+    
+    def _on_setting_page_changed(self, index):
+        if self.settingStackedWidget.widget(index) is getattr(self, 'detectSettingPage', None):
+            self._ensure_detect_tool_manager()
+    
+    def _ensure_detect_tool_manager(self):
+        """Setup DetectToolManager UI on first use (not visible at startup)"""
+        if getattr(self, '_detect_tool_manager_ready', False):
+            return
+        self._detect_tool_manager_ready = True
         if hasattr(self, 'detect_tool_manager'):
             logging.info("Setting up DetectToolManager...")
             logging.info(f"algorithmComboBox before setup: {self.algorithmComboBox}")
@@ -1206,6 +1220,7 @@ class MainWindow(QMainWindow):
         
     def refresh_detect_tool_manager(self):
         """Refresh DetectToolManager connections when switching to detect page"""
+        self._ensure_detect_tool_manager()
         if hasattr(self, 'detect_tool_manager'):
             logging.info("Refreshing DetectToolManager connections...")
             self.detect_tool_manager._force_refresh_connections()
@@ -1663,7 +1678,8 @@ class MainWindow(QMainWindow):
             # Check if we're editing an existing tool or adding a new one
             if self._editing_tool is not None:
                 logging.info(f"Updating existing SaveImage tool: {self._editing_tool.display_name}")
-                self._editing_tool.update_config(config)
+                with self._editing_current_job():
+                    self._editing_tool.update_config(config)
                 self._editing_tool = None
             else:
                 # Adding new SaveImage tool
@@ -1869,16 +1885,17 @@ class MainWindow(QMainWindow):
                     # Luôn lưu detection_area từ UI nếu có
                     if detection_area:
                         new_config['detection_area'] = detection_area
-                    self._editing_tool.config = new_config
+                    with self._editing_current_job():
+                        self._editing_tool.config = new_config
+                        # Mark config as changed so DetectTool will re-initialize on next process()
+                        if hasattr(self._editing_tool, 'mark_config_changed'):
+                            self._editing_tool.mark_config_changed()
                     conditional_print(f"DEBUG: Updated DetectTool config: {self._editing_tool.config}")
-                    # Mark config as changed so DetectTool will re-initialize on next process()
-                    if hasattr(self._editing_tool, 'mark_config_changed'):
-                        self._editing_tool.mark_config_changed()
-                        conditional_print(f"DEBUG: Marked DetectTool config as changed for re-initialization")
                 else:
                     # For other tools, update config with detection_area if present
                     if hasattr(self._editing_tool, 'config') and detection_area:
-                        self._editing_tool.config['detection_area'] = detection_area
+                        with self._editing_current_job():
+                            self._editing_tool.config['detection_area'] = detection_area
                 self._editing_tool = None
                 if hasattr(self.tool_manager, '_update_job_view'):
                     self.tool_manager._update_job_view()
@@ -2179,6 +2196,7 @@ class MainWindow(QMainWindow):
             # Handle tool-specific configuration loading
             if tool.name == "Detect Tool" and hasattr(self, 'detect_tool_manager'):
                 conditional_print(f"DEBUG: Loading DetectTool configuration via DetectToolManager")
+                self._ensure_detect_tool_manager()
                 self.detect_tool_manager.load_tool_config(config)
 
             # --- Load detection area (x1, y1, x2, y2) robustly ---
@@ -2208,7 +2226,8 @@ class MainWindow(QMainWindow):
                     if overlay and hasattr(overlay, 'get_area_coords'):
                         area = overlay.get_area_coords()
                         # Update config so next time it is available
-                        tool.config['detection_area'] = area
+                        with self._editing_current_job():
+                            tool.config['detection_area'] = area
                         conditional_print(f"DEBUG: Loaded detection_area from overlay: {area}")
                     else:
                         conditional_print(f"DEBUG: No overlay found for tool #{tool.tool_id}")
@@ -2338,6 +2357,11 @@ class MainWindow(QMainWindow):
 
         conditional_print(f"DEBUG: Updated detection area fields from area change: x1={int(x1)}, y1={int(y1)}, x2={int(x2)}, y2={int(y2)}")
     
+    def _editing_current_job(self):
+        """Context manager holding the current job while a tool config is edited"""
+        job = self.job_manager.get_current_job() if getattr(self, 'job_manager', None) else None
+        return job.editing() if job is not None else nullcontext()
+
     def _collect_detection_area(self):
         """Collect detection area coordinates from UI or current drawn area"""
         conditional_print(f"DEBUG: _collect_detection_area called")
@@ -2750,6 +2774,19 @@ class MainWindow(QMainWindow):
                     logger.warning("Cleanup timeout - forcing exit")
                     return
                 
+                # Ghi nốt lịch sử kiểm tra còn trong hàng đợi
+                if hasattr(self, 'result_tab_manager') and self.result_tab_manager:
+                    self.result_tab_manager.close_history()
+                
+                # Ghi nốt ảnh NG còn trong archive của SaveImageTool
+                if hasattr(self, 'job_manager') and self.job_manager:
+                    for job in self.job_manager.jobs:
+                        for tool in job.tools:
+                            try:
+                                tool.cleanup()
+                            except Exception as tool_err:
+                                logger.error(f"Error cleaning up tool {getattr(tool, 'name', tool)}: {tool_err}")
+                
                 logger.info("Main window cleanup completed")
             
             # Try cleanup with timeout protection
@@ -2869,7 +2906,8 @@ class MainWindow(QMainWindow):
             try:
                 ct = self.camera_manager.find_camera_tool() if hasattr(self.camera_manager, 'find_camera_tool') else None
                 if ct and hasattr(ct, 'update_config'):
-                    ct.update_config({'format': fmt})
+                    with self._editing_current_job():
+                        ct.update_config({'format': fmt})
                     conditional_print(f"DEBUG: [MainWindow] Updated CameraTool config with format {fmt}")
             except Exception as e:
                 conditional_print(f"DEBUG: [MainWindow] Could not update CameraTool config: {e}")
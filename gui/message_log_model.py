@@ -0,0 +1,185 @@
+"""
+MessageLogModel - Bounded, batched list model for the TCP message log
+
+Purpose:
+  - Replace per-line QListWidget.addItem + scrollToBottom on the GUI thread
+  - Accept lines from any thread (deque.append, no lock on the hot path)
+  - Flush pending lines to the view in one insert per UI tick (default 10 Hz)
+  - Keep at most `capacity` lines (oldest dropped in one removeRows per tick)
+  - Tag every line with a kind (RX/TX/STATUS/FRAME/SERVO/SENSOR/ERROR) so the
+    view can filter through MessageLogFilter
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Iterable, List, Optional, Tuple
+
+from PyQt5.QtCore import (QAbstractListModel, QModelIndex, QSortFilterProxyModel,
+                          Qt, QTimer, pyqtSignal)
+from PyQt5.QtGui import QBrush, QColor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 2000
+DEFAULT_FLUSH_INTERVAL_MS = 100
+
+KIND_RX = 'RX'
+KIND_TX = 'TX'
+KIND_STATUS = 'STATUS'
+KIND_FRAME = 'FRAME'
+KIND_SERVO = 'SERVO'
+KIND_SENSOR = 'SENSOR'
+KIND_ERROR = 'ERROR'
+KINDS = (KIND_RX, KIND_TX, KIND_STATUS, KIND_FRAME, KIND_SERVO, KIND_SENSOR, KIND_ERROR)
+
+KindRole = Qt.UserRole + 1
+TimestampRole = Qt.UserRole + 2
+
+# Line prefix -> kind (checked in order)
+_PREFIX_KINDS = (
+    ('RX:', KIND_RX),
+    ('TX:', KIND_TX),
+    ('Status:', KIND_STATUS),
+    ('[FRAME]', KIND_FRAME),
+    ('[SERVO]', KIND_SERVO),
+    ('[SENSOR', KIND_SENSOR),
+    ('Error', KIND_ERROR),
+)
+
+_KIND_COLORS = {
+    KIND_ERROR: QColor(Qt.red),
+    KIND_SERVO: QColor(Qt.darkCyan),
+}
+
+Entry = Tuple[float, str, str]  # (timestamp, kind, text)
+
+
+def classify(text: str) -> str:
+    """Kind of a log line from its prefix"""
+    for prefix, kind in _PREFIX_KINDS:
+        if text.startswith(prefix):
+            return kind
+    return KIND_STATUS
+
+
+class MessageLogModel(QAbstractListModel):
+    """Ring-buffered list model; rows only change on flush()"""
+
+    batch_flushed = pyqtSignal(int)  # number of lines appended in the batch
+
+    def __init__(self, parent=None, capacity: int = DEFAULT_CAPACITY,
+                 flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS):
+        super().__init__(parent)
+        self.capacity = max(1, int(capacity))
+        self._rows: Deque[Entry] = deque()
+        # Producer side: deque.append/popleft are atomic, so any thread may append
+        self._pending: Deque[Entry] = deque()
+        self.lines_appended = 0
+        self.lines_dropped = 0
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(max(1, int(flush_interval_ms)))
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start()
+
+    # ------------------------------------------------------------------
+    # Producer API (any thread)
+    # ------------------------------------------------------------------
+    def append(self, text: str, kind: Optional[str] = None) -> None:
+        self._pending.append((time.time(), kind or classify(text), text))
+
+    # ------------------------------------------------------------------
+    # GUI thread
+    # ------------------------------------------------------------------
+    def flush(self) -> int:
+        """Move pending lines into the model: at most one remove + one insert"""
+        if not self._pending:
+            return 0
+        batch: List[Entry] = []
+        try:
+            while True:
+                batch.append(self._pending.popleft())
+        except IndexError:
+            pass
+        if len(batch) > self.capacity:
+            self.lines_dropped += len(batch) - self.capacity
+            batch = batch[-self.capacity:]
+
+        overflow = len(self._rows) + len(batch) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._rows.popleft()
+            self.endRemoveRows()
+            self.lines_dropped += overflow
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        self._rows.extend(batch)
+        self.endInsertRows()
+        self.lines_appended += len(batch)
+        self.batch_flushed.emit(len(batch))
+        return len(batch)
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
+
+    def stop(self) -> None:
+        self._flush_timer.stop()
+
+    def lines(self, kinds: Optional[Iterable[str]] = None) -> List[str]:
+        """Text of the lines in the model (optionally of some kinds only)"""
+        wanted = set(kinds) if kinds is not None else None
+        return [text for _, kind, text in self._rows if wanted is None or kind in wanted]
+
+    # ------------------------------------------------------------------
+    # Qt model interface
+    # ------------------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        timestamp, kind, text = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == KindRole:
+            return kind
+        if role == TimestampRole:
+            return timestamp
+        if role == Qt.ToolTipRole:
+            return time.strftime('%H:%M:%S', time.localtime(timestamp)) + f".{int(timestamp % 1 * 1000):03d}"
+        if role == Qt.ForegroundRole and kind in _KIND_COLORS:
+            return QBrush(_KIND_COLORS[kind])
+        return None
+
+
+class MessageLogFilter(QSortFilterProxyModel):
+    """Shows only the enabled message kinds"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._enabled = set(KINDS)
+
+    def enabled_kinds(self) -> List[str]:
+        return [kind for kind in KINDS if kind in self._enabled]
+
+    def set_kind_enabled(self, kind: str, enabled: bool) -> None:
+        if enabled:
+            self._enabled.add(kind)
+        else:
+            self._enabled.discard(kind)
+        self.invalidateFilter()
+
+    def set_enabled_kinds(self, kinds: Iterable[str]) -> None:
+        self._enabled = set(kinds)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        return self.sourceModel().data(index, KindRole) in self._enabled
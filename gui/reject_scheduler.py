@@ -0,0 +1,322 @@
+"""
+Reject Scheduler - Sends sorting-gate (servo) commands as soon as a verdict is ready
+
+Purpose:
+  - Learn the sensor IN -> sensor OUT transit time from the FIFO queue timestamps
+  - Give every part a deadline: predicted arrival at the gate minus the gate
+    travel time
+  - Send "GOTO 5" (OK) / "GOTO 45" (NG) as soon as the part's verdict exists and
+    the part ahead of it has cleared the gate
+  - Flag parts whose command was late or never sent, and keep margin statistics
+
+Gate model: the gate sits downstream of the OUT sensor and parts leave in FIFO
+order. A part reaches the gate gate_delay_s after its OUT edge; the part ahead
+has cleared the gate gate_clearance_s after its own OUT edge, so the command
+for part N goes out at max(verdict time, OUT(N-1) + gate_clearance_s). With
+gate_clearance_s=None (default) the clearance is unknown and the command waits
+for part N's own OUT edge, as the old end_sensor logic did; a verdict that
+arrives after that edge is still sent immediately.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from statistics import median
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from utils.debug_utils import conditional_print
+
+logger = logging.getLogger(__name__)
+
+SERVO_COMMANDS = {
+    'OK': 'GOTO 5',
+    'NG': 'GOTO 45',
+}
+
+# Gate travel 5° -> 45° on the Pico: 40° in SERVO_STEP_DEG=4 steps every SERVO_STEP_MS=8
+DEFAULT_ACTUATION_S = 0.08
+
+
+@dataclass
+class TrackedPart:
+    """One part between the IN and OUT sensors"""
+    frame_id: int
+    t_in: float
+    status: Optional[str] = None
+    command: Optional[str] = None
+    t_sent: Optional[float] = None
+    deadline: Optional[float] = None     # Latest send time for the gate to be in place
+    t_out: Optional[float] = None
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """datetime / float timestamp from a queue item -> float seconds"""
+    if value is None:
+        return None
+    if hasattr(value, 'timestamp'):
+        return value.timestamp()
+    return float(value)
+
+
+def _thread_timer(delay_s: float, callback: Callable[[], None]) -> None:
+    timer = threading.Timer(delay_s, callback)
+    timer.daemon = True
+    timer.start()
+
+
+class RejectScheduler:
+    """
+    Predictive reject scheduling driven by FIFOResultQueue events
+
+    Call part_entered() after sensor IN created a frame, verdict_ready() when
+    the frame's OK/NG status is set and part_exited() when sensor OUT matched
+    it. Commands go out through send_command(command) -> bool; a command
+    that must wait for the gate to clear is re-tried through
+    schedule(delay_s, callback) (a daemon threading.Timer by default).
+    """
+
+    def __init__(self, fifo_queue, send_command: Callable[[str], bool],
+                 actuation_s: float = DEFAULT_ACTUATION_S, transit_window: int = 32,
+                 default_transit_s: Optional[float] = None, history: int = 512,
+                 on_flagged: Optional[Callable[[int, str], None]] = None,
+                 gate_delay_s: Optional[float] = None, gate_clearance_s: Optional[float] = None,
+                 schedule: Callable[[float, Callable[[], None]], Any] = _thread_timer,
+                 clock: Callable[[], float] = time.time):
+        self.fifo_queue = fifo_queue
+        self.send_command = send_command
+        self.actuation_s = max(0.0, float(actuation_s))
+        # OUT sensor -> gate travel; None = a command sent at the OUT edge is just in time
+        self.gate_delay_s = self.actuation_s if gate_delay_s is None else max(0.0, float(gate_delay_s))
+        self.gate_clearance_s = None if gate_clearance_s is None else max(0.0, float(gate_clearance_s))
+        self.default_transit_s = default_transit_s
+        self.on_flagged = on_flagged
+        self._schedule = schedule
+        self._clock = clock
+        self._lock = threading.RLock()
+
+        self._parts: Deque[TrackedPart] = deque()   # FIFO order, head = next part at the gate
+        self._by_id: Dict[int, TrackedPart] = {}
+        self._last_out: Optional[float] = None      # OUT time of the part that last left
+        self._wake_at: Optional[float] = None       # Pending schedule() retry
+        self._transits: Deque[float] = deque(maxlen=max(1, transit_window))
+
+        # Margin = (gate arrival - actuation) - send time; negative = gate late
+        self.margins_ms: Deque[float] = deque(maxlen=history)
+        self.flagged: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.commands_sent = 0
+        self.on_time = 0
+        self.late = 0
+        self.missed = 0
+
+    # ------------------------------------------------------------------
+    # Queue events
+    # ------------------------------------------------------------------
+    def part_entered(self, frame_id: int) -> None:
+        """Sensor IN created frame_id"""
+        try:
+            item = self.fifo_queue.get_item(frame_id)
+            if item is None:
+                return
+            with self._lock:
+                t_in = _timestamp(item.timestamp_in) or self._clock()
+                part = TrackedPart(frame_id, t_in)
+                part.deadline = self._predicted_deadline(part)
+                self._parts.append(part)
+                self._by_id[frame_id] = part
+                if item.frame_status in SERVO_COMMANDS:
+                    # Verdict was buffered before the part reached the IN sensor
+                    part.status = item.frame_status
+                self._pump()
+        except Exception as e:
+            logger.error(f"RejectScheduler: Error tracking frame {frame_id}: {e}", exc_info=True)
+
+    def verdict_ready(self, frame_id: int, status: Optional[str] = None) -> None:
+        """OK/NG status set for frame_id (untracked frames are ignored)"""
+        try:
+            with self._lock:
+                part = self._by_id.get(frame_id)
+                if part is None:
+                    return
+                if status is None:
+                    item = self.fifo_queue.get_item(frame_id)
+                    status = item.frame_status if item is not None else None
+                if status not in SERVO_COMMANDS or part.command is not None:
+                    return
+                part.status = status
+                self._pump()
+        except Exception as e:
+            logger.error(f"RejectScheduler: Error handling verdict for frame {frame_id}: {e}", exc_info=True)
+
+    def part_exited(self, frame_id: int) -> None:
+        """Sensor OUT matched frame_id: learn the transit, send a held command, score it"""
+        try:
+            item = self.fifo_queue.get_item(frame_id)
+            with self._lock:
+                part = self._by_id.pop(frame_id, None)
+                if part is None:
+                    return
+                while self._parts and self._parts[0] is not part:
+                    ahead = self._parts[0]
+                    if ahead.t_out is not None:
+                        # Still held for the gate when the next part left: too late now
+                        self._finish(ahead)
+                    else:
+                        # Never got an OUT: removed from the queue
+                        self._by_id.pop(self._parts.popleft().frame_id, None)
+
+                t_out = _timestamp(item.timestamp_out) if item is not None else None
+                part.t_out = t_out or self._clock()
+                if part.t_out > part.t_in:
+                    self._transits.append(part.t_out - part.t_in)
+
+                if part.command is not None or part.status is None:
+                    self._finish(part)
+                # A verdict still waiting for the gate goes out (and is scored) as soon as it clears
+                self._pump()
+        except Exception as e:
+            logger.error(f"RejectScheduler: Error handling exit of frame {frame_id}: {e}", exc_info=True)
+
+    def _finish(self, part: TrackedPart) -> None:
+        """Score the command of a part past the OUT sensor and release the gate to the next (lock held)"""
+        if self._parts and self._parts[0] is part:
+            self._parts.popleft()
+        self._last_out = part.t_out
+
+        if part.t_sent is None:
+            self.missed += 1
+            self._flag(part, 'missed', None)
+            return
+        deadline = part.t_out + self.gate_delay_s - self.actuation_s
+        margin_ms = (deadline - part.t_sent) * 1000.0
+        self.margins_ms.append(margin_ms)
+        if margin_ms < 0:
+            self.late += 1
+            self._flag(part, 'late', margin_ms)
+        else:
+            self.on_time += 1
+
+    def reset(self) -> None:
+        """Forget tracked parts (queue cleared); the learned transit time is kept"""
+        with self._lock:
+            self._parts.clear()
+            self._by_id.clear()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def transit_estimate(self) -> Optional[float]:
+        """Median IN -> OUT transit over recent parts (seconds)"""
+        with self._lock:
+            if self._transits:
+                return median(self._transits)
+            return self.default_transit_s
+
+    def _predicted_deadline(self, part: TrackedPart) -> Optional[float]:
+        """Predicted gate arrival minus actuation time (None until a transit is known)"""
+        transit = self.transit_estimate()
+        if transit is None:
+            return None
+        return part.t_in + transit + self.gate_delay_s - self.actuation_s
+
+    def _prune_deleted(self) -> None:
+        """Drop parts whose rows were deleted/cleared from the queue (lock held)"""
+        # A dropped part's OUT event can no longer be matched; the gate counts as free
+        while self._parts and self.fifo_queue.get_item(self._parts[0].frame_id) is None:
+            dropped = self._parts.popleft()
+            self._by_id.pop(dropped.frame_id, None)
+
+    def _gate_free_at(self, part: TrackedPart) -> Optional[float]:
+        """Earliest send time for the head part (None = not known yet)"""
+        if self.gate_clearance_s is None:
+            # Clearance unknown: the part's own OUT edge, as the old end_sensor logic
+            return part.t_out
+        if self._last_out is None:
+            return float('-inf')
+        return self._last_out + self.gate_clearance_s
+
+    def _on_wake(self) -> None:
+        with self._lock:
+            self._wake_at = None
+            self._pump()
+
+    def _pump(self) -> None:
+        """Send the head part's command once it has a verdict and the gate is clear (lock held)"""
+        while True:
+            self._prune_deleted()
+            if not self._parts:
+                return
+            part = self._parts[0]
+            # The head part holds the gate from its command until its OUT edge
+            if part.status is None or part.command is not None:
+                return
+            free_at = self._gate_free_at(part)
+            if free_at is None:
+                return
+            now = self._clock()
+            if now < free_at:
+                if self._wake_at != free_at:
+                    self._wake_at = free_at
+                    self._schedule(free_at - now, self._on_wake)
+                return
+            self._send(part)
+            if self._parts and self._parts[0] is part:
+                return  # Still ahead of the OUT sensor: holds the gate
+
+    def _send(self, part: TrackedPart) -> None:
+        command = SERVO_COMMANDS[part.status]
+        now = self._clock()
+        if part.deadline is None:
+            part.deadline = self._predicted_deadline(part)
+        if self.send_command(command):
+            part.command = command
+            part.t_sent = now
+            self.commands_sent += 1
+            if part.deadline is not None and now > part.deadline:
+                logger.warning(f"RejectScheduler: Frame {part.frame_id} command sent "
+                               f"{(now - part.deadline) * 1000:.1f}ms after its predicted deadline")
+            conditional_print(f"DEBUG: [RejectScheduler] Frame {part.frame_id} {part.status} → {command}")
+        else:
+            logger.error(f"RejectScheduler: Failed to send {command} for frame {part.frame_id}")
+        if part.t_out is not None:
+            # Held until after its OUT edge: scored now (missed if the send failed)
+            self._finish(part)
+
+    def _flag(self, part: TrackedPart, reason: str, margin_ms: Optional[float]) -> None:
+        entry = {'frame_id': part.frame_id, 'reason': reason, 'status': part.status, 'margin_ms': margin_ms}
+        self.flagged.append(entry)
+        logger.warning(f"RejectScheduler: Frame {part.frame_id} ({part.status or 'no verdict'}) reject command {reason}"
+                       + (f", margin {margin_ms:.1f}ms" if margin_ms is not None else ""))
+        if self.on_flagged:
+            try:
+                self.on_flagged(part.frame_id, reason)
+            except Exception as e:
+                logger.error(f"RejectScheduler: on_flagged callback failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+    def get_flagged_frames(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.flagged)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            margins = sorted(self.margins_ms)
+            transit = self.transit_estimate()
+            stats = {
+                'in_flight': len(self._parts),
+                'commands_sent': self.commands_sent,
+                'on_time': self.on_time,
+                'late': self.late,
+                'missed': self.missed,
+                'transit_ms': round(transit * 1000.0, 1) if transit is not None else None,
+            }
+            if margins:
+                stats.update({
+                    'margin_ms_mean': round(sum(margins) / len(margins), 1),
+                    'margin_ms_min': round(margins[0], 1),
+                    'margin_ms_p5': round(margins[int(len(margins) * 0.05)], 1),
+                })
+            return stats
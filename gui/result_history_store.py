@@ -0,0 +1,391 @@
+"""
+ResultHistoryStore - Persistent inspection history (SQLite, WAL mode)
+
+Purpose:
+  - Keep every inspected part, not just the last rows of the FIFO queue
+  - Record frame id, sensor ids, timestamps, status, detections and timings
+  - Write from a background thread in batched transactions, so recording
+    costs the caller one queue.put per frame
+  - Indexed queries by time range, status and class for yield reports
+
+Records are keyed by (run_id, frame_id): a frame written again (e.g. when
+sensor OUT arrives after the OK/NG result) updates its row instead of
+adding a duplicate. run_id separates app sessions, since frame ids restart.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'data', 'inspection_history.db')
+
+# Writer batching: flush when this many records are waiting or after this delay
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL_S = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inspections (
+    id                INTEGER PRIMARY KEY,
+    run_id            TEXT NOT NULL,
+    frame_id          INTEGER NOT NULL,
+    sensor_id_in      INTEGER,
+    sensor_id_out     INTEGER,
+    ts_in             REAL,
+    ts_out            REAL,
+    ts_result         REAL NOT NULL,
+    status            TEXT NOT NULL,
+    completion_status TEXT,
+    inference_ms      REAL,
+    detection_count   INTEGER,
+    detections        TEXT,
+    timings           TEXT,
+    UNIQUE (run_id, frame_id)
+);
+CREATE INDEX IF NOT EXISTS idx_inspections_ts ON inspections (ts_result);
+CREATE INDEX IF NOT EXISTS idx_inspections_status_ts ON inspections (status, ts_result);
+
+CREATE TABLE IF NOT EXISTS inspection_classes (
+    run_id     TEXT NOT NULL,
+    frame_id   INTEGER NOT NULL,
+    class_name TEXT NOT NULL,
+    count      INTEGER NOT NULL,
+    ts_result  REAL NOT NULL,
+    PRIMARY KEY (run_id, frame_id, class_name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_classes_name_ts ON inspection_classes (class_name, ts_result);
+"""
+
+_UPSERT = """
+INSERT INTO inspections (run_id, frame_id, sensor_id_in, sensor_id_out, ts_in, ts_out, ts_result,
+                         status, completion_status, inference_ms, detection_count, detections, timings)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (run_id, frame_id) DO UPDATE SET
+    sensor_id_in = excluded.sensor_id_in,
+    sensor_id_out = excluded.sensor_id_out,
+    ts_in = excluded.ts_in,
+    ts_out = excluded.ts_out,
+    status = excluded.status,
+    completion_status = excluded.completion_status,
+    inference_ms = excluded.inference_ms,
+    detection_count = excluded.detection_count,
+    detections = excluded.detections,
+    timings = excluded.timings
+"""
+
+_COLUMNS = ('run_id', 'frame_id', 'sensor_id_in', 'sensor_id_out', 'ts_in', 'ts_out', 'ts_result',
+            'status', 'completion_status', 'inference_ms', 'detection_count', 'detections', 'timings')
+
+_STOP = object()
+
+
+def _epoch(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _class_counts(detections: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for det in detections or []:
+        if isinstance(det, dict):
+            name = det.get('class_name') or det.get('class')
+            if name is not None:
+                counts[str(name)] = counts.get(str(name), 0) + 1
+    return counts
+
+
+def record_from_item(item: Any, ts_result: Optional[float] = None) -> Dict[str, Any]:
+    """Flatten a ResultQueueItem into a history record"""
+    data = item.detection_data if isinstance(item.detection_data, dict) else {}
+    detections = data.get('detections') or []
+    inference_time = data.get('inference_time')
+    timings = {k: v for k, v in data.items() if k.endswith('_time') and isinstance(v, (int, float))}
+    return {
+        'frame_id': item.frame_id,
+        'sensor_id_in': item.sensor_id_in,
+        'sensor_id_out': item.sensor_id_out,
+        'ts_in': _epoch(item.timestamp_in),
+        'ts_out': _epoch(item.timestamp_out),
+        'ts_result': ts_result if ts_result is not None else time.time(),
+        'status': item.frame_status or 'PENDING',
+        'completion_status': item.completion_status,
+        'inference_ms': float(inference_time) * 1000.0 if isinstance(inference_time, (int, float)) else None,
+        'detection_count': int(data.get('detection_count', len(detections)) or 0),
+        'detections': detections,
+        'timings': timings,
+    }
+
+
+class ResultHistoryStore:
+    """
+    Append-only inspection history written by a background thread
+
+    record() only enqueues; the writer drains the queue and commits each
+    batch in one transaction. Query methods open their own read connection,
+    which WAL mode lets run alongside the writer.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL_S, run_id: Optional[str] = None):
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d-%H%M%S-') + str(os.getpid())
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self.records_written = 0
+        self.batches_written = 0
+        self.write_errors = 0
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.executescript(_SCHEMA)
+                conn.commit()
+            finally:
+                conn.close()
+            self._thread = threading.Thread(target=self._writer_loop, name="ResultHistoryWriter", daemon=True)
+            self._thread.start()
+            logger.info(f"ResultHistoryStore: Writing history to {self.path} (run_id={self.run_id})")
+
+    def record(self, record: Dict[str, Any]) -> bool:
+        """Queue one record for writing (non-blocking)"""
+        if self._closed:
+            return False
+        try:
+            self._ensure_started()
+            self._queue.put(record)
+            return True
+        except Exception as e:
+            logger.error(f"ResultHistoryStore: Error queueing record: {e}")
+            return False
+
+    def record_item(self, item: Any) -> bool:
+        """Queue a ResultQueueItem"""
+        try:
+            return self.record(record_from_item(item))
+        except Exception as e:
+            logger.error(f"ResultHistoryStore: Error converting queue item: {e}")
+            return False
+
+    def _writer_loop(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                batch, waiters, stop = self._next_batch()
+                if batch:
+                    self._write_batch(conn, batch)
+                for event in waiters:
+                    event.set()
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def _next_batch(self) -> Tuple[List[Dict[str, Any]], List[threading.Event], bool]:
+        """Block for the first item, then drain up to batch_size until the flush deadline"""
+        batch: List[Dict[str, Any]] = []
+        waiters: List[threading.Event] = []
+        first = self._queue.get()
+        deadline = time.monotonic() + self.flush_interval
+        entry = first
+        while True:
+            if entry is _STOP:
+                return batch, waiters, True
+            if isinstance(entry, threading.Event):
+                # flush() marker: commit what we have now
+                waiters.append(entry)
+                return batch, waiters, False
+            batch.append(entry)
+            if len(batch) >= self.batch_size:
+                return batch, waiters, False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return batch, waiters, False
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return batch, waiters, False
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Dict[str, Any]]) -> None:
+        rows = []
+        class_rows = []
+        for rec in batch:
+            counts = _class_counts(rec.get('detections'))
+            rows.append((
+                self.run_id, rec['frame_id'], rec.get('sensor_id_in'), rec.get('sensor_id_out'),
+                rec.get('ts_in'), rec.get('ts_out'), rec['ts_result'], rec.get('status', 'PENDING'),
+                rec.get('completion_status'), rec.get('inference_ms'), rec.get('detection_count'),
+                json.dumps(rec.get('detections') or [], default=str),
+                json.dumps(rec.get('timings') or {}, default=str),
+            ))
+            class_rows.extend((self.run_id, rec['frame_id'], name, count, rec['ts_result'])
+                              for name, count in counts.items())
+        try:
+            with conn:
+                conn.executemany(_UPSERT, rows)
+                conn.executemany("DELETE FROM inspection_classes WHERE run_id = ? AND frame_id = ?",
+                                 [(self.run_id, rec['frame_id']) for rec in batch])
+                conn.executemany("INSERT OR REPLACE INTO inspection_classes VALUES (?, ?, ?, ?, ?)", class_rows)
+            self.records_written += len(rows)
+            self.batches_written += 1
+        except Exception as e:
+            self.write_errors += 1
+            logger.error(f"ResultHistoryStore: Error writing batch of {len(rows)} records: {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is committed"""
+        if self._thread is None:
+            return True
+        event = threading.Event()
+        self._queue.put(event)
+        return event.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Commit pending records and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            logger.info(f"ResultHistoryStore: Closed ({self.records_written} records written)")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _read(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        if not os.path.exists(self.path):
+            return []
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _time_filter(start: Optional[float], end: Optional[float], column: str = 'ts_result') -> Tuple[str, List]:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(_epoch(start))
+        if end is not None:
+            clauses.append(f"{column} < ?")
+            params.append(_epoch(end))
+        return " AND ".join(clauses), params
+
+    def query(self, start: Any = None, end: Any = None, status: Optional[str] = None,
+              class_name: Optional[str] = None, limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
+        """
+        Inspection records filtered by time range [start, end), status and class
+
+        Args:
+            start, end: epoch seconds or datetime (None = open)
+            status: 'OK' / 'NG' / ...
+            class_name: only frames with at least one detection of this class
+            limit: max rows, newest first (None = all)
+        """
+        try:
+            where, params = self._time_filter(start, end, 'i.ts_result')
+            clauses = [where] if where else []
+            if status is not None:
+                clauses.append("i.status = ?")
+                params.append(status)
+            if class_name is not None:
+                ctime, cparams = self._time_filter(start, end, 'c.ts_result')
+                clauses.append("(i.run_id, i.frame_id) IN (SELECT c.run_id, c.frame_id FROM inspection_classes c "
+                               "WHERE c.class_name = ?" + (f" AND {ctime}" if ctime else "") + ")")
+                params.extend([class_name] + cparams)
+            sql = f"SELECT {', '.join('i.' + c for c in _COLUMNS)} FROM inspections i"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += " ORDER BY i.ts_result DESC"
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(int(limit))
+            records = []
+            for row in self._read(sql, tuple(params)):
+                rec = dict(row)
+                rec['detections'] = json.loads(rec['detections'] or '[]')
+                rec['timings'] = json.loads(rec['timings'] or '{}')
+                records.append(rec)
+            return records
+        except Exception as e:
+            logger.error(f"ResultHistoryStore: Error querying history: {e}")
+            return []
+
+    def yield_report(self, start: Any = None, end: Any = None) -> Dict[str, Any]:
+        """Part counts per status and OK yield over a time range"""
+        try:
+            where, params = self._time_filter(start, end)
+            sql = "SELECT status, COUNT(*) AS n, AVG(inference_ms) AS avg_ms FROM inspections"
+            if where:
+                sql += " WHERE " + where
+            sql += " GROUP BY status"
+            by_status = {row['status']: row['n'] for row in self._read(sql, tuple(params))}
+            total = sum(by_status.values())
+            return {
+                'total': total,
+                'ok': by_status.get('OK', 0),
+                'ng': by_status.get('NG', 0),
+                'by_status': by_status,
+                'yield': by_status.get('OK', 0) / total if total else 0.0,
+            }
+        except Exception as e:
+            logger.error(f"ResultHistoryStore: Error building yield report: {e}")
+            return {'total': 0, 'ok': 0, 'ng': 0, 'by_status': {}, 'yield': 0.0}
+
+    def class_counts(self, start: Any = None, end: Any = None) -> Dict[str, int]:
+        """Detections per class over a time range"""
+        try:
+            where, params = self._time_filter(start, end)
+            sql = "SELECT class_name, SUM(count) AS n FROM inspection_classes"
+            if where:
+                sql += " WHERE " + where
+            sql += " GROUP BY class_name ORDER BY n DESC"
+            return {row['class_name']: row['n'] for row in self._read(sql, tuple(params))}
+        except Exception as e:
+            logger.error(f"ResultHistoryStore: Error counting classes: {e}")
+            return {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'run_id': self.run_id,
+            'queued': self._queue.qsize(),
+            'records_written': self.records_written,
+            'batches_written': self.batches_written,
+            'write_errors': self.write_errors,
+        }
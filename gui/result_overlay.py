@@ -0,0 +1,257 @@
+"""
+ResultOverlay - Detection/classification results as scene items over the camera view
+
+Purpose:
+  - Render detections, classification labels and the OK/NG verdict as
+    lightweight QGraphicsItems driven by the structured job results, instead
+    of tools copying the frame and rasterizing boxes/text into it
+  - Items are pooled: each update moves/retexts existing items and hides the
+    spare ones, nothing is allocated per frame once the pool is warm
+  - Boxes live in frame (scene) coordinates; text ignores the view transform
+    so it stays readable at any zoom
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QBrush, QColor, QFont, QPen
+from PyQt5.QtWidgets import (QGraphicsItem, QGraphicsRectItem, QGraphicsScene,
+                             QGraphicsSimpleTextItem)
+
+logger = logging.getLogger(__name__)
+
+OVERLAY_Z = 0.5  # Above the frame pixmap (-1), below detection area overlays (0+)
+BOX_COLOR = QColor(0, 255, 0)
+CLASS_LABEL_COLOR = QColor(0, 255, 0)
+VERDICT_COLORS = {'OK': QColor(0, 200, 0), 'NG': QColor(220, 0, 0)}
+VERDICT_SIZE = (80, 36)  # Badge size in device pixels
+VERDICT_PAD = 8
+
+
+class _LabelItem(QGraphicsRectItem):
+    """Text with a filled background, drawn at a fixed on-screen size"""
+
+    def __init__(self, text_color: QColor, point_size: int = 10):
+        super().__init__()
+        self.setFlag(QGraphicsItem.ItemIgnoresTransformations, True)
+        self.setPen(QPen(Qt.NoPen))
+        self._text = QGraphicsSimpleTextItem(self)
+        font = QFont()
+        font.setPointSize(point_size)
+        font.setBold(True)
+        self._text.setFont(font)
+        self._text.setBrush(QBrush(text_color))
+        self._anchor = Qt.AlignLeft | Qt.AlignBottom
+        self._offset = (0.0, 0.0)  # Device px from the anchor point
+
+    def set_anchor(self, anchor, offset: Tuple[float, float] = (0.0, 0.0)) -> None:
+        self._anchor = anchor
+        self._offset = offset
+
+    def set_text(self, text: str, background: Optional[QColor]) -> None:
+        if self._text.text() != text:
+            self._text.setText(text)
+        self.setBrush(QBrush(background) if background is not None else QBrush(Qt.NoBrush))
+        self._layout(self._text.boundingRect().width() + 6, self._text.boundingRect().height() + 2)
+
+    def set_fixed_size(self, width: float, height: float) -> None:
+        self._layout(width, height, center_text=True)
+
+    def _layout(self, width: float, height: float, center_text: bool = False) -> None:
+        # Local rect relative to the anchor point (pos)
+        x = (-width if self._anchor & Qt.AlignRight else 0.0) + self._offset[0]
+        y = (-height if self._anchor & Qt.AlignBottom else 0.0) + self._offset[1]
+        self.setRect(QRectF(x, y, width, height))
+        text_rect = self._text.boundingRect()
+        if center_text:
+            self._text.setPos(x + (width - text_rect.width()) / 2, y + (height - text_rect.height()) / 2)
+        else:
+            self._text.setPos(x + 3, y + 1)
+
+
+class _BoxItem(QGraphicsRectItem):
+    """Bounding box (scene coordinates) with a label above its top-left corner"""
+
+    def __init__(self):
+        super().__init__()
+        pen = QPen(BOX_COLOR, 2)
+        pen.setCosmetic(True)  # 2 device px at any zoom
+        self.setPen(pen)
+        self.label = _LabelItem(QColor(0, 0, 0))
+        self.label.setParentItem(self)
+
+    def show_box(self, x1: float, y1: float, x2: float, y2: float, text: Optional[str],
+                 label_background: Optional[QColor] = BOX_COLOR) -> None:
+        self.setRect(QRectF(x1, y1, max(0.0, x2 - x1), max(0.0, y2 - y1)))
+        if text:
+            self.label.setPos(x1, y1)
+            self.label.set_text(text, label_background)
+            self.label.setVisible(True)
+        else:
+            self.label.setVisible(False)
+        self.setVisible(True)
+
+
+def _box_of(item: Dict[str, Any]) -> Optional[Tuple[float, float, float, float]]:
+    """(x1, y1, x2, y2) from DetectTool ('x1'...) or 'bbox' style dicts"""
+    bbox = item.get('bbox')
+    if bbox and len(bbox) == 4:
+        return tuple(float(v) for v in bbox)
+    if all(k in item for k in ('x1', 'y1', 'x2', 'y2')):
+        return float(item['x1']), float(item['y1']), float(item['x2']), float(item['y2'])
+    return None
+
+
+class ResultOverlay:
+    """Pooled scene items for the results of the last inspected frame"""
+
+    def __init__(self, scene: QGraphicsScene, z: float = OVERLAY_Z):
+        self.scene = scene
+        # All overlay items hang off one content-less root: one call hides/shows them
+        self.root = QGraphicsRectItem()
+        self.root.setFlag(QGraphicsItem.ItemHasNoContents, True)
+        self.root.setZValue(z)
+        scene.addItem(self.root)
+        self._boxes: List[_BoxItem] = []
+        self._class_labels: List[_LabelItem] = []
+        self._verdict: Optional[_LabelItem] = None
+        self.frame_size: Optional[Tuple[int, int]] = None  # (width, height) for corner badges
+
+    # ------------------------------------------------------------------
+    # Pools
+    # ------------------------------------------------------------------
+    def _box(self, index: int) -> _BoxItem:
+        while len(self._boxes) <= index:
+            item = _BoxItem()
+            item.setVisible(False)
+            item.setParentItem(self.root)
+            self._boxes.append(item)
+        return self._boxes[index]
+
+    def _class_label(self, index: int) -> _LabelItem:
+        while len(self._class_labels) <= index:
+            item = _LabelItem(CLASS_LABEL_COLOR, point_size=11)
+            item.setZValue(1)
+            item.setVisible(False)
+            item.setParentItem(self.root)
+            self._class_labels.append(item)
+        return self._class_labels[index]
+
+    @staticmethod
+    def _hide_from(items: Iterable[QGraphicsItem], start: int) -> None:
+        for item in list(items)[start:]:
+            if item.isVisible():
+                item.setVisible(False)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def update_detections(self, detections: List[Dict[str, Any]], show_class_names: bool = True,
+                          show_confidence: bool = True) -> None:
+        count = 0
+        for detection in detections or []:
+            box = _box_of(detection)
+            if box is None:
+                continue
+            text = None
+            if show_class_names:
+                text = str(detection.get('class_name', ''))
+                if show_confidence and 'confidence' in detection:
+                    text += f" {float(detection['confidence']):.2f}"
+            self._box(count).show_box(*box, text)
+            count += 1
+        self._hide_from(self._boxes, count)
+
+    def update_classifications(self, results: List[Dict[str, Any]],
+                               position: Tuple[float, float] = (8, 24)) -> None:
+        """Top-1 class per classified ROI (full-frame results at `position`)"""
+        count = 0
+        for result in results or []:
+            predictions = result.get('predictions') or []
+            if not predictions:
+                continue
+            top1 = predictions[0]
+            box = _box_of(result)
+            label = self._class_label(count)
+            if box is not None:
+                label.setPos(box[0] + 4, max(box[1] - 6, 12))
+            else:
+                label.setPos(*position)
+            label.set_text(f"{top1.get('class_name', '')} {float(top1.get('confidence', 0.0)):.2f}", None)
+            label.setVisible(True)
+            count += 1
+        self._hide_from(self._class_labels, count)
+
+    def set_verdict(self, verdict: Optional[str], corner: str = 'top-right') -> None:
+        """OK/NG badge in a frame corner (None hides it)"""
+        if verdict not in VERDICT_COLORS or self.frame_size is None:
+            if self._verdict is not None:
+                self._verdict.setVisible(False)
+            return
+        if self._verdict is None:
+            self._verdict = _LabelItem(QColor(Qt.white), point_size=14)
+            self._verdict.setZValue(2)
+            self._verdict.setParentItem(self.root)
+        width, height = self.frame_size
+        corner = (corner or 'top-right').lower()
+        right = corner.endswith('right')
+        bottom = corner.startswith('bottom')
+        # Anchor at the frame corner; the badge extends inwards in device pixels
+        self._verdict.set_anchor((Qt.AlignRight if right else Qt.AlignLeft) |
+                                 (Qt.AlignBottom if bottom else Qt.AlignTop),
+                                 (-VERDICT_PAD if right else VERDICT_PAD, -VERDICT_PAD if bottom else VERDICT_PAD))
+        self._verdict.setPos(width if right else 0, height if bottom else 0)
+        self._verdict.set_text(verdict, VERDICT_COLORS[verdict])
+        self._verdict.set_fixed_size(*VERDICT_SIZE)
+        self._verdict.setVisible(True)
+
+    def update_from_job_results(self, job_results: Dict[str, Any],
+                                frame_size: Optional[Tuple[int, int]] = None) -> None:
+        """Find detection/classification data in Job.run() results and show it"""
+        try:
+            if frame_size is not None:
+                self.frame_size = frame_size
+            tool_results = job_results.get('results', {}) if isinstance(job_results, dict) else {}
+            detections: List[Dict[str, Any]] = []
+            classifications: List[Dict[str, Any]] = []
+            verdict, corner, position = None, 'top-right', (8, 24)
+            show_names, show_confidence = True, True
+            for tool_result in tool_results.values():
+                data = tool_result.get('data', tool_result) if isinstance(tool_result, dict) else None
+                if not isinstance(data, dict):
+                    continue
+                overlay = data.get('overlay') or {}
+                if isinstance(data.get('detections'), list) and overlay.get('boxes', True):
+                    detections = data['detections']
+                    show_names = overlay.get('class_names', True)
+                    show_confidence = overlay.get('confidence', True)
+                results = data.get('results')
+                if isinstance(results, list) and results and isinstance(results[0], dict) \
+                        and 'predictions' in results[0]:
+                    classifications = results if overlay.get('labels', True) else []
+                    verdict = overlay.get('verdict')
+                    corner = overlay.get('corner', corner)
+                    position = tuple(overlay.get('position', position))
+            self.update_detections(detections, show_names, show_confidence)
+            self.update_classifications(classifications, position)
+            self.set_verdict(verdict, corner)
+        except Exception as e:
+            logger.error(f"ResultOverlay: Error updating from job results: {e}")
+
+    def set_rotation(self, angle: float, center) -> None:
+        """Follow the frame item's rotation (center in scene coordinates)"""
+        self.root.setTransformOriginPoint(center)
+        self.root.setRotation(angle)
+
+    def set_visible(self, visible: bool) -> None:
+        self.root.setVisible(bool(visible))
+
+    def is_visible(self) -> bool:
+        return self.root.isVisible()
+
+    def clear(self) -> None:
+        self._hide_from(self._boxes, 0)
+        self._hide_from(self._class_labels, 0)
+        if self._verdict is not None:
+            self._verdict.setVisible(False)
@@ -2,19 +2,22 @@
 ResultTabManager - Manages Result Tab UI and integration with FIFO queue
 
 Purpose:
-  - Display FIFO queue items in QTableView
+  - Display FIFO queue items in QTableView (ResultTableModel, incremental updates)
   - Handle button clicks (Delete, Clear Queue)
   - Update table when new frames/sensors added
   - Provide interface to result_manager for OK/NG evaluation
+  - Record finished frames to the persistent history store (SQLite)
 """
 
 import logging
 from utils.debug_utils import conditional_print
-from typing import Optional, Dict, Any, List
-from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QMessageBox, QPushButton
-from PyQt5.QtCore import Qt, QTimer
+from typing import Optional, Dict, Any, List, Callable
+from PyQt5.QtWidgets import QTableView, QMessageBox, QPushButton
+from PyQt5.QtCore import QTimer
 
 from .fifo_result_queue import FIFOResultQueue, ResultQueueItem
+from .result_table_model import ResultTableModel
+from .result_history_store import ResultHistoryStore, DEFAULT_HISTORY_PATH
 from .pending_result import PendingJobResult
 
 logger = logging.getLogger(__name__)
@@ -32,18 +35,24 @@ class ResultTabManager:
     - Provide data for result evaluation
     """
     
-    def __init__(self, main_window=None):
+    def __init__(self, main_window=None, history_path: Optional[str] = DEFAULT_HISTORY_PATH):
         """
         Initialize ResultTabManager
         
         Args:
             main_window: Reference to MainWindow for UI access
+            history_path: SQLite file for the inspection history (None = disabled)
         """
         self.main_window = main_window
         self.fifo_queue = FIFOResultQueue()
+        # Table model over the queue: only changed rows are repainted
+        self.table_model = ResultTableModel(self.fifo_queue)
+        # Lịch sử kiểm tra lâu dài - ghi nền theo batch, DB chỉ tạo khi có frame đầu tiên
+        self.history_store: Optional[ResultHistoryStore] = (
+            ResultHistoryStore(history_path) if history_path else None)
         
         # UI components (initialized in setup_ui)
-        self.result_table_view: Optional[QTableWidget] = None
+        self.result_table_view: Optional[QTableView] = None
         self.delete_button: Optional[QPushButton] = None
         self.clear_button: Optional[QPushButton] = None
         
@@ -55,6 +64,10 @@ class ResultTabManager:
         # When job completes → Pop oldest frame_id from queue and update it
         self.waiting_frames_queue: List[int] = []  # FIFO queue of frame IDs waiting for results
         
+        # Called with (frame_id, status) when a job result reaches a waiting frame
+        # (TCPControllerManager uses it to send the reject command early)
+        self.verdict_callback: Optional[Callable[[int, str], None]] = None
+        
         # Table column mapping
         self.COLUMNS = {
             'frame_id': 0,
@@ -139,12 +152,8 @@ class ResultTabManager:
                 logger.warning("ResultTabManager: result_table_view is None")
                 return
             
-            # Set column count (6 columns now)
-            self.result_table_view.setColumnCount(6)
-            
-            # Set headers
-            headers = ['Frame ID', 'Frame Status', 'Sensor IN', 'Sensor OUT', 'Execution Time', 'Status']
-            self.result_table_view.setHorizontalHeaderLabels(headers)
+            # Attach model (columns/headers come from ResultTableModel)
+            self.result_table_view.setModel(self.table_model)
             
             # Set column widths
             self.result_table_view.setColumnWidth(0, 80)   # Frame ID
@@ -203,6 +212,10 @@ class ResultTabManager:
         """
         try:
             success = self.fifo_queue.add_sensor_out_event(sensor_id_out)
+            if success:
+                done_item = self.fifo_queue.get_last_done_frame()
+                if done_item is not None and done_item.sensor_id_out == sensor_id_out:
+                    self._record_history(done_item.frame_id)
             self.refresh_table()
             logger.info(f"ResultTabManager: Sensor OUT added - sensor_id_out={sensor_id_out}, success={success}")
             return success
@@ -313,6 +326,7 @@ class ResultTabManager:
                     # Store detection data if available
                     if pending.detection_data:
                         self.set_frame_detection_data(frame_id, pending.detection_data)
+                    self._record_history(frame_id)
                     
                     # Clear pending result after using
                     self.pending_result = None
@@ -386,6 +400,9 @@ class ResultTabManager:
                 self.set_frame_detection_data(frame_id, detection_data)
                 logger.info(f"[ResultTabManager] Stored detection data for frame {frame_id}")
                 conditional_print(f"DEBUG: [ResultTabManager] Detection data stored")
+            self._record_history(frame_id)
+            if self.verdict_callback:
+                self.verdict_callback(frame_id, status)
             
             # Refresh table
             self.refresh_table()
@@ -460,6 +477,7 @@ class ResultTabManager:
             # Set detection data if available
             if detection_data:
                 self.set_frame_detection_data(frame_id, detection_data)
+            self._record_history(frame_id)
             
             logger.info(f"[ResultTabManager] Frame created successfully: frame_id={frame_id}, status={status}")
             conditional_print(f"DEBUG: [ResultTabManager] Frame #{frame_id} created with status={status}")
@@ -493,97 +511,45 @@ class ResultTabManager:
             conditional_print(f"DEBUG: ResultTabManager status error: {e}")
             return False
     
+    def _record_history(self, frame_id: int) -> None:
+        """Queue the frame's current state for the history store (non-blocking)"""
+        if self.history_store is None:
+            return
+        try:
+            item = self.fifo_queue.get_item(frame_id)
+            if item is not None:
+                self.history_store.record_item(item)
+        except Exception as e:
+            logger.error(f"ResultTabManager: Error recording history for frame {frame_id}: {e}")
+    
+    def close_history(self):
+        """Commit queued history records and stop the writer (app shutdown)"""
+        if self.history_store is not None:
+            try:
+                self.history_store.close()
+            except Exception as e:
+                logger.error(f"ResultTabManager: Error closing history store: {e}")
+    
     def refresh_table(self):
-        """Refresh table view with current queue data"""
+        """
+        Request a table update from the current queue data
+        
+        Requests are coalesced by the model (at most one sync per display
+        interval) and only rows that changed are emitted to the view.
+        """
         try:
-            if not self.result_table_view:
-                logger.warning("ResultTabManager: result_table_view is None")
-                conditional_print(f"DEBUG: ResultTabManager refresh_table - result_table_view is None!")
-                return
-            
-            # Get queue data
-            queue_data = self.fifo_queue.get_queue_as_table_data()
-            logger.info(f"ResultTabManager: Refreshing table with {len(queue_data)} items")
-            conditional_print(f"DEBUG: ResultTabManager refresh_table - queue_data count: {len(queue_data)}")
-            
-            # Clear existing rows
-            self.result_table_view.setRowCount(0)
-            conditional_print(f"DEBUG: ResultTabManager refresh_table - cleared table rows")
-            
-            # Add rows
-            for row_idx, item_dict in enumerate(queue_data):
-                self.result_table_view.insertRow(row_idx)
-                conditional_print(f"DEBUG: ResultTabManager refresh_table - inserted row {row_idx}, frame_id={item_dict.get('frame_id')}")
-                
-                # Frame ID
-                frame_id_item = QTableWidgetItem(str(item_dict['frame_id']))
-                frame_id_item.setFlags(frame_id_item.flags() & ~Qt.ItemIsEditable)
-                self.result_table_view.setItem(row_idx, self.COLUMNS['frame_id'], frame_id_item)
-                
-                # Frame Status (OK/NG) with color coding
-                frame_status_text = item_dict.get('frame_status', 'PENDING')
-                frame_status_item = QTableWidgetItem(frame_status_text)
-                frame_status_item.setFlags(frame_status_item.flags() & ~Qt.ItemIsEditable)
-                
-                # Color code frame status
-                if frame_status_text == 'OK':
-                    frame_status_item.setBackground(Qt.green)
-                    conditional_print(f"DEBUG: ResultTabManager refresh_table - Row {row_idx}: frame_status=OK (green)")
-                elif frame_status_text == 'NG':
-                    frame_status_item.setBackground(Qt.red)
-                    conditional_print(f"DEBUG: ResultTabManager refresh_table - Row {row_idx}: frame_status=NG (red)")
-                else:
-                    frame_status_item.setBackground(Qt.yellow)
-                    conditional_print(f"DEBUG: ResultTabManager refresh_table - Row {row_idx}: frame_status=PENDING (yellow)")
-                
-                self.result_table_view.setItem(row_idx, self.COLUMNS['frame_status'], frame_status_item)
-                
-                # Sensor IN
-                sensor_in_text = str(item_dict.get('sensor_id_in', '')) if item_dict.get('sensor_id_in') is not None else '-'
-                sensor_in_item = QTableWidgetItem(sensor_in_text)
-                sensor_in_item.setFlags(sensor_in_item.flags() & ~Qt.ItemIsEditable)
-                self.result_table_view.setItem(row_idx, self.COLUMNS['sensor_id_in'], sensor_in_item)
-                
-                # Sensor OUT
-                sensor_out_text = str(item_dict.get('sensor_id_out', '')) if item_dict.get('sensor_id_out') else '-'
-                sensor_out_item = QTableWidgetItem(sensor_out_text)
-                sensor_out_item.setFlags(sensor_out_item.flags() & ~Qt.ItemIsEditable)
-                self.result_table_view.setItem(row_idx, self.COLUMNS['sensor_id_out'], sensor_out_item)
-                
-                # Execution Time (inference_time từ detection_data)
-                execution_time_text = '-'
-                detection_data = item_dict.get('detection_data')
-                if isinstance(detection_data, dict) and 'inference_time' in detection_data:
-                    inference_time = detection_data['inference_time']
-                    execution_time_text = f"{inference_time:.3f}"
-                    conditional_print(f"DEBUG: ResultTabManager refresh_table - Row {row_idx}: execution_time={execution_time_text}")
-                
-                execution_time_item = QTableWidgetItem(execution_time_text)
-                execution_time_item.setFlags(execution_time_item.flags() & ~Qt.ItemIsEditable)
-                self.result_table_view.setItem(row_idx, self.COLUMNS['execution_time'], execution_time_item)
-                
-                # Completion Status (PENDING/DONE) with color coding
-                completion_status_text = item_dict.get('completion_status', 'PENDING')
-                completion_status_item = QTableWidgetItem(completion_status_text)
-                completion_status_item.setFlags(completion_status_item.flags() & ~Qt.ItemIsEditable)
-                
-                # Color code completion status
-                if completion_status_text == 'DONE':
-                    completion_status_item.setBackground(Qt.cyan)
-                    conditional_print(f"DEBUG: ResultTabManager refresh_table - Row {row_idx}: completion_status=DONE (cyan)")
-                else:  # PENDING
-                    completion_status_item.setBackground(Qt.yellow)
-                    conditional_print(f"DEBUG: ResultTabManager refresh_table - Row {row_idx}: completion_status=PENDING (yellow)")
-                
-                self.result_table_view.setItem(row_idx, self.COLUMNS['completion_status'], completion_status_item)
-            
-            logger.info(f"ResultTabManager: Table refreshed successfully - {len(queue_data)} rows displayed")
-            conditional_print(f"DEBUG: ResultTabManager refresh_table - COMPLETE with {len(queue_data)} rows")
-            
+            self.table_model.request_sync()
         except Exception as e:
             logger.error(f"ResultTabManager: Error refreshing table: {e}", exc_info=True)
             conditional_print(f"DEBUG: ResultTabManager refresh error: {e}")
     
+    def refresh_table_now(self):
+        """Sync the table immediately (user actions like delete/clear)"""
+        try:
+            self.table_model.sync()
+        except Exception as e:
+            logger.error(f"ResultTabManager: Error refreshing table: {e}", exc_info=True)
+    
     def on_delete_clicked(self):
         """Handle Delete Object button click"""
         try:
@@ -608,10 +574,11 @@ class ResultTabManager:
             )
             
             if reply == QMessageBox.Yes:
-                # Delete from queue
-                success = self.fifo_queue.delete_item_by_row(row_index)
+                # Delete from queue by frame_id of the row on screen
+                frame_id = self.table_model.frame_id_at(row_index)
+                success = frame_id is not None and self.fifo_queue.delete_item_by_frame_id(frame_id)
                 if success:
-                    self.refresh_table()
+                    self.refresh_table_now()
                     logger.info(f"ResultTabManager: Row deleted - row_index={row_index}")
                 else:
                     QMessageBox.critical(self.main_window, "Error", "Failed to delete row")
@@ -634,7 +601,7 @@ class ResultTabManager:
             
             if reply == QMessageBox.Yes:
                 count = self.fifo_queue.clear_queue()
-                self.refresh_table()
+                self.refresh_table_now()
                 QMessageBox.information(
                     self.main_window,
                     "Success",
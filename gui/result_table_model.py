@@ -0,0 +1,171 @@
+"""
+ResultTableModel - QAbstractTableModel over the FIFO result queue
+
+Purpose:
+  - Back the Result tab QTableView without re-creating cells on every refresh
+  - Diff the queue snapshot against the rows on screen and emit only
+    rowsRemoved / dataChanged / rowsInserted for the rows that changed
+  - Coalesce sync requests that arrive faster than the display refresh rate
+"""
+
+import logging
+from typing import Any, List, Optional, Tuple
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PyQt5.QtGui import QBrush, QColor
+
+from .fifo_result_queue import FIFOResultQueue, ResultQueueItem
+
+logger = logging.getLogger(__name__)
+
+HEADERS = ['Frame ID', 'Frame Status', 'Sensor IN', 'Sensor OUT', 'Execution Time', 'Status']
+COL_FRAME_STATUS = 1
+COL_COMPLETION = 5
+
+# Minimum interval between two syncs (~20 Hz is plenty for a status table)
+DEFAULT_SYNC_INTERVAL_MS = 50
+
+_STATUS_COLORS = {
+    'OK': QColor(Qt.green),
+    'NG': QColor(Qt.red),
+    'DONE': QColor(Qt.cyan),
+}
+_PENDING_COLOR = QColor(Qt.yellow)
+
+RowValues = Tuple[str, str, str, str, str, str]
+
+
+def row_values(item: ResultQueueItem) -> RowValues:
+    """Display strings of one queue item, in column order"""
+    execution_time = '-'
+    data = item.detection_data
+    if isinstance(data, dict) and 'inference_time' in data:
+        try:
+            execution_time = f"{float(data['inference_time']):.3f}"
+        except (TypeError, ValueError):
+            pass
+    return (
+        str(item.frame_id),
+        item.frame_status or 'PENDING',
+        str(item.sensor_id_in) if item.sensor_id_in is not None else '-',
+        str(item.sensor_id_out) if item.sensor_id_out else '-',
+        execution_time,
+        item.completion_status or 'PENDING',
+    )
+
+
+class ResultTableModel(QAbstractTableModel):
+    """Table model whose rows mirror FIFOResultQueue items by frame_id"""
+
+    def __init__(self, fifo_queue: FIFOResultQueue, parent=None,
+                 sync_interval_ms: int = DEFAULT_SYNC_INTERVAL_MS):
+        super().__init__(parent)
+        self.fifo_queue = fifo_queue
+        self._frame_ids: List[int] = []
+        self._rows: List[RowValues] = []
+
+        # Single-shot timer: many sync requests inside one interval -> one sync
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(max(0, int(sync_interval_ms)))
+        self._sync_timer.timeout.connect(self.sync)
+        self.sync_count = 0
+
+    # ------------------------------------------------------------------
+    # Qt model interface
+    # ------------------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(HEADERS):
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return value
+        if role == Qt.BackgroundRole and index.column() in (COL_FRAME_STATUS, COL_COMPLETION):
+            return QBrush(_STATUS_COLORS.get(value, _PENDING_COLOR))
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    # ------------------------------------------------------------------
+    # Incremental sync
+    # ------------------------------------------------------------------
+    def request_sync(self) -> None:
+        """Schedule a sync; repeated requests within the interval are coalesced"""
+        if not self._sync_timer.isActive():
+            self._sync_timer.start()
+
+    def frame_id_at(self, row: int) -> Optional[int]:
+        return self._frame_ids[row] if 0 <= row < len(self._frame_ids) else None
+
+    def sync(self) -> None:
+        """Bring the rows in line with the queue, emitting only the differences"""
+        self._sync_timer.stop()
+        try:
+            items = self.fifo_queue.get_queue_items()
+            new_ids = [item.frame_id for item in items]
+            new_rows = {item.frame_id: row_values(item) for item in items}
+            self.sync_count += 1
+
+            self._remove_missing(set(new_ids))
+            self._update_changed(new_rows)
+            self._append_new(new_ids, new_rows)
+        except Exception as e:
+            logger.error(f"ResultTableModel: Error syncing with queue: {e}", exc_info=True)
+
+    def _remove_missing(self, live_ids: set) -> None:
+        """rowsRemoved for contiguous runs of rows whose frame left the queue (bottom-up)"""
+        row = len(self._frame_ids) - 1
+        while row >= 0:
+            if self._frame_ids[row] in live_ids:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._frame_ids[row] not in live_ids:
+                row -= 1
+            first = row + 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._frame_ids[first:last + 1]
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+
+    def _update_changed(self, new_rows: dict) -> None:
+        """dataChanged for contiguous runs of rows whose values changed"""
+        last_col = len(HEADERS) - 1
+        run_start = None
+        for row, frame_id in enumerate(self._frame_ids):
+            values = new_rows[frame_id]
+            if values != self._rows[row]:
+                self._rows[row] = values
+                if run_start is None:
+                    run_start = row
+            elif run_start is not None:
+                self.dataChanged.emit(self.index(run_start, 0), self.index(row - 1, last_col))
+                run_start = None
+        if run_start is not None:
+            self.dataChanged.emit(self.index(run_start, 0), self.index(len(self._rows) - 1, last_col))
+
+    def _append_new(self, new_ids: List[int], new_rows: dict) -> None:
+        """rowsInserted for frames not on screen yet (the queue only grows at the tail)"""
+        known = set(self._frame_ids)
+        added = [frame_id for frame_id in new_ids if frame_id not in known]
+        if not added:
+            return
+        first = len(self._frame_ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+        self._frame_ids.extend(added)
+        self._rows.extend(new_rows[frame_id] for frame_id in added)
+        self.endInsertRows()
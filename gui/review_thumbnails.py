@@ -0,0 +1,142 @@
+"""
+Review thumbnails - Frames for reviewView_1..5 rendered once, at view size
+
+Purpose:
+  - The frame history worker turns each new frame into one thumbnail at the
+    exact review-view viewport size (letterboxed), instead of storing frames
+    up to 1440x1080 and re-scaling all five on every review update
+  - Thumbnails live in a small ring (newest last); the OK/NG verdict is baked
+    into the thumbnail (border + badge) once per status and cached
+  - Each thumbnail caches its QPixmap, so when the ring shifts the GUI only
+    reassigns existing pixmaps and uploads the one new thumbnail
+"""
+
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen, QPixmap
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THUMBNAIL_SIZE = (320, 240)
+BACKGROUND_RGB = (0x2b, 0x2b, 0x2b)  # Same as the review view background
+
+VERDICT_COLORS = {
+    'OK': QColor('#00AA00'),
+    'NG': QColor('#AA0000'),
+}
+
+
+def make_thumbnail(frame: np.ndarray, width: int, height: int) -> QImage:
+    """RGB/gray frame -> width x height RGB QImage (aspect kept, letterboxed)"""
+    if frame.ndim == 2:
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+    elif frame.shape[2] == 4:
+        frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2RGB)
+    h, w = frame.shape[:2]
+    scale = min(width / float(w), height / float(h))
+    new_w = max(1, min(width, int(round(w * scale))))
+    new_h = max(1, min(height, int(round(h * scale))))
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=interpolation)
+
+    canvas = np.empty((height, width, 3), dtype=np.uint8)
+    canvas[:] = BACKGROUND_RGB
+    x0 = (width - new_w) // 2
+    y0 = (height - new_h) // 2
+    canvas[y0:y0 + new_h, x0:x0 + new_w] = resized
+    qimage = QImage(canvas.data, width, height, canvas.strides[0], QImage.Format_RGB888)
+    qimage._numpy_buffer = canvas  # QImage reads the numpy buffer directly
+    return qimage
+
+
+def bake_verdict(image: QImage, status: Optional[str]) -> QImage:
+    """Copy of the thumbnail with a colored border and OK/NG badge"""
+    color = VERDICT_COLORS.get(status)
+    if color is None:
+        return image
+    baked = image.convertToFormat(QImage.Format_RGB32)
+    painter = QPainter(baked)
+    try:
+        painter.setPen(QPen(color, 4))
+        painter.drawRect(2, 2, baked.width() - 4, baked.height() - 4)
+        font = QFont()
+        font.setBold(True)
+        font.setPixelSize(max(10, baked.height() // 8))
+        painter.setFont(font)
+        badge_w = painter.fontMetrics().horizontalAdvance(status) + 10
+        badge_h = painter.fontMetrics().height() + 2
+        painter.fillRect(4, 4, badge_w, badge_h, color)
+        painter.setPen(QColor(Qt.white))
+        painter.drawText(4, 4, badge_w, badge_h, Qt.AlignCenter, status)
+    finally:
+        painter.end()
+    return baked
+
+
+@dataclass
+class ReviewThumbnail:
+    """One history frame at review-view size"""
+    seq: int
+    image: QImage
+    # status -> QPixmap (GUI thread only; QPixmap must not be built off it)
+    pixmaps: Dict[Optional[str], QPixmap] = field(default_factory=dict)
+
+    def pixmap(self, status: Optional[str] = None) -> QPixmap:
+        """Pixmap with the verdict baked in (rendered once per status)"""
+        key = status if status in VERDICT_COLORS else None
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(bake_verdict(self.image, key))
+            self.pixmaps[key] = pixmap
+        return pixmap
+
+
+class ReviewThumbnailRing:
+    """Last `slots` thumbnails, oldest first (thread-safe)"""
+
+    def __init__(self, slots: int = 5, size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE):
+        self._lock = threading.Lock()
+        self._ring: Deque[ReviewThumbnail] = deque(maxlen=max(1, slots))
+        self._size = size
+        self._seq = 0
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self._size
+
+    def set_size(self, width: int, height: int) -> None:
+        """Size for thumbnails made from now on (review view viewport size)"""
+        if width > 0 and height > 0:
+            self._size = (int(width), int(height))
+
+    def add_frame(self, frame: np.ndarray) -> Optional[ReviewThumbnail]:
+        """Render frame at the current size and push it into the ring (worker thread)"""
+        try:
+            width, height = self._size
+            image = make_thumbnail(frame, width, height)
+            with self._lock:
+                self._seq += 1
+                thumbnail = ReviewThumbnail(self._seq, image)
+                self._ring.append(thumbnail)
+            return thumbnail
+        except Exception as e:
+            logger.error(f"ReviewThumbnailRing: Error creating thumbnail: {e}")
+            return None
+
+    def snapshot(self) -> List[ReviewThumbnail]:
+        with self._lock:
+            return list(self._ring)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ring.clear()
+
+    def __len__(self) -> int:
+        return len(self._ring)
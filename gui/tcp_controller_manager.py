@@ -1,8 +1,11 @@
-from PyQt5.QtWidgets import QWidget, QPushButton, QLabel, QLineEdit, QListWidget, QMessageBox
+from PyQt5.QtWidgets import QWidget, QPushButton, QLabel, QLineEdit, QListView, QMessageBox, QMenu
 from PyQt5.QtCore import Qt, QTimer
 from controller.tcp_controller import TCPController
-from gui.tcp_optimized_trigger import OptimizedTCPControllerManager
+from gui.tcp_optimized_trigger import OptimizedTCPControllerManager, parse_edge_message
+from gui.reject_scheduler import RejectScheduler
+from gui.message_log_model import MessageLogModel, MessageLogFilter, KINDS
 import logging
+import math
 from utils.debug_utils import conditional_print
 import time
 
@@ -14,18 +17,27 @@ class TCPControllerManager:
         # OPTIMIZATION: Initialize optimized trigger handler
         self.optimized_manager = None
         
+        # Servo reject commands, sent as soon as each part's verdict is ready
+        self.reject_scheduler = None
+        # Gate geometry (seconds after a part's OUT edge): None = unknown, the command
+        # then waits for the part's own OUT edge like the old end_sensor logic
+        self.reject_gate_delay_s = None       # OUT sensor -> gate
+        self.reject_gate_clearance_s = None   # OUT sensor -> part has passed the gate
+        
         # UI components - Camera Controller
         self.ip_edit: QLineEdit = None
         self.port_edit: QLineEdit = None
         self.connect_button: QPushButton = None
         self.status_label: QLabel = None
-        self.message_list: QListWidget = None
+        self.message_list: QListView = None
         self.message_edit: QLineEdit = None
         self.send_button: QPushButton = None
+        self.message_log: MessageLogModel = None
+        self.message_filter: MessageLogFilter = None
         
     def setup(self, ip_edit: QLineEdit, port_edit: QLineEdit,
              connect_button: QPushButton, status_label: QLabel,
-             message_list: QListWidget, message_edit: QLineEdit,
+             message_list: QListView, message_edit: QLineEdit,
              send_button: QPushButton):
         """Setup UI components and initialize auto-connect"""
         try:
@@ -35,6 +47,7 @@ class TCPControllerManager:
             self.connect_button = connect_button
             self.status_label = status_label
             self.message_list = message_list
+            self._setup_message_log()
             self.message_edit = message_edit
             self.send_button = send_button
             
@@ -61,6 +74,13 @@ class TCPControllerManager:
                         self.tcp_controller,
                         self.main_window.camera_manager
                     )
+                    # Edges parsed on the socket thread arrive here already decoded
+                    self.optimized_manager.edge_received.connect(self._on_sensor_edge)
+                    self._sync_delay_trigger_settings()
+                    for name, signal in (('delayTriggerCheckBox', 'toggled'), ('delayTriggerTime', 'valueChanged')):
+                        widget = getattr(self.main_window, name, None)
+                        if widget is not None:
+                            getattr(widget, signal).connect(lambda *_: self._sync_delay_trigger_settings())
                     logging.info("Optimized TCP trigger handler initialized")
                 else:
                     logging.warning("Camera manager not found, optimized handler disabled")
@@ -104,6 +124,51 @@ class TCPControllerManager:
         except Exception as e:
             logging.error(f"Error during TCP controller setup: {str(e)}")
     
+    def _setup_message_log(self):
+        """Back the message list with a bounded model flushed at a fixed UI rate"""
+        self.message_log = MessageLogModel(self.message_list)
+        self.message_filter = MessageLogFilter(self.message_list)
+        self.message_filter.setSourceModel(self.message_log)
+        self.message_list.setModel(self.message_filter)
+        self.message_list.setUniformItemSizes(True)
+        self._log_follow = True
+        # Follow the tail only if the user had not scrolled up before the batch
+        self.message_log.rowsAboutToBeInserted.connect(self._on_log_about_to_grow)
+        self.message_log.batch_flushed.connect(self._on_log_flushed)
+        self.message_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.message_list.customContextMenuRequested.connect(self._show_message_log_menu)
+    
+    def _log(self, text: str):
+        """Queue one line for the message log (safe from any thread)"""
+        if self.message_log is not None:
+            self.message_log.append(text)
+    
+    def _on_log_about_to_grow(self, *_):
+        scroll_bar = self.message_list.verticalScrollBar()
+        self._log_follow = scroll_bar.value() >= scroll_bar.maximum() - 2
+    
+    def _on_log_flushed(self, count: int):
+        if self._log_follow:
+            self.message_list.scrollToBottom()
+    
+    def _show_message_log_menu(self, pos):
+        """Right-click menu: show/hide message kinds, clear the log"""
+        menu = QMenu(self.message_list)
+        enabled = set(self.message_filter.enabled_kinds())
+        for kind in KINDS:
+            action = menu.addAction(kind)
+            action.setCheckable(True)
+            action.setChecked(kind in enabled)
+            action.toggled.connect(lambda checked, k=kind: self.message_filter.set_kind_enabled(k, checked))
+        menu.addSeparator()
+        menu.addAction("Clear", self.message_log.clear)
+        menu.exec_(self.message_list.viewport().mapToGlobal(pos))
+    
+    def set_message_filter(self, kinds):
+        """Show only these message kinds (see gui.message_log_model.KINDS)"""
+        if self.message_filter is not None:
+            self.message_filter.set_enabled_kinds(kinds)
+    
     def _update_button_states(self, connected: bool):
         """Update UI states based on connection status"""
         # Connection controls
@@ -145,28 +210,32 @@ class TCPControllerManager:
         )
         
         # Add status message to list
-        self.message_list.addItem(f"Status: {message}")
-        self.message_list.scrollToBottom()
+        self._log(f"Status: {message}")
         
     def _on_message_received(self, message: str):
         """Handle received messages and trigger camera in trigger mode"""
-        logging.info(f"★★★ _on_message_received CALLED! message={message!r} ★★★")
+        logging.debug(f"RX: {message!r}")
         
-        # Add message to UI
-        if self.message_list:
-            logging.info(f"Adding message to list: RX: {message}")
-            self.message_list.addItem(f"RX: {message}")
-            self.message_list.scrollToBottom()
-            logging.info(f"Message added to list")
-        else:
-            logging.error("message_list is None!")
+        # Add message to UI (batched, bounded log)
+        self._log(f"RX: {message}")
         
         # NEW: Check if message is sensor event from pico
         # Expected format: "start_sensor,<sensor_id>" or "end_sensor,<sensor_id>"
         self._process_sensor_event(message)
         
-        # Check if in trigger mode and trigger camera if needed
-        self._check_and_trigger_camera_if_needed(message)
+        # start_rising/end_rising are handled by the real-time dispatcher
+        # (_on_sensor_edge); parse them here only when it is not running
+        if self.optimized_manager is None:
+            self._check_and_trigger_camera_if_needed(message)
+    
+    def _on_sensor_edge(self, edge: str, sensor_id: int, t_dispatch: float):
+        """GUI-thread bookkeeping for an edge decoded by RealtimeTriggerDispatcher"""
+        queue_delay_ms = (time.perf_counter() - t_dispatch) * 1000
+        logging.debug(f"Sensor edge {edge} sensor_id={sensor_id} (GUI delay {queue_delay_ms:.1f}ms)")
+        if edge == 'start':
+            self._handle_sensor_in_event(sensor_id)
+        elif edge == 'end':
+            self._handle_sensor_out_event(sensor_id)
     
     def _process_sensor_event(self, message: str):
         """
@@ -233,12 +302,13 @@ class TCPControllerManager:
             
             if frame_id > 0:
                 logging.info(f"[TCPController] Frame created: frame_id={frame_id}, sensor_id={sensor_id}")
+                scheduler = self._get_reject_scheduler()
+                if scheduler:
+                    scheduler.part_entered(frame_id)
                 conditional_print(f"DEBUG: [TCPController] Frame created: {frame_id}")
                 
                 # Optional: hiển thị message trên UI
-                if self.message_list:
-                    self.message_list.addItem(f"[FRAME] Frame #{frame_id} created with sensor_id={sensor_id}")
-                    self.message_list.scrollToBottom()
+                self._log(f"[FRAME] Frame #{frame_id} created with sensor_id={sensor_id}")
             else:
                 logging.error(f"[TCPController] Failed to create frame for sensor_id={sensor_id}")
                 conditional_print(f"DEBUG: [TCPController] Failed to create frame")
@@ -253,7 +323,8 @@ class TCPControllerManager:
         When sensor OUT arrives:
         1. Frame marked as DONE
         2. Get frame status (OK/NG)
-        3. Execute servo command: OK → GOTO 41, NG → HOME
+        3. Reject scheduler sends the part's servo command if it was held for
+           this edge, scores it and starts the gate clearance for the next part
         
         Args:
             sensor_id: Sensor ID từ pico
@@ -275,13 +346,14 @@ class TCPControllerManager:
                 logging.info(f"[TCPController] Sensor OUT matched successfully")
                 conditional_print(f"DEBUG: [TCPController] Sensor OUT matched")
                 
-                # ✅ NEW: Execute servo command based on frame status
-                self._execute_servo_command_for_done_frame()
+                # Part passed the OUT sensor: send/score its servo command, schedule the next one
+                done_frame = result_tab_manager.fifo_queue.get_last_done_frame()
+                scheduler = self._get_reject_scheduler()
+                if scheduler and done_frame is not None:
+                    scheduler.part_exited(done_frame.frame_id)
                 
                 # Optional: hiển thị message trên UI
-                if self.message_list:
-                    self.message_list.addItem(f"[SENSOR_OUT] Sensor OUT={sensor_id} matched")
-                    self.message_list.scrollToBottom()
+                self._log(f"[SENSOR_OUT] Sensor OUT={sensor_id} matched")
             else:
                 logging.warning(f"[TCPController] Sensor OUT not matched (no pending frame)")
                 conditional_print(f"DEBUG: [TCPController] Sensor OUT not matched")
@@ -290,72 +362,45 @@ class TCPControllerManager:
             logging.error(f"[TCPController] Error handling sensor OUT: {e}", exc_info=True)
             conditional_print(f"DEBUG: [TCPController] Error handling sensor OUT: {e}")
     
-    def _execute_servo_command_for_done_frame(self):
-        """
-        ✅ NEW: Execute servo command based on the frame that just became DONE
-        
-        FIFO: Get most recently DONE frame
-        - If frame_status == "OK" → Send "GOTO 41" (move to position 41)
-        - If frame_status == "NG" → Send "HOME" (move to home position)
-        """
-        try:
-            # Get result tab manager to access queue
+    def _get_reject_scheduler(self):
+        """Reject scheduler bound to the result tab queue (created on first use)"""
+        if self.reject_scheduler is None:
             result_tab_manager = getattr(self.main_window, 'result_tab_manager', None)
             if not result_tab_manager:
-                logging.warning("[TCPController] Cannot execute servo: Result Tab Manager not found")
-                return
-            
-            # Get FIFO queue
-            fifo_queue = getattr(result_tab_manager, 'fifo_queue', None)
-            if not fifo_queue:
-                logging.warning("[TCPController] Cannot execute servo: FIFO queue not found")
-                return
-            
-            # Get the most recently DONE frame
-            done_frame = fifo_queue.get_last_done_frame()
-            if not done_frame:
-                logging.warning("[TCPController] Cannot execute servo: No DONE frame found")
-                return
-            
-            # Determine servo command based on frame status
-            frame_status = done_frame.frame_status
-            servo_command = None
-            
-            if frame_status == "OK":
-                servo_command = "GOTO 5"
-                logging.info(f"[TCPController] ✅ Frame {done_frame.frame_id} is OK → Servo command: GOTO 5")
-                conditional_print(f"DEBUG: [TCPController] ✅ OK status → GOTO 5")
-            elif frame_status == "NG":
-                servo_command = "GOTO 45"
-                logging.info(f"[TCPController] ❌ Frame {done_frame.frame_id} is NG → Servo command: GOTO 45")
-                conditional_print(f"DEBUG: [TCPController] ❌ NG status → GOTO 45")
-            else:
-                logging.warning(f"[TCPController] Frame status is '{frame_status}' (not OK/NG), skipping servo command")
-                conditional_print(f"DEBUG: [TCPController] Skipping: status={frame_status}")
-                return
-            
-            # Send servo command via TCP
-            if servo_command and self.tcp_controller and self.tcp_controller.is_connected:
-                success = self.tcp_controller.send_message(servo_command)
-                
-                if success:
-                    logging.info(f"[TCPController] ✅ Servo command sent: {servo_command}")
-                    conditional_print(f"DEBUG: [TCPController] ✅ TX: {servo_command}")
-                    
-                    # Add to message list for UI display
-                    if self.message_list:
-                        self.message_list.addItem(f"[SERVO] TX: {servo_command}")
-                        self.message_list.scrollToBottom()
-                else:
-                    logging.error(f"[TCPController] Failed to send servo command: {servo_command}")
-                    conditional_print(f"DEBUG: [TCPController] ❌ Failed to send: {servo_command}")
-            else:
-                logging.warning("[TCPController] Cannot send servo command: TCP not connected")
-                conditional_print(f"DEBUG: [TCPController] TCP not connected")
-            
-        except Exception as e:
-            logging.error(f"[TCPController] Error executing servo command: {e}", exc_info=True)
-            conditional_print(f"DEBUG: [TCPController] Error executing servo: {e}")
+                return None
+            self.reject_scheduler = RejectScheduler(
+                result_tab_manager.fifo_queue,
+                self._send_servo_command,
+                on_flagged=self._on_reject_flagged,
+                gate_delay_s=self.reject_gate_delay_s,
+                gate_clearance_s=self.reject_gate_clearance_s,
+                # Retries run on the GUI thread, like the sensor events
+                schedule=lambda delay_s, callback: QTimer.singleShot(math.ceil(delay_s * 1000), callback),
+            )
+            result_tab_manager.verdict_callback = self.reject_scheduler.verdict_ready
+        return self.reject_scheduler
+    
+    def _send_servo_command(self, servo_command: str) -> bool:
+        """Send one servo command over TCP (called by the reject scheduler)"""
+        if not (self.tcp_controller and self.tcp_controller.is_connected):
+            logging.warning("[TCPController] Cannot send servo command: TCP not connected")
+            return False
+        success = self.tcp_controller.send_message(servo_command)
+        if success:
+            logging.info(f"[TCPController] ✅ Servo command sent: {servo_command}")
+            self._log(f"[SERVO] TX: {servo_command}")
+        else:
+            logging.error(f"[TCPController] Failed to send servo command: {servo_command}")
+        return success
+    
+    def _on_reject_flagged(self, frame_id: int, reason: str):
+        """A part reached the gate without (or too late for) its servo command"""
+        self._log(f"[SERVO] ⚠ Frame #{frame_id} reject command {reason}")
+    
+    def get_reject_statistics(self) -> dict:
+        """Transit time, late/missed counts and gate margin statistics"""
+        scheduler = self._get_reject_scheduler()
+        return scheduler.get_stats() if scheduler else {}
     
     def _on_connect_click(self):
         """Handle connect/disconnect button clicks"""
@@ -424,13 +469,11 @@ class TCPControllerManager:
         if message:
             if self.tcp_controller.send_message(message):
                 # Add sent message to list
-                self.message_list.addItem(f"TX: {message}")
-                self.message_list.scrollToBottom()
+                self._log(f"TX: {message}")
                 # Clear input field
                 self.message_edit.clear()
             else:
-                self.message_list.addItem("Error: Failed to send message")
-                self.message_list.scrollToBottom()
+                self._log("Error: Failed to send message")
     
     def _get_delay_trigger_settings(self):
         """
@@ -456,61 +499,38 @@ class TCPControllerManager:
             logging.error(f"Error getting delay trigger settings: {e}")
             return False, 0.0
     
+    def _sync_delay_trigger_settings(self):
+        """Push the delay trigger UI settings into the edge dispatcher"""
+        if self.optimized_manager is None:
+            return
+        _, delay_ms = self._get_delay_trigger_settings()
+        self.optimized_manager.set_delay_ms(delay_ms)
+    
     def _apply_delay_trigger(self, delay_ms: float):
         """
-        Apply delay before triggering camera
+        Trigger the camera delay_ms from now without blocking
         
-        Handles both delay application and cooldown management:
-        - If delay < cooldown: applies delay, then trigger (may hit cooldown)
-        - If delay >= cooldown: resets trigger timer to allow trigger
+        The capture is scheduled on the dispatcher's timer wheel and fired
+        from its capture thread, so several delayed captures can be in flight.
+        Edge-driven captures use the Pico edge timestamp instead of "now"
+        (see RealtimeTriggerDispatcher).
         
         Args:
             delay_ms: Delay time in milliseconds (0.0 = no delay)
         """
-        if delay_ms > 0:
-            # Convert milliseconds to seconds
-            delay_sec = delay_ms / 1000.0
-            logging.info(f"Applying delay: {delay_ms:.1f}ms ({delay_sec:.4f}s)")
-            
-            # IMPORTANT: Reset the last_trigger_time so the delay duration
-            # acts as the effective cooldown period instead of blocking trigger
-            try:
-                if hasattr(self.main_window, 'camera_manager') and self.main_window.camera_manager:
-                    camera_manager = self.main_window.camera_manager
-                    if hasattr(camera_manager, 'camera_stream') and camera_manager.camera_stream:
-                        camera_stream = camera_manager.camera_stream
-                        
-                        # Get current cooldown
-                        import time as time_module
-                        current_cooldown_s = camera_stream._cooldown_s
-                        current_cooldown_ms = current_cooldown_s * 1000.0
-                        
-                        # If delay >= cooldown, reset the trigger timer
-                        # This ensures trigger after delay won't be blocked
-                        if delay_ms >= current_cooldown_ms:
-                            logging.info(f"📊 Delay ({delay_ms:.1f}ms) >= Cooldown ({current_cooldown_ms:.1f}ms)")
-                            logging.info(f"📊 Resetting trigger timer to bypass cooldown block")
-                            # Set last_trigger_time to BEFORE delay duration
-                            camera_stream._last_trigger_time = time_module.time() - delay_sec
-                        else:
-                            logging.info(f"📊 Delay ({delay_ms:.1f}ms) < Cooldown ({current_cooldown_ms:.1f}ms)")
-                            logging.info(f"📊 Adjusting cooldown temporarily to prevent blocking")
-                            # For smaller delays, temporarily reduce cooldown
-                            new_cooldown_sec = delay_sec * 0.9
-                            camera_stream.set_trigger_cooldown(new_cooldown_sec)
-            except Exception as e:
-                logging.debug(f"Note: Could not manage cooldown: {e}")
-            
-            time.sleep(delay_sec)
-            logging.info(f"Delay completed, triggering camera now...")
+        if self.optimized_manager is None:
+            logging.warning("Delay trigger requested but optimized handler is not available")
+            return False
+        logging.debug(f"Scheduling delayed trigger in {delay_ms:.1f}ms")
+        return self.optimized_manager.schedule_capture_in(delay_ms)
 
     def _check_and_trigger_camera_if_needed(self, message: str):
         """
         Handle start_rising and end_rising sensor signals and update result tab
         
         Message formats from sensor:
-        - "start_rising||<sensor_id>" → Create new frame entry (sensor IN)
-        - "end_rising||<sensor_id>"   → Match to pending frame (sensor OUT, FIFO)
+        - "start_rising|<seq>|<ticks_us>" → Create new frame entry (sensor IN)
+        - "end_rising|<seq>|<ticks_us>"   → Match to pending frame (sensor OUT, FIFO)
         
         NOTE: Neither message triggers camera automatically. Camera trigger is user-controlled.
         """
@@ -531,23 +551,19 @@ class TCPControllerManager:
         """
         Handle start_rising signal - create new frame entry in result tab
         
-        Message format: "start_rising||<sensor_id>"
+        Message format: "start_rising|<seq>|<ticks_us>" (legacy "start_rising||<ticks_ms>")
         """
         try:
             logging.info(f"★ Detected start_rising signal: {message}")
             
-            # Extract sensor_id from message format: "start_rising||<sensor_id>"
-            try:
-                parts = message.split('||')
-                if len(parts) >= 2:
-                    sensor_id = int(parts[1].strip())
-                    logging.info(f"★ Extracted sensor_id: {sensor_id}")
-                else:
-                    logging.warning(f"Could not parse sensor_id from message: {message}")
-                    return
-            except (ValueError, IndexError) as e:
-                logging.warning(f"Error parsing sensor_id from message '{message}': {e}")
+            # sensor_id = Pico sequence number ("start_rising|<seq>|<ticks_us>"),
+            # or the timestamp for legacy "start_rising||<ticks_ms>" messages
+            parsed = parse_edge_message(message)
+            if parsed is None:
+                logging.warning(f"Could not parse sensor_id from message: {message}")
                 return
+            sensor_id = parsed[1]
+            logging.info(f"★ Extracted sensor_id: {sensor_id}")
             
             # Call sensor IN handler to create frame and merge result
             logging.info(f"★ Calling _handle_sensor_in_event with sensor_id={sensor_id}")
@@ -560,24 +576,20 @@ class TCPControllerManager:
         """
         Handle end_rising signal - match to first PENDING frame in queue (FIFO)
         
-        Message format: "end_rising||<sensor_id>"
+        Message format: "end_rising|<seq>|<ticks_us>" (legacy "end_rising||<ticks_ms>")
         When matched, frame's completion_status becomes DONE
         """
         try:
             logging.info(f"★ Detected end_rising signal: {message}")
             
-            # Extract sensor_id from message format: "end_rising||<sensor_id>"
-            try:
-                parts = message.split('||')
-                if len(parts) >= 2:
-                    sensor_id = int(parts[1].strip())
-                    logging.info(f"★ Extracted sensor_id for end_rising: {sensor_id}")
-                else:
-                    logging.warning(f"Could not parse sensor_id from message: {message}")
-                    return
-            except (ValueError, IndexError) as e:
-                logging.warning(f"Error parsing sensor_id from message '{message}': {e}")
+            # sensor_id = Pico sequence number ("end_rising|<seq>|<ticks_us>"),
+            # or the timestamp for legacy "end_rising||<ticks_ms>" messages
+            parsed = parse_edge_message(message)
+            if parsed is None:
+                logging.warning(f"Could not parse sensor_id from message: {message}")
                 return
+            sensor_id = parsed[1]
+            logging.info(f"★ Extracted sensor_id for end_rising: {sensor_id}")
             
             # Call sensor OUT handler to match to PENDING frame
             logging.info(f"★ Calling _handle_sensor_out_event with sensor_id={sensor_id}")
@@ -586,28 +598,15 @@ class TCPControllerManager:
         except Exception as e:
             logging.error(f"Error in _handle_end_rising: {e}", exc_info=True)
     
-    def _restore_default_cooldown(self):
-        """
-        Restore camera cooldown to default value (250ms)
-        This is called after trigger completes to ensure normal cooldown timing
-        """
-        try:
-            if hasattr(self.main_window, 'camera_manager') and self.main_window.camera_manager:
-                camera_manager = self.main_window.camera_manager
-                if hasattr(camera_manager, 'camera_stream') and camera_manager.camera_stream:
-                    camera_stream = camera_manager.camera_stream
-                    # Restore to default 250ms (0.25s)
-                    camera_stream.set_trigger_cooldown(0.25)
-                    logging.debug(f"Cooldown restored to default: 250ms")
-        except Exception as e:
-            logging.debug(f"Note: Could not restore cooldown: {e}")
-    
     def cleanup(self):
         """
         Clean up TCP controller and optimized handler resources
         Called during application shutdown to prevent threading hangs
         """
         try:
+            if self.message_log is not None:
+                self.message_log.stop()
+            
             # Cleanup optimized trigger handler first
             if self.optimized_manager:
                 try:
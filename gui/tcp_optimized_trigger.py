@@ -18,14 +18,100 @@ Date: October 21, 2025
 
 import re
 import logging
+import queue
 import time
 from threading import Thread, Lock, Event
+from collections import deque
+from typing import Optional, Tuple
 from PyQt5.QtCore import QObject, pyqtSignal, QMutex, QMutexLocker, QThread
 
+from controller.timer_wheel import TimerWheel
+
 logger = logging.getLogger(__name__)
 
 # Pre-compiled regex cho parse message nhanh hơn
-TRIGGER_PATTERN = re.compile(r'start_rising\|\|(\d+)')
+TRIGGER_PATTERN = re.compile(r'start_rising\|\d*\|(\d+)')
+END_PATTERN = re.compile(r'end_rising\|\d*\|(\d+)')
+# "start_rising|<seq>|<ticks_us>" (ring-buffer firmware) or legacy "start_rising||<ticks_ms>"
+EDGE_PATTERN = re.compile(r'(start|end)_rising\|(\d*)\|(\d+)')
+
+EDGE_START = 'start'
+EDGE_END = 'end'
+
+# MicroPython utime.ticks_ms() / ticks_us() both wrap at 2**30
+PICO_TICKS_PERIOD = 1 << 30
+TICK_NS_US = 1_000
+TICK_NS_MS = 1_000_000
+
+
+def parse_edge_message(message: str) -> Optional[Tuple[str, int, int, int]]:
+    """
+    Decode a Pico sensor edge message
+
+    Returns:
+        (edge, sensor_id, ticks, tick_ns) or None. With the ring-buffer
+        firmware sensor_id is the per-sensor sequence number and ticks is
+        ticks_us at the edge; legacy messages carry only ticks_ms, which is
+        also used as sensor_id.
+    """
+    match = EDGE_PATTERN.search(message)
+    if not match:
+        return None
+    edge, seq, ticks = match.group(1), match.group(2), int(match.group(3))
+    if seq:
+        return edge, int(seq), ticks, TICK_NS_US
+    return edge, ticks, ticks, TICK_NS_MS
+
+
+class PicoEdgeClock:
+    """
+    Maps Pico edge timestamps onto this host's time.monotonic_ns
+
+    pico/main.py stamps every edge with ticks_us in the sensor IRQ (older
+    firmware: ticks_ms when the event was sent). The host-minus-Pico offset is the
+    minimum (receive_time - pico_time) over recent messages: the message that
+    travelled fastest bounds the offset most tightly. A sliding window lets
+    the estimate follow clock drift.
+
+    Ticks wrap every 2**30 (~17.9 min in us). After a receive gap longer than
+    half that, the tick delta is ambiguous, so unwrap and offsets start over.
+    """
+
+    def __init__(self, window: int = 64):
+        self._samples = deque(maxlen=window)
+        self._last_ticks = None
+        self._last_received_ns = None
+        self._unwrapped = 0
+        self._tick_ns = None
+
+    def _unwrap(self, ticks: int) -> int:
+        if self._last_ticks is None:
+            self._unwrapped = ticks
+        else:
+            delta = (ticks - self._last_ticks) % PICO_TICKS_PERIOD
+            if delta >= PICO_TICKS_PERIOD // 2:
+                delta -= PICO_TICKS_PERIOD  # Slightly out-of-order edge
+            self._unwrapped += delta
+        self._last_ticks = ticks
+        return self._unwrapped
+
+    def observe(self, ticks: int, received_ns: int, tick_ns: int = TICK_NS_MS) -> int:
+        """Record one edge and return its estimated host monotonic_ns"""
+        if tick_ns != self._tick_ns:
+            self.reset()  # Firmware changed timestamp unit
+            self._tick_ns = tick_ns
+        elif self._last_received_ns is not None and \
+                received_ns - self._last_received_ns > (PICO_TICKS_PERIOD // 2) * tick_ns:
+            self.reset()  # Idle longer than half the tick period: unwrap is ambiguous
+        self._last_received_ns = received_ns
+        pico_ns = self._unwrap(ticks) * tick_ns
+        self._samples.append(received_ns - pico_ns)
+        return pico_ns + min(self._samples)
+
+    def reset(self):
+        self._samples.clear()
+        self._last_ticks = None
+        self._last_received_ns = None
 
 
 class CameraTriggerWorker(QThread):
@@ -234,6 +320,162 @@ class OptimizedTCPTriggerHandler(QObject):
         logger.info("Trigger statistics reset")
 
 
+class RealtimeTriggerDispatcher(OptimizedTCPTriggerHandler):
+    """
+    Trigger dispatcher chạy trên socket thread của TCPController
+
+    - Parses start_rising/end_rising with EDGE_PATTERN right where the bytes
+      arrive (no Qt event loop in between)
+    - Checks the per-sensor sequence numbers sent by the Pico and counts
+      edges that never arrived (ring overflow or disconnected socket)
+    - Optionally starts a capture on start_rising through a persistent
+      capture thread, so edge-to-capture latency does not depend on how busy
+      the GUI thread is
+    - Posts one queued edge_received signal per edge for the GUI bookkeeping
+      (result tab frame, servo) instead of re-parsing raw messages there
+    """
+
+    edge_received = pyqtSignal(str, int, float)  # (edge 'start'/'end', sensor_id, perf_counter at dispatch)
+
+    def __init__(self, camera_manager, tcp_controller=None, capture_on_edge: bool = False,
+                 delay_ms: float = 0.0):
+        super().__init__(camera_manager, tcp_controller)
+        # Camera trigger vẫn do người dùng điều khiển trừ khi bật capture_on_edge
+        self.capture_on_edge = capture_on_edge
+        self._stats_lock = Lock()
+        self._capture_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._capture_thread = None
+        self.edges = {EDGE_START: 0, EDGE_END: 0}
+        self._last_seq = {EDGE_START: None, EDGE_END: None}
+        self.dropped_edges = {EDGE_START: 0, EDGE_END: 0}
+        self.last_edge_ns = {EDGE_START: None, EDGE_END: None}  # Host monotonic_ns of the last edge
+
+        # Delay trigger: capture at (Pico edge time + delay), many in flight
+        self.delay_ns = int(max(0.0, delay_ms) * 1_000_000)
+        self.edge_clock = PicoEdgeClock()
+        self.timer_wheel = TimerWheel()
+        self.schedule_errors_us = deque(maxlen=1024)  # actual - intended, per delayed capture
+
+    def set_delay_ms(self, delay_ms: float):
+        """Delay between the start sensor edge and the capture (0 = immediate)"""
+        self.delay_ns = int(max(0.0, float(delay_ms)) * 1_000_000)
+
+    def schedule_capture(self, intended_ns: int, message: str = "scheduled", sensor_id: int = 0):
+        """Queue a capture for monotonic_ns() == intended_ns (non-blocking)"""
+        self._ensure_capture_thread()
+        self.timer_wheel.schedule_at(intended_ns, self._on_capture_due, message, sensor_id, intended_ns)
+
+    def _on_capture_due(self, message: str, sensor_id: int, intended_ns: int, wheel_error_ns: int):
+        # Runs on the wheel thread: hand over to the capture thread immediately
+        self._capture_queue.put((message, sensor_id, time.perf_counter(), intended_ns))
+
+    def process_trigger_message_fast(self, message: str) -> bool:
+        """
+        Socket-thread entry point for every sensor edge message
+
+        Returns:
+            bool: True if the message was a start_rising/end_rising edge
+        """
+        t_dispatch = time.perf_counter()
+        received_ns = time.monotonic_ns()
+        parsed = parse_edge_message(message)
+        if parsed is None:
+            return False
+        edge, sensor_id, ticks, tick_ns = parsed
+        self.edges[edge] += 1
+        if tick_ns == TICK_NS_US:
+            self._check_sequence(edge, sensor_id)
+
+        edge_ns = self.edge_clock.observe(ticks, received_ns, tick_ns)
+        self.last_edge_ns[edge] = edge_ns
+        if edge == EDGE_START:
+            if self.capture_on_edge and self._capture_allowed():
+                if self.delay_ns > 0:
+                    self.schedule_capture(edge_ns + self.delay_ns, message, sensor_id)
+                else:
+                    self._ensure_capture_thread()
+                    self._capture_queue.put((message, sensor_id, t_dispatch, None))
+
+        self.edge_received.emit(edge, sensor_id, t_dispatch)
+        return True
+
+    def _check_sequence(self, edge: str, seq: int):
+        last = self._last_seq[edge]
+        self._last_seq[edge] = seq
+        if last is None or seq <= last:
+            return  # First edge, or the Pico restarted its counters
+        gap = seq - last - 1
+        if gap:
+            self.dropped_edges[edge] += gap
+            logger.warning(f"Lost {gap} {edge}_rising edge(s) between seq {last} and {seq}")
+
+    def _capture_allowed(self) -> bool:
+        """Only capture on edges in trigger mode (plain attribute read, no widgets)"""
+        return getattr(self.camera_manager, 'current_mode', None) == 'trigger'
+
+    def _ensure_capture_thread(self):
+        if self._capture_thread is None or not self._capture_thread.is_alive():
+            self._capture_thread = Thread(target=self._capture_loop, name="EdgeCapture", daemon=True)
+            self._capture_thread.start()
+
+    def _capture_loop(self):
+        while True:
+            item = self._capture_queue.get()
+            if item is None:
+                break
+            message, sensor_id, t_dispatch, intended_ns = item
+            latency_ms = (time.perf_counter() - t_dispatch) * 1000
+            if intended_ns is not None:
+                error_us = (time.monotonic_ns() - intended_ns) / 1000.0
+                with self._stats_lock:
+                    self.schedule_errors_us.append(error_us)
+            success = False
+            try:
+                camera_stream = getattr(self.camera_manager, 'camera_stream', None)
+                if camera_stream is not None:
+                    camera_stream.trigger_capture()
+                    success = True
+            except Exception as e:
+                logger.error(f"Edge capture error: {e}", exc_info=True)
+            self._record_capture(success, latency_ms)
+            if success:
+                self.trigger_executed.emit(message, float(sensor_id), latency_ms)
+
+    def _record_capture(self, success: bool, latency_ms: float):
+        with self._stats_lock:
+            self.stats['total_triggers'] += 1
+            if success:
+                self.stats['successful_triggers'] += 1
+                self.stats['total_latency_ms'] += latency_ms
+                self.stats['min_latency_ms'] = min(self.stats['min_latency_ms'], latency_ms)
+                self.stats['max_latency_ms'] = max(self.stats['max_latency_ms'], latency_ms)
+            else:
+                self.stats['failed_triggers'] += 1
+
+    def get_statistics(self) -> dict:
+        with self._stats_lock:
+            stats = super().get_statistics()
+            errors = list(self.schedule_errors_us)
+        stats['start_edges'] = self.edges[EDGE_START]
+        stats['end_edges'] = self.edges[EDGE_END]
+        stats['dropped_start_edges'] = self.dropped_edges[EDGE_START]
+        stats['dropped_end_edges'] = self.dropped_edges[EDGE_END]
+        stats['scheduled_in_flight'] = self.timer_wheel.pending()
+        if errors:
+            stats['schedule_error_mean_us'] = round(sum(errors) / len(errors), 1)
+            stats['schedule_error_max_us'] = round(max(errors), 1)
+            stats['schedule_error_last_us'] = round(errors[-1], 1)
+        return stats
+
+    def stop(self):
+        """Stop the capture thread (pending captures are dropped)"""
+        self.timer_wheel.stop()
+        if self._capture_thread is not None and self._capture_thread.is_alive():
+            self._capture_queue.put(None)
+            self._capture_thread.join(0.5)
+        self._capture_thread = None
+
+
 class OptimizedTCPControllerManager(QObject):
     """
     Enhanced TCP Controller Manager with low-latency optimization
@@ -250,45 +492,39 @@ class OptimizedTCPControllerManager(QObject):
         self.tcp_controller = tcp_controller
         self.camera_manager = camera_manager
         
-        # Create optimized trigger handler
-        self.trigger_handler = OptimizedTCPTriggerHandler(camera_manager, tcp_controller)
-        
-        # Connect TCP controller signals
-        if hasattr(tcp_controller, 'message_received'):
-            tcp_controller.message_received.connect(self._on_message_received_optimized)
+        # Real-time dispatcher: edges are parsed on the socket thread
+        self.trigger_handler = RealtimeTriggerDispatcher(camera_manager, tcp_controller)
+        self.edge_received = self.trigger_handler.edge_received
         
         # Direct callback for triggers (bypass signal chain)
         self.tcp_controller.on_trigger_callback = self._on_trigger_direct
         
         logger.info("OptimizedTCPControllerManager initialized")
     
-    def _on_message_received_optimized(self, message: str):
-        """
-        Optimized message handler
-        
-        - Fast path: Trigger messages processed immediately
-        - Slow path: Regular messages logged
-        """
-        message = message.strip()
-        if not message:
-            return
-        
-        # Fast trigger path (< 1ms)
-        if 'start_rising' in message:
-            self.trigger_handler.process_trigger_message_fast(message)
-        
-        # Regular message path
-        logger.debug(f"Regular message: {message}")
-    
     def _on_trigger_direct(self, message: str):
         """
         Direct callback for triggers (no signal overhead)
         
-        Called directly from tcp_controller for minimum latency
+        Called directly from tcp_controller (socket thread) for minimum latency
         """
-        logger.info(f"★ Direct trigger callback: {message}")
         self.trigger_handler.process_trigger_message_fast(message)
     
+    def set_capture_on_edge(self, enabled: bool):
+        """Capture a frame on every start_rising edge while in trigger mode"""
+        self.trigger_handler.capture_on_edge = bool(enabled)
+        logger.info(f"Capture on start_rising edge: {'enabled' if enabled else 'disabled'}")
+    
+    def set_delay_ms(self, delay_ms: float):
+        """Delay between the start_rising edge and the capture it triggers"""
+        self.trigger_handler.set_delay_ms(delay_ms)
+        logger.info(f"Delay trigger: {float(delay_ms):.1f}ms after edge")
+    
+    def schedule_capture_in(self, delay_ms: float) -> bool:
+        """Schedule one capture delay_ms from now without blocking the caller"""
+        intended_ns = time.monotonic_ns() + int(max(0.0, float(delay_ms)) * 1_000_000)
+        self.trigger_handler.schedule_capture(intended_ns, message="delay_trigger")
+        return True
+    
     def get_trigger_statistics(self) -> dict:
         """Get trigger statistics"""
         return self.trigger_handler.get_statistics()
@@ -310,6 +546,9 @@ class OptimizedTCPControllerManager(QObject):
             # Terminate all active trigger worker threads
             if hasattr(self, 'trigger_handler') and self.trigger_handler:
                 try:
+                    self.tcp_controller.on_trigger_callback = None
+                    self.trigger_handler.stop()
+                    
                     # Terminate active workers with short timeout
                     for worker in list(self.trigger_handler.active_workers):
                         try:
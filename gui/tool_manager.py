@@ -64,8 +64,7 @@ class ToolManager(QObject):
             return
             
         # Reorder tools in job
-        tool = job.tools.pop(from_index)
-        job.tools.insert(to_index, tool)
+        job.move_tool(from_index, to_index)
         
         # Update UI
         self._update_job_view()
@@ -737,12 +736,13 @@ class ToolManager(QObject):
             job = self.job_manager.get_current_job()
             if job:
                 # Find and remove tool from job
-                for i, job_tool in enumerate(job.tools):
-                    if job_tool.tool_id == tool.tool_id:
-                        removed_tool = job.tools.pop(i)
-                        self._update_job_view()
-                        logging.info(f"ToolManager: Removed tool: {removed_tool.display_name}")
-                        break
+                with job.editing():
+                    index = next((i for i, job_tool in enumerate(job.tools)
+                                  if job_tool.tool_id == tool.tool_id), None)
+                    removed_tool = job.tools.pop(index) if index is not None else None
+                if removed_tool is not None:
+                    self._update_job_view()
+                    logging.info(f"ToolManager: Removed tool: {removed_tool.display_name}")
             
     def on_edit_tool_in_job(self):
         """Chỉnh sửa tool được chọn trong jobView"""
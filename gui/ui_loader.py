@@ -0,0 +1,95 @@
+"""
+UI loader - mainUI.ui from the precompiled Python module
+
+Purpose:
+  - Building the main window from gui/ui_mainwindow.py (pyuic5 output) avoids
+    importing PyQt5.uic and parsing the XML on every start
+  - The module records a hash of the mainUI.ui it was generated from; when the
+    .ui has been edited since, the window falls back to uic.loadUi so the
+    running UI always matches the .ui file
+  - compile_main_ui() regenerates the module (python main.py --compile-ui)
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UI_PATH = os.path.join(PROJECT_ROOT, 'mainUI.ui')
+COMPILED_UI_PATH = os.path.join(PROJECT_ROOT, 'gui', 'ui_mainwindow.py')
+
+_HASH_LINE = re.compile(r'^# Source hash: ([0-9a-f]{40})$', re.MULTILINE)
+
+
+def ui_source_hash(ui_path: str = UI_PATH) -> Optional[str]:
+    try:
+        with open(ui_path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError as e:
+        logger.error(f"UI loader: Cannot read {ui_path}: {e}")
+        return None
+
+
+def compiled_ui_hash(compiled_path: str = COMPILED_UI_PATH) -> Optional[str]:
+    """Hash of the .ui recorded in the compiled module header (None if missing)"""
+    try:
+        with open(compiled_path, 'r', encoding='utf-8') as f:
+            match = _HASH_LINE.search(f.read(2048))
+        return match.group(1) if match else None
+    except OSError:
+        return None
+
+
+def compiled_ui_is_current(ui_path: str = UI_PATH, compiled_path: str = COMPILED_UI_PATH) -> bool:
+    source_hash = ui_source_hash(ui_path)
+    return source_hash is not None and source_hash == compiled_ui_hash(compiled_path)
+
+
+def compile_main_ui(ui_path: str = UI_PATH, compiled_path: str = COMPILED_UI_PATH) -> bool:
+    """Regenerate the compiled module from the .ui (same output as pyuic5)"""
+    try:
+        from PyQt5 import uic
+        source_hash = ui_source_hash(ui_path)
+        if source_hash is None:
+            return False
+        out = io.StringIO()
+        uic.compileUi(ui_path, out)
+        code = out.getvalue().replace(ui_path, os.path.basename(ui_path))
+        header = f"# Source hash: {source_hash}\n"
+        with open(compiled_path, 'w', encoding='utf-8') as f:
+            f.write(code.replace('\n\n', f"\n{header}\n", 1) if '\n\n' in code else header + code)
+        logger.info(f"UI loader: Compiled {ui_path} -> {compiled_path}")
+        return True
+    except Exception as e:
+        logger.error(f"UI loader: Failed to compile {ui_path}: {e}")
+        return False
+
+
+def load_main_ui(window, ui_path: str = UI_PATH) -> str:
+    """
+    Build the main window widgets onto `window`
+
+    Returns 'compiled' or 'runtime' (uic.loadUi fallback) for the startup report.
+    """
+    if compiled_ui_is_current(ui_path):
+        try:
+            from gui.ui_mainwindow import Ui_MainWindow
+            ui = Ui_MainWindow()
+            ui.setupUi(window)
+            # Same attribute layout as uic.loadUi(ui_path, window)
+            for name, widget in vars(ui).items():
+                setattr(window, name, widget)
+            return 'compiled'
+        except Exception as e:
+            logger.error(f"UI loader: Precompiled UI failed, loading {ui_path} at runtime: {e}")
+    else:
+        logger.warning("UI loader: gui/ui_mainwindow.py is out of date with mainUI.ui "
+                       "(run: python main.py --compile-ui), loading the .ui at runtime")
+    from PyQt5 import uic
+    uic.loadUi(ui_path, window)
+    return 'runtime'
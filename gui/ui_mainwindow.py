@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+# Source hash: 475eecc0ada7ea40b666adbbd8ebf94a55f33420
 
 # Form implementation generated from reading ui file 'mainUI.ui'
 #
@@ -15,7 +16,7 @@ class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
         MainWindow.setObjectName("MainWindow")
         MainWindow.setEnabled(True)
-        MainWindow.resize(1522, 944)
+        MainWindow.resize(1532, 917)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -31,7 +32,7 @@ class Ui_MainWindow(object):
         self.centralwidget.setSizePolicy(sizePolicy)
         self.centralwidget.setObjectName("centralwidget")
         self.mainFrame = QtWidgets.QFrame(self.centralwidget)
-        self.mainFrame.setGeometry(QtCore.QRect(0, 0, 1511, 891))
+        self.mainFrame.setGeometry(QtCore.QRect(0, 0, 1531, 871))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -42,7 +43,7 @@ class Ui_MainWindow(object):
         self.mainFrame.setLineWidth(2)
         self.mainFrame.setObjectName("mainFrame")
         self.horizontalLayoutWidget = QtWidgets.QWidget(self.mainFrame)
-        self.horizontalLayoutWidget.setGeometry(QtCore.QRect(9, 9, 1471, 851))
+        self.horizontalLayoutWidget.setGeometry(QtCore.QRect(9, 19, 1511, 841))
         self.horizontalLayoutWidget.setObjectName("horizontalLayoutWidget")
         self.mainLayout = QtWidgets.QHBoxLayout(self.horizontalLayoutWidget)
         self.mainLayout.setContentsMargins(0, 0, 0, 0)
@@ -56,21 +57,22 @@ class Ui_MainWindow(object):
         self.cameraFrame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.cameraFrame.setObjectName("cameraFrame")
         self.cameraView = QtWidgets.QGraphicsView(self.cameraFrame)
-        self.cameraView.setGeometry(QtCore.QRect(20, 70, 931, 601))
+        self.cameraView.setGeometry(QtCore.QRect(20, 70, 800, 600))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
         sizePolicy.setHeightForWidth(self.cameraView.sizePolicy().hasHeightForWidth())
         self.cameraView.setSizePolicy(sizePolicy)
         self.cameraView.viewport().setProperty("cursor", QtGui.QCursor(QtCore.Qt.CrossCursor))
-        self.cameraView.setMouseTracking(False)
+        self.cameraView.setMouseTracking(True)
         self.cameraView.setAcceptDrops(False)
         self.cameraView.setFrameShape(QtWidgets.QFrame.Panel)
         self.cameraView.setFrameShadow(QtWidgets.QFrame.Plain)
-        self.cameraView.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
-        self.cameraView.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
-        self.cameraView.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContentsOnFirstShow)
+        self.cameraView.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+        self.cameraView.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAsNeeded)
+        self.cameraView.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
         self.cameraView.setInteractive(True)
+        self.cameraView.setRenderHints(QtGui.QPainter.Antialiasing|QtGui.QPainter.HighQualityAntialiasing)
         self.cameraView.setDragMode(QtWidgets.QGraphicsView.ScrollHandDrag)
         self.cameraView.setResizeAnchor(QtWidgets.QGraphicsView.AnchorViewCenter)
         self.cameraView.setViewportUpdateMode(QtWidgets.QGraphicsView.FullViewportUpdate)
@@ -85,14 +87,23 @@ class Ui_MainWindow(object):
         self.onlineCamera.setSizePolicy(sizePolicy)
         self.onlineCamera.setObjectName("onlineCamera")
         self.executionTime = QtWidgets.QLCDNumber(self.cameraFrame)
-        self.executionTime.setGeometry(QtCore.QRect(690, 40, 81, 21))
+        self.executionTime.setGeometry(QtCore.QRect(570, 10, 91, 51))
+        font = QtGui.QFont()
+        font.setFamily("MS Shell Dlg 2")
+        font.setPointSize(12)
+        font.setBold(True)
+        font.setWeight(75)
+        font.setKerning(True)
+        self.executionTime.setFont(font)
+        self.executionTime.setAutoFillBackground(True)
         self.executionTime.setFrameShape(QtWidgets.QFrame.Box)
         self.executionTime.setFrameShadow(QtWidgets.QFrame.Plain)
         self.executionTime.setSmallDecimalPoint(True)
-        self.executionTime.setSegmentStyle(QtWidgets.QLCDNumber.Filled)
+        self.executionTime.setSegmentStyle(QtWidgets.QLCDNumber.Flat)
+        self.executionTime.setProperty("intValue", 0)
         self.executionTime.setObjectName("executionTime")
         self.zoomIn = QtWidgets.QPushButton(self.cameraFrame)
-        self.zoomIn.setGeometry(QtCore.QRect(210, 10, 101, 21))
+        self.zoomIn.setGeometry(QtCore.QRect(200, 10, 101, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -100,7 +111,7 @@ class Ui_MainWindow(object):
         self.zoomIn.setSizePolicy(sizePolicy)
         self.zoomIn.setObjectName("zoomIn")
         self.zoomOut = QtWidgets.QPushButton(self.cameraFrame)
-        self.zoomOut.setGeometry(QtCore.QRect(330, 10, 101, 21))
+        self.zoomOut.setGeometry(QtCore.QRect(320, 10, 101, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -108,11 +119,12 @@ class Ui_MainWindow(object):
         self.zoomOut.setSizePolicy(sizePolicy)
         self.zoomOut.setObjectName("zoomOut")
         self.fpsNum = QtWidgets.QLCDNumber(self.cameraFrame)
-        self.fpsNum.setGeometry(QtCore.QRect(690, 10, 81, 21))
+        self.fpsNum.setGeometry(QtCore.QRect(460, 10, 91, 51))
+        self.fpsNum.setAutoFillBackground(True)
         self.fpsNum.setFrameShape(QtWidgets.QFrame.Box)
         self.fpsNum.setFrameShadow(QtWidgets.QFrame.Plain)
         self.fpsNum.setSmallDecimalPoint(True)
-        self.fpsNum.setSegmentStyle(QtWidgets.QLCDNumber.Filled)
+        self.fpsNum.setSegmentStyle(QtWidgets.QLCDNumber.Flat)
         self.fpsNum.setObjectName("fpsNum")
         self.triggerCamera = QtWidgets.QPushButton(self.cameraFrame)
         self.triggerCamera.setEnabled(True)
@@ -124,7 +136,7 @@ class Ui_MainWindow(object):
         self.triggerCamera.setSizePolicy(sizePolicy)
         self.triggerCamera.setObjectName("triggerCamera")
         self.gridLayoutWidget = QtWidgets.QWidget(self.cameraFrame)
-        self.gridLayoutWidget.setGeometry(QtCore.QRect(20, 680, 931, 151))
+        self.gridLayoutWidget.setGeometry(QtCore.QRect(20, 680, 801, 131))
         self.gridLayoutWidget.setObjectName("gridLayoutWidget")
         self.reviewViewLayout = QtWidgets.QGridLayout(self.gridLayoutWidget)
         self.reviewViewLayout.setContentsMargins(0, 0, 0, 0)
@@ -182,7 +194,7 @@ class Ui_MainWindow(object):
         self.reviewViewLayout.setRowStretch(0, 3)
         self.reviewViewLayout.setRowStretch(1, 1)
         self.executionLabel = QtWidgets.QLabel(self.cameraFrame)
-        self.executionLabel.setGeometry(QtCore.QRect(820, 10, 131, 51))
+        self.executionLabel.setGeometry(QtCore.QRect(690, 10, 131, 51))
         self.executionLabel.setAutoFillBackground(True)
         self.executionLabel.setFrameShape(QtWidgets.QFrame.Box)
         self.executionLabel.setFrameShadow(QtWidgets.QFrame.Plain)
@@ -190,7 +202,7 @@ class Ui_MainWindow(object):
         self.executionLabel.setAlignment(QtCore.Qt.AlignCenter)
         self.executionLabel.setObjectName("executionLabel")
         self.zoomReset = QtWidgets.QPushButton(self.cameraFrame)
-        self.zoomReset.setGeometry(QtCore.QRect(210, 40, 221, 21))
+        self.zoomReset.setGeometry(QtCore.QRect(200, 40, 221, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -206,37 +218,40 @@ class Ui_MainWindow(object):
         self.palettePage = QtWidgets.QWidget()
         self.palettePage.setObjectName("palettePage")
         self.paletteFrame = QtWidgets.QFrame(self.palettePage)
-        self.paletteFrame.setGeometry(QtCore.QRect(0, 0, 481, 741))
+        self.paletteFrame.setGeometry(QtCore.QRect(0, 0, 666, 739))
         self.paletteFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.paletteFrame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.paletteFrame.setObjectName("paletteFrame")
         self.paletteLabel = QtWidgets.QLabel(self.paletteFrame)
-        self.paletteLabel.setGeometry(QtCore.QRect(0, 10, 481, 16))
+        self.paletteLabel.setGeometry(QtCore.QRect(0, 0, 631, 21))
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        font.setBold(True)
+        font.setWeight(75)
+        self.paletteLabel.setFont(font)
         self.paletteLabel.setTextFormat(QtCore.Qt.AutoText)
         self.paletteLabel.setScaledContents(True)
         self.paletteLabel.setAlignment(QtCore.Qt.AlignCenter)
         self.paletteLabel.setObjectName("paletteLabel")
         self.paletteTab = QtWidgets.QTabWidget(self.paletteFrame)
-        self.paletteTab.setGeometry(QtCore.QRect(10, 30, 461, 521))
+        self.paletteTab.setGeometry(QtCore.QRect(10, 20, 641, 611))
         self.paletteTab.setObjectName("paletteTab")
         self.resultTab = QtWidgets.QWidget()
         self.resultTab.setObjectName("resultTab")
         self.clearQueueButton = QtWidgets.QPushButton(self.resultTab)
-        self.clearQueueButton.setGeometry(QtCore.QRect(330, 420, 111, 21))
+        self.clearQueueButton.setGeometry(QtCore.QRect(530, 540, 91, 21))
         self.clearQueueButton.setObjectName("clearQueueButton")
         self.deleteObjectButton = QtWidgets.QPushButton(self.resultTab)
-        self.deleteObjectButton.setGeometry(QtCore.QRect(200, 420, 111, 21))
+        self.deleteObjectButton.setGeometry(QtCore.QRect(350, 540, 111, 21))
         self.deleteObjectButton.setObjectName("deleteObjectButton")
-        self.resultTableView = QtWidgets.QTableWidget(self.resultTab)
-        self.resultTableView.setGeometry(QtCore.QRect(10, 10, 431, 401))
+        self.resultTableView = QtWidgets.QTableView(self.resultTab)
+        self.resultTableView.setGeometry(QtCore.QRect(10, 10, 611, 511))
         self.resultTableView.setObjectName("resultTableView")
-        self.resultTableView.setColumnCount(0)
-        self.resultTableView.setRowCount(0)
         self.paletteTab.addTab(self.resultTab, "")
         self.jobTab = QtWidgets.QWidget()
         self.jobTab.setObjectName("jobTab")
         self.jobView = QtWidgets.QTreeView(self.jobTab)
-        self.jobView.setGeometry(QtCore.QRect(10, 10, 431, 331))
+        self.jobView.setGeometry(QtCore.QRect(10, 10, 611, 341))
         self.jobView.setObjectName("jobView")
         self.removeJob = QtWidgets.QPushButton(self.jobTab)
         self.removeJob.setGeometry(QtCore.QRect(120, 390, 81, 21))
@@ -247,7 +262,7 @@ class Ui_MainWindow(object):
         self.removeJob.setSizePolicy(sizePolicy)
         self.removeJob.setObjectName("removeJob")
         self.editTool = QtWidgets.QPushButton(self.jobTab)
-        self.editTool.setGeometry(QtCore.QRect(340, 360, 101, 21))
+        self.editTool.setGeometry(QtCore.QRect(520, 360, 101, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -263,7 +278,7 @@ class Ui_MainWindow(object):
         self.addJob.setSizePolicy(sizePolicy)
         self.addJob.setObjectName("addJob")
         self.loadJob = QtWidgets.QPushButton(self.jobTab)
-        self.loadJob.setGeometry(QtCore.QRect(20, 360, 81, 21))
+        self.loadJob.setGeometry(QtCore.QRect(10, 360, 81, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -271,7 +286,7 @@ class Ui_MainWindow(object):
         self.loadJob.setSizePolicy(sizePolicy)
         self.loadJob.setObjectName("loadJob")
         self.saveJob = QtWidgets.QPushButton(self.jobTab)
-        self.saveJob.setGeometry(QtCore.QRect(20, 390, 81, 21))
+        self.saveJob.setGeometry(QtCore.QRect(10, 390, 81, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -279,7 +294,7 @@ class Ui_MainWindow(object):
         self.saveJob.setSizePolicy(sizePolicy)
         self.saveJob.setObjectName("saveJob")
         self.removeTool = QtWidgets.QPushButton(self.jobTab)
-        self.removeTool.setGeometry(QtCore.QRect(340, 390, 101, 21))
+        self.removeTool.setGeometry(QtCore.QRect(520, 390, 101, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -290,46 +305,43 @@ class Ui_MainWindow(object):
         self.controllerTab = QtWidgets.QWidget()
         self.controllerTab.setObjectName("controllerTab")
         self.connectButton = QtWidgets.QPushButton(self.controllerTab)
-        self.connectButton.setGeometry(QtCore.QRect(350, 60, 91, 23))
+        self.connectButton.setGeometry(QtCore.QRect(520, 60, 101, 23))
         self.connectButton.setObjectName("connectButton")
         self.deviceLabel = QtWidgets.QLabel(self.controllerTab)
         self.deviceLabel.setGeometry(QtCore.QRect(10, 20, 61, 21))
         self.deviceLabel.setObjectName("deviceLabel")
         self.statusLabel = QtWidgets.QLabel(self.controllerTab)
-        self.statusLabel.setGeometry(QtCore.QRect(10, 60, 91, 21))
+        self.statusLabel.setGeometry(QtCore.QRect(10, 60, 241, 21))
         self.statusLabel.setFrameShape(QtWidgets.QFrame.WinPanel)
         self.statusLabel.setText("")
         self.statusLabel.setObjectName("statusLabel")
-        self.testServoButton = QtWidgets.QPushButton(self.controllerTab)
-        self.testServoButton.setGeometry(QtCore.QRect(10, 330, 91, 21))
-        self.testServoButton.setObjectName("testServoButton")
-        self.messageListWidget = QtWidgets.QListWidget(self.controllerTab)
-        self.messageListWidget.setGeometry(QtCore.QRect(10, 100, 431, 191))
+        self.messageListWidget = QtWidgets.QListView(self.controllerTab)
+        self.messageListWidget.setGeometry(QtCore.QRect(10, 100, 611, 201))
         self.messageListWidget.setObjectName("messageListWidget")
         self.ipLineEdit = QtWidgets.QLineEdit(self.controllerTab)
         self.ipLineEdit.setGeometry(QtCore.QRect(70, 20, 181, 21))
         self.ipLineEdit.setObjectName("ipLineEdit")
         self.portLineEdit = QtWidgets.QLineEdit(self.controllerTab)
-        self.portLineEdit.setGeometry(QtCore.QRect(340, 20, 101, 21))
+        self.portLineEdit.setGeometry(QtCore.QRect(520, 20, 101, 21))
         self.portLineEdit.setObjectName("portLineEdit")
         self.portLabel = QtWidgets.QLabel(self.controllerTab)
-        self.portLabel.setGeometry(QtCore.QRect(270, 20, 61, 21))
+        self.portLabel.setGeometry(QtCore.QRect(420, 20, 61, 21))
         self.portLabel.setObjectName("portLabel")
         self.messageLineEdit = QtWidgets.QLineEdit(self.controllerTab)
-        self.messageLineEdit.setGeometry(QtCore.QRect(10, 300, 331, 21))
+        self.messageLineEdit.setGeometry(QtCore.QRect(10, 320, 471, 21))
         self.messageLineEdit.setObjectName("messageLineEdit")
         self.sendButton = QtWidgets.QPushButton(self.controllerTab)
-        self.sendButton.setGeometry(QtCore.QRect(350, 300, 91, 21))
+        self.sendButton.setGeometry(QtCore.QRect(530, 320, 91, 21))
         self.sendButton.setObjectName("sendButton")
         self.paletteTab.addTab(self.controllerTab, "")
         self.toolLayout = QtWidgets.QFrame(self.paletteFrame)
-        self.toolLayout.setGeometry(QtCore.QRect(10, 560, 461, 61))
+        self.toolLayout.setGeometry(QtCore.QRect(0, 670, 666, 71))
         self.toolLayout.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.toolLayout.setFrameShadow(QtWidgets.QFrame.Raised)
         self.toolLayout.setObjectName("toolLayout")
         self.addTool = QtWidgets.QPushButton(self.toolLayout)
         self.addTool.setEnabled(True)
-        self.addTool.setGeometry(QtCore.QRect(340, 10, 101, 31))
+        self.addTool.setGeometry(QtCore.QRect(540, 20, 111, 31))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -337,7 +349,7 @@ class Ui_MainWindow(object):
         self.addTool.setSizePolicy(sizePolicy)
         self.addTool.setObjectName("addTool")
         self.toolComboBox = QtWidgets.QComboBox(self.toolLayout)
-        self.toolComboBox.setGeometry(QtCore.QRect(10, 10, 311, 31))
+        self.toolComboBox.setGeometry(QtCore.QRect(10, 20, 461, 31))
         self.toolComboBox.setObjectName("toolComboBox")
         self.toolComboBox.addItem("")
         self.toolComboBox.addItem("")
@@ -349,15 +361,15 @@ class Ui_MainWindow(object):
         self.cameraSettingPage = QtWidgets.QWidget()
         self.cameraSettingPage.setObjectName("cameraSettingPage")
         self.cameraSettingFrame = QtWidgets.QFrame(self.cameraSettingPage)
-        self.cameraSettingFrame.setGeometry(QtCore.QRect(0, 0, 481, 751))
+        self.cameraSettingFrame.setGeometry(QtCore.QRect(0, 0, 666, 751))
         self.cameraSettingFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.cameraSettingFrame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.cameraSettingFrame.setObjectName("cameraSettingFrame")
         self.triggerCameraMode = QtWidgets.QPushButton(self.cameraSettingFrame)
-        self.triggerCameraMode.setGeometry(QtCore.QRect(90, 50, 161, 21))
+        self.triggerCameraMode.setGeometry(QtCore.QRect(90, 50, 241, 21))
         self.triggerCameraMode.setObjectName("triggerCameraMode")
         self.liveCameraMode = QtWidgets.QPushButton(self.cameraSettingFrame)
-        self.liveCameraMode.setGeometry(QtCore.QRect(280, 50, 161, 21))
+        self.liveCameraMode.setGeometry(QtCore.QRect(380, 50, 231, 21))
         self.liveCameraMode.setObjectName("liveCameraMode")
         self.modeLabel = QtWidgets.QLabel(self.cameraSettingFrame)
         self.modeLabel.setGeometry(QtCore.QRect(30, 50, 61, 21))
@@ -370,27 +382,27 @@ class Ui_MainWindow(object):
         self.modeLabel.setObjectName("modeLabel")
         self.heightCameraFrameSpinBox = QtWidgets.QSpinBox(self.cameraSettingFrame)
         self.heightCameraFrameSpinBox.setEnabled(True)
-        self.heightCameraFrameSpinBox.setGeometry(QtCore.QRect(90, 130, 101, 21))
+        self.heightCameraFrameSpinBox.setGeometry(QtCore.QRect(140, 130, 151, 21))
         self.heightCameraFrameSpinBox.setObjectName("heightCameraFrameSpinBox")
         self.widthCameraFrameSpinBox = QtWidgets.QSpinBox(self.cameraSettingFrame)
         self.widthCameraFrameSpinBox.setEnabled(True)
-        self.widthCameraFrameSpinBox.setGeometry(QtCore.QRect(340, 130, 101, 21))
+        self.widthCameraFrameSpinBox.setGeometry(QtCore.QRect(460, 130, 151, 21))
         self.widthCameraFrameSpinBox.setObjectName("widthCameraFrameSpinBox")
         self.heightCameraFrameLabel = QtWidgets.QLabel(self.cameraSettingFrame)
         self.heightCameraFrameLabel.setGeometry(QtCore.QRect(30, 130, 55, 21))
         self.heightCameraFrameLabel.setObjectName("heightCameraFrameLabel")
         self.widthCameraFrameLabel = QtWidgets.QLabel(self.cameraSettingFrame)
-        self.widthCameraFrameLabel.setGeometry(QtCore.QRect(260, 130, 55, 21))
+        self.widthCameraFrameLabel.setGeometry(QtCore.QRect(380, 130, 55, 21))
         self.widthCameraFrameLabel.setObjectName("widthCameraFrameLabel")
         self.formatCameraComboBox = QtWidgets.QComboBox(self.cameraSettingFrame)
         self.formatCameraComboBox.setEnabled(True)
-        self.formatCameraComboBox.setGeometry(QtCore.QRect(90, 90, 351, 22))
+        self.formatCameraComboBox.setGeometry(QtCore.QRect(90, 90, 521, 22))
         self.formatCameraComboBox.setObjectName("formatCameraComboBox")
         self.formatCameraLabel = QtWidgets.QLabel(self.cameraSettingFrame)
         self.formatCameraLabel.setGeometry(QtCore.QRect(30, 90, 55, 21))
         self.formatCameraLabel.setObjectName("formatCameraLabel")
         self.rotateRight = QtWidgets.QPushButton(self.cameraSettingFrame)
-        self.rotateRight.setGeometry(QtCore.QRect(280, 170, 161, 21))
+        self.rotateRight.setGeometry(QtCore.QRect(380, 170, 231, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -398,7 +410,7 @@ class Ui_MainWindow(object):
         self.rotateRight.setSizePolicy(sizePolicy)
         self.rotateRight.setObjectName("rotateRight")
         self.rotateLeft = QtWidgets.QPushButton(self.cameraSettingFrame)
-        self.rotateLeft.setGeometry(QtCore.QRect(90, 170, 161, 21))
+        self.rotateLeft.setGeometry(QtCore.QRect(90, 170, 241, 21))
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -409,7 +421,7 @@ class Ui_MainWindow(object):
         self.rotateLabel.setGeometry(QtCore.QRect(30, 170, 55, 21))
         self.rotateLabel.setObjectName("rotateLabel")
         self.verticalLayoutWidget = QtWidgets.QWidget(self.cameraSettingFrame)
-        self.verticalLayoutWidget.setGeometry(QtCore.QRect(10, 210, 461, 131))
+        self.verticalLayoutWidget.setGeometry(QtCore.QRect(30, 210, 601, 122))
         self.verticalLayoutWidget.setObjectName("verticalLayoutWidget")
         self.AEVerticalLayout = QtWidgets.QVBoxLayout(self.verticalLayoutWidget)
         self.AEVerticalLayout.setSizeConstraint(QtWidgets.QLayout.SetDefaultConstraint)
@@ -485,7 +497,7 @@ class Ui_MainWindow(object):
         self.AEVerticalLayout.setStretch(0, 1)
         self.AEVerticalLayout.setStretch(1, 3)
         self.verticalLayoutWidget_2 = QtWidgets.QWidget(self.cameraSettingFrame)
-        self.verticalLayoutWidget_2.setGeometry(QtCore.QRect(10, 350, 461, 131))
+        self.verticalLayoutWidget_2.setGeometry(QtCore.QRect(30, 350, 601, 181))
         self.verticalLayoutWidget_2.setObjectName("verticalLayoutWidget_2")
         self.AWBVerticalLayout = QtWidgets.QVBoxLayout(self.verticalLayoutWidget_2)
         self.AWBVerticalLayout.setSizeConstraint(QtWidgets.QLayout.SetDefaultConstraint)
@@ -563,7 +575,7 @@ class Ui_MainWindow(object):
         self.detectSettingPage = QtWidgets.QWidget()
         self.detectSettingPage.setObjectName("detectSettingPage")
         self.detectSettingFrame = QtWidgets.QFrame(self.detectSettingPage)
-        self.detectSettingFrame.setGeometry(QtCore.QRect(10, 10, 471, 731))
+        self.detectSettingFrame.setGeometry(QtCore.QRect(0, 10, 666, 739))
         self.detectSettingFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.detectSettingFrame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.detectSettingFrame.setObjectName("detectSettingFrame")
@@ -571,26 +583,26 @@ class Ui_MainWindow(object):
         self.algorithmLabel.setGeometry(QtCore.QRect(10, 10, 61, 21))
         self.algorithmLabel.setObjectName("algorithmLabel")
         self.algorithmComboBox = QtWidgets.QComboBox(self.detectSettingFrame)
-        self.algorithmComboBox.setGeometry(QtCore.QRect(70, 10, 231, 21))
+        self.algorithmComboBox.setGeometry(QtCore.QRect(70, 10, 541, 21))
         self.algorithmComboBox.setSizeAdjustPolicy(QtWidgets.QComboBox.AdjustToMinimumContentsLengthWithIcon)
         self.algorithmComboBox.setObjectName("algorithmComboBox")
         self.classificationComboBox = QtWidgets.QComboBox(self.detectSettingFrame)
-        self.classificationComboBox.setGeometry(QtCore.QRect(10, 220, 191, 22))
+        self.classificationComboBox.setGeometry(QtCore.QRect(10, 180, 331, 22))
         self.classificationComboBox.setObjectName("classificationComboBox")
         self.addClassificationButton = QtWidgets.QPushButton(self.detectSettingFrame)
-        self.addClassificationButton.setGeometry(QtCore.QRect(220, 220, 111, 23))
+        self.addClassificationButton.setGeometry(QtCore.QRect(370, 180, 111, 23))
         self.addClassificationButton.setObjectName("addClassificationButton")
         self.removeClassificationButton = QtWidgets.QPushButton(self.detectSettingFrame)
-        self.removeClassificationButton.setGeometry(QtCore.QRect(350, 220, 111, 23))
+        self.removeClassificationButton.setGeometry(QtCore.QRect(500, 180, 111, 23))
         self.removeClassificationButton.setObjectName("removeClassificationButton")
         self.classificationTableView = QtWidgets.QTableView(self.detectSettingFrame)
-        self.classificationTableView.setGeometry(QtCore.QRect(10, 260, 451, 121))
+        self.classificationTableView.setGeometry(QtCore.QRect(10, 50, 601, 121))
         self.classificationTableView.setObjectName("classificationTableView")
         self.settingStackedWidget.addWidget(self.detectSettingPage)
         self.saveImagePage = QtWidgets.QWidget()
         self.saveImagePage.setObjectName("saveImagePage")
         self.saveImageFrame = QtWidgets.QFrame(self.saveImagePage)
-        self.saveImageFrame.setGeometry(QtCore.QRect(10, 10, 461, 731))
+        self.saveImageFrame.setGeometry(QtCore.QRect(0, 10, 666, 731))
         self.saveImageFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.saveImageFrame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.saveImageFrame.setObjectName("saveImageFrame")
@@ -623,7 +635,7 @@ class Ui_MainWindow(object):
         self.classificationSettingPage = QtWidgets.QWidget()
         self.classificationSettingPage.setObjectName("classificationSettingPage")
         self.classificationSettingFrame = QtWidgets.QFrame(self.classificationSettingPage)
-        self.classificationSettingFrame.setGeometry(QtCore.QRect(20, 10, 451, 731))
+        self.classificationSettingFrame.setGeometry(QtCore.QRect(0, 10, 666, 731))
         self.classificationSettingFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.classificationSettingFrame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.classificationSettingFrame.setObjectName("classificationSettingFrame")
@@ -640,34 +652,35 @@ class Ui_MainWindow(object):
         self.resultToolPage = QtWidgets.QWidget()
         self.resultToolPage.setObjectName("resultToolPage")
         self.resultToolFrame = QtWidgets.QFrame(self.resultToolPage)
-        self.resultToolFrame.setGeometry(QtCore.QRect(10, 10, 461, 731))
+        self.resultToolFrame.setGeometry(QtCore.QRect(10, 10, 666, 731))
         self.resultToolFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.resultToolFrame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.resultToolFrame.setObjectName("resultToolFrame")
         self.settingStackedWidget.addWidget(self.resultToolPage)
         self.settingLayout.addWidget(self.settingStackedWidget)
         self.selectionSettingFrame = QtWidgets.QFrame(self.horizontalLayoutWidget)
+        self.selectionSettingFrame.setEnabled(True)
         self.selectionSettingFrame.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.selectionSettingFrame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.selectionSettingFrame.setObjectName("selectionSettingFrame")
         self.applySetting = QtWidgets.QPushButton(self.selectionSettingFrame)
-        self.applySetting.setGeometry(QtCore.QRect(10, 10, 461, 23))
+        self.applySetting.setGeometry(QtCore.QRect(10, 10, 641, 31))
         self.applySetting.setObjectName("applySetting")
         self.cancleSetting = QtWidgets.QPushButton(self.selectionSettingFrame)
-        self.cancleSetting.setGeometry(QtCore.QRect(10, 50, 461, 23))
+        self.cancleSetting.setGeometry(QtCore.QRect(10, 50, 641, 31))
         self.cancleSetting.setObjectName("cancleSetting")
         self.settingLayout.addWidget(self.selectionSettingFrame)
         self.settingLayout.setStretch(0, 8)
         self.settingLayout.setStretch(1, 1)
         self.mainLayout.addLayout(self.settingLayout)
-        self.mainLayout.setStretch(0, 2)
-        self.mainLayout.setStretch(1, 1)
+        self.mainLayout.setStretch(0, 5)
+        self.mainLayout.setStretch(1, 4)
         MainWindow.setCentralWidget(self.centralwidget)
         self.statusbar = QtWidgets.QStatusBar(MainWindow)
         self.statusbar.setObjectName("statusbar")
         MainWindow.setStatusBar(self.statusbar)
         self.menuBar = QtWidgets.QMenuBar(MainWindow)
-        self.menuBar.setGeometry(QtCore.QRect(0, 0, 1522, 21))
+        self.menuBar.setGeometry(QtCore.QRect(0, 0, 1532, 21))
         self.menuBar.setObjectName("menuBar")
         self.menuFile = QtWidgets.QMenu(self.menuBar)
         self.menuFile.setObjectName("menuFile")
@@ -682,7 +695,7 @@ class Ui_MainWindow(object):
 
         self.retranslateUi(MainWindow)
         self.settingStackedWidget.setCurrentIndex(0)
-        self.paletteTab.setCurrentIndex(0)
+        self.paletteTab.setCurrentIndex(1)
         QtCore.QMetaObject.connectSlotsByName(MainWindow)
 
     def retranslateUi(self, MainWindow):
@@ -706,7 +719,6 @@ class Ui_MainWindow(object):
         self.paletteTab.setTabText(self.paletteTab.indexOf(self.jobTab), _translate("MainWindow", "Job"))
         self.connectButton.setText(_translate("MainWindow", "Connect"))
         self.deviceLabel.setText(_translate("MainWindow", "Device"))
-        self.testServoButton.setText(_translate("MainWindow", "Test servo"))
         self.portLabel.setText(_translate("MainWindow", "Port"))
         self.sendButton.setText(_translate("MainWindow", "Send"))
         self.paletteTab.setTabText(self.paletteTab.indexOf(self.controllerTab), _translate("MainWindow", "Controller"))
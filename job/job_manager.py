@@ -1,7 +1,12 @@
 import json
 import os
 import logging
+import importlib
+import threading
 import time
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from functools import wraps
 from typing import Dict, List, Any, Optional, Tuple, Union, cast
 
 import numpy as np
@@ -18,6 +23,7 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger("JobManager")
 
 from tools.base_tool import ToolConfig, BaseTool, GenericTool
+from tools.pixel_format import CONTEXT_FRAME_FORMATS, FrameFormats, frame_formats_for
 from utils.debug_utils import debug_log
 
 
@@ -48,6 +54,15 @@ class JobWorkerThread(QThread if QT_AVAILABLE else object):
                 self.job_error.emit(self.job.name, error_msg)
 
 
+def _edits_job(method):
+    """Sửa tools của job dưới _run_lock, không chen vào giữa một lần chạy"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._run_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class Job:
     """Đại diện cho một chuỗi công cụ xử lý hình ảnh với cấu trúc input/output"""
     
@@ -60,6 +75,10 @@ class Job:
         self.last_run_time = 0.0
         self.execution_time = 0.0
         self._next_tool_id = 1  # Counter for tool IDs
+        # Tools giữ trạng thái (tracker, cache theo track_id, ResultTool seen-sets):
+        # mỗi lần chỉ một luồng chạy job (inspection worker hoặc Run thủ công).
+        # Sửa tools/config từ GUI cũng giữ lock này (xem editing()).
+        self._run_lock = threading.RLock()
         
         # Thông tin cấu trúc workflow
         self.start_tools: List[BaseTool] = []  # Các tools bắt đầu (không có input)
@@ -91,6 +110,7 @@ class Job:
             if not tool.get_outputs():
                 self.end_tools.append(tool)
         
+    @_edits_job
     def add_tool(self, tool: Union[BaseTool, Dict[str, Any]], source_tool_id: Optional[int] = None) -> Optional[BaseTool]:
         """
         Thêm một công cụ vào chuỗi xử lý và kết nối với tool nguồn nếu được chỉ định
@@ -178,6 +198,7 @@ class Job:
                 return tool
         return None
         
+    @_edits_job
     def connect_tools(self, source_tool_id: int, target_tool_id: int) -> bool:
         """
         Kết nối hai công cụ với nhau trong workflow
@@ -211,6 +232,7 @@ class Job:
         debug_log(f"Đã kết nối: {source_tool.display_name} -> {target_tool.display_name}", logging.INFO)
         return True
         
+    @_edits_job
     def disconnect_tools(self, source_tool_id: int, target_tool_id: int) -> bool:
         """
         Ngắt kết nối giữa hai công cụ trong workflow
@@ -246,6 +268,7 @@ class Job:
         debug_log(f"Đã ngắt kết nối: {source_tool.display_name} -> {target_tool.display_name}", logging.INFO)
         return True
         
+    @_edits_job
     def set_tool_as_source(self, source_tool_id: int, target_tool_id: int) -> bool:
         """
         Thiết lập một công cụ làm nguồn dữ liệu chính cho một công cụ khác
@@ -317,6 +340,7 @@ class Job:
             "end_tools": [t.tool_id for t in self.end_tools]
         }
         
+    @_edits_job
     def remove_tool(self, index: int) -> bool:
         """
         Xóa một công cụ theo chỉ số và cập nhật các kết nối
@@ -355,6 +379,7 @@ class Job:
             return True
         return False
         
+    @_edits_job
     def move_tool(self, from_index: int, to_index: int) -> bool:
         """Di chuyển một công cụ từ vị trí này sang vị trí khác"""
         if 0 <= from_index < len(self.tools) and 0 <= to_index < len(self.tools):
@@ -363,6 +388,7 @@ class Job:
             return True
         return False
         
+    @_edits_job
     def edit_tool(self, index: int, new_tool: BaseTool) -> bool:
         """Chỉnh sửa một công cụ theo chỉ số"""
         if 0 <= index < len(self.tools):
@@ -371,10 +397,23 @@ class Job:
             return True
         return False
         
+    @contextmanager
+    def editing(self):
+        """
+        Giữ job trong lúc sửa tools hoặc config của tool từ GUI
+
+        Chờ lần chạy đang diễn ra kết thúc và chặn lần chạy kế tiếp cho đến khi
+        sửa xong, để inspection worker không duyệt tools đang bị thay đổi.
+        """
+        with self._run_lock:
+            yield self
+
     def run(self, image: np.ndarray, initial_context: Dict[str, Any] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
         """
         Thực thi chuỗi công cụ xử lý trên hình ảnh theo cấu trúc workflow input/output
         
+        Các lần chạy từ nhiều luồng được tuần tự hóa (xem _run_lock).
+        
         Args:
             image: Hình ảnh đầu vào (numpy array)
             initial_context: Context ban đầu để chuyển cho các tools
@@ -382,6 +421,10 @@ class Job:
         Returns:
             Tuple chứa hình ảnh cuối cùng và kết quả tổng hợp
         """
+        with self._run_lock:
+            return self._run(image, initial_context)
+    
+    def _run(self, image: np.ndarray, initial_context: Dict[str, Any] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
         if not self.tools:
             logger.warning(f"Không có công cụ nào trong job {self.name}")
             return image, {"error": "Không có công cụ nào"}
@@ -398,6 +441,7 @@ class Job:
             # Lưu trữ kết quả từ mỗi tool để sử dụng cho các tool phụ thuộc
             tool_results: Dict[int, Tuple[np.ndarray, Dict[str, Any]]] = {}
             processed_tools: List[int] = []  # Danh sách ID tool đã xử lý
+            frame_formats: Dict[int, FrameFormats] = {}  # id(image) -> cache chuyển đổi layout
             
             # Khởi chạy từ các công cụ đầu tiên
             queue = list(self.start_tools) if self.start_tools else self.tools.copy()
@@ -433,6 +477,14 @@ class Job:
                     # Cập nhật context với kết quả từ source_tool
                     current_context.update(source_result)
                 
+                # Pixel-format negotiation: một cache chuyển đổi cho mỗi frame
+                if getattr(tool, 'required_layout', None):
+                    formats = frame_formats.get(id(current_image))
+                    if formats is None or not formats.owns(current_image):
+                        formats = frame_formats_for(current_image, current_context)
+                        frame_formats[id(current_image)] = formats
+                    current_context[CONTEXT_FRAME_FORMATS] = formats
+                
                 # 🔍 Log before calling process
                 debug_log(f"   🔍 Calling tool.process() - image shape: {current_image.shape}, context keys: {list(current_context.keys())}", logging.INFO)
                 
@@ -551,13 +603,79 @@ class Job:
         return job
 
 
+class ToolRegistry(MutableMapping):
+    """
+    tool_type -> Tool class
+
+    Tools registered with register_lazy() are listed immediately but their
+    module is imported the first time the class is looked up, so heavy
+    dependencies (onnxruntime, easyocr, ...) are not loaded at startup.
+    """
+
+    def __init__(self):
+        self._classes: Dict[str, type] = {}
+        self._lazy: Dict[str, str] = {}  # tool_type -> "module:ClassName"
+
+    def register_lazy(self, tool_type: str, import_path: str) -> None:
+        self._classes.pop(tool_type, None)
+        self._lazy[tool_type] = import_path
+
+    def __getitem__(self, tool_type: str) -> type:
+        if tool_type in self._classes:
+            return self._classes[tool_type]
+        import_path = self._lazy.get(tool_type)
+        if import_path is None:
+            raise KeyError(tool_type)
+        module_name, _, class_name = import_path.partition(':')
+        try:
+            tool_class = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError) as e:
+            # Same outcome as a failed eager registration: the type disappears
+            logger.warning(f"Không thể đăng ký {tool_type}: {e}")
+            del self._lazy[tool_type]
+            raise KeyError(tool_type) from e
+        except Exception as e:
+            # Module failed while executing (missing DLL, broken dependency, ...)
+            logger.error(f"Lỗi khi import {tool_type} từ {module_name}: {e}")
+            del self._lazy[tool_type]
+            raise KeyError(tool_type) from e
+        del self._lazy[tool_type]
+        self._classes[tool_type] = tool_class
+        debug_log(f"Đã import {tool_type} từ {module_name}", logging.INFO)
+        return tool_class
+
+    def __setitem__(self, tool_type: str, tool_class: type) -> None:
+        self._lazy.pop(tool_type, None)
+        self._classes[tool_type] = tool_class
+
+    def __delitem__(self, tool_type: str) -> None:
+        if tool_type in self._classes:
+            del self._classes[tool_type]
+        else:
+            del self._lazy[tool_type]
+
+    def __contains__(self, tool_type: object) -> bool:
+        # Membership does not import the module
+        return tool_type in self._classes or tool_type in self._lazy
+
+    def __iter__(self):
+        yield from list(self._classes)
+        yield from list(self._lazy)
+
+    def __len__(self) -> int:
+        return len(self._classes) + len(self._lazy)
+
+    def is_loaded(self, tool_type: str) -> bool:
+        return tool_type in self._classes
+
+
 class JobManager:
     """Quản lý tất cả các job và công cụ có sẵn"""
     
     def __init__(self):
         self.jobs: List[Job] = []
         self.current_job_index = -1
-        self.tool_registry: Dict[str, type] = {}  # map tool_type -> Tool class
+        self.tool_registry = ToolRegistry()  # map tool_type -> Tool class (imported on first use)
         self.register_default_tools()
         
         # Performance optimization attributes
@@ -579,33 +697,13 @@ class JobManager:
         # Đăng ký công cụ chung trước
         self.register_tool(GenericTool)
 
-        # Import các công cụ cụ thể ở đây để tránh import vòng tròn
-        try:
-            from tools.detection.ocr_tool import OcrTool
-            self.register_tool(OcrTool)
-        except ImportError:
-            logger.warning("Không thể đăng ký OcrTool")
-
-        try:
-            from tools.detection.edge_detection import EdgeDetectionTool
-            self.register_tool(EdgeDetectionTool)
-        except ImportError:
-            logger.warning("Không thể đăng ký EdgeDetectionTool")
-
-        try:
-            from tools.saveimage_tool import SaveImageTool
-            self.register_tool(SaveImageTool)
-            debug_log("Đã đăng ký SaveImageTool", logging.INFO)
-        except ImportError:
-            logger.warning("Không thể đăng ký SaveImageTool")
-
+        # Công cụ cụ thể được import lần đầu khi dùng (tránh import vòng tròn và
+        # không tải onnxruntime/easyocr lúc khởi động)
+        self.tool_registry.register_lazy("OcrTool", "tools.detection.ocr_tool:OcrTool")
+        self.tool_registry.register_lazy("EdgeDetectionTool", "tools.detection.edge_detection:EdgeDetectionTool")
+        self.tool_registry.register_lazy("SaveImageTool", "tools.saveimage_tool:SaveImageTool")
         # ClassificationTool (optional, ONNX-based)
-        try:
-            from tools.classification_tool import ClassificationTool
-            self.register_tool(ClassificationTool)
-            debug_log("Đã đăng ký ClassificationTool", logging.INFO)
-        except ImportError:
-            logger.warning("Không thể đăng ký ClassificationTool")
+        self.tool_registry.register_lazy("ClassificationTool", "tools.classification_tool:ClassificationTool")
         
     def create_tool(self, tool_type: str, name: str, config: Optional[Dict[str, Any]] = None) -> Optional[BaseTool]:
         """
@@ -619,8 +717,8 @@ class JobManager:
         Returns:
             Công cụ đã được khởi tạo hoặc None nếu loại không tồn tại
         """
-        if tool_type in self.tool_registry:
-            tool_class = self.tool_registry[tool_type]
+        tool_class = self.tool_registry.get(tool_type)
+        if tool_class is not None:
             return tool_class(name, ToolConfig(config or {}))
         logger.warning(f"Loại công cụ không hợp lệ: {tool_type}")
         return None
@@ -691,8 +789,9 @@ class JobManager:
                 # Update last detection time
                 self.last_detection_time = current_time
             
-            # Base context ensures SaveImageTool can save when desired
-            initial_context: Dict[str, Any] = {"force_save": True}
+            # No force_save here: SaveImageTool keeps frames in its NG archive and
+            # only writes NG frames (+ neighbours) and sampled OK frames
+            initial_context: Dict[str, Any] = {}
             # Merge additional context from caller (e.g., pixel_format)
             if context:
                 try:
@@ -2,8 +2,14 @@ import sys
 import os
 import argparse
 import logging
+
+# Bật profiler trước khi import PyQt5/OpenCV để đo toàn bộ thời gian import
+from utils.startup_profile import startup_profiler
+if '--profile-startup' in sys.argv:
+    startup_profiler.start()
+
 from PyQt5.QtWidgets import QApplication, QMessageBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 
 class DebugOnlyStreamHandler(logging.StreamHandler):
@@ -99,8 +105,18 @@ def main():
     parser.add_argument('--platform',
                        choices=['xcb', 'wayland', 'eglfs', 'linuxfb'],
                        help='Force specific Qt platform plugin')
+    parser.add_argument('--profile-startup',
+                       action='store_true',
+                       help='Print an import-time breakdown and startup milestones')
+    parser.add_argument('--compile-ui',
+                       action='store_true',
+                       help='Regenerate gui/ui_mainwindow.py from mainUI.ui and exit')
     args = parser.parse_args()
     
+    if args.compile_ui:
+        from gui.ui_loader import compile_main_ui
+        sys.exit(0 if compile_main_ui() else 1)
+    
     # Set debug level if requested
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -138,6 +154,7 @@ def main():
     
     # Set application style
     app.setStyle('Fusion')
+    startup_profiler.mark("QApplication created")
     
     # CameraStream now includes required methods; no dynamic patching needed
     
@@ -160,6 +177,10 @@ def main():
         # Show window and run application
         window.show()
         logger.info("SED Application started successfully")
+        startup_profiler.mark("main window shown")
+        if startup_profiler.enabled:
+            # Report once the event loop runs (first paint queued); first frame is printed when it arrives
+            QTimer.singleShot(0, lambda: (startup_profiler.mark("event loop running"), startup_profiler.report()))
         
         # Run the application
         exit_code = app.exec_()
@@ -0,0 +1,355 @@
+"""
+Pico emulator + load generator (CPython)
+
+Stand-in for pico/main.py on any Linux box: listens like OneSocketHost,
+sends "start_rising|<seq>|<ticks_us>" / "end_rising|<seq>|<ticks_us>" for a
+configurable stream of parts and answers PING/KICK/SETKICK/GOTO/HOME/
+RELEASE/TRIGGER the same way the firmware does. Every servo command that
+comes back is matched (FIFO) to the oldest part still waiting for one, which
+gives the event -> servo round trip of the whole trigger-to-reject loop.
+
+Usage:
+    python -m pico.emulator --port 4000 --rate 10 --count 500 --jitter-ms 5
+then connect the application to 127.0.0.1:4000.
+"""
+
+import argparse
+import json
+import logging
+import random
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TICKS_PERIOD = 1 << 30          # utime.ticks_us() wraps at 2**30
+SERVO_COMMANDS = ('GOTO', 'KICK', 'HOME')
+KICK_DEFAULT_DEG = 90
+HOME_DEG = 5
+
+
+def ticks_us() -> int:
+    return (time.monotonic_ns() // 1000) % TICKS_PERIOD
+
+
+@dataclass
+class PartPattern:
+    """
+    Part arrival pattern
+
+    rate_hz: mean part rate at the IN sensor
+    jitter_ms: uniform +/- jitter on each arrival
+    burst_size / burst_every: every burst_every parts, burst_size parts arrive
+        burst_spacing_ms apart (closely spaced parts on the belt)
+    transit_ms / transit_jitter_ms: IN -> OUT sensor travel time
+    """
+    rate_hz: float = 5.0
+    count: int = 100
+    jitter_ms: float = 0.0
+    burst_size: int = 1
+    burst_every: int = 0
+    burst_spacing_ms: float = 20.0
+    transit_ms: float = 800.0
+    transit_jitter_ms: float = 0.0
+    seed: Optional[int] = None
+
+    def arrivals(self) -> List[float]:
+        """Arrival offsets in seconds (sorted) for count parts"""
+        rng = random.Random(self.seed)
+        interval = 1.0 / self.rate_hz if self.rate_hz > 0 else 0.0
+        times = []
+        t = 0.0
+        i = 0
+        while i < self.count:
+            in_burst = self.burst_every > 0 and self.burst_size > 1 and i % self.burst_every == 0
+            group = min(self.burst_size if in_burst else 1, self.count - i)
+            for k in range(group):
+                jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) / 1000.0 if self.jitter_ms else 0.0
+                times.append(max(0.0, t + k * self.burst_spacing_ms / 1000.0 + jitter))
+            i += group
+            t += interval * group
+        return sorted(times)
+
+    def transit_s(self, rng: random.Random) -> float:
+        jitter = rng.uniform(-self.transit_jitter_ms, self.transit_jitter_ms) if self.transit_jitter_ms else 0.0
+        return max(0.0, self.transit_ms + jitter) / 1000.0
+
+
+@dataclass
+class EmulatedPart:
+    seq: int
+    start_ns: int = 0
+    end_ns: Optional[int] = None
+    command: Optional[str] = None
+    command_ns: Optional[int] = None
+
+
+class PicoEmulator:
+    """One-socket Pico host emulator with a part generator"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 4000):
+        self.host = host
+        self.port = port
+        self._server: Optional[socket.socket] = None
+        self._client: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.connected = threading.Event()
+
+        self.seq = {'start': 0, 'end': 0}
+        self.parts: List[EmulatedPart] = []
+        self._awaiting: Deque[EmulatedPart] = deque()   # Parts without a servo command yet
+        self._parts_lock = threading.Lock()
+        self.received: List[str] = []
+        self.servo_deg = HOME_DEG
+        self.kick_deg = KICK_DEFAULT_DEG
+        self.triggers = 0
+        self.unmatched_commands = 0
+
+    # ------------------------------------------------------------------
+    # Socket side
+    # ------------------------------------------------------------------
+    def start(self) -> int:
+        """Listen and serve in the background; returns the bound port"""
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen(1)
+        self._server.settimeout(0.2)
+        self.port = self._server.getsockname()[1]
+        thread = threading.Thread(target=self._serve, name="PicoEmulator", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        logger.info(f"PicoEmulator: Listening on {self.host}:{self.port}")
+        return self.port
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(2.0)
+        for sock in (self._client, self._server):
+            if sock is not None:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            try:
+                client, addr = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client.settimeout(0.2)
+            self._client = client
+            logger.info(f"PicoEmulator: Client connected: {addr}")
+            self.send_line("HELLO from Pico (server)")
+            self.connected.set()
+            self._read_client(client)
+            self.connected.clear()
+            self._client = None
+            logger.info("PicoEmulator: Client disconnected")
+
+    def _read_client(self, client: socket.socket) -> None:
+        buffer = b""
+        while not self._stop.is_set():
+            try:
+                data = client.recv(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if not data:
+                return
+            now_ns = time.monotonic_ns()
+            buffer += data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                self._handle_line(line.decode('utf-8', 'ignore'), now_ns)
+
+    def send_line(self, text: str) -> bool:
+        client = self._client
+        if client is None:
+            return False
+        try:
+            with self._send_lock:
+                client.sendall((text + "\n").encode())
+            return True
+        except OSError:
+            return False
+
+    def _handle_line(self, line: str, now_ns: int) -> None:
+        """Same replies as OneSocketHost._handle_line"""
+        s = line.strip()
+        if not s:
+            return
+        self.received.append(s)
+        parts = s.split()
+        cmd = parts[0].upper()
+
+        def parse_deg(idx=1, fallback=None):
+            try:
+                return int(parts[idx])
+            except (IndexError, ValueError):
+                return fallback
+
+        if cmd in SERVO_COMMANDS:
+            self._match_command(s, now_ns)
+        if cmd == "PING":
+            self.send_line("PONG")
+        elif cmd == "KICK":
+            self.kick_deg = max(0, min(180, parse_deg(1, self.kick_deg)))
+            self.send_line(f"OK KICK {self.kick_deg}")
+        elif cmd == "SETKICK":
+            deg = parse_deg(1)
+            if deg is None:
+                self.send_line("ERR SETKICK needs <deg>")
+                return
+            self.kick_deg = max(0, min(180, deg))
+            self.send_line(f"OK SETKICK {self.kick_deg}")
+        elif cmd == "GOTO":
+            deg = parse_deg(1)
+            if deg is None:
+                self.send_line("ERR GOTO needs <deg>")
+                return
+            self.servo_deg = max(0, min(180, deg))
+            self.send_line(f"OK GOTO {deg}")
+        elif cmd == "HOME":
+            self.servo_deg = HOME_DEG
+            self.send_line("OK HOME")
+        elif cmd == "RELEASE":
+            self.send_line("OK RELEASE")
+        elif cmd == "TRIGGER":
+            self.triggers += 1
+            self.send_line("OK TRIGGER")
+        else:
+            self.send_line("ERR unknown cmd")
+
+    def _match_command(self, command: str, now_ns: int) -> None:
+        with self._parts_lock:
+            if not self._awaiting:
+                self.unmatched_commands += 1
+                return
+            part = self._awaiting.popleft()
+            part.command = command
+            part.command_ns = now_ns
+
+    # ------------------------------------------------------------------
+    # Load generator
+    # ------------------------------------------------------------------
+    def send_event(self, name: str) -> int:
+        """Send one sensor edge like the firmware; returns its sequence number"""
+        edge = name.split('_', 1)[0]
+        self.seq[edge] += 1
+        self.send_line(f"{name}|{self.seq[edge]}|{ticks_us()}")
+        return self.seq[edge]
+
+    def run_pattern(self, pattern: PartPattern, settle_s: float = 1.0) -> Dict[str, Any]:
+        """Play a part pattern in real time and return the latency report"""
+        rng = random.Random(None if pattern.seed is None else pattern.seed + 1)
+        events = []
+        for arrival in pattern.arrivals():
+            events.append((arrival, 'start'))
+            events.append((arrival + pattern.transit_s(rng), 'end'))
+        events.sort()
+
+        pending_end: Deque[EmulatedPart] = deque()
+        t0 = time.monotonic()
+        for offset, kind in events:
+            if self._stop.is_set():
+                break
+            delay = t0 + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if kind == 'start':
+                part = EmulatedPart(seq=self.seq['start'] + 1)
+                part.start_ns = time.monotonic_ns()
+                with self._parts_lock:
+                    self.parts.append(part)
+                    self._awaiting.append(part)
+                pending_end.append(part)
+                self.send_event('start_rising')
+            elif pending_end:
+                part = pending_end.popleft()
+                part.end_ns = time.monotonic_ns()
+                self.send_event('end_rising')
+        time.sleep(settle_s)
+        return self.get_report()
+
+    def get_report(self) -> Dict[str, Any]:
+        """Event -> servo round-trip and deadline statistics"""
+        with self._parts_lock:
+            parts = list(self.parts)
+        rtts = sorted((p.command_ns - p.start_ns) / 1e6 for p in parts if p.command_ns is not None)
+        after_out = [p for p in parts if p.command_ns is not None and p.end_ns is not None
+                     and p.command_ns > p.end_ns]
+        report = {
+            'parts': len(parts),
+            'commands': len(rtts),
+            'missing_commands': len(parts) - len(rtts),
+            'commands_after_out': len(after_out),
+            'unmatched_commands': self.unmatched_commands,
+        }
+        if rtts:
+            def pct(p):
+                return round(rtts[min(len(rtts) - 1, int(len(rtts) * p))], 2)
+            report.update({
+                'rtt_ms_min': round(rtts[0], 2),
+                'rtt_ms_p50': pct(0.50),
+                'rtt_ms_p95': pct(0.95),
+                'rtt_ms_p99': pct(0.99),
+                'rtt_ms_max': round(rtts[-1], 2),
+            })
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pico emulator + part load generator")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4000)
+    parser.add_argument('--rate', type=float, default=5.0, help="parts per second")
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--burst-size', type=int, default=1)
+    parser.add_argument('--burst-every', type=int, default=0)
+    parser.add_argument('--burst-spacing-ms', type=float, default=20.0)
+    parser.add_argument('--transit-ms', type=float, default=800.0)
+    parser.add_argument('--transit-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--connect-timeout', type=float, default=60.0)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    emulator = PicoEmulator(args.host, args.port)
+    port = emulator.start()
+    print(f"Waiting for the application on {args.host}:{port} ...")
+    try:
+        if not emulator.connected.wait(args.connect_timeout):
+            print("No client connected")
+            return 1
+        pattern = PartPattern(rate_hz=args.rate, count=args.count, jitter_ms=args.jitter_ms,
+                              burst_size=args.burst_size, burst_every=args.burst_every,
+                              burst_spacing_ms=args.burst_spacing_ms, transit_ms=args.transit_ms,
+                              transit_jitter_ms=args.transit_jitter_ms, seed=args.seed)
+        report = emulator.run_pattern(pattern)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            for key, value in report.items():
+                print(f"{key:>20}: {value}")
+        return 0
+    finally:
+        emulator.stop()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
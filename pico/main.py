@@ -4,12 +4,14 @@
 # - Pico là TCP CLIENT kết nối 1 cổng duy nhất (Hercules TCP Server)
 # - Nhận lệnh & phản hồi ngay trên chính socket này (PING/KICK/SETKICK/GOTO/HOME)
 # - Gửi event START/END cũng trên chính socket này
-# - START sensor RISING: trigger camera + send "start_rising|.."
-# - END   sensor RISING: servo kick + send "end_rising|.."
+# - START sensor RISING: trigger camera + send "start_rising|<seq>|<ticks_us>"
+# - END   sensor: send "end_rising|<seq>|<ticks_us>"
+# - Sensor IRQ -> ring buffer (lossless, us timestamps, per-sensor seq)
 # - Anti-jitter servo: release PWM at HOME + short refresh (non-blocking)
 # ==========================================
 
-from machine import Pin, PWM, SPI
+from machine import Pin, PWM, SPI, Timer, disable_irq, enable_irq
+from array import array
 import utime
 import network
 import usocket as socket
@@ -22,7 +24,8 @@ RELAY_PIN        = 17        # trigger relay đèn (active-high)
 LED_PIN_NAME     = "LED"
 
 PULSE_US     = 3000          # độ rộng xung camera (us)
-DEBOUNCE_MS  = 10            # chống dội (ms)
+RELAY_HOLD_MS = 100          # giữ relay đèn sau khi trigger (relay cần 10-100ms)
+DEBOUNCE_MS  = 10            # chống dội (ms) - so với timestamp của cạnh trước
 MIN_GAP_MS   = 10            # tối thiểu giữa 2 lần trigger camera (ms)
 
 # ====== SERVO CONFIG (anti-jitter) ======
@@ -142,24 +145,38 @@ def led_blink_update(now_ms):
         else:
             _led_next_toggle = utime.ticks_add(now_ms, _led_blink_interval)
 
-# ====== FIRE TRIGGER (CAM + RELAY) ======
-def fire_trigger():
+# ====== FIRE TRIGGER (CAM + RELAY, NON-BLOCKING) ======
+# Xung camera được nhả bởi Timer one-shot (đúng PULSE_US), relay/LED được
+# tắt trong main loop (trigger_update) -> main loop không bị chặn khi đèn sáng
+_cam_timer      = Timer()
+relay_active    = False
+relay_off_at_ms = 0
+
+def _cam_release(t):
+    cam_out.value(1)    # GPIO18 nhả về HIGH
+
+def fire_trigger(now_ms=None):
     """Phát xung đồng bộ cho Camera (GPIO18) và bật Relay (GPIO17)
-    Chạy chậm để relay có thời gian phản ứng
+    Không chờ: trả về ngay sau khi kéo các chân, phần nhả do timer/main loop
     """
+    global relay_active, relay_off_at_ms
+    if now_ms is None:
+        now_ms = utime.ticks_ms()
     relay_out.value(1)  # Bật relay (GPIO17 = HIGH/3.3V)
     led.value(1)        # Bật LED
+    relay_active    = True
+    relay_off_at_ms = utime.ticks_add(now_ms, RELAY_HOLD_MS)  # trigger mới -> gia hạn
 
     # --- Camera: active-low pulse ---
     cam_out.value(0)    # bắt đầu phơi (GPIO18 xuống LOW)
-    utime.sleep_us(PULSE_US)  # xung 1000us
-    cam_out.value(1)    # GPIO18 nhả về HIGH
+    _cam_timer.init(mode=Timer.ONE_SHOT, freq=1_000_000 // PULSE_US, callback=_cam_release)
 
-    # --- Giữ relay bật lâu hơn để nó có thời gian phản ứng ---
-    utime.sleep_ms(100)  # Relay cần 10-100ms để hoạt động, giữ thêm để chắc
-    
-    relay_out.value(0)  # Tắt relay
-    led.value(0)        # Tắt LED
+def trigger_update(now_ms):
+    global relay_active
+    if relay_active and utime.ticks_diff(now_ms, relay_off_at_ms) >= 0:
+        relay_out.value(0)  # Tắt relay
+        led.value(0)        # Tắt LED
+        relay_active = False
 
 # ====== SERVO STATE MACHINE (NON-BLOCKING) ======
 # States: IDLE/MOVE_OUT/HOLDING/MOVE_HOME/AT_HOME/RELEASED
@@ -292,30 +309,79 @@ utime.sleep_ms(300)
 if SERVO_RELEASE_AFTER_HOME:
     servo_disable()
 
-# ====== START SENSOR IRQ + DEBOUNCE ======
-event_flag    = False
-event_time_ms = 0
-last_cam_ms   = utime.ticks_ms()
+# ====== SENSOR IRQ -> RING BUFFER (KHÔNG MẤT CẠNH) ======
+# IRQ chỉ ghi (sensor, ticks_us, ticks_ms) vào ring buffer cấp phát sẵn; main loop lấy ra,
+# chống dội theo timestamp và gửi từng event kèm số thứ tự (seq) riêng mỗi sensor.
+# ticks_us (gửi cho PC) quay vòng sau 2**30 us (~17.9 phút): sau ~9 phút idle
+# ticks_diff ra số âm. Chống dội và MIN_GAP vì vậy so bằng ticks_ms (~6.2 ngày).
+# Ring đầy -> cạnh bị đếm vào _evt_lost và seq nhảy cóc để PC phát hiện mất cạnh.
+SENSOR_START = 0
+SENSOR_END   = 1
+EVT_RING_SIZE = 64
+
+_evt_sensor = bytearray(EVT_RING_SIZE)
+_evt_time   = array('i', [0] * EVT_RING_SIZE)   # ticks_us (< 2**30)
+_evt_time_ms = array('i', [0] * EVT_RING_SIZE)  # ticks_ms cùng cạnh, cho chống dội/MIN_GAP
+_evt_head   = 0     # IRQ ghi
+_evt_tail   = 0     # main loop đọc
+_evt_lost   = array('i', [0, 0])                # cạnh mất do ring đầy, theo sensor
+
+sensor_seq      = array('i', [0, 0])            # seq của event cuối đã chấp nhận
+_last_accept_ms = array('i', [0, 0])
+_has_accepted   = bytearray(2)
+last_cam_ms     = 0
+
+def _evt_push(sensor):
+    global _evt_head
+    t = utime.ticks_us()
+    t_ms = utime.ticks_ms()
+    nxt = (_evt_head + 1) % EVT_RING_SIZE
+    if nxt == _evt_tail:
+        _evt_lost[sensor] += 1
+        return
+    _evt_sensor[_evt_head] = sensor
+    _evt_time[_evt_head] = t
+    _evt_time_ms[_evt_head] = t_ms
+    _evt_head = nxt
 
 def on_edge_start(pin):
-    global event_flag, event_time_ms
-    event_time_ms = utime.ticks_ms()
-    event_flag = True
-
-start_sensor.irq(trigger=Pin.IRQ_RISING, handler=on_edge_start)
-
-# ====== END SENSOR IRQ + DEBOUNCE (chỉ bắt 0->1) ======
-end_event_flag    = False
-end_event_time_ms = 0
+    _evt_push(SENSOR_START)
 
 def on_edge_end(pin):
-    global end_event_flag, end_event_time_ms
-    end_event_time_ms = utime.ticks_ms()
-    end_event_flag = True
+    _evt_push(SENSOR_END)
 
-# Chỉ lắng nghe cạnh lên (0->1), gửi event ngay, không tự kick servo
+start_sensor.irq(trigger=Pin.IRQ_RISING, handler=on_edge_start)
+# Giữ nguyên cạnh IRQ của END sensor như trước, không tự kick servo
 end_sensor.irq(trigger=Pin.IRQ_FALLING, handler=on_edge_end)
 
+def evt_pop():
+    """Cạnh kế tiếp trong ring -> (sensor, t_us, t_ms) hoặc None"""
+    global _evt_tail
+    if _evt_tail == _evt_head:
+        return None
+    sensor = _evt_sensor[_evt_tail]
+    t_us = _evt_time[_evt_tail]
+    t_ms = _evt_time_ms[_evt_tail]
+    _evt_tail = (_evt_tail + 1) % EVT_RING_SIZE
+    return sensor, t_us, t_ms
+
+def evt_accept(sensor, t_ms):
+    """Chống dội theo timestamp ms; trả về seq nếu cạnh hợp lệ, None nếu là dội"""
+    if _has_accepted[sensor] and utime.ticks_diff(t_ms, _last_accept_ms[sensor]) < DEBOUNCE_MS:
+        return None
+    _has_accepted[sensor] = 1
+    _last_accept_ms[sensor] = t_ms
+    irq_state = disable_irq()
+    lost = _evt_lost[sensor]
+    _evt_lost[sensor] = 0
+    enable_irq(irq_state)
+    sensor_seq[sensor] += 1 + lost
+    return sensor_seq[sensor]
+
+def cam_gap_ok(t_ms, seq):
+    """Camera chỉ bắn lại sau MIN_GAP_MS kể từ lần bắn trước (theo ticks_ms)"""
+    return seq == 1 or utime.ticks_diff(t_ms, last_cam_ms) >= MIN_GAP_MS
+
 # ====== ONE-SOCKET CONTROL CLIENT ======
 class OneSocketClient:
     def __init__(self, host, port, reconnect_ms=1500):
@@ -395,9 +461,10 @@ class OneSocketClient:
     def send_line(self, text):
         self._safe_write((text + "\n").encode())
 
-    def send_event(self, name, payload=""):
-        now = utime.ticks_ms()
-        self.send_line("{}|{}|{}".format(name, payload, now))
+    def send_event(self, name, payload="", ts=None):
+        if ts is None:
+            ts = utime.ticks_ms()
+        self.send_line("{}|{}|{}".format(name, payload, ts))
 
     def close(self):
         try:
@@ -506,7 +573,7 @@ class OneSocketClient:
                 servo_release_from_hold(now)
                 self.send_line("OK RELEASE")
             elif cmd == "TRIGGER":
-                fire_trigger()
+                fire_trigger(now)
                 self.send_line("OK TRIGGER")
             else:
                 self.send_line("ERR unknown cmd")
@@ -646,9 +713,10 @@ class OneSocketHost:
     def send_line(self, text):
         self._safe_write((text + "\n").encode())
 
-    def send_event(self, name, payload=""):
-        now = utime.ticks_ms()
-        self.send_line("{}|{}|{}".format(name, payload, now))
+    def send_event(self, name, payload="", ts=None):
+        if ts is None:
+            ts = utime.ticks_ms()
+        self.send_line("{}|{}|{}".format(name, payload, ts))
 
     def close(self):
         try:
@@ -758,7 +826,7 @@ class OneSocketHost:
                 servo_release_from_hold(now)
                 self.send_line("OK RELEASE")
             elif cmd == "TRIGGER":
-                fire_trigger()
+                fire_trigger(now)
                 self.send_line("OK TRIGGER")
             else:
                 self.send_line("ERR unknown cmd")
@@ -822,28 +890,31 @@ while True:
     if loop_count % 5000 == 0:
         print("[LOOP] Running... ({}ms) NET_READY={} control={}".format(now, NET_READY, control is not None))
 
-    # START -> Trigger camera + relay + send event
-    if event_flag and utime.ticks_diff(now, event_time_ms) >= DEBOUNCE_MS:
-        event_flag = False
-        if start_sensor.value() == 1:
-            if utime.ticks_diff(now, last_cam_ms) >= MIN_GAP_MS:
-                print("[FIRE] camera + relay triggered at {}ms".format(now))
-                fire_trigger()  # Phát xung camera + bật relay
-                last_cam_ms = utime.ticks_ms()
+    # Xử lý mọi cạnh đã buffer: "start_rising|<seq>|<ticks_us>" / "end_rising|<seq>|<ticks_us>"
+    evt = evt_pop()
+    while evt is not None:
+        sensor, t_us, t_ms = evt
+        seq = evt_accept(sensor, t_ms)
+        if seq is not None:
+            if sensor == SENSOR_START:
+                # START -> Trigger camera + relay + send event
+                if cam_gap_ok(t_ms, seq):
+                    print("[FIRE] camera + relay triggered, seq={} t={}us".format(seq, t_us))
+                    fire_trigger(now)  # Phát xung camera + bật relay (không chặn)
+                    last_cam_ms = t_ms
                 if control and control.connected:
-                    control.send_event("start_rising")
-
-    # END SENSOR -> Gửi event khi nhận cạnh lên (0->1), không tự kick
-    if end_event_flag and utime.ticks_diff(now, end_event_time_ms) >= DEBOUNCE_MS:
-        end_event_flag = False
-        if end_sensor.value() == 1:  # Cạnh lên
-            print("[END_SENSOR] Rising edge detected at {}ms".format(now))
-            if control and control.connected:
-                control.send_event("end_rising")
+                    control.send_event("start_rising", seq, t_us)
             else:
-                print("[END_SENSOR] Waiting for TCP connection to send event")
+                # END SENSOR -> chỉ gửi event, không tự kick
+                print("[END_SENSOR] Edge seq={} t={}us".format(seq, t_us))
+                if control and control.connected:
+                    control.send_event("end_rising", seq, t_us)
+                else:
+                    print("[END_SENSOR] Waiting for TCP connection to send event")
+        evt = evt_pop()
 
-    # cập nhật servo & LED
+    # cập nhật relay đèn, servo & LED
+    trigger_update(now)
     _servo_update(now)
     led_blink_update(now)
 
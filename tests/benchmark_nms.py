@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark cho NMS dùng chung (tools/detection/nms.py)
+So sánh vòng lặp cũ, ma trận IoU, OpenCV và chế độ auto với 10 → 10.000 box
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.detection.nms import batched_nms
+
+
+def legacy_nms(boxes, scores, iou_thres):
+    """Vòng lặp while class-agnostic cũ của DetectTool._nms_numpy_fast"""
+    x1, y1, x2, y2 = boxes.T
+    areas = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        if order.size == 1:
+            break
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+        inter = np.maximum(0, xx2 - xx1) * np.maximum(0, yy2 - yy1)
+        iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-6)
+        order = order[1:][iou <= iou_thres]
+    return np.array(keep, dtype=np.int64)
+
+
+def make_candidates(n, num_classes=3, seed=0):
+    """Tạo n box ngẫu nhiên, tập trung thành cụm như đầu ra YOLO thật"""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(50, 590, size=(max(1, n // 20), 2))
+    idx = rng.integers(0, len(centers), size=n)
+    xy = centers[idx] + rng.normal(0, 4, size=(n, 2))
+    wh = rng.uniform(30, 90, size=(n, 2))
+    boxes = np.concatenate([xy - wh / 2, xy + wh / 2], axis=1).astype(np.float32)
+    scores = rng.uniform(0.05, 1.0, size=n).astype(np.float32)
+    class_ids = rng.integers(0, num_classes, size=n)
+    return boxes, scores, class_ids
+
+
+def time_call(fn, repeat):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NMS micro-benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500, 1000, 3000, 10000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--iou', type=float, default=0.45)
+    args = parser.parse_args()
+
+    print(f"{'N':>7} {'legacy':>10} {'matrix':>10} {'opencv':>10} {'auto':>10}   (ms/call, kept)")
+    for n in args.sizes:
+        boxes, scores, class_ids = make_candidates(n)
+        repeat = max(1, args.repeat if n <= 1000 else args.repeat // 4)
+
+        t_legacy = time_call(lambda: legacy_nms(boxes, scores, args.iou), repeat)
+        t_matrix = time_call(lambda: batched_nms(boxes, scores, class_ids, args.iou,
+                                                 pre_nms_top_k=0, method='matrix'), repeat)
+        t_cv = time_call(lambda: batched_nms(boxes, scores, class_ids, args.iou,
+                                             pre_nms_top_k=0, method='opencv'), repeat)
+        t_auto = time_call(lambda: batched_nms(boxes, scores, class_ids, args.iou), repeat)
+        kept = len(batched_nms(boxes, scores, class_ids, args.iou))
+
+        print(f"{n:>7} {t_legacy:>10.3f} {t_matrix:>10.3f} {t_cv:>10.3f} {t_auto:>10.3f}   {kept}")
+
+
+if __name__ == '__main__':
+    main()
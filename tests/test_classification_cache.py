@@ -0,0 +1,138 @@
+"""
+Unit Tests for the classification result cache
+
+Tests crop fingerprinting, LRU eviction, hit/miss statistics and
+invalidation when the model or thresholds change
+"""
+
+import unittest
+import numpy as np
+
+from tools.classification.result_cache import ClassificationCache, crop_fingerprint
+from tools.classification.classification_tool import ClassificationTool
+from tools.classification.model_adapter import ClassifierAdapter, TRANSFORM_SOFTMAX
+
+
+class _Node:
+    def __init__(self, name, shape=None):
+        self.name = name
+        self.shape = shape
+
+
+class CountingSession:
+    """Stand-in ONNX session returning fixed logits"""
+
+    def __init__(self, logits):
+        self.logits = np.asarray(logits, dtype=np.float32)
+        self.calls = 0
+
+    def get_inputs(self):
+        return [_Node('images', [1, 3, 32, 32])]
+
+    def get_outputs(self):
+        return [_Node('output0', [1, len(self.logits)])]
+
+    def run(self, names, feed):
+        self.calls += 1
+        return [self.logits[None]]
+
+
+def _tool(session, **config):
+    cfg = {'input_width': 32, 'input_height': 32, 'draw_result': False, 'result_display_enable': False}
+    cfg.update(config)
+    tool = ClassificationTool("Cls", cfg)
+    tool.onnx_session = session
+    tool._model_loaded = True
+    tool._labels = ['ok', 'ng']
+    tool._adapter = ClassifierAdapter(session, tool._labels, (32, 32), transform=TRANSFORM_SOFTMAX)
+    tool._ensure_model = lambda: True
+    return tool
+
+
+class TestCropFingerprint(unittest.TestCase):
+    """Fingerprint stability"""
+
+    def test_same_crop_same_key(self):
+        crop = np.random.RandomState(0).randint(0, 255, (64, 48, 3), dtype=np.uint8)
+        self.assertEqual(crop_fingerprint(crop), crop_fingerprint(crop.copy()))
+
+    def test_different_crop_different_key(self):
+        crop = np.zeros((64, 64, 3), dtype=np.uint8)
+        other = crop.copy()
+        other[:32] = 255
+        self.assertNotEqual(crop_fingerprint(crop), crop_fingerprint(other))
+
+    def test_quantization_absorbs_noise(self):
+        crop = np.full((64, 64, 3), 100, dtype=np.uint8)
+        noisy = crop + np.random.RandomState(1).randint(0, 2, crop.shape).astype(np.uint8)
+        self.assertNotEqual(crop_fingerprint(crop), crop_fingerprint(noisy))
+        self.assertEqual(crop_fingerprint(crop, quant_bits=3), crop_fingerprint(noisy, quant_bits=3))
+
+
+class TestClassificationCache(unittest.TestCase):
+    """LRU behaviour"""
+
+    def test_lru_eviction_and_stats(self):
+        cache = ClassificationCache(max_size=2)
+        cache.put('a', [{'class_name': 'ok'}])
+        cache.put('b', [{'class_name': 'ng'}])
+        self.assertIsNotNone(cache.get('a'))   # 'a' becomes most recent
+        cache.put('c', [{'class_name': 'ok'}])
+        self.assertIsNone(cache.get('b'))
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (1, 1, 1))
+
+    def test_returned_predictions_are_copies(self):
+        cache = ClassificationCache()
+        cache.put('a', [{'class_name': 'ok'}])
+        cache.get('a')[0]['class_name'] = 'changed'
+        self.assertEqual(cache.get('a')[0]['class_name'], 'ok')
+
+
+class TestClassificationToolCache(unittest.TestCase):
+    """ClassificationTool integration"""
+
+    def test_repeated_crop_skips_inference(self):
+        session = CountingSession([4.0, 0.0])
+        tool = _tool(session)
+        image = np.random.RandomState(2).randint(0, 255, (64, 64, 3), dtype=np.uint8)
+        for _ in range(5):
+            _, result = tool.process(image, {'frame_layout': 'RGB'})
+        self.assertEqual(session.calls, 1)
+        self.assertEqual(result['results'][0]['predictions'][0]['class_name'], 'ok')
+        self.assertEqual(result['cache']['hits'], 4)
+
+    def test_threshold_change_invalidates(self):
+        session = CountingSession([4.0, 0.0])
+        tool = _tool(session)
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        tool.process(image)
+        tool.update_config({'confidence_threshold': 0.5})
+        tool._model_loaded = True
+        tool.process(image)
+        self.assertEqual(session.calls, 2)
+
+    def test_top_k_change_not_served_from_cache(self):
+        session = CountingSession([4.0, 0.0])
+        tool = _tool(session, enable_rejection=False)
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        _, result = tool.process(image)
+        self.assertEqual(len(result['results'][0]['predictions']), 1)
+        tool.update_config({'top_k': 2})
+        tool._model_loaded = True
+        _, result = tool.process(image)
+        self.assertEqual(len(result['results'][0]['predictions']), 2)
+        self.assertEqual(session.calls, 2)
+
+    def test_cache_disabled(self):
+        session = CountingSession([4.0, 0.0])
+        tool = _tool(session, result_cache_enabled=False)
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        tool.process(image)
+        _, result = tool.process(image)
+        self.assertEqual(session.calls, 2)
+        self.assertNotIn('cache', result)
+
+
+if __name__ == '__main__':
+    unittest.main()
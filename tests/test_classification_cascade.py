@@ -0,0 +1,103 @@
+"""
+Unit Tests for cascaded classification
+
+Tests that confident crops are decided by the small model, uncertain ones
+escalate to the full model, and escalation statistics are reported
+"""
+
+import unittest
+import numpy as np
+
+from tools.classification.cascade import CascadeStats
+from tools.classification.classification_tool import ClassificationTool
+from tools.classification.model_adapter import ClassifierAdapter, TRANSFORM_SOFTMAX
+
+
+class _Node:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeSession:
+    """Stand-in ONNX session returning fixed logits and recording input sizes"""
+
+    def __init__(self, logits):
+        self.logits = np.asarray(logits, dtype=np.float32)
+        self.input_shapes = []
+
+    def get_inputs(self):
+        return [_Node('images')]
+
+    def get_outputs(self):
+        return [_Node('output0')]
+
+    def run(self, names, feed):
+        self.input_shapes.append(next(iter(feed.values())).shape)
+        return [self.logits[None]]
+
+
+def _tool(stage1_logits, stage2_logits):
+    tool = ClassificationTool("Cls", {
+        'input_width': 64, 'input_height': 64,
+        'cascade_enabled': True, 'cascade_input_width': 16, 'cascade_input_height': 16,
+        'result_cache_enabled': False, 'draw_result': False,
+        'result_display_enable': True, 'expected_class_name': 'ok',
+    })
+    tool.onnx_session = FakeSession(stage2_logits)
+    tool._cascade_session = FakeSession(stage1_logits)
+    tool._model_loaded = True
+    tool._labels = ['ok', 'ng']
+    tool._adapter = ClassifierAdapter(tool.onnx_session, tool._labels, (64, 64), transform=TRANSFORM_SOFTMAX)
+    tool._cascade_adapter = ClassifierAdapter(tool._cascade_session, tool._labels, (16, 16),
+                                              transform=TRANSFORM_SOFTMAX)
+    tool._ensure_model = lambda: True
+    return tool
+
+
+class TestCascade(unittest.TestCase):
+    """Two-stage decision"""
+
+    def test_confident_crop_stays_in_stage1(self):
+        tool = _tool([8.0, 0.0], [0.0, 8.0])
+        _, result = tool.process(np.zeros((100, 100, 3), dtype=np.uint8))
+
+        self.assertEqual(tool._cascade_session.input_shapes, [(1, 3, 16, 16)])
+        self.assertEqual(tool.onnx_session.input_shapes, [])
+        self.assertEqual(result['results'][0]['predictions'][0]['class_name'], 'ok')
+        self.assertEqual(result['cascade']['escalation_rate'], 0.0)
+
+    def test_uncertain_crop_escalates(self):
+        tool = _tool([0.2, -0.1], [0.0, 8.0])
+        _, result = tool.process(np.zeros((100, 100, 3), dtype=np.uint8))
+
+        self.assertEqual(tool.onnx_session.input_shapes, [(1, 3, 64, 64)])
+        # Full model decides: same rejection/OK-NG path as without cascade
+        self.assertEqual(result['results'][0]['predictions'][0]['class_name'], 'ng')
+        self.assertEqual(result['cascade']['escalated'], 1)
+
+    def test_disabled_cascade_uses_full_model_only(self):
+        tool = _tool([8.0, 0.0], [0.0, 8.0])
+        tool.config.set('cascade_enabled', False)
+        _, result = tool.process(np.zeros((100, 100, 3), dtype=np.uint8))
+
+        self.assertEqual(tool._cascade_session.input_shapes, [])
+        self.assertNotIn('cascade', result)
+
+
+class TestCascadeStats(unittest.TestCase):
+    """Statistics bookkeeping"""
+
+    def test_rates_and_latency(self):
+        stats = CascadeStats()
+        stats.record(0.001)
+        stats.record(0.001)
+        stats.record(0.001, 0.010)
+        s = stats.get_stats()
+        self.assertEqual(s['crops'], 3)
+        self.assertAlmostEqual(s['escalation_rate'], 1 / 3)
+        self.assertAlmostEqual(s['stage2_avg_ms'], 10.0)
+        self.assertAlmostEqual(s['avg_cost_ms'], 13.0 / 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
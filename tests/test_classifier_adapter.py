@@ -0,0 +1,120 @@
+"""
+Unit Tests for the classifier model adapter
+
+Tests that output semantics are decided once at load (probe) and that the
+lean top-k path matches a full sort, and that ClassificationTool applies
+top_k only after rejection
+"""
+
+import unittest
+import numpy as np
+
+from tools.classification.classification_tool import ClassificationTool
+from tools.classification.model_adapter import (ClassifierAdapter, TRANSFORM_IDENTITY, TRANSFORM_NORMALIZE,
+                                                TRANSFORM_SOFTMAX)
+
+
+class _Node:
+    def __init__(self, name, shape):
+        self.name = name
+        self.shape = shape
+
+
+class ScriptedSession:
+    """Session whose output is produced by a function of the input"""
+
+    def __init__(self, fn, classes=3, dynamic=False):
+        self.fn = fn
+        self.classes = classes
+        self.dynamic = dynamic
+        self.calls = 0
+
+    def get_inputs(self):
+        return [_Node('pixel_values', ['batch', 3, 'h', 'w'])]
+
+    def get_outputs(self):
+        return [_Node('probs', ['batch', 'n'] if self.dynamic else [1, self.classes])]
+
+    def run(self, names, feed):
+        self.calls += 1
+        x = feed['pixel_values']
+        return [self.fn(x)[None].astype(np.float32)]
+
+
+class TestProbe(unittest.TestCase):
+    """Output transform detection"""
+
+    def test_logits_get_softmax(self):
+        session = ScriptedSession(lambda x: np.array([2.0, -1.0, 0.5]) * x.mean())
+        adapter = ClassifierAdapter(session, ['a', 'b', 'c'], (8, 8))
+        self.assertEqual(adapter.transform, TRANSFORM_SOFTMAX)
+        probs = adapter.probabilities(np.ones((1, 3, 8, 8), dtype=np.float32))
+        self.assertAlmostEqual(float(probs.sum()), 1.0, places=5)
+
+    def test_probabilities_pass_through(self):
+        session = ScriptedSession(lambda x: np.array([0.7, 0.2, 0.1]))
+        adapter = ClassifierAdapter(session, ['a', 'b', 'c'], (8, 8))
+        self.assertEqual(adapter.transform, TRANSFORM_IDENTITY)
+
+    def test_scores_get_normalized(self):
+        session = ScriptedSession(lambda x: np.array([0.9, 0.8, 0.1]))
+        adapter = ClassifierAdapter(session, ['a', 'b', 'c'], (8, 8))
+        self.assertEqual(adapter.transform, TRANSFORM_NORMALIZE)
+
+    def test_probe_runs_only_at_load(self):
+        session = ScriptedSession(lambda x: np.array([2.0, -1.0, 0.5]))
+        adapter = ClassifierAdapter(session, ['a', 'b', 'c'], (8, 8))
+        calls = session.calls
+        for _ in range(5):
+            adapter.infer(np.zeros((1, 3, 8, 8), dtype=np.float32))
+        self.assertEqual(session.calls, calls + 5)
+
+    def test_labels_padded_from_dynamic_output(self):
+        session = ScriptedSession(lambda x: np.array([2.0, -1.0, 0.5, 0.0]), dynamic=True)
+        adapter = ClassifierAdapter(session, ['a', 'b'], (8, 8))
+        self.assertEqual(adapter.num_classes, 4)
+        self.assertEqual(adapter.label(3), 'class_3')
+
+
+class TestTopK(unittest.TestCase):
+    """argpartition top-k"""
+
+    def test_matches_full_sort(self):
+        probs = np.random.RandomState(0).rand(1000).astype(np.float32)
+        ids, values = ClassifierAdapter.top_k(probs, 5)
+        np.testing.assert_array_equal(ids, np.argsort(-probs)[:5])
+        np.testing.assert_array_equal(values, probs[ids])
+
+    def test_k_larger_than_classes(self):
+        ids, _ = ClassifierAdapter.top_k(np.array([0.2, 0.5, 0.3]), 10)
+        self.assertEqual(list(ids), [1, 2, 0])
+
+
+class TestRejectionBeforeTopK(unittest.TestCase):
+    """Rejection sees every class, top_k trims the result"""
+
+    def _tool(self, probs, **config):
+        cfg = {'input_width': 8, 'input_height': 8, 'result_cache_enabled': False,
+               'rejection_method': 'confidence', 'confidence_threshold': 0.5}
+        cfg.update(config)
+        tool = ClassificationTool("Cls", cfg)
+        session = ScriptedSession(lambda x: np.array(probs))
+        tool.onnx_session = session
+        tool._model_loaded = True
+        tool._labels = ['ok', 'scratch', 'dent']
+        tool._adapter = ClassifierAdapter(session, tool._labels, (8, 8), transform=TRANSFORM_IDENTITY)
+        return tool
+
+    def test_class_below_top_k_accepted_by_its_threshold(self):
+        tool = self._tool([0.6, 0.3, 0.1], top_k=1, class_thresholds={'ok': 0.9, 'scratch': 0.25})
+        results = tool._classify_image(np.zeros((8, 8, 3), dtype=np.uint8))
+        self.assertEqual([r['class_name'] for r in results], ['scratch'])
+
+    def test_top_k_applied_to_accepted_classes(self):
+        tool = self._tool([0.5, 0.3, 0.2], top_k=2, confidence_threshold=0.1)
+        results = tool._classify_image(np.zeros((8, 8, 3), dtype=np.uint8))
+        self.assertEqual([r['class_name'] for r in results], ['ok', 'scratch'])
+
+
+if __name__ == '__main__':
+    unittest.main()
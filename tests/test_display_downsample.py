@@ -0,0 +1,67 @@
+"""
+Unit Tests for the downsampled camera display path
+
+Tests that frames are resized to the on-screen size before QImage
+conversion, that 1:1 / zoomed-in frames keep full resolution and that the
+QImage wraps the numpy buffer without a copy
+"""
+
+import unittest
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from gui.camera_view import CameraDisplayWorker, downsample_for_view, qimage_from_rgb
+
+app = QApplication.instance() or QApplication([])
+
+
+class _StubCameraView:
+    """Minimal CameraView surface used by CameraDisplayWorker"""
+
+    main_window = None
+
+    def __init__(self, display_scale):
+        self._display_scale = display_scale
+
+    def _get_display_frame_from_raw(self, raw_frame):
+        return None
+
+
+class TestDisplayDownsample(unittest.TestCase):
+    """Viewport-sized display images"""
+
+    def test_downsample_to_view_scale(self):
+        frame = np.zeros((1080, 1440, 3), dtype=np.uint8)
+        resized, scale = downsample_for_view(frame, 0.5)
+        self.assertEqual(resized.shape, (540, 720, 3))
+        self.assertAlmostEqual(scale, 0.5)
+
+    def test_full_resolution_when_zoomed_in(self):
+        frame = np.zeros((1080, 1440, 3), dtype=np.uint8)
+        for view_scale in (0.99, 1.0, 2.5):
+            resized, scale = downsample_for_view(frame, view_scale)
+            self.assertIs(resized, frame)
+            self.assertEqual(scale, 1.0)
+
+    def test_qimage_wraps_buffer_without_copy(self):
+        rgb = np.zeros((4, 6, 3), dtype=np.uint8)
+        rgb[1, 2] = (10, 20, 30)
+        qimage = qimage_from_rgb(rgb)
+        self.assertEqual((qimage.width(), qimage.height()), (6, 4))
+        self.assertEqual(qimage.pixelColor(2, 1).getRgb()[:3], (10, 20, 30))
+        self.assertTrue(np.shares_memory(qimage._numpy_buffer, rgb))
+
+    def test_worker_emits_viewport_sized_image_and_full_history(self):
+        frame = np.zeros((1080, 1440, 3), dtype=np.uint8)
+        frame[..., 0] = 255  # Blue in BGR memory layout
+        worker = CameraDisplayWorker(_StubCameraView(display_scale=0.5))
+        qimage, history = worker._process_frame_to_qimage(frame)
+        self.assertEqual((qimage.width(), qimage.height()), (720, 540))
+        self.assertEqual(history.shape, (1080, 1440, 3))
+        self.assertEqual(tuple(history[0, 0]), (0, 0, 255))
+        self.assertEqual(qimage.pixelColor(0, 0).getRgb()[:3], (0, 0, 255))
+
+
+if __name__ == '__main__':
+    unittest.main()
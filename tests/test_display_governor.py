@@ -0,0 +1,196 @@
+"""
+Unit Tests for the display governor and the inspection worker
+
+Tests that the governor shows only the newest frame per UI tick, that live
+frames waiting for inspection are replaced while every trigger frame gets
+one result in order, and that the inspection rate cap is respected
+"""
+
+import threading
+import time
+import unittest
+
+from PyQt5.QtCore import QCoreApplication
+
+import numpy as np
+
+from gui.display_governor import NO_VERDICT_RESULT, DisplayGovernor, InspectionWorker, RateMeter
+from job.job_manager import Job
+from tools.base_tool import GenericTool
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+class TestDisplayGovernor(unittest.TestCase):
+    """Newest-frame display at the UI rate"""
+
+    def test_only_newest_frame_displayed(self):
+        shown = []
+        governor = DisplayGovernor(shown.append, ui_fps=30)
+        for i in range(5):
+            governor.submit(i)
+        self.assertTrue(governor.flush())
+        self.assertFalse(governor.flush())
+        self.assertEqual(shown, [4])
+        self.assertEqual(governor.get_stats()['submitted'], 5)
+
+    def test_timer_drives_display(self):
+        shown = []
+        governor = DisplayGovernor(shown.append, ui_fps=100)
+        governor.start()
+        try:
+            governor.submit('frame')
+            deadline = time.time() + 1.0
+            while not shown and time.time() < deadline:
+                app.processEvents()
+                time.sleep(0.002)
+        finally:
+            governor.stop()
+        self.assertEqual(shown, ['frame'])
+
+    def test_rejects_invalid_rate(self):
+        governor = DisplayGovernor(lambda frame: None, ui_fps=25)
+        governor.set_ui_fps(0)
+        self.assertEqual(governor.ui_fps, 25)
+
+    def test_rate_meter(self):
+        now = [0.0]
+        meter = RateMeter(alpha=0.0, clock=lambda: now[0])
+        for _ in range(3):
+            meter.tick()
+            now[0] += 0.1
+        self.assertAlmostEqual(meter.rate, 10.0)
+
+
+class TestInspectionWorker(unittest.TestCase):
+    """Independent inspection thread"""
+
+    def _start(self, worker):
+        thread = threading.Thread(target=worker.run, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 1.0)
+        self.addCleanup(worker.stop)
+        return thread
+
+    def test_live_frames_latest_wins_trigger_frames_kept(self):
+        release = threading.Event()
+        seen = []
+
+        def run_job(frame, context):
+            release.wait(1.0)
+            seen.append(frame)
+            return frame, {}
+
+        worker = InspectionWorker(run_job)
+        worker.submit('busy', {})
+        self._start(worker)
+        time.sleep(0.05)  # 'busy' is running
+        for i in range(3):
+            worker.submit(f'live{i}', {})
+        worker.submit('part1', {}, keep=True)
+        worker.submit('part2', {}, keep=True)
+        worker.submit('live3', {})
+        release.set()
+        deadline = time.time() + 1.0
+        while worker.pending() and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(seen, ['busy', 'part1', 'part2', 'live3'])
+        self.assertEqual(worker.skipped_live, 3)
+
+    def test_full_trigger_queue_keeps_order_with_no_verdict(self):
+        worker = InspectionWorker(lambda frame, context: (frame, {'ran': frame}), trigger_queue=2)
+        worker.submit('live', {})
+        worker.submit('part1', {}, keep=True)
+        worker.submit('part2', {}, keep=True)
+        worker.submit('part3', {}, keep=True)
+        self.assertEqual([entry[0] for entry in worker._queue], ['live', None, 'part2', 'part3'])
+        self.assertEqual(worker.dropped_trigger, 1)
+
+        results = []
+        worker.inspected.connect(lambda frame, processed, job_results, t: results.append(job_results))
+        self._start(worker)
+        deadline = time.time() + 1.0
+        while len(results) < 4 and time.time() < deadline:
+            app.processEvents()  # inspected is queued to this thread
+            time.sleep(0.002)
+        self.assertEqual(results[0], {'ran': 'live'})
+        self.assertEqual(results[1], NO_VERDICT_RESULT)
+        self.assertEqual(results[2:], [{'ran': 'part2'}, {'ran': 'part3'}])
+
+    def test_rate_cap(self):
+        starts = []
+        done = []
+        worker = InspectionWorker(lambda frame, context: (frame, {}), max_fps=20)
+        worker.inspected.connect(lambda *args: done.append(args[0]))
+        self._start(worker)
+        for i in range(3):
+            starts.append(time.monotonic())
+            worker.submit(i, {})
+            deadline = time.time() + 1.0
+            while len(done) <= i and time.time() < deadline:
+                app.processEvents()  # inspected is queued to this thread
+                time.sleep(0.002)
+        elapsed = time.monotonic() - starts[0]
+        self.assertEqual(done, [0, 1, 2])
+        self.assertGreaterEqual(elapsed, 0.09)
+
+
+class _ConcurrencyProbeTool(GenericTool):
+    """Records how many threads are inside process() at once"""
+
+    def __init__(self):
+        super().__init__(name='Probe')
+        self.active = 0
+        self.max_active = 0
+        self.started = threading.Event()
+
+    def process(self, image, context=None):
+        self.started.set()
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        self.active -= 1
+        return image, {}
+
+
+class TestJobRunSerialized(unittest.TestCase):
+    """Manual runs, the inspection worker and GUI edits share the job's tools"""
+
+    def test_concurrent_runs_do_not_overlap(self):
+        tool = _ConcurrencyProbeTool()
+        job = Job('serial', [tool])
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        threads = [threading.Thread(target=job.run, args=(frame, {})) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(2.0)
+        self.assertEqual(tool.max_active, 1)
+
+    def test_edits_wait_for_running_job(self):
+        tool = _ConcurrencyProbeTool()
+        job = Job('edit', [tool])
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        thread = threading.Thread(target=job.run, args=(frame, {}))
+        thread.start()
+        self.assertTrue(tool.started.wait(1.0))
+        with job.editing():
+            self.assertEqual(tool.active, 0)
+        thread.join(2.0)
+
+    def test_runs_wait_for_edit(self):
+        tool = _ConcurrencyProbeTool()
+        job = Job('edit', [tool])
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        with job.editing():
+            thread = threading.Thread(target=job.run, args=(frame, {}))
+            thread.start()
+            self.assertFalse(tool.started.wait(0.05))
+            job.move_tool(0, 0)  # Job edits re-enter the same lock
+        self.assertTrue(tool.started.wait(1.0))
+        thread.join(2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@ Unit Tests for FIFO Result Queue System
 Tests queue operations, sensor matching, and table management
 """
 
+import threading
+import time
 import unittest
 from datetime import datetime
 from gui.fifo_result_queue import FIFOResultQueue, ResultQueueItem
@@ -301,5 +303,82 @@ class TestResultQueueItem(unittest.TestCase):
         self.assertEqual(item_dict['sensor_id_out'], '')
 
 
+class TestIndexedFIFOResultQueue(unittest.TestCase):
+    """Test indexed (deque + dict) queue behaviour"""
+    
+    def setUp(self):
+        self.queue = FIFOResultQueue()
+    
+    def test_eviction_keeps_index_consistent(self):
+        """Test evicted frames disappear from lookups and OUT matching"""
+        self.queue.max_queue_size = 3
+        for i in range(5):
+            self.queue.add_sensor_in_event(i)
+        
+        self.assertEqual(self.queue.get_queue_size(), 3)
+        self.assertIsNone(self.queue.get_item(1))
+        self.assertTrue(self.queue.add_sensor_out_event(99))
+        self.assertEqual(self.queue.get_item(3).sensor_id_out, 99)
+    
+    def test_sensor_out_skips_deleted_frame(self):
+        """Test OUT matches the oldest remaining pending frame"""
+        f1 = self.queue.add_sensor_in_event(1)
+        f2 = self.queue.add_sensor_in_event(2)
+        self.queue.delete_item_by_frame_id(f1)
+        
+        self.assertTrue(self.queue.add_sensor_out_event(10))
+        self.assertEqual(self.queue.get_item(f2).completion_status, "DONE")
+        self.assertFalse(self.queue.add_sensor_out_event(11))
+    
+    def test_last_done_after_deletion(self):
+        """Test last DONE frame falls back to the previous one when deleted"""
+        f1 = self.queue.add_sensor_in_event(1)
+        f2 = self.queue.add_sensor_in_event(2)
+        self.queue.add_sensor_out_event(10)
+        self.queue.add_sensor_out_event(11)
+        self.assertEqual(self.queue.get_last_done_frame().frame_id, f2)
+        
+        self.queue.delete_item_by_frame_id(f2)
+        self.assertEqual(self.queue.get_last_done_frame().frame_id, f1)
+    
+    def test_concurrent_in_out(self):
+        """Test IN/OUT from two threads never double-match a frame"""
+        count = 2000
+        
+        def producer():
+            for i in range(count):
+                self.queue.add_sensor_in_event(i)
+        
+        matched = []
+        
+        def consumer():
+            while len(matched) < count:
+                if self.queue.add_sensor_out_event(len(matched)):
+                    matched.append(1)
+        
+        threads = [threading.Thread(target=producer), threading.Thread(target=consumer)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+        
+        self.assertEqual(len(self.queue.get_completed_items()), count)
+        self.assertEqual(len(self.queue.get_pending_items()), 0)
+    
+    def test_large_queue_is_fast(self):
+        """Test thousands of in-flight parts keep per-event cost flat"""
+        self.queue.max_queue_size = 5000
+        start = time.perf_counter()
+        for i in range(20000):
+            frame_id = self.queue.add_sensor_in_event(i)
+            self.queue.set_frame_status(frame_id, 'OK')
+            if i >= 4000:
+                self.queue.add_sensor_out_event(i)
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(self.queue.get_queue_size(), 5000)
+        self.assertLess(elapsed, 5.0)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+"""
+Unit Tests for the single-slot frame mailbox used by the display workers
+
+Tests that a waiting worker wakes as soon as a frame is posted, that only
+the newest frame is kept, that close() releases a blocked worker and that
+CameraView reports the frame age at display
+"""
+
+import threading
+import time
+import unittest
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QGraphicsView
+
+from gui.frame_mailbox import FrameMailbox
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestFrameMailbox(unittest.TestCase):
+    """Latest-wins handoff"""
+
+    def test_take_wakes_on_put(self):
+        mailbox = FrameMailbox()
+        woke = []
+
+        def worker():
+            entry = mailbox.take(timeout=2.0)
+            woke.append((entry, time.monotonic()))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(0.05)
+        posted_at = time.monotonic()
+        mailbox.put('frame', posted_at)
+        thread.join(2.0)
+
+        (item, stamp), woke_at = woke[0]
+        self.assertEqual(item, 'frame')
+        self.assertEqual(stamp, posted_at)
+        self.assertLess(woke_at - posted_at, 0.02)
+
+    def test_newest_frame_wins(self):
+        mailbox = FrameMailbox()
+        for i in range(3):
+            mailbox.put(i)
+        self.assertEqual(mailbox.overwritten, 2)
+        self.assertEqual(mailbox.take(0)[0], 2)
+        self.assertIsNone(mailbox.take(0.01))
+
+    def test_close_releases_waiter(self):
+        mailbox = FrameMailbox()
+        result = []
+        thread = threading.Thread(target=lambda: result.append(mailbox.take()))
+        thread.start()
+        time.sleep(0.05)
+        mailbox.close()
+        thread.join(1.0)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result, [None])
+        self.assertFalse(mailbox.put('late'))
+
+
+class TestCameraViewFrameAge(unittest.TestCase):
+    """Display worker end to end"""
+
+    def test_frame_age_reported(self):
+        from gui.camera_view import CameraView
+
+        view = QGraphicsView()
+        camera_view = CameraView(view)
+        ages = []
+        camera_view.frame_age_updated.connect(ages.append)
+        try:
+            camera_view.display_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+            deadline = time.time() + 2.0
+            while not ages and time.time() < deadline:
+                app.processEvents()
+                time.sleep(0.005)
+            self.assertTrue(ages)
+            stats = camera_view.get_display_stats()
+            self.assertIn('frame_age_ms_p95', stats)
+            self.assertGreaterEqual(stats['frame_age_ms'], 0.0)
+        finally:
+            camera_view._stop_camera_display_worker()
+            camera_view._stop_frame_history_worker()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Unit Tests for the bounded TCP message log model
+
+Tests that lines appended from other threads only reach the view on flush,
+that the model never grows past its capacity and that the filter proxy
+shows only the enabled message kinds
+"""
+
+import threading
+import unittest
+
+from PyQt5.QtCore import QCoreApplication
+
+from gui.message_log_model import (KIND_RX, KIND_SERVO, MessageLogFilter, MessageLogModel,
+                                   classify)
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+class TestMessageLogModel(unittest.TestCase):
+    """Batching, capacity and filtering"""
+
+    def setUp(self):
+        self.model = MessageLogModel(capacity=100, flush_interval_ms=10_000)
+        self.inserts = []
+        self.model.rowsInserted.connect(lambda parent, first, last: self.inserts.append(last - first + 1))
+
+    def tearDown(self):
+        self.model.stop()
+
+    def test_lines_from_threads_flushed_in_one_batch(self):
+        workers = [threading.Thread(target=lambda: [self.model.append(f"RX: {i}") for i in range(20)])
+                   for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(self.model.rowCount(), 0)
+
+        self.assertEqual(self.model.flush(), 60)
+        self.assertEqual(self.model.rowCount(), 60)
+        self.assertEqual(self.inserts, [60])
+
+    def test_capacity_bounded(self):
+        for i in range(250):
+            self.model.append(f"RX: {i}")
+            if i % 50 == 49:
+                self.model.flush()
+        self.assertEqual(self.model.rowCount(), 100)
+        self.assertEqual(self.model.lines()[0], "RX: 150")
+        self.assertEqual(self.model.lines_dropped, 150)
+
+    def test_filter_by_kind(self):
+        for line in ("RX: start_rising|1|100", "[SERVO] TX: GOTO 45", "Status: Connected", "RX: PONG"):
+            self.model.append(line)
+        self.model.flush()
+        proxy = MessageLogFilter()
+        proxy.setSourceModel(self.model)
+        proxy.set_enabled_kinds([KIND_RX])
+        self.assertEqual([proxy.index(r, 0).data() for r in range(proxy.rowCount())],
+                         ["RX: start_rising|1|100", "RX: PONG"])
+        proxy.set_kind_enabled(KIND_SERVO, True)
+        self.assertEqual(proxy.rowCount(), 3)
+        self.assertEqual(classify("[SENSOR_OUT] Sensor OUT=1 matched"), 'SENSOR')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Unit Tests for the NG frame archive
+
+Tests that NG frames are saved with their pre/post-trigger neighbours, that
+OK frames are only sampled and that SaveImageTool routes frames to the
+archive when nothing forces a save
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import cv2
+import numpy as np
+
+from tools.ng_archive import NGFrameArchive
+from tools.saveimage_tool import SaveImageTool
+
+
+def _frame(value):
+    return np.full((24, 32, 3), value, dtype=np.uint8)
+
+
+class TestNGFrameArchive(unittest.TestCase):
+    """Trigger windows and sampling"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _tags(self):
+        return sorted(name.rsplit('_', 2)[1:] for name in os.listdir(self.tmpdir))
+
+    def test_ng_saves_pre_and_post_window(self):
+        archive = NGFrameArchive(self.tmpdir, ring_size=10, pre_frames=2, post_frames=3, ok_sample_every=0)
+        statuses = ['OK'] * 5 + ['NG'] + ['OK'] * 6
+        for i, status in enumerate(statuses):
+            archive.push(_frame(i), 'BGR', status)
+        archive.flush()
+        archive.close()
+
+        tags = self._tags()
+        self.assertEqual([seq for seq, _ in tags], ['0000004', '0000005', '0000006', '0000007', '0000008', '0000009'])
+        self.assertEqual([t.split('.')[0] for _, t in tags], ['pre', 'pre', 'NG', 'post', 'post', 'post'])
+        self.assertEqual(archive.get_stats()['ng_events'], 1)
+
+    def test_overlapping_windows_write_each_frame_once(self):
+        archive = NGFrameArchive(self.tmpdir, ring_size=10, pre_frames=3, post_frames=2, ok_sample_every=0)
+        for status in ['OK', 'NG', 'OK', 'NG', 'OK', 'OK', 'OK']:
+            archive.push(_frame(0), 'BGR', status)
+        archive.flush()
+
+        self.assertEqual(len(os.listdir(self.tmpdir)), 6)
+        self.assertEqual(archive.get_stats()['files_written'], 6)
+        archive.close()
+
+    def test_ok_frames_sampled(self):
+        archive = NGFrameArchive(self.tmpdir, ring_size=100, ok_sample_every=10)
+        for _ in range(100):
+            archive.push(_frame(0), 'BGR', 'OK')
+        archive.flush()
+        archive.close()
+        self.assertEqual(len(os.listdir(self.tmpdir)), 10)
+
+    def test_saved_file_is_bgr_and_downscaled(self):
+        archive = NGFrameArchive(self.tmpdir, image_format='PNG', scale=0.5)
+        rgb = np.zeros((20, 40, 3), dtype=np.uint8)
+        rgb[..., 0] = 255  # Red in RGB
+        archive.push(rgb, 'RGB', 'NG')
+        archive.flush()
+        archive.close()
+
+        saved = cv2.imread(os.path.join(self.tmpdir, os.listdir(self.tmpdir)[0]))
+        self.assertEqual(saved.shape, (10, 20, 3))
+        self.assertEqual(tuple(saved[0, 0]), (0, 0, 255))
+
+    def _stall_worker(self, archive):
+        # Worker "running" but never draining: the queue fills up
+        archive._thread = threading.current_thread()
+
+    def _start_worker(self, archive):
+        archive._thread = threading.Thread(target=archive._worker_loop, daemon=True)
+        archive._thread.start()
+
+    def test_ng_frame_not_dropped_when_queue_full_of_ok_frames(self):
+        archive = NGFrameArchive(self.tmpdir, ring_size=2, pre_frames=0, post_frames=0, ok_sample_every=0)
+        self._stall_worker(archive)
+        for i in range(4):
+            self.assertTrue(archive.push(_frame(i), 'BGR', 'OK'))
+        self.assertFalse(archive.push(_frame(4), 'BGR', 'OK'))
+        self.assertTrue(archive.push(_frame(5), 'BGR', 'NG'))
+
+        self._start_worker(archive)
+        archive.flush()
+        archive.close()
+        self.assertEqual([t.split('.')[0] for _, t in self._tags()], ['NG'])
+        self.assertEqual(archive.get_stats()['dropped'], 2)
+        self.assertEqual(archive.get_stats()['ng_dropped'], 0)
+
+    def test_ng_frame_waits_when_only_ng_frames_queued(self):
+        archive = NGFrameArchive(self.tmpdir, ring_size=1, ok_sample_every=0, ng_wait_s=0.05)
+        self._stall_worker(archive)
+        self.assertTrue(archive.push(_frame(0), 'BGR', 'NG'))
+        self.assertTrue(archive.push(_frame(1), 'BGR', 'NG'))
+        self.assertFalse(archive.push(_frame(2), 'BGR', 'NG'))
+        self.assertEqual(archive.get_stats()['ng_dropped'], 1)
+
+    def test_only_written_frames_are_encoded(self):
+        archive = NGFrameArchive(self.tmpdir, ring_size=10, pre_frames=1, post_frames=1, ok_sample_every=0)
+        encoded = []
+        encode = archive._encode
+        archive._encode = lambda image, layout: encoded.append(1) or encode(image, layout)
+        for status in ['OK'] * 5 + ['NG'] + ['OK'] * 5:
+            archive.push(_frame(0), 'BGR', status)
+        archive.flush()
+        archive.close()
+        self.assertEqual(len(encoded), 3)
+
+    def test_flush_times_out_when_queue_stays_full(self):
+        archive = NGFrameArchive(self.tmpdir, ring_size=1)
+        self._stall_worker(archive)
+        archive.push(_frame(0), 'BGR', 'OK')
+        archive.push(_frame(1), 'BGR', 'OK')
+        self.assertFalse(archive.flush(timeout=0.05))
+
+
+class TestSaveImageToolArchive(unittest.TestCase):
+    """SaveImageTool routing"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.tool = SaveImageTool("Save Image", {'directory': self.tmpdir, 'archive_ok_sample_every': 0,
+                                                 'archive_post_frames': 0, 'archive_pre_frames': 1})
+
+    def tearDown(self):
+        self.tool.cleanup()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_only_ng_frames_written_without_force_save(self):
+        for status in ['OK', 'OK', 'NG', 'OK']:
+            _, result = self.tool.process(_frame(10), {'ng_ok_result': status, 'frame_layout': 'BGR'})
+            self.assertFalse(result['saved'])
+            self.assertTrue(result['archived'])
+        self.tool._archive.flush()
+        self.assertEqual(len(os.listdir(self.tmpdir)), 2)
+
+    def test_force_save_still_saves_every_frame(self):
+        for _ in range(3):
+            _, result = self.tool.process(_frame(10), {'force_save': True})
+            self.assertTrue(result['saved'])
+        self.assertIsNone(self.tool._archive)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit Tests for shared NMS module
+
+Tests class-aware suppression, top-k prefilter and matrix/OpenCV agreement
+"""
+
+import unittest
+import numpy as np
+
+from tools.detection.nms import batched_nms, box_iou, nms_detections
+
+
+def _reference_nms(boxes, scores, iou_thres):
+    """Plain greedy NMS used as ground truth"""
+    order = list(np.argsort(-scores, kind='stable'))
+    keep = []
+    while order:
+        i = order.pop(0)
+        keep.append(i)
+        order = [j for j in order if box_iou(boxes[i:i + 1], boxes[j:j + 1])[0, 0] <= iou_thres]
+    return np.array(keep, dtype=np.int64)
+
+
+def _random_boxes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, 600, size=(n, 2)).astype(np.float32)
+    wh = rng.uniform(10, 80, size=(n, 2)).astype(np.float32)
+    scores = rng.uniform(0, 1, size=n).astype(np.float32)
+    return np.concatenate([xy, xy + wh], axis=1), scores
+
+
+class TestBatchedNMS(unittest.TestCase):
+    """Test batched_nms behaviour"""
+    
+    def test_empty(self):
+        """Test empty input returns no indices"""
+        keep = batched_nms(np.zeros((0, 4)), np.zeros(0))
+        self.assertEqual(keep.size, 0)
+    
+    def test_overlapping_same_class_suppressed(self):
+        """Test overlapping boxes of the same class are suppressed"""
+        boxes = np.array([[0, 0, 100, 100], [5, 5, 100, 100]], dtype=np.float32)
+        scores = np.array([0.9, 0.8], dtype=np.float32)
+        keep = batched_nms(boxes, scores, np.array([0, 0]), iou_threshold=0.5)
+        self.assertEqual(keep.tolist(), [0])
+    
+    def test_overlapping_different_class_kept(self):
+        """Test overlapping boxes of different classes do not suppress each other"""
+        boxes = np.array([[0, 0, 100, 100], [5, 5, 100, 100]], dtype=np.float32)
+        scores = np.array([0.8, 0.9], dtype=np.float32)
+        for method in ('matrix', 'opencv'):
+            keep = batched_nms(boxes, scores, np.array([0, 1]), iou_threshold=0.5, method=method)
+            self.assertEqual(keep.tolist(), [1, 0], method)
+    
+    def test_class_agnostic(self):
+        """Test class_agnostic suppresses across classes"""
+        boxes = np.array([[0, 0, 100, 100], [5, 5, 100, 100]], dtype=np.float32)
+        scores = np.array([0.9, 0.8], dtype=np.float32)
+        keep = batched_nms(boxes, scores, np.array([0, 1]), iou_threshold=0.5, class_agnostic=True)
+        self.assertEqual(keep.tolist(), [0])
+    
+    def test_matrix_matches_reference(self):
+        """Test blocked IoU matrix path matches plain greedy NMS"""
+        boxes, scores = _random_boxes(700, seed=1)
+        expected = _reference_nms(boxes, scores, 0.45)
+        keep = batched_nms(boxes, scores, iou_threshold=0.45, pre_nms_top_k=0, method='matrix')
+        self.assertEqual(keep.tolist(), expected.tolist())
+    
+    def test_opencv_matches_matrix(self):
+        """Test OpenCV path keeps the same boxes as the matrix path"""
+        boxes, scores = _random_boxes(300, seed=2)
+        class_ids = np.arange(300) % 3
+        keep_matrix = batched_nms(boxes, scores, class_ids, iou_threshold=0.45, method='matrix')
+        keep_cv = batched_nms(boxes, scores, class_ids, iou_threshold=0.45, method='opencv')
+        self.assertEqual(sorted(keep_matrix.tolist()), sorted(keep_cv.tolist()))
+    
+    def test_top_k_and_score_threshold(self):
+        """Test candidates are prefiltered by score and top-k"""
+        boxes, scores = _random_boxes(200, seed=3)
+        keep = batched_nms(boxes, scores, iou_threshold=1.0, score_threshold=0.5, pre_nms_top_k=10)
+        self.assertEqual(len(keep), min(10, int((scores >= 0.5).sum())))
+        self.assertTrue(np.all(scores[keep] >= 0.5))
+        self.assertTrue(np.all(np.diff(scores[keep]) <= 0))
+    
+    def test_max_detections(self):
+        """Test output is capped at max_detections"""
+        boxes, scores = _random_boxes(100, seed=4)
+        keep = batched_nms(boxes, scores, iou_threshold=1.0, max_detections=5)
+        self.assertEqual(len(keep), 5)
+    
+    def test_nms_detections_array(self):
+        """Test Nx6 helper returns filtered rows"""
+        dets = np.array([
+            [0, 0, 100, 100, 0.9, 0],
+            [5, 5, 100, 100, 0.8, 0],
+            [5, 5, 100, 100, 0.7, 1],
+        ], dtype=np.float32)
+        filtered, keep = nms_detections(dets, iou_threshold=0.5)
+        self.assertEqual(keep.tolist(), [0, 2])
+        self.assertEqual(filtered.shape, (2, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Unit Tests for the CPython Pico emulator
+
+Tests the arrival pattern generator, the firmware-compatible command
+replies and the event -> servo round-trip report against a client that
+answers every start_rising with a servo command
+"""
+
+import socket
+import threading
+import unittest
+
+from gui.tcp_optimized_trigger import parse_edge_message
+from pico.emulator import PartPattern, PicoEmulator
+
+
+class TestPartPattern(unittest.TestCase):
+    """Arrival generation"""
+
+    def test_rate_and_bursts(self):
+        pattern = PartPattern(rate_hz=10, count=6, burst_size=3, burst_every=3, burst_spacing_ms=20)
+        arrivals = pattern.arrivals()
+        self.assertEqual(len(arrivals), 6)
+        self.assertAlmostEqual(arrivals[1] - arrivals[0], 0.02)
+        self.assertAlmostEqual(arrivals[3], 0.3)
+
+    def test_jitter_is_repeatable_with_seed(self):
+        a = PartPattern(rate_hz=100, count=20, jitter_ms=3, seed=7).arrivals()
+        b = PartPattern(rate_hz=100, count=20, jitter_ms=3, seed=7).arrivals()
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, PartPattern(rate_hz=100, count=20).arrivals())
+
+
+class TestPicoEmulator(unittest.TestCase):
+    """Protocol and round-trip measurement"""
+
+    def setUp(self):
+        self.emulator = PicoEmulator(port=0)
+        port = self.emulator.start()
+        self.client = socket.create_connection(('127.0.0.1', port), timeout=2.0)
+        self.reader = self.client.makefile('r')
+        self.assertTrue(self.emulator.connected.wait(2.0))
+        self.assertEqual(self.reader.readline().strip(), "HELLO from Pico (server)")
+
+    def tearDown(self):
+        self.client.close()
+        self.emulator.stop()
+
+    def test_command_replies(self):
+        for command, reply in (("PING", "PONG"), ("GOTO 45", "OK GOTO 45"), ("HOME", "OK HOME"),
+                               ("TRIGGER", "OK TRIGGER"), ("BOGUS", "ERR unknown cmd")):
+            self.client.sendall((command + "\n").encode())
+            self.assertEqual(self.reader.readline().strip(), reply)
+        self.assertEqual(self.emulator.triggers, 1)
+
+    def test_round_trip_report(self):
+        edges = []
+
+        def answer():
+            for line in self.reader:
+                parsed = parse_edge_message(line.strip())
+                if parsed is None:
+                    continue
+                edges.append(parsed[:2])
+                if parsed[0] == 'start':
+                    self.client.sendall(b"GOTO 45\n")
+                if len(edges) == 8:
+                    return
+
+        thread = threading.Thread(target=answer, daemon=True)
+        thread.start()
+        report = self.emulator.run_pattern(PartPattern(rate_hz=50, count=4, transit_ms=30), settle_s=0.2)
+        thread.join(2.0)
+
+        self.assertEqual(sorted(edges), [('end', 1), ('end', 2), ('end', 3), ('end', 4),
+                                         ('start', 1), ('start', 2), ('start', 3), ('start', 4)])
+        self.assertEqual((report['parts'], report['commands'], report['missing_commands']), (4, 4, 0))
+        self.assertLess(report['rtt_ms_max'], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
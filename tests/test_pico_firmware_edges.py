@@ -0,0 +1,86 @@
+"""
+Unit Tests for the Pico firmware edge filter
+
+pico/main.py is MicroPython and cannot be imported here, so the edge
+functions (evt_accept, cam_gap_ok) are taken from its source and run against
+a fake utime with the 2**30 tick period. Tests that an edge after a long idle
+(longer than half the ticks_us period) is neither debounced nor blocked by
+the camera min-gap check
+"""
+
+import ast
+import os
+import unittest
+from array import array
+
+PICO_MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pico', 'main.py')
+TICKS_PERIOD = 1 << 30
+
+
+class FakeUtime:
+    """ticks_ms/ticks_us/ticks_diff with MicroPython wrap-around semantics"""
+
+    def __init__(self):
+        self.ms = 0
+
+    def ticks_ms(self):
+        return self.ms % TICKS_PERIOD
+
+    def ticks_us(self):
+        return (self.ms * 1000) % TICKS_PERIOD
+
+    @staticmethod
+    def ticks_diff(a, b):
+        return ((a - b + TICKS_PERIOD // 2) % TICKS_PERIOD) - TICKS_PERIOD // 2
+
+
+def _load_edge_functions(utime):
+    with open(PICO_MAIN, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    wanted = {'evt_accept', 'cam_gap_ok'}
+    module = ast.Module(body=[node for node in tree.body
+                              if isinstance(node, ast.FunctionDef) and node.name in wanted],
+                        type_ignores=[])
+    namespace = {
+        'utime': utime, 'DEBOUNCE_MS': 5, 'MIN_GAP_MS': 100,
+        '_last_accept_ms': array('i', [0, 0]), '_has_accepted': bytearray(2),
+        '_evt_lost': array('i', [0, 0]), 'sensor_seq': array('i', [0, 0]), 'last_cam_ms': 0,
+        'disable_irq': lambda: 0, 'enable_irq': lambda state: None,
+    }
+    exec(compile(module, PICO_MAIN, 'exec'), namespace)
+    return namespace
+
+
+class TestFirmwareEdgeFilter(unittest.TestCase):
+    """Debounce and camera gap across long idle periods"""
+
+    def setUp(self):
+        self.utime = FakeUtime()
+        self.fw = _load_edge_functions(self.utime)
+
+    def _start_edge(self):
+        """Main loop handling of one START edge -> (seq, camera fired)"""
+        t_ms = self.utime.ticks_ms()
+        seq = self.fw['evt_accept'](0, t_ms)
+        fired = seq is not None and self.fw['cam_gap_ok'](t_ms, seq)
+        if fired:
+            self.fw['last_cam_ms'] = t_ms
+        return seq, fired
+
+    def test_bounce_rejected(self):
+        self.assertEqual(self._start_edge(), (1, True))
+        self.utime.ms += 2
+        self.assertEqual(self._start_edge(), (None, False))
+
+    def test_edge_after_long_idle_accepted(self):
+        for idle_min in (10, 15, 30):
+            with self.subTest(idle_min=idle_min):
+                self._start_edge()
+                self.utime.ms += idle_min * 60 * 1000
+                seq, fired = self._start_edge()
+                self.assertIsNotNone(seq)
+                self.assertTrue(fired)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Unit Tests for pixel-format negotiation
+
+Tests layout detection, the per-frame conversion cache and the
+single BGR->RGB conversion shared by DetectTool/ClassificationTool
+"""
+
+import unittest
+import numpy as np
+
+from tools.base_tool import BaseTool
+from tools.pixel_format import (CONTEXT_FRAME_FORMATS, FrameFormats, LAYOUT_BGR, LAYOUT_BGRA,
+                                LAYOUT_GRAY, LAYOUT_RGB, convert_layout, frame_formats_for,
+                                get_frame_as, memory_layout)
+from job.job_manager import Job
+
+
+def _bgr_frame():
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    frame[..., 0] = 10   # B
+    frame[..., 1] = 20   # G
+    frame[..., 2] = 30   # R
+    return frame
+
+
+class TestMemoryLayout(unittest.TestCase):
+    """Picamera2 format names vs actual byte order"""
+
+    def test_three_channel_is_bgr_regardless_of_name(self):
+        frame = _bgr_frame()
+        self.assertEqual(memory_layout(frame, 'RGB888'), LAYOUT_BGR)
+        self.assertEqual(memory_layout(frame, 'BGR888'), LAYOUT_BGR)
+
+    def test_four_channel_is_bgra(self):
+        frame = np.zeros((4, 4, 4), dtype=np.uint8)
+        self.assertEqual(memory_layout(frame, 'XRGB8888'), LAYOUT_BGRA)
+
+    def test_explicit_layout_wins(self):
+        self.assertEqual(memory_layout(_bgr_frame(), 'RGB'), LAYOUT_RGB)
+        # Channel count mismatch falls back to the camera rule
+        self.assertEqual(memory_layout(_bgr_frame(), 'GRAY'), LAYOUT_BGR)
+
+    def test_gray(self):
+        self.assertEqual(memory_layout(np.zeros((4, 4), dtype=np.uint8)), LAYOUT_GRAY)
+
+
+class TestFrameFormats(unittest.TestCase):
+    """Conversion cache"""
+
+    def test_converts_once_per_layout(self):
+        frame = _bgr_frame()
+        formats = FrameFormats(frame, LAYOUT_BGR)
+        rgb1 = formats.get(LAYOUT_RGB)
+        rgb2 = formats.get(LAYOUT_RGB)
+        self.assertIs(rgb1, rgb2)
+        self.assertEqual(formats.conversions, 1)
+        self.assertEqual(tuple(rgb1[0, 0]), (30, 20, 10))
+
+    def test_same_layout_returns_source(self):
+        frame = _bgr_frame()
+        formats = FrameFormats(frame, LAYOUT_BGR)
+        self.assertIs(formats.get(LAYOUT_BGR), frame)
+        self.assertEqual(formats.conversions, 0)
+
+    def test_context_cache_is_reused(self):
+        frame = _bgr_frame()
+        formats = FrameFormats(frame, LAYOUT_BGR)
+        context = {CONTEXT_FRAME_FORMATS: formats}
+        self.assertIs(frame_formats_for(frame, context), formats)
+        get_frame_as(frame, context, LAYOUT_RGB)
+        get_frame_as(frame, context, LAYOUT_RGB)
+        self.assertEqual(formats.conversions, 1)
+
+    def test_other_image_gets_new_cache(self):
+        formats = FrameFormats(_bgr_frame(), LAYOUT_BGR)
+        other = _bgr_frame()
+        self.assertIsNot(frame_formats_for(other, {CONTEXT_FRAME_FORMATS: formats}), formats)
+
+    def test_converted_view_as_input(self):
+        formats = FrameFormats(_bgr_frame(), LAYOUT_BGR)
+        rgb = formats.get(LAYOUT_RGB)
+        # A tool that receives the RGB view must not swap it again
+        again = get_frame_as(rgb, {CONTEXT_FRAME_FORMATS: formats}, LAYOUT_RGB)
+        self.assertIs(again, rgb)
+
+    def test_bgra_to_rgb(self):
+        frame = np.zeros((2, 2, 4), dtype=np.uint8)
+        frame[..., :3] = (10, 20, 30)
+        rgb = convert_layout(frame, LAYOUT_BGRA, LAYOUT_RGB)
+        self.assertEqual(rgb.shape, (2, 2, 3))
+        self.assertEqual(tuple(rgb[0, 0]), (30, 20, 10))
+
+
+class _RgbTool(BaseTool):
+    required_layout = LAYOUT_RGB
+
+    def __init__(self, name, seen):
+        super().__init__(name)
+        self.seen = seen
+
+    def process(self, image, context=None):
+        self.seen.append(get_frame_as(image, context, LAYOUT_RGB))
+        return image, {}
+
+
+class TestJobNegotiation(unittest.TestCase):
+    """Job.run shares one conversion between tools on the same frame"""
+
+    def test_tools_share_conversion(self):
+        seen = []
+        first = _RgbTool("first", seen)
+        second = _RgbTool("second", seen)
+        job = Job("job", [first, second])
+        job.run(_bgr_frame(), {"pixel_format": "RGB888"})
+
+        self.assertEqual(len(seen), 2)
+        self.assertIs(seen[0], seen[1])
+        self.assertEqual(tuple(seen[0][0, 0]), (30, 20, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
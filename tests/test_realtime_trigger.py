@@ -0,0 +1,94 @@
+"""
+Unit Tests for the real-time TCP trigger dispatcher
+
+Tests that edges are parsed on the calling (socket) thread, that captures
+start without the Qt event loop running and that the GUI gets one decoded
+edge signal per message
+"""
+
+import threading
+import time
+import unittest
+
+from PyQt5.QtCore import QCoreApplication
+
+from gui.tcp_optimized_trigger import RealtimeTriggerDispatcher, parse_edge_message
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+class FakeStream:
+    def __init__(self):
+        self.captured = threading.Event()
+        self.calls = 0
+
+    def trigger_capture(self):
+        self.calls += 1
+        self.captured.set()
+
+
+class FakeCameraManager:
+    def __init__(self, mode='trigger'):
+        self.current_mode = mode
+        self.camera_stream = FakeStream()
+
+
+class TestRealtimeTriggerDispatcher(unittest.TestCase):
+    """Socket-thread dispatch"""
+
+    def setUp(self):
+        self.camera = FakeCameraManager()
+        self.dispatcher = RealtimeTriggerDispatcher(self.camera, capture_on_edge=True)
+        self.edges = []
+        self.dispatcher.edge_received.connect(lambda edge, sid, t: self.edges.append((edge, sid)))
+
+    def tearDown(self):
+        self.dispatcher.stop()
+
+    def test_capture_without_event_loop(self):
+        # Emulate the socket thread; the GUI loop never runs during the capture
+        worker = threading.Thread(target=self.dispatcher.process_trigger_message_fast, args=('start_rising||12',))
+        worker.start()
+        worker.join()
+        self.assertTrue(self.camera.camera_stream.captured.wait(1.0))
+
+        stats = self.dispatcher.get_statistics()
+        self.assertEqual((stats['successful_triggers'], stats['start_edges']), (1, 1))
+        self.assertLess(stats['max_latency_ms'], 100)
+
+    def test_edges_posted_to_gui(self):
+        self.assertTrue(self.dispatcher.process_trigger_message_fast('start_rising||3'))
+        self.assertTrue(self.dispatcher.process_trigger_message_fast('end_rising||3'))
+        self.assertFalse(self.dispatcher.process_trigger_message_fast('GPIO 1 ON'))
+        app.processEvents()
+        self.assertEqual(self.edges, [('start', 3), ('end', 3)])
+
+    def test_no_capture_outside_trigger_mode(self):
+        self.camera.current_mode = 'live'
+        self.dispatcher.process_trigger_message_fast('start_rising||1')
+        self.dispatcher.capture_on_edge = False
+        self.camera.current_mode = 'trigger'
+        self.dispatcher.process_trigger_message_fast('start_rising||2')
+        time.sleep(0.05)
+        self.assertEqual(self.camera.camera_stream.calls, 0)
+        self.assertEqual(self.dispatcher.get_statistics()['start_edges'], 2)
+
+    def test_sequence_gaps_counted_as_dropped(self):
+        for seq in (1, 2, 5):
+            self.dispatcher.process_trigger_message_fast(f'start_rising|{seq}|{seq * 1000}')
+        self.dispatcher.process_trigger_message_fast('end_rising|1|9000')
+        self.dispatcher.process_trigger_message_fast('end_rising|2|9500')
+        app.processEvents()
+
+        stats = self.dispatcher.get_statistics()
+        self.assertEqual((stats['dropped_start_edges'], stats['dropped_end_edges']), (2, 0))
+        self.assertEqual([sid for _, sid in self.edges], [1, 2, 5, 1, 2])
+
+    def test_parse_both_firmware_formats(self):
+        self.assertEqual(parse_edge_message('start_rising|7|123456'), ('start', 7, 123456, 1_000))
+        self.assertEqual(parse_edge_message('end_rising||4321'), ('end', 4321, 4321, 1_000_000))
+        self.assertIsNone(parse_edge_message('OK GOTO 45'))
+
+
+if __name__ == '__main__':
+    unittest.main()
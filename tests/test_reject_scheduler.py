@@ -0,0 +1,151 @@
+"""
+Unit Tests for the predictive reject scheduler
+
+Tests that servo commands go out as soon as a verdict exists and the part
+ahead has cleared the gate (or at the part's own OUT edge when the clearance
+is unknown), that the transit time is learned from the queue timestamps and
+that late or missing verdicts are flagged
+"""
+
+import unittest
+from datetime import datetime
+
+from gui.fifo_result_queue import FIFOResultQueue
+from gui.reject_scheduler import RejectScheduler
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestRejectScheduler(unittest.TestCase):
+    """Send timing, transit learning and flags (gate clearance known)"""
+
+    def setUp(self):
+        self.queue = FIFOResultQueue()
+        self.clock = FakeClock()
+        self.sent = []
+        self.flagged = []
+        self.timers = []
+        self.scheduler = self._scheduler(gate_delay_s=0.3, gate_clearance_s=0.4)
+
+    def _scheduler(self, **kwargs):
+        return RejectScheduler(self.queue, self._send, actuation_s=0.05, clock=self.clock,
+                               schedule=lambda delay, callback: self.timers.append((self.clock.now + delay, callback)),
+                               on_flagged=lambda fid, reason: self.flagged.append((fid, reason)), **kwargs)
+
+    def _send(self, command):
+        self.sent.append((command, self.clock.now))
+        return True
+
+    def _advance(self, t):
+        """Move the clock to t, firing scheduled callbacks that are due"""
+        self.clock.now = t
+        due = [callback for when, callback in self.timers if when <= t]
+        self.timers = [(when, callback) for when, callback in self.timers if when > t]
+        for callback in due:
+            callback()
+
+    def _enter(self, t):
+        self._advance(t)
+        frame_id = self.queue.add_sensor_in_event(1)
+        self.queue.get_item(frame_id).timestamp_in = datetime.fromtimestamp(t)
+        self.scheduler.part_entered(frame_id)
+        return frame_id
+
+    def _verdict(self, frame_id, status, t):
+        self._advance(t)
+        self.queue.set_frame_status(frame_id, status)
+        self.scheduler.verdict_ready(frame_id, status)
+
+    def _exit(self, frame_id, t):
+        self._advance(t)
+        self.queue.add_sensor_out_event(1)
+        self.queue.get_item(frame_id).timestamp_out = datetime.fromtimestamp(t)
+        self.scheduler.part_exited(frame_id)
+
+    def test_command_sent_on_verdict_not_on_exit(self):
+        frame_id = self._enter(1000.0)
+        self._verdict(frame_id, 'NG', 1000.2)
+        self.assertEqual(self.sent, [('GOTO 45', 1000.2)])
+        self._exit(frame_id, 1001.0)
+
+        stats = self.scheduler.get_stats()
+        self.assertEqual((stats['commands_sent'], stats['on_time'], stats['missed']), (1, 1, 0))
+        self.assertAlmostEqual(stats['transit_ms'], 1000.0, places=1)
+        # Deadline = OUT + gate delay - actuation = 1001.25
+        self.assertAlmostEqual(stats['margin_ms_min'], 1050.0, places=1)
+
+    def test_next_part_waits_for_gate_clearance(self):
+        first = self._enter(1000.0)
+        second = self._enter(1000.1)
+        self._verdict(second, 'OK', 1000.2)   # Verdict ahead of the part in front
+        self._verdict(first, 'NG', 1000.3)
+        self.assertEqual([c for c, _ in self.sent], ['GOTO 45'])
+
+        # First part is between the OUT sensor and the gate until 1001.4
+        self._exit(first, 1001.0)
+        self.assertEqual(len(self.sent), 1)
+        self._advance(1001.39)
+        self.assertEqual(len(self.sent), 1)
+        self._advance(1001.4)
+        self.assertEqual(self.sent[-1], ('GOTO 5', 1001.4))
+
+    def test_missed_and_late_parts_flagged(self):
+        missed = self._enter(1000.0)
+        self._exit(missed, 1001.0)
+        # Follows too closely: reaches OUT before the gate clears at 1001.4
+        late = self._enter(1000.1)
+        self._verdict(late, 'OK', 1000.5)
+        self._exit(late, 1001.05)
+        self.assertEqual(self.sent, [])
+        self._advance(1001.4)
+
+        self.assertEqual(self.sent, [('GOTO 5', 1001.4)])
+        self.assertEqual(self.flagged, [(missed, 'missed'), (late, 'late')])
+        stats = self.scheduler.get_stats()
+        self.assertEqual((stats['missed'], stats['late']), (1, 1))
+        self.assertAlmostEqual(stats['margin_ms_min'], -100.0, places=1)
+
+    def test_buffered_verdict_and_cleared_queue(self):
+        self.clock.now = 1000.0
+        frame_id = self.queue.add_sensor_in_event(1)
+        self.queue.set_frame_status(frame_id, 'OK')   # Result attached before tracking
+        self.scheduler.part_entered(frame_id)
+        self.assertEqual([c for c, _ in self.sent], ['GOTO 5'])
+
+        self.queue.clear_queue()
+        following = self._enter(1001.0)
+        self._verdict(following, 'NG', 1001.1)
+        self.assertEqual([c for c, _ in self.sent], ['GOTO 5', 'GOTO 45'])
+
+    def test_unknown_clearance_sends_at_own_out_edge(self):
+        """Default gate model: same timing as the old end_sensor logic"""
+        self.scheduler = self._scheduler()
+        first = self._enter(1000.0)
+        second = self._enter(1000.1)
+        self._verdict(first, 'NG', 1000.2)
+        self._verdict(second, 'OK', 1000.3)
+        self.assertEqual(self.sent, [])
+
+        self._exit(first, 1001.0)
+        self.assertEqual(self.sent, [('GOTO 45', 1001.0)])
+        self._exit(second, 1001.5)
+        self.assertEqual(self.sent[-1], ('GOTO 5', 1001.5))
+        stats = self.scheduler.get_stats()
+        self.assertEqual((stats['on_time'], stats['late'], stats['missed']), (2, 0, 0))
+
+        # A verdict that arrives after the OUT edge is too late to be sent
+        third = self._enter(1002.0)
+        self._exit(third, 1003.0)
+        self._verdict(third, 'NG', 1003.1)
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual(self.flagged, [(third, 'missed')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit Tests for the persistent inspection history store
+
+Tests batched background writes, updates of a frame recorded twice and
+indexed queries by time range, status and class
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+from gui.fifo_result_queue import FIFOResultQueue
+from gui.result_history_store import ResultHistoryStore, record_from_item
+
+
+def _record(frame_id, status, ts, classes=()):
+    return {
+        'frame_id': frame_id,
+        'sensor_id_in': frame_id,
+        'ts_result': ts,
+        'status': status,
+        'inference_ms': 12.5,
+        'detection_count': len(classes),
+        'detections': [{'class_name': c, 'confidence': 0.9} for c in classes],
+    }
+
+
+class TestResultHistoryStore(unittest.TestCase):
+    """Writer and queries"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'sub', 'history.db')
+        self.store = ResultHistoryStore(self.path, batch_size=64, flush_interval=0.05, run_id='run-1')
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_records_batched_in_wal_mode(self):
+        for i in range(200):
+            self.store.record(_record(i, 'OK' if i % 4 else 'NG', 1000.0 + i))
+        self.assertTrue(self.store.flush())
+
+        stats = self.store.get_stats()
+        self.assertEqual(stats['records_written'], 200)
+        self.assertLess(stats['batches_written'], 200)
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        conn.close()
+
+    def test_rewritten_frame_updates_row(self):
+        self.store.record(_record(1, 'OK', 1000.0, ['screw']))
+        self.store.flush()
+        rec = _record(1, 'NG', 1000.0, ['crack'])
+        rec['sensor_id_out'] = 7
+        self.store.record(rec)
+        self.store.flush()
+
+        rows = self.store.query()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]['status'], rows[0]['sensor_id_out']), ('NG', 7))
+        self.assertEqual(self.store.class_counts(), {'crack': 1})
+
+    def test_queries_by_time_status_and_class(self):
+        for i in range(10):
+            classes = ['crack'] if i % 5 == 0 else ['screw']
+            self.store.record(_record(i, 'NG' if i % 5 == 0 else 'OK', 1000.0 + i, classes))
+        self.store.flush()
+
+        self.assertEqual([r['frame_id'] for r in self.store.query(status='NG')], [5, 0])
+        self.assertEqual([r['frame_id'] for r in self.store.query(start=1002, end=1005)], [4, 3, 2])
+        self.assertEqual([r['frame_id'] for r in self.store.query(class_name='crack', start=1001)], [5])
+        self.assertEqual(self.store.query(class_name='crack')[0]['detections'][0]['class_name'], 'crack')
+
+        report = self.store.yield_report()
+        self.assertEqual((report['total'], report['ok'], report['ng']), (10, 8, 2))
+        self.assertAlmostEqual(report['yield'], 0.8)
+
+    def test_record_from_queue_item(self):
+        queue = FIFOResultQueue()
+        frame_id = queue.add_sensor_in_event(3)
+        queue.set_frame_status(frame_id, 'OK')
+        queue.set_frame_detection_data(frame_id, {'detections': [{'class_name': 'screw'}],
+                                                  'detection_count': 1, 'inference_time': 0.02})
+        rec = record_from_item(queue.get_item(frame_id), ts_result=5.0)
+
+        self.assertEqual((rec['frame_id'], rec['sensor_id_in'], rec['status']), (frame_id, 3, 'OK'))
+        self.assertAlmostEqual(rec['inference_ms'], 20.0)
+        self.assertEqual(rec['timings'], {'inference_time': 0.02})
+        self.assertIsInstance(rec['ts_in'], float)
+
+    def test_no_file_until_first_record(self):
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.store.query(), [])
+        self.assertEqual(self.store.yield_report(start=datetime(2020, 1, 1))['total'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
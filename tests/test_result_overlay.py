@@ -0,0 +1,144 @@
+"""
+Unit Tests for the result overlay
+
+Tests that detections, classification labels and the OK/NG verdict are shown
+as pooled scene items (reused, never re-created per frame), that the camera
+view keeps its frame item between frames, and that the classification tool
+returns the input frame untouched with overlay hints instead of drawing
+"""
+
+import unittest
+
+import numpy as np
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication, QGraphicsScene, QGraphicsView
+
+from gui.result_overlay import ResultOverlay
+from tools.classification.classification_tool import ClassificationTool
+from tools.classification.model_adapter import ClassifierAdapter, TRANSFORM_SOFTMAX
+
+app = QApplication.instance() or QApplication([])
+
+
+def _detection(x1, y1, x2, y2, name='part', confidence=0.9):
+    return {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2, 'class_name': name, 'confidence': confidence}
+
+
+def _job_results(detections, verdict=None):
+    return {
+        'results': {
+            'Detect Tool': {'data': {'detections': detections,
+                                     'overlay': {'boxes': True, 'class_names': True, 'confidence': False}}},
+            'Classification Tool': {'data': {
+                'results': [{'bbox': None, 'predictions': [{'class_name': 'ok', 'confidence': 0.97}]}],
+                'overlay': {'labels': True, 'verdict': verdict, 'corner': 'top-left'},
+            }},
+        }
+    }
+
+
+class TestResultOverlay(unittest.TestCase):
+    """Pooled overlay items"""
+
+    def setUp(self):
+        self.scene = QGraphicsScene()
+        self.overlay = ResultOverlay(self.scene)
+
+    def _visible_boxes(self):
+        return [item for item in self.overlay._boxes if item.isVisible()]
+
+    def test_items_reused_between_frames(self):
+        self.overlay.update_detections([_detection(0, 0, 10, 10), _detection(20, 20, 40, 40)])
+        first = list(self.overlay._boxes)
+        scene_items = len(self.scene.items())
+
+        self.overlay.update_detections([_detection(5, 5, 15, 25)])
+        self.assertEqual(self.overlay._boxes, first)
+        self.assertEqual(len(self.scene.items()), scene_items)
+        visible = self._visible_boxes()
+        self.assertEqual(len(visible), 1)
+        self.assertEqual(visible[0].rect().getRect(), (5.0, 5.0, 10.0, 20.0))
+
+    def test_job_results_drive_boxes_labels_and_verdict(self):
+        self.overlay.update_from_job_results(_job_results([_detection(0, 0, 10, 10, 'cap')], 'NG'), (640, 480))
+        box = self._visible_boxes()[0]
+        self.assertEqual(box.label._text.text(), 'cap')  # confidence disabled by hint
+        self.assertTrue(self.overlay._class_labels[0].isVisible())
+        self.assertTrue(self.overlay._verdict.isVisible())
+        self.assertEqual(self.overlay._verdict._text.text(), 'NG')
+
+        self.overlay.update_from_job_results(_job_results([]), (640, 480))
+        self.assertEqual(self._visible_boxes(), [])
+        self.assertFalse(self.overlay._verdict.isVisible())
+
+    def test_hide_and_show(self):
+        self.overlay.update_detections([_detection(0, 0, 10, 10)])
+        self.overlay.set_visible(False)
+        self.assertFalse(self.overlay._boxes[0].isVisible())
+        self.overlay.set_visible(True)
+        self.assertTrue(self.overlay._boxes[0].isVisible())
+
+
+class TestCameraViewFrameItem(unittest.TestCase):
+    """The scene is not cleared per frame"""
+
+    def test_frame_item_and_overlay_survive_new_frames(self):
+        from gui.camera_view import CameraView
+        camera_view = CameraView(QGraphicsView())
+        try:
+            camera_view.result_overlay.update_detections([_detection(0, 0, 10, 10)])
+            image = QImage(64, 48, QImage.Format_RGB888)
+            image.fill(0)
+            camera_view._display_qimage(image)
+            item = camera_view.pixmap_item
+            camera_view._display_qimage(image)
+            self.assertIs(camera_view.pixmap_item, item)
+            self.assertIs(camera_view.result_overlay._boxes[0].scene(), camera_view.scene)
+            self.assertTrue(camera_view.result_overlay._boxes[0].isVisible())
+        finally:
+            camera_view._stop_camera_display_worker()
+            camera_view._stop_frame_history_worker()
+
+
+class _Node:
+    def __init__(self, name):
+        self.name = name
+
+
+class _FakeSession:
+    def get_inputs(self):
+        return [_Node('images')]
+
+    def get_outputs(self):
+        return [_Node('output0')]
+
+    def run(self, names, feed):
+        return [np.array([[0.0, 8.0]], dtype=np.float32)]
+
+
+class TestClassificationToolOverlayHints(unittest.TestCase):
+    """Tool output is the untouched frame plus overlay hints"""
+
+    def test_returns_input_frame_with_verdict_hint(self):
+        tool = ClassificationTool("Cls", {
+            'input_width': 32, 'input_height': 32, 'result_cache_enabled': False,
+            'draw_result': True, 'result_display_enable': True, 'expected_class_name': 'ok',
+            'result_corner': 'bottom-left',
+        })
+        tool.onnx_session = _FakeSession()
+        tool._model_loaded = True
+        tool._labels = ['ok', 'ng']
+        tool._adapter = ClassifierAdapter(tool.onnx_session, tool._labels, (32, 32), transform=TRANSFORM_SOFTMAX)
+        tool._ensure_model = lambda: True
+
+        image = np.zeros((48, 64, 3), dtype=np.uint8)
+        output_image, result = tool.process(image)
+        self.assertIs(output_image, image)
+        self.assertFalse(image.any())
+        self.assertEqual(result['overlay']['verdict'], 'NG')
+        self.assertEqual(result['overlay']['corner'], 'bottom-left')
+        self.assertTrue(result['overlay']['labels'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit Tests for the Result tab table model
+
+Tests that syncing with the FIFO queue emits only the row changes that
+happened and that rapid refresh requests are coalesced
+"""
+
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from gui.fifo_result_queue import FIFOResultQueue
+from gui.result_table_model import ResultTableModel
+
+app = QApplication.instance() or QApplication([])
+
+
+class SignalRecorder:
+    """Collects model change signals"""
+
+    def __init__(self, model):
+        self.inserted, self.removed, self.changed = [], [], []
+        model.rowsInserted.connect(lambda parent, first, last: self.inserted.append((first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: self.removed.append((first, last)))
+        model.dataChanged.connect(lambda tl, br, roles=None: self.changed.append((tl.row(), br.row())))
+
+
+class TestResultTableModel(unittest.TestCase):
+    """Test incremental row updates"""
+
+    def setUp(self):
+        self.queue = FIFOResultQueue()
+        self.model = ResultTableModel(self.queue)
+        self.signals = SignalRecorder(self.model)
+
+    def test_new_rows_inserted_at_tail(self):
+        for i in range(3):
+            self.queue.add_sensor_in_event(i)
+        self.model.sync()
+        self.queue.add_sensor_in_event(3)
+        self.model.sync()
+
+        self.assertEqual(self.signals.inserted, [(0, 2), (3, 3)])
+        self.assertEqual(self.model.rowCount(), 4)
+        self.assertEqual(self.signals.changed, [])
+
+    def test_only_changed_row_emits_data_changed(self):
+        ids = [self.queue.add_sensor_in_event(i) for i in range(5)]
+        self.model.sync()
+        self.queue.set_frame_status(ids[2], 'NG')
+        self.model.sync()
+
+        self.assertEqual(self.signals.changed, [(2, 2)])
+        index = self.model.index(2, 1)
+        self.assertEqual(self.model.data(index), 'NG')
+        self.assertEqual(self.model.data(index, Qt.BackgroundRole).color(), Qt.red)
+
+    def test_deleted_and_evicted_rows_removed(self):
+        self.queue.max_queue_size = 4
+        ids = [self.queue.add_sensor_in_event(i) for i in range(4)]
+        self.model.sync()
+        self.queue.delete_item_by_frame_id(ids[2])
+        self.queue.add_sensor_in_event(4)
+        self.queue.add_sensor_in_event(5)   # Evicts ids[0]
+        self.model.sync()
+
+        self.assertEqual(self.signals.removed, [(2, 2), (0, 0)])
+        self.assertEqual([self.model.frame_id_at(r) for r in range(self.model.rowCount())],
+                         [ids[1], ids[3], 5, 6])
+
+    def test_requests_are_coalesced(self):
+        for i in range(50):
+            self.queue.add_sensor_in_event(i)
+            self.model.request_sync()
+        self.assertEqual(self.model.sync_count, 0)
+
+        self.model._sync_timer.timeout.emit()
+        self.assertEqual(self.model.sync_count, 1)
+        self.assertEqual(self.signals.inserted, [(0, 49)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Unit Tests for the precomputed review-view thumbnails
+
+Tests that thumbnails are rendered once at the review view size, that the
+verdict is baked in and cached per status, and that a new frame only uploads
+one pixmap while the older ones shift between the review views
+"""
+
+import unittest
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QGraphicsView
+
+from gui.review_thumbnails import ReviewThumbnailRing, bake_verdict, make_thumbnail
+
+app = QApplication.instance() or QApplication([])
+
+
+class _StubResultManager:
+    def __init__(self):
+        self.history = []
+
+    def get_frame_status_history(self):
+        return list(self.history)
+
+
+class _StubMainWindow:
+    def __init__(self):
+        self.result_manager = _StubResultManager()
+
+
+class TestReviewThumbnails(unittest.TestCase):
+    """Thumbnail rendering and ring"""
+
+    def test_thumbnail_is_view_sized_and_letterboxed(self):
+        frame = np.full((1080, 1440, 3), 200, dtype=np.uint8)
+        image = make_thumbnail(frame, 320, 180)
+        self.assertEqual((image.width(), image.height()), (320, 180))
+        self.assertEqual(image.pixelColor(160, 90).getRgb()[:3], (200, 200, 200))
+        self.assertEqual(image.pixelColor(5, 90).getRgb()[:3], (0x2b, 0x2b, 0x2b))
+
+    def test_verdict_baked_and_cached(self):
+        ring = ReviewThumbnailRing(slots=2, size=(64, 48))
+        thumbnail = ring.add_frame(np.zeros((96, 128, 3), dtype=np.uint8))
+        ng = thumbnail.pixmap('NG')
+        self.assertIs(thumbnail.pixmap('NG'), ng)
+        self.assertIsNot(thumbnail.pixmap('OK'), ng)
+        baked = bake_verdict(thumbnail.image, 'NG')
+        self.assertEqual(baked.pixelColor(2, 30).getRgb()[:3], (0xAA, 0, 0))
+
+    def test_ring_keeps_last_slots(self):
+        ring = ReviewThumbnailRing(slots=3, size=(32, 24))
+        for _ in range(5):
+            ring.add_frame(np.zeros((24, 32, 3), dtype=np.uint8))
+        self.assertEqual([t.seq for t in ring.snapshot()], [3, 4, 5])
+
+
+class TestCameraViewReviewViews(unittest.TestCase):
+    """Review view updates through CameraView"""
+
+    def setUp(self):
+        from gui.camera_view import CameraView
+        self.camera_view = CameraView(QGraphicsView(), main_window=_StubMainWindow())
+        self.views = [QGraphicsView() for _ in range(5)]
+        for view in self.views:
+            view.resize(160, 120)
+        self.camera_view.set_review_views(self.views)
+
+    def tearDown(self):
+        self.camera_view._stop_camera_display_worker()
+        self.camera_view._stop_frame_history_worker()
+
+    def test_new_frame_shifts_existing_pixmaps(self):
+        ring = self.camera_view.frame_history
+        for _ in range(2):
+            ring.add_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+        self.camera_view._update_review_views_threaded()
+        newest_key = self.camera_view._review_items[0].pixmap().cacheKey()
+
+        ring.add_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+        self.camera_view._update_review_views_threaded()
+        items = self.camera_view._review_items
+        self.assertEqual(items[1].pixmap().cacheKey(), newest_key)
+        self.assertNotEqual(items[0].pixmap().cacheKey(), newest_key)
+        self.assertTrue(items[3].pixmap().isNull())
+
+    def test_clear_with_empty_history(self):
+        self.camera_view.frame_history.add_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+        self.camera_view._update_review_views_threaded()
+        self.assertFalse(self.camera_view._review_items[0].pixmap().isNull())
+        self.camera_view.frame_history.clear()
+        self.camera_view._update_review_views_with_frames([])
+        self.assertTrue(self.camera_view._review_items[0].pixmap().isNull())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Unit Tests for fast startup
+
+Tests that tool modules registered lazily are only imported on first lookup,
+that gui/ui_mainwindow.py is in sync with mainUI.ui, that importing the
+detection model manager does not load the inference modules, and that the
+startup profiler attributes import time to packages
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from gui.ui_loader import compile_main_ui, compiled_ui_hash, compiled_ui_is_current, ui_source_hash
+from job.job_manager import JobManager, ToolRegistry
+from utils.startup_profile import StartupProfiler
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestToolRegistry(unittest.TestCase):
+    """Lazy tool registration"""
+
+    def test_lookup_imports_on_first_use(self):
+        registry = ToolRegistry()
+        registry.register_lazy('JSONDecoder', 'json.decoder:JSONDecoder')
+        self.assertIn('JSONDecoder', registry)
+        self.assertFalse(registry.is_loaded('JSONDecoder'))
+
+        import json.decoder
+        self.assertIs(registry['JSONDecoder'], json.decoder.JSONDecoder)
+        self.assertTrue(registry.is_loaded('JSONDecoder'))
+
+    def test_failed_import_unregisters(self):
+        registry = ToolRegistry()
+        registry.register_lazy('Missing', 'no_such_module_for_sed:Missing')
+        self.assertIsNone(registry.get('Missing'))
+        self.assertNotIn('Missing', registry)
+        self.assertEqual(len(registry), 0)
+
+    def test_module_error_becomes_key_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'sed_broken_tool.py'), 'w') as f:
+                f.write("raise RuntimeError('driver not found')\n")
+            sys.path.insert(0, tmp)
+            try:
+                registry = ToolRegistry()
+                registry.register_lazy('Broken', 'sed_broken_tool:Broken')
+                with self.assertRaises(KeyError):
+                    registry['Broken']
+                self.assertNotIn('Broken', registry)
+            finally:
+                sys.path.remove(tmp)
+                sys.modules.pop('sed_broken_tool', None)
+
+    def test_job_manager_lists_default_tools_without_importing(self):
+        manager = JobManager()
+        self.assertIn('OcrTool', manager.get_available_tool_types())
+        self.assertFalse(manager.tool_registry.is_loaded('OcrTool'))
+        self.assertTrue(manager.tool_registry.is_loaded('GenericTool'))
+
+
+class TestPrecompiledUi(unittest.TestCase):
+    """gui/ui_mainwindow.py matches mainUI.ui"""
+
+    def test_compiled_module_is_current(self):
+        # If this fails after editing mainUI.ui: python main.py --compile-ui
+        self.assertTrue(compiled_ui_is_current())
+
+    def test_stale_module_detected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ui_path = os.path.join(tmp, 'mainUI.ui')
+            compiled_path = os.path.join(tmp, 'ui_mainwindow.py')
+            with open(os.path.join(PROJECT_ROOT, 'mainUI.ui'), 'rb') as src, open(ui_path, 'wb') as dst:
+                dst.write(src.read())
+            self.assertTrue(compile_main_ui(ui_path, compiled_path))
+            self.assertEqual(compiled_ui_hash(compiled_path), ui_source_hash(ui_path))
+            self.assertTrue(compiled_ui_is_current(ui_path, compiled_path))
+
+            with open(ui_path, 'a') as f:
+                f.write('\n')
+            self.assertFalse(compiled_ui_is_current(ui_path, compiled_path))
+
+
+class TestLazyImports(unittest.TestCase):
+    """Startup imports stay light"""
+
+    def test_model_manager_does_not_load_inference(self):
+        code = ("import sys, tools.detection.model_manager; "
+                "print(any(m in sys.modules for m in "
+                "('onnxruntime', 'tools.detection.detect_tool', 'tools.detection.ocr_tool')))")
+        output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(output.stdout.strip().splitlines()[-1], 'False', output.stderr)
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Import-time breakdown"""
+
+    def test_imports_attributed_to_package(self):
+        profiler = StartupProfiler()
+        profiler.start()
+        try:
+            sys.modules.pop('xml.dom.minidom', None)
+            import xml.dom.minidom  # noqa: F401
+            profiler.mark('imported')
+        finally:
+            profiler.stop_import_tracking()
+        self.assertGreater(profiler.import_count['xml'], 0)
+        self.assertEqual(profiler.milestones[0][0], 'imported')
+
+    def test_disabled_profiler_is_inert(self):
+        profiler = StartupProfiler()
+        profiler.mark('ignored')
+        self.assertEqual(profiler.milestones, [])
+        self.assertIsNone(profiler.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit Tests for TCP message framing and the selector-based TCPController
+
+Tests line and length-prefixed framing across arbitrary recv boundaries and
+that messages reach handlers as soon as their terminator arrives
+"""
+
+import socket
+import threading
+import time
+import unittest
+
+from PyQt5.QtCore import QCoreApplication
+
+from controller.framing import LengthPrefixedFramer, LineFramer, make_framer, FRAMING_LENGTH_PREFIXED
+from controller.tcp_controller import TCPController
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def _wait(event, timeout):
+    """Wait for event while delivering queued signals from the monitor thread"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if event.is_set():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+class TestLineFramer(unittest.TestCase):
+    """Newline framing"""
+
+    def test_split_across_chunks(self):
+        framer = LineFramer()
+        stream = b"start_rising||1\nend_rising||1\r\nstart_"
+        messages = []
+        for i in range(len(stream)):
+            messages += framer.feed(stream[i:i + 1])
+        self.assertEqual(messages, ['start_rising||1', 'end_rising||1'])
+        self.assertEqual(framer.pending(), len(b"start_"))
+        self.assertEqual(framer.feed(memoryview(b"rising||2\n")), ['start_rising||2'])
+
+    def test_oversized_line_dropped(self):
+        framer = LineFramer(max_message_size=16)
+        self.assertEqual(framer.feed(b"x" * 40), [])
+        self.assertEqual((framer.pending(), framer.dropped), (0, 1))
+        self.assertEqual(framer.feed(b"ok\n"), ['ok'])
+
+
+class TestLengthPrefixedFramer(unittest.TestCase):
+    """4-byte length header framing"""
+
+    def test_roundtrip_byte_by_byte(self):
+        stream = b"".join(LengthPrefixedFramer.encode(m) for m in ['a\nb', '', 'start_rising||7'])
+        framer = make_framer(FRAMING_LENGTH_PREFIXED)
+        messages = []
+        for i in range(len(stream)):
+            messages += framer.feed(stream[i:i + 1])
+        self.assertEqual(messages, ['a\nb', '', 'start_rising||7'])
+        self.assertEqual(framer.pending(), 0)
+
+
+class TestTCPController(unittest.TestCase):
+    """Controller against a local socket server"""
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.controller = TCPController()
+        self.received = []
+        self.got_message = threading.Event()
+        self.controller.message_received.connect(self._on_message)
+
+    def tearDown(self):
+        self.controller.disconnect()
+        self.server.close()
+
+    def _on_message(self, message):
+        self.received.append(message)
+        self.got_message.set()
+
+    def _connect(self):
+        port = self.server.getsockname()[1]
+        self.assertTrue(self.controller.connect('127.0.0.1', str(port)))
+        peer, _ = self.server.accept()
+        self.addCleanup(peer.close)
+        return peer
+
+    def test_socket_options_and_immediate_delivery(self):
+        peer = self._connect()
+        sock = self.controller._socket
+        self.assertEqual(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY), 1)
+        self.assertEqual(sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE), 1)
+
+        triggers = []
+        self.controller.on_trigger_callback = triggers.append
+        peer.sendall(b"start_rising||3\n")
+        self.assertTrue(_wait(self.got_message, 1.0))
+        self.assertEqual(self.received, ['start_rising||3'])
+        self.assertEqual(triggers, ['start_rising||3'])
+
+    def test_partial_line_waits_for_newline(self):
+        peer = self._connect()
+        peer.sendall(b"end_ris")
+        self.assertFalse(_wait(self.got_message, 0.2))
+        peer.sendall(b"ing||4\n")
+        self.assertTrue(_wait(self.got_message, 1.0))
+        self.assertEqual(self.received, ['end_rising||4'])
+
+    def test_send_and_disconnect(self):
+        peer = self._connect()
+        self.assertTrue(self.controller.send_message('GPIO 1 ON'))
+        self.assertEqual(peer.recv(64), b'GPIO 1 ON\n')
+
+        start = time.monotonic()
+        self.controller.disconnect()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(self.controller.is_connected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -57,7 +57,7 @@ def test_widget_hierarchy():
             
             if controllerTab:
                 from PyQt5.QtWidgets import (QLineEdit, QPushButton, QLabel, 
-                                            QListWidget)
+                                            QListView)
                 
                 # Tìm tất cả TCP widgets
                 tcp_widgets = {
@@ -65,7 +65,7 @@ def test_widget_hierarchy():
                     'portLineEdit': (QLineEdit, 'portLineEdit'),
                     'connectButton': (QPushButton, 'connectButton'),
                     'statusLabel': (QLabel, 'statusLabel'),
-                    'messageListWidget': (QListWidget, 'messageListWidget'),
+                    'messageListWidget': (QListView, 'messageListWidget'),
                     'messageLineEdit': (QLineEdit, 'messageLineEdit'),
                     'sendButton': (QPushButton, 'sendButton'),
                 }
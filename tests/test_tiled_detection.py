@@ -0,0 +1,142 @@
+"""
+Unit Tests for tiled high-resolution detection
+
+Tests tile planning, saliency skipping and cross-tile merging in DetectTool
+"""
+
+import unittest
+import numpy as np
+
+from tools.detection.detect_tool import DetectTool
+from tools.detection.tiling import clip_area, compute_tiles, tile_saliency
+
+
+class _Input:
+    name = 'images'
+    
+    def __init__(self, batch='batch'):
+        self.shape = [batch, 3, 640, 640]
+
+
+class FakeSession:
+    """Returns one box per tile at a fixed model-space position (NMS'd Nx6 format)"""
+    
+    def __init__(self, box=(100, 100, 140, 140), batch='batch'):
+        self.box = box
+        self.batch = batch
+        self.batches = []
+    
+    def get_inputs(self):
+        return [_Input(self.batch)]
+    
+    def run(self, _names, feeds):
+        x = feeds['images']
+        if isinstance(self.batch, int) and x.shape[0] != self.batch:
+            raise ValueError(f"Got invalid dimensions for input: images index: 0 Got: {x.shape[0]} Expected: {self.batch}")
+        self.batches.append(x.shape[0])
+        out = np.zeros((x.shape[0], 1, 6), dtype=np.float32)
+        out[:, 0] = list(self.box) + [0.9, 0]
+        return [out]
+
+
+class TestTilePlanning(unittest.TestCase):
+    """Test compute_tiles / clip_area / tile_saliency"""
+    
+    def test_default_tiles_cover_frame(self):
+        """Test 1456x1088 frame is covered by 3x2 native-size tiles"""
+        tiles = compute_tiles((0, 0, 1456, 1088), tile_size=640, overlap=0.2)
+        self.assertEqual(len(tiles), 6)
+        self.assertTrue(all(x2 - x1 == 640 and y2 - y1 == 640 for x1, y1, x2, y2 in tiles))
+        self.assertEqual(max(t[2] for t in tiles), 1456)
+        self.assertEqual(max(t[3] for t in tiles), 1088)
+    
+    def test_grid_override(self):
+        """Test explicit (cols, rows) grid"""
+        tiles = compute_tiles((0, 0, 1000, 500), overlap=0.25, grid=(2, 1))
+        self.assertEqual(len(tiles), 2)
+        self.assertEqual(tiles[0][0], 0)
+        self.assertEqual(tiles[-1][2], 1000)
+        self.assertGreater(tiles[0][2], tiles[1][0])  # overlapping
+    
+    def test_small_area_single_tile(self):
+        """Test area smaller than a tile gives one tile"""
+        self.assertEqual(compute_tiles((10, 20, 300, 200)), [(10, 20, 300, 200)])
+    
+    def test_clip_area(self):
+        """Test area clipping and fallback to full frame"""
+        self.assertEqual(clip_area(None, 100, 50), (0, 0, 100, 50))
+        self.assertEqual(clip_area((90, -5, 10, 60), 100, 50), (10, 0, 90, 50))
+    
+    def test_saliency_flat_vs_textured(self):
+        """Test flat tile scores lower than textured tile"""
+        image = np.full((640, 1280, 3), 120, dtype=np.uint8)
+        image[200:400, 800:1000] = 250  # a part on the belt
+        scores = tile_saliency(image, [(0, 0, 640, 640), (640, 0, 1280, 640)])
+        self.assertLess(scores[0], 1.0)
+        self.assertGreater(scores[1], 10.0)
+
+
+class TestDetectToolTiled(unittest.TestCase):
+    """Test DetectTool tiled inference path"""
+    
+    def _make_tool(self, box=(100, 100, 140, 140), **config):
+        base = {'class_names': ['part'], 'tiled_inference': True, 'tile_saliency_threshold': 0.0}
+        base.update(config)
+        tool = DetectTool("Tiled", base)
+        tool.session = FakeSession(box)
+        tool.input_name = 'images'
+        tool.model_path = 'fake.onnx'
+        tool.is_initialized = True
+        tool.tiled_inference = True
+        tool.tile_grid = base.get('tile_grid')
+        tool.tile_overlap = base.get('tile_overlap', 0.2)
+        tool.tile_saliency_threshold = base['tile_saliency_threshold']
+        return tool
+    
+    def test_tiles_run_as_one_batch(self):
+        """Test all tiles go through a single session.run and map back to frame coordinates"""
+        tool = self._make_tool()
+        image = np.zeros((1088, 1456, 3), dtype=np.uint8)
+        _, result = tool.process(image)
+        
+        self.assertEqual(tool.session.batches, [6])
+        self.assertEqual(result['tiles']['processed'], 6)
+        self.assertEqual(result['detection_count'], 6)
+        xs = sorted({round(d['x1']) for d in result['detections']})
+        self.assertEqual(xs[0], 100)
+        self.assertGreater(xs[-1], 800)
+    
+    def test_fixed_batch_model_runs_padded_groups(self):
+        """Test a model exported with batch=2 gets full groups of 2 and padded outputs are dropped"""
+        tool = self._make_tool(tile_grid=(3, 1))
+        tool.session = FakeSession(batch=2)
+        image = np.zeros((640, 1456, 3), dtype=np.uint8)
+        _, result = tool.process(image)
+        
+        self.assertEqual(result['tiles']['processed'], 3)
+        self.assertEqual(tool.session.batches, [2, 2])
+        self.assertEqual(result['detection_count'], 3)
+    
+    def test_empty_tiles_skipped(self):
+        """Test saliency pre-check skips flat tiles"""
+        tool = self._make_tool(tile_saliency_threshold=4.0)
+        image = np.full((1088, 1456, 3), 100, dtype=np.uint8)
+        image[100:300, 100:300] = 250  # one part in the top-left tile only
+        _, result = tool.process(image)
+        
+        self.assertEqual(result['tiles']['total'], 6)
+        self.assertEqual(result['tiles']['processed'], 1)
+        self.assertEqual(tool.session.batches, [1])
+    
+    def test_cross_tile_duplicates_merged(self):
+        """Test the same object seen by two overlapping tiles is reported once"""
+        tool = self._make_tool(box=(100, 100, 400, 400), tile_grid=(2, 1), tile_overlap=0.9)
+        image = np.zeros((640, 700, 3), dtype=np.uint8)
+        _, result = tool.process(image)
+        
+        self.assertEqual(result['tiles']['processed'], 2)
+        self.assertEqual(result['detection_count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Unit Tests for the delay-trigger timer wheel
+
+Tests that many in-flight timers fire in deadline order close to their
+deadline, that long delays survive several wheel revolutions, and that the
+dispatcher schedules delayed captures from the Pico edge timestamp
+"""
+
+import threading
+import time
+import unittest
+
+from PyQt5.QtCore import QCoreApplication
+
+from controller.timer_wheel import TimerWheel
+from gui.tcp_optimized_trigger import PICO_TICKS_PERIOD, PicoEdgeClock, RealtimeTriggerDispatcher
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Scheduling accuracy and ordering"""
+
+    def setUp(self):
+        self.wheel = TimerWheel(tick_ns=1_000_000, slots=16)
+        self.fired = []
+        self.done = threading.Event()
+
+    def tearDown(self):
+        self.wheel.stop()
+
+    def _record(self, tag, error_ns):
+        self.fired.append((tag, time.monotonic_ns(), error_ns))
+        if len(self.fired) == self.expected:
+            self.done.set()
+
+    def test_many_in_flight_fire_in_order(self):
+        self.expected = 20
+        now = time.monotonic_ns()
+        deadlines = {i: now + (40 - i) * 1_500_000 for i in range(self.expected)}
+        for i, deadline in deadlines.items():
+            self.wheel.schedule_at(deadline, self._record, i)
+        self.assertTrue(self.done.wait(2.0))
+
+        self.assertEqual([tag for tag, _, _ in self.fired], sorted(deadlines, key=deadlines.get))
+        for tag, fired_at, error_ns in self.fired:
+            self.assertGreaterEqual(fired_at, deadlines[tag])
+            self.assertGreaterEqual(error_ns, 0)
+        self.assertEqual(self.wheel.get_stats()['fired'], 20)
+        self.assertEqual(self.wheel.pending(), 0)
+
+    def test_delay_longer_than_one_revolution(self):
+        self.expected = 1
+        start = time.monotonic_ns()
+        self.wheel.schedule_in(40_000_000, self._record, 'late')  # 40 ticks on a 16-slot wheel
+        self.assertTrue(self.done.wait(1.0))
+        self.assertGreaterEqual(self.fired[0][1] - start, 40_000_000)
+
+    def test_cancelled_timer_does_not_fire(self):
+        self.expected = 1
+        timer = self.wheel.schedule_in(5_000_000, self._record, 'cancelled')
+        self.wheel.schedule_in(10_000_000, self._record, 'kept')
+        TimerWheel.cancel(timer)
+        self.assertTrue(self.done.wait(1.0))
+        time.sleep(0.01)
+        self.assertEqual([tag for tag, _, _ in self.fired], ['kept'])
+
+
+class TestPicoEdgeClock(unittest.TestCase):
+    """Pico ticks_ms to host monotonic_ns mapping"""
+
+    def test_offset_tracks_fastest_message_and_wraps(self):
+        clock = PicoEdgeClock()
+        base = 10_000_000_000
+        # Edge at pico 100 ms arrives 3 ms late, edge at 200 ms only 1 ms late
+        self.assertEqual(clock.observe(100, base + 103_000_000), base + 103_000_000)
+        self.assertEqual(clock.observe(200, base + 201_000_000), base + 201_000_000)
+        self.assertEqual(clock.observe(300, base + 305_000_000), base + 301_000_000)
+
+        wrap = PicoEdgeClock()
+        wrap.observe(PICO_TICKS_PERIOD - 10, base)
+        self.assertEqual(wrap.observe(10, base + 20_000_000), base + 20_000_000)
+
+    def test_microsecond_ticks(self):
+        clock = PicoEdgeClock()
+        base = 10_000_000_000
+        clock.observe(5_000, base + 900_000, tick_ns=1_000)
+        # 1.5 ms later on the Pico, received with 0.2 ms more transport delay
+        self.assertEqual(clock.observe(6_500, base + 2_600_000, tick_ns=1_000), base + 2_400_000)
+
+    def test_idle_longer_than_half_period_restarts_mapping(self):
+        clock = PicoEdgeClock()
+        base = 10_000_000_000
+        clock.observe(1_000, base + 500_000, tick_ns=1_000)
+        # 20 min idle: ticks_us moved 1.2e9 us, i.e. wrapped and landed past half a period
+        idle_us = 20 * 60 * 1_000_000
+        ticks = (1_000 + idle_us) % PICO_TICKS_PERIOD
+        received = base + 500_000 + idle_us * 1_000 + 300_000
+        self.assertEqual(clock.observe(ticks, received, tick_ns=1_000), received)
+        # Next edge is mapped from the new offset, not ~17.9 min in the past
+        self.assertEqual(clock.observe(ticks + 2_000, received + 2_000_000, tick_ns=1_000), received + 2_000_000)
+
+
+class FakeStream:
+    def __init__(self):
+        self.times = []
+
+    def trigger_capture(self):
+        self.times.append(time.monotonic_ns())
+
+
+class FakeCameraManager:
+    current_mode = 'trigger'
+
+    def __init__(self):
+        self.camera_stream = FakeStream()
+
+
+class TestDelayedCapture(unittest.TestCase):
+    """Dispatcher delay trigger"""
+
+    def test_captures_scheduled_after_edge(self):
+        camera = FakeCameraManager()
+        dispatcher = RealtimeTriggerDispatcher(camera, capture_on_edge=True, delay_ms=20)
+        try:
+            sent = time.monotonic_ns()
+            for ticks in (1000, 1005, 1010):  # Three parts in flight at once
+                dispatcher.process_trigger_message_fast(f'start_rising||{ticks}')
+            self.assertEqual(camera.camera_stream.times, [])
+            deadline = time.monotonic() + 1.0
+            while len(camera.camera_stream.times) < 3 and time.monotonic() < deadline:
+                time.sleep(0.005)
+
+            self.assertEqual(len(camera.camera_stream.times), 3)
+            self.assertGreaterEqual(camera.camera_stream.times[0] - sent, 20_000_000)
+            stats = dispatcher.get_statistics()
+            self.assertEqual(stats['successful_triggers'], 3)
+            self.assertIn('schedule_error_mean_us', stats)
+        finally:
+            dispatcher.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
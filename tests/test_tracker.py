@@ -0,0 +1,194 @@
+"""
+Unit Tests for live-mode multi-object tracker
+
+Tests stable track ids, keyframe scheduling and once-per-track classification
+"""
+
+import unittest
+import numpy as np
+
+from tools.detection.tracker import MultiObjectTracker
+from tools.detection.detect_tool import DetectTool
+from tools.classification.classification_tool import ClassificationTool
+
+
+def _det(x, y=100, size=80, score=0.9, class_id=0):
+    return [x, y, x + size, y + size, score, class_id]
+
+
+class TestMultiObjectTracker(unittest.TestCase):
+    """Test MultiObjectTracker association and keyframe policy"""
+    
+    def test_stable_id_for_moving_part(self):
+        """Test a part moving along the belt keeps its track id"""
+        tracker = MultiObjectTracker(keyframe_interval=1)
+        ids = set()
+        for i in range(10):
+            out = tracker.update(np.array([_det(50 + 20 * i)]))
+            self.assertEqual(len(out), 1)
+            ids.add(int(out[0, 6]))
+        self.assertEqual(len(ids), 1)
+    
+    def test_ids_unique_across_tracker_instances(self):
+        """Test a rebuilt tracker (DetectTool re-init) never reuses track ids"""
+        first = MultiObjectTracker(keyframe_interval=1)
+        old_id = int(first.update(np.array([_det(50)]))[0, 6])
+        second = MultiObjectTracker(keyframe_interval=1)
+        new_id = int(second.update(np.array([_det(50)]))[0, 6])
+        self.assertNotEqual(new_id, old_id)
+        self.assertEqual(second.get_stats()['tracks_created'], 1)
+    
+    def test_propagation_follows_motion(self):
+        """Test propagated boxes continue the learned velocity"""
+        tracker = MultiObjectTracker(keyframe_interval=100)
+        for i in range(8):
+            tracker.update(np.array([_det(50 + 20 * i)]))
+        out = tracker.propagate()
+        self.assertEqual(len(out), 1)
+        self.assertAlmostEqual(float(out[0, 0]), 50 + 20 * 8, delta=6)
+    
+    def test_keyframe_interval(self):
+        """Test detection is requested every N frames"""
+        tracker = MultiObjectTracker(keyframe_interval=3, min_confidence=0.0)
+        tracker.update(np.array([_det(50)]))
+        schedule = []
+        for _ in range(6):
+            if tracker.needs_detection():
+                schedule.append('D')
+                tracker.update(np.array([_det(50)]))
+            else:
+                schedule.append('P')
+                tracker.propagate()
+        self.assertEqual(''.join(schedule), 'PPDPPD')
+    
+    def test_low_confidence_forces_keyframe(self):
+        """Test a decayed track triggers an early detection"""
+        tracker = MultiObjectTracker(keyframe_interval=100, min_confidence=0.5, confidence_decay=0.5)
+        tracker.update(np.array([_det(50, score=0.9)]))
+        self.assertFalse(tracker.needs_detection())
+        tracker.propagate()
+        self.assertTrue(tracker.needs_detection())
+    
+    def test_classes_not_mixed(self):
+        """Test overlapping parts of different classes get different ids"""
+        tracker = MultiObjectTracker(keyframe_interval=1)
+        out = tracker.update(np.array([_det(50, class_id=0), _det(55, class_id=1)]))
+        first = {int(r[5]): int(r[6]) for r in out}
+        self.assertEqual(len(set(first.values())), 2)
+        out = tracker.update(np.array([_det(60, class_id=1), _det(52, class_id=0)]))
+        ids = {int(r[5]): int(r[6]) for r in out}
+        self.assertEqual(ids, first)
+    
+    def test_low_score_detection_keeps_track(self):
+        """Test second-stage association with low-score detections (ByteTrack)"""
+        tracker = MultiObjectTracker(keyframe_interval=1, high_score=0.5)
+        track_id = int(tracker.update(np.array([_det(50, score=0.9)]))[0, 6])
+        out = tracker.update(np.array([_det(55, score=0.3)]))
+        self.assertEqual(out[:, 6].astype(int).tolist(), [track_id])
+        # A low-score detection alone never starts a track
+        out = tracker.update(np.array([_det(55, score=0.3), _det(400, score=0.3)]))
+        self.assertEqual(out[:, 6].astype(int).tolist(), [track_id])
+
+
+class _Input:
+    name = 'images'
+    shape = [1, 3, 640, 640]
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = 0
+    
+    def get_inputs(self):
+        return [_Input()]
+    
+    def run(self, _names, _feeds):
+        self.calls += 1
+        return [np.array([[[100, 100, 200, 200, 0.9, 0]]], dtype=np.float32)]
+
+
+class RawOutputSession(CountingSession):
+    """Raw (pre-NMS) output [cx, cy, w, h, obj, p0..p2] with one score per call"""
+    
+    def __init__(self, scores):
+        super().__init__()
+        self.scores = scores
+    
+    def run(self, _names, _feeds):
+        score = self.scores[min(self.calls, len(self.scores) - 1)]
+        self.calls += 1
+        return [np.array([[[150, 150, 100, 100, score, 1.0, 0.0, 0.0]]], dtype=np.float32)]
+
+
+class TestDetectToolTracking(unittest.TestCase):
+    """Test DetectTool keyframe scheduling in live mode"""
+    
+    def _make_tool(self):
+        tool = DetectTool("Tracked", {'class_names': ['part'], 'tracking_enabled': True, 'keyframe_interval': 4})
+        tool.session = CountingSession()
+        tool.input_name = 'images'
+        tool.model_path = 'fake.onnx'
+        tool.is_initialized = True
+        tool.tracker = MultiObjectTracker(keyframe_interval=4, min_confidence=0.0)
+        return tool
+    
+    def test_live_mode_runs_detector_on_keyframes(self):
+        """Test full detection runs every N frames with stable track ids"""
+        tool = self._make_tool()
+        image = np.zeros((640, 640, 3), dtype=np.uint8)
+        results = [tool.process(image, {'camera_mode': 'live'})[1] for _ in range(8)]
+        
+        self.assertEqual(tool.session.calls, 2)
+        self.assertEqual([r['keyframe'] for r in results], [True, False, False, False, True, False, False, False])
+        track_id = results[0]['detections'][0]['track_id']
+        self.assertTrue(all(r['detections'][0]['track_id'] == track_id for r in results))
+    
+    def test_trigger_mode_always_detects(self):
+        """Test tracking is bypassed outside live mode"""
+        tool = self._make_tool()
+        image = np.zeros((640, 640, 3), dtype=np.uint8)
+        for _ in range(3):
+            _, result = tool.process(image, {'camera_mode': 'trigger'})
+            self.assertNotIn('track_id', result['detections'][0])
+        self.assertEqual(tool.session.calls, 3)
+    
+    def test_low_score_keyframe_extends_track(self):
+        """Test low-score keyframe boxes reach the tracker but are not reported"""
+        tool = self._make_tool()
+        tool.session = RawOutputSession(scores=(0.9, 0.2, 0.9))
+        tool.tracker = MultiObjectTracker(keyframe_interval=1, high_score=0.5, max_age=0)
+        image = np.zeros((640, 640, 3), dtype=np.uint8)
+        results = [tool.process(image, {'camera_mode': 'live'})[1] for _ in range(3)]
+        
+        self.assertEqual(results[1]['detections'], [])
+        # max_age=0: the track survives frame 2 only through the low-score match
+        self.assertEqual(results[2]['detections'][0]['track_id'], results[0]['detections'][0]['track_id'])
+
+
+class TestClassificationPerTrack(unittest.TestCase):
+    """Test ClassificationTool classifies each tracked part once"""
+    
+    def test_predictions_reused_for_same_track(self):
+        tool = ClassificationTool("Cls", {'use_detection_roi': True, 'draw_result': False,
+                                          'result_display_enable': False})
+        tool._ensure_model = lambda: True
+        calls = []
+        
+        def fake_classify(crop):
+            calls.append(crop.shape)
+            return [{'class_name': 'ok_part', 'confidence': 0.99, 'class_id': 0}]
+        
+        tool._classify_image = fake_classify
+        image = np.zeros((300, 300, 3), dtype=np.uint8)
+        for x in (10, 20, 30):
+            context = {'pixel_format': 'RGB888',
+                       'detections': [{'x1': x, 'y1': 10, 'x2': x + 50, 'y2': 60, 'class_name': 'part', 'track_id': 7}]}
+            _, result = tool.process(image, context)
+        
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(result['results'][0]['reused'])
+        self.assertEqual(result['results'][0]['track_id'], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -53,6 +53,9 @@ class BaseTool:
     Lớp cơ sở cho tất cả các tool xử lý trong pipeline.
     Mỗi tool đều phải có input và output chuẩn.
     """
+    # Layout điểm ảnh tool cần (xem tools/pixel_format.py); None = dùng ảnh như nhận được
+    required_layout: Optional[str] = None
+
     def __init__(self, name: str = None, config: Optional[Union[Dict[str, Any], ToolConfig]] = None, tool_id: Optional[int] = None):
         """
         Khởi tạo công cụ với tên và cấu hình
@@ -225,9 +228,9 @@ class BaseTool:
             return GenericTool(name=data.get('display_name'), config=data.get('config', {}), tool_id=data.get('tool_id'))
             
         tool_type = data.get('tool_type')
-        if tool_type in tool_registry:
+        tool_class = tool_registry.get(tool_type)  # Lazy registry entries are imported here
+        if tool_class is not None:
             # Tạo công cụ cụ thể
-            tool_class = tool_registry[tool_type]
             tool = tool_class(
                 name=data.get('display_name'),
                 config=data.get('config', {}),
@@ -10,6 +10,8 @@ from typing import Dict, Any, Tuple, Optional, List, Union
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QThread, QMutex, QMutexLocker
 
 from tools.base_tool import BaseTool, ToolConfig
+from tools.pixel_format import (CONTEXT_FRAME_LAYOUT, LAYOUT_BGR, LAYOUT_BGRA, LAYOUT_RGB, LAYOUT_RGBA,
+                                convert_layout, memory_layout)
 
 logger = logging.getLogger(__name__)
 
@@ -734,21 +736,15 @@ class CameraTool(BaseTool):
                 except Exception as e:
                     logger.debug(f"CameraTool: Failed to get pixel format: {e}")
                 
-                # Convert 4-channel frames to 3-channel for downstream tools compatibility
-                # XRGB8888 (4-channel) -> RGB (3-channel)
-                # XBGR8888 (4-channel) -> BGR (3-channel)
-                if len(current_frame.shape) == 3 and current_frame.shape[2] == 4:
-                    logger.debug(f"CameraTool: Converting 4-channel {pixel_format} to 3-channel")
-                    if str(pixel_format) in ('RGB888', 'XRGB8888'):
-                        # XRGB format: OpenCV sees as BGRA, convert to RGB
-                        import cv2
-                        current_frame = cv2.cvtColor(current_frame, cv2.COLOR_BGRA2RGB)
-                        logger.debug(f"CameraTool: Converted XRGB8888 (BGRA) to RGB")
-                    elif str(pixel_format) in ('BGR888', 'XBGR8888'):
-                        # XBGR format: OpenCV sees as RGBA, convert to BGR
-                        import cv2
-                        current_frame = cv2.cvtColor(current_frame, cv2.COLOR_RGBA2BGR)
-                        logger.debug(f"CameraTool: Converted XBGR8888 (RGBA) to BGR")
+                # Layout thực tế trong bộ nhớ (picamera2: 3 kênh = BGR, 4 kênh = BGRA).
+                # Chỉ bỏ byte đệm của frame 4 kênh, giữ nguyên thứ tự kênh; tool nào
+                # cần RGB sẽ lấy qua FrameFormats (chuyển một lần cho mỗi frame)
+                frame_layout = memory_layout(current_frame, context.get(CONTEXT_FRAME_LAYOUT) if context else None)
+                if frame_layout in (LAYOUT_BGRA, LAYOUT_RGBA):
+                    logger.debug(f"CameraTool: Dropping padding byte of 4-channel {pixel_format} ({frame_layout})")
+                    packed_layout = LAYOUT_BGR if frame_layout == LAYOUT_BGRA else LAYOUT_RGB
+                    current_frame = convert_layout(current_frame, frame_layout, packed_layout)
+                    frame_layout = packed_layout
                 
                 # Return frame with format information in context
                 return current_frame, {
@@ -756,6 +752,7 @@ class CameraTool(BaseTool):
                     "status": "success", 
                     "source": "Camera Source",
                     "pixel_format": pixel_format,  # Pass format info to downstream tools
+                    CONTEXT_FRAME_LAYOUT: frame_layout,  # Actual byte order of the returned frame
                     "frame_shape": current_frame.shape,
                     "tool_id": self.tool_id
                 }
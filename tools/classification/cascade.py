@@ -0,0 +1,43 @@
+"""
+Two-stage classification cascade statistics
+A small low-resolution model decides the easy crops; only crops it is
+uncertain about escalate to the full model. CascadeStats keeps the
+escalation rate and per-stage latency for the result dict / UI
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+
+class CascadeStats:
+    """Escalation and latency counters for the classification cascade"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.crops = 0
+        self.escalated = 0
+        self.stage1_time = 0.0
+        self.stage2_time = 0.0
+
+    def record(self, stage1_time: float, stage2_time: Optional[float] = None) -> None:
+        """Record one crop; stage2_time is None when stage 1 decided it"""
+        with self._lock:
+            self.crops += 1
+            self.stage1_time += stage1_time
+            if stage2_time is not None:
+                self.escalated += 1
+                self.stage2_time += stage2_time
+
+    def get_stats(self) -> Dict[str, Any]:
+        crops = self.crops
+        return {
+            'crops': crops,
+            'escalated': self.escalated,
+            'escalation_rate': (self.escalated / crops) if crops else 0.0,
+            'stage1_avg_ms': (self.stage1_time / crops * 1000.0) if crops else 0.0,
+            'stage2_avg_ms': (self.stage2_time / self.escalated * 1000.0) if self.escalated else 0.0,
+            'avg_cost_ms': ((self.stage1_time + self.stage2_time) / crops * 1000.0) if crops else 0.0,
+        }
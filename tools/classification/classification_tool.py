@@ -16,7 +16,9 @@ from __future__ import annotations
 
 import os
 import json
+import time
 import logging
+from collections import OrderedDict
 from utils.debug_utils import conditional_print
 from typing import Dict, Any, Tuple, Optional, List, Union
 
@@ -24,6 +26,10 @@ import numpy as np
 import cv2
 
 from tools.base_tool import BaseTool, ToolConfig
+from tools.pixel_format import LAYOUT_RGB, get_frame_as
+from .cascade import CascadeStats
+from .model_adapter import ClassifierAdapter
+from .result_cache import ClassificationCache, crop_fingerprint, model_version
 from utils.debug_utils import debug_log
 
 # Direct ONNX imports
@@ -40,6 +46,8 @@ logger = logging.getLogger(__name__)
 
 
 class ClassificationTool(BaseTool):
+    required_layout = LAYOUT_RGB
+
     def __init__(
         self,
         name: str = "Classification Tool",
@@ -53,6 +61,21 @@ class ClassificationTool(BaseTool):
         self._model_loaded = False
         self._labels: List[str] = []
         self._model_path = ""
+        self._adapter: Optional[ClassifierAdapter] = None
+        
+        # Predictions per tracked object (track_id from DetectTool in live tracking mode)
+        self._track_predictions: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        
+        # Predictions per crop fingerprint (static scene / re-inspection)
+        self._result_cache = ClassificationCache(int(self.config.get("result_cache_size", 512)))
+        self._model_version: Tuple[str, int, int] = ("", 0, 0)
+        
+        # Optional low-resolution first stage (cascade)
+        self._cascade_session = None
+        self._cascade_adapter: Optional[ClassifierAdapter] = None
+        self._cascade_path = ""
+        self._cascade_version: Tuple[str, int, int] = ("", 0, 0)
+        self._cascade_stats = CascadeStats()
         
         # Model info
         project_root = Path(__file__).resolve().parents[2]
@@ -85,6 +108,22 @@ class ClassificationTool(BaseTool):
         self.config.set_default("use_detection_roi", False)
         self.config.set_default("classify_only_classes", [])
         self.config.set_default("roi_expand", 0.0)
+        # Classify each tracked object once instead of once per frame
+        self.config.set_default("classify_once_per_track", True)
+        self.config.set_default("track_cache_size", 256)
+        # LRU cache of results keyed by crop fingerprint
+        self.config.set_default("result_cache_enabled", True)
+        self.config.set_default("result_cache_size", 512)
+        self.config.set_default("result_cache_quant_bits", 0)  # >0 tolerates sensor noise
+
+        # Cascade: small model first, full model only for uncertain crops
+        self.config.set_default("cascade_enabled", False)
+        self.config.set_default("cascade_model_name", "")
+        self.config.set_default("cascade_model_path", "")
+        self.config.set_default("cascade_input_width", 112)
+        self.config.set_default("cascade_input_height", 112)
+        self.config.set_default("cascade_uncertainty_threshold", 0.3)  # Normalized entropy above which to escalate
+        self.config.set_default("cascade_min_confidence", 0.9)  # Top-1 below which to escalate
 
         # NEW: Confidence-based rejection
         self.config.set_default("confidence_threshold", 0.75)
@@ -102,6 +141,8 @@ class ClassificationTool(BaseTool):
         self.config.set_validator("roi_expand", lambda x: 0.0 <= float(x) <= 0.5)
         self.config.set_validator("confidence_threshold", lambda x: 0.0 <= float(x) <= 1.0)
         self.config.set_validator("uncertainty_threshold", lambda x: 0.0 <= float(x) <= 1.0)
+        self.config.set_validator("cascade_uncertainty_threshold", lambda x: 0.0 <= float(x) <= 1.0)
+        self.config.set_validator("cascade_min_confidence", lambda x: 0.0 <= float(x) <= 1.0)
 
     def _load_class_names(self, model_name: str) -> List[str]:
         """Load class names from JSON file - YOLO style"""
@@ -168,15 +209,22 @@ class ClassificationTool(BaseTool):
             self._model_path = model_path
             self._model_loaded = True
             
+            # Cached results belong to one model file version
+            version = model_version(model_path)
+            if version != self._model_version:
+                self._result_cache.invalidate()
+                self._model_version = version
+            
+            # Output semantics, io names and label array are fixed once here
+            self._adapter = ClassifierAdapter(self.onnx_session, self._labels, self._input_size(), model_path)
+            
             # Log model info
-            input_shape = self.onnx_session.get_inputs()[0].shape
-            output_shape = self.onnx_session.get_outputs()[0].shape
             logger.info(f"ONNX model loaded successfully:")
             logger.info(f"  Path: {model_path}")
-            logger.info(f"  Input shape: {input_shape}")
-            logger.info(f"  Output shape: {output_shape}")
+            logger.info(f"  Input: {self._adapter.input_name}, Output: {self._adapter.output_name} ({self._adapter.transform})")
             logger.info(f"  Classes: {self._labels}")
             
+            self._ensure_cascade_model()
             return True
             
         except Exception as e:
@@ -184,6 +232,41 @@ class ClassificationTool(BaseTool):
             self._model_loaded = False
             return False
 
+    def _ensure_cascade_model(self) -> bool:
+        """Load the first-stage model of the cascade (optional, failures fall back to single stage)"""
+        if not bool(self.config.get("cascade_enabled", False)):
+            self._cascade_session = None
+            return False
+
+        model_path = self.config.get("cascade_model_path", "")
+        model_name = self.config.get("cascade_model_name", "")
+        if (not model_path) and model_name:
+            model_path = str(self.models_dir / f"{model_name}.onnx")
+        if self._cascade_session is not None and model_path == self._cascade_path:
+            return True
+        if not model_path or not os.path.exists(model_path):
+            logger.warning(f"ClassificationTool: Cascade model not found ({model_path}), using single stage")
+            self._cascade_session = None
+            return False
+
+        try:
+            self._cascade_session = ort.InferenceSession(model_path)
+            self._cascade_adapter = ClassifierAdapter(self._cascade_session, self._labels,
+                                                      self._cascade_input_size(), model_path)
+            self._cascade_path = model_path
+            self._cascade_version = model_version(model_path)
+            self._cascade_stats.reset()
+            logger.info(f"ClassificationTool: Cascade stage 1 loaded: {model_path} "
+                        f"({self.config.get('cascade_input_width')}x{self.config.get('cascade_input_height')})")
+            return True
+        except Exception as e:
+            logger.error(f"ClassificationTool: Failed to load cascade model: {e}")
+            self._cascade_session = None
+            return False
+
+    def _cascade_active(self) -> bool:
+        return self._cascade_session is not None and bool(self.config.get("cascade_enabled", False))
+
     @staticmethod
     def _clip_roi(x1: int, y1: int, x2: int, y2: int, w: int, h: int) -> Tuple[int, int, int, int]:
         x1 = max(0, min(x1, w - 1))
@@ -203,6 +286,28 @@ class ClassificationTool(BaseTool):
         entropy = -np.sum(probs * np.log(probs))
         return entropy
 
+    def _normalized_uncertainty(self, probabilities: np.ndarray) -> float:
+        """Entropy scaled to 0..1 by the maximum entropy for this class count"""
+        max_entropy = np.log(len(probabilities))
+        return float(self._calculate_entropy(probabilities) / max_entropy) if max_entropy > 0 else 0.0
+
+    def _rejection_candidates(self, probabilities: np.ndarray, top_k: int) -> np.ndarray:
+        """
+        Class ids to build predictions for, by descending probability
+        
+        With confidence rejection every class that can meet its (per-class)
+        threshold is a candidate, so a class outside the raw top-k is still
+        accepted when a higher one is rejected. Otherwise only the top-k.
+        """
+        rejection_method = self.config.get("rejection_method", "both")
+        if not bool(self.config.get("enable_rejection", True)) or rejection_method not in ["confidence", "both"]:
+            return self._main_adapter().top_k(probabilities, top_k)[0]
+        
+        thresholds = [float(self.config.get("confidence_threshold", 0.75))]
+        thresholds.extend(float(t) for t in self.config.get("class_thresholds", {}).values())
+        ids = np.flatnonzero(probabilities >= min(thresholds))
+        return ids[np.argsort(-probabilities[ids], kind='stable')]
+
     def _apply_rejection_logic(self, predictions: List[Dict[str, Any]], probabilities: np.ndarray) -> List[Dict[str, Any]]:
         """Apply confidence and entropy-based rejection"""
         if not bool(self.config.get("enable_rejection", True)):
@@ -264,11 +369,10 @@ class ClassificationTool(BaseTool):
         
         return predictions
 
-    def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
-        """Preprocess image for ONNX inference"""
+    def _preprocess_image(self, image: np.ndarray, size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Preprocess an RGB image for ONNX inference (size overrides input_width/height)"""
         # Get config parameters
-        width = int(self.config.get("input_width", 448))
-        height = int(self.config.get("input_height", 448))
+        width, height = size or self._input_size()
         use_rgb = bool(self.config.get("use_rgb", True))
         normalize = bool(self.config.get("normalize", False))
         mean = self.config.get("mean", [0.485, 0.456, 0.406])
@@ -280,9 +384,9 @@ class ClassificationTool(BaseTool):
         # Resize image
         resized = cv2.resize(image, (width, height))
         
-        # Convert BGR to RGB if needed
-        if use_rgb:
-            resized = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+        # Input is already RGB (see process()); only BGR-trained models need a swap
+        if not use_rgb:
+            resized = cv2.cvtColor(resized, cv2.COLOR_RGB2BGR)
         
         # Convert to float32 and normalize to 0-1
         img_float = resized.astype(np.float32) / 255.0
@@ -303,73 +407,31 @@ class ClassificationTool(BaseTool):
         """Classify image using direct ONNX inference"""
         top_k = int(self.config.get("top_k", 1))
         
-        # Add frame tracking (reduced logging for performance)
-        import hashlib
-        frame_hash = hashlib.md5(image.tobytes()).hexdigest()[:8]
-        frame_mean = np.mean(image)
-        frame_std = np.std(image)
-        
         debug_log(f"ClassificationTool: _classify_image - input shape={image.shape}, top_k={top_k}", logging.INFO)
-        debug_log(f"ClassificationTool: Frame hash={frame_hash}, mean={frame_mean:.2f}, std={frame_std:.2f}", logging.INFO)
+
+        cache_key = self._result_cache_key(image)
+        if cache_key is not None:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                debug_log(f"ClassificationTool: Result cache hit ({cached[0]['class_name'] if cached else '-'})", logging.INFO)
+                return cached
 
         try:
-            # Preprocess image
-            input_tensor = self._preprocess_image(image)
-            debug_log(f"ClassificationTool: Input tensor shape: {input_tensor.shape}", logging.INFO)
-            
-            # Run inference
-            input_name = self.onnx_session.get_inputs()[0].name
-            output_name = self.onnx_session.get_outputs()[0].name
-            
-            outputs = self.onnx_session.run([output_name], {input_name: input_tensor})
-            predictions = outputs[0][0]  # Remove batch dimension
-            
-            # Detailed logging disabled for performance
-            # logger.info(f"ClassificationTool: Raw predictions shape: {predictions.shape}")
-            debug_log(f"ClassificationTool: Raw predictions/logits: {predictions}", logging.INFO)
-            
-            # Handle different output formats like YOLO
-            if np.allclose(np.sum(predictions), 1.0, atol=1e-6) and np.all(predictions >= 0) and np.all(predictions <= 1):
-                # Predictions are already probabilities
-                probabilities = predictions
-                debug_log("ClassificationTool: Using direct probabilities (no softmax needed)", logging.INFO)
-            elif np.max(predictions) <= 1.0 and np.min(predictions) >= 0:
-                # Looks like probabilities but don't sum to 1, normalize
-                probabilities = predictions / np.sum(predictions)
-                debug_log("ClassificationTool: Using normalized probabilities", logging.INFO)
+            if self._cascade_active():
+                probabilities = self._cascade_probabilities(image)
             else:
-                # Check if this is a YOLO-style output where one value is 1.0 and others are near 0
-                if np.max(predictions) == 1.0 and np.sum(predictions < 1e-10) >= (len(predictions) - 1):
-                    # This is already a one-hot style output from YOLO
-                    probabilities = predictions.copy()
-                    debug_log("ClassificationTool: Using YOLO-style one-hot output", logging.INFO)
-                else:
-                    # Apply softmax to get probabilities
-                    max_pred = np.max(predictions)
-                    exp_scores = np.exp(predictions - max_pred)  # Numerical stability
-                    probabilities = exp_scores / np.sum(exp_scores)
-                    debug_log("ClassificationTool: Using softmax probabilities", logging.INFO)
+                input_tensor = self._preprocess_image(image)
+                probabilities = self._main_adapter().probabilities(input_tensor)
             
-            debug_log(f"ClassificationTool: Final probabilities: {probabilities}", logging.INFO)
+            adapter = self._main_adapter()
+            candidate_ids = self._rejection_candidates(probabilities, top_k)
+            initial_results = [
+                {"class_name": adapter.label(int(idx)), "confidence": float(probabilities[idx]), "class_id": int(idx)}
+                for idx in candidate_ids
+            ]
             
-            # Create initial results (all classes sorted by confidence)
-            num_classes = len(probabilities)
-            all_indices = np.argsort(probabilities)[::-1]  # All classes sorted by confidence
-            
-            initial_results = []
-            for i, idx in enumerate(all_indices):
-                confidence = float(probabilities[idx])
-                class_name = self._labels[idx] if idx < len(self._labels) else f"class_{idx}"
-                
-                result = {
-                    "class_name": class_name,
-                    "confidence": confidence,
-                    "class_id": int(idx)
-                }
-                initial_results.append(result)
-            
-            # Apply rejection logic (confidence + entropy based)
-            final_results = self._apply_rejection_logic(initial_results, probabilities)
+            # Apply rejection logic (confidence + entropy based), then keep the top-k survivors
+            final_results = self._apply_rejection_logic(initial_results, probabilities)[:top_k]
             
             # Debug logging for final results
             if final_results:
@@ -384,6 +446,8 @@ class ClassificationTool(BaseTool):
                 results_str = [(r['class_name'], f"{r['confidence']:.4f}") for r in top_k_results]
                 debug_log(f"ClassificationTool: Final Top-{top_k} results: {results_str}", logging.INFO)
             
+            if cache_key is not None:
+                self._result_cache.put(cache_key, final_results)
             return final_results  # Return processed results with rejection logic
             
         except Exception as e:
@@ -392,11 +456,70 @@ class ClassificationTool(BaseTool):
             traceback.print_exc()
             return []
 
-    def _draw_label(self, img: np.ndarray, text: str, org: Tuple[int, int]) -> None:
-        import cv2
-        x, y = org
-        cv2.putText(img, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX,
-                    float(self.config.get("font_scale", 0.6)), (0, 255, 0), 2, cv2.LINE_AA)
+    def _input_size(self) -> Tuple[int, int]:
+        return int(self.config.get("input_width", 448)), int(self.config.get("input_height", 448))
+
+    def _cascade_input_size(self) -> Tuple[int, int]:
+        return int(self.config.get("cascade_input_width", 112)), int(self.config.get("cascade_input_height", 112))
+
+    def _main_adapter(self) -> ClassifierAdapter:
+        """Adapter of the full model (built on first use if the session was attached directly)"""
+        if self._adapter is None or self._adapter.session is not self.onnx_session:
+            self._adapter = ClassifierAdapter(self.onnx_session, self._labels, self._input_size(), self._model_path)
+        return self._adapter
+
+    def _stage1_adapter(self) -> ClassifierAdapter:
+        if self._cascade_adapter is None or self._cascade_adapter.session is not self._cascade_session:
+            self._cascade_adapter = ClassifierAdapter(self._cascade_session, self._labels,
+                                                      self._cascade_input_size(), self._cascade_path)
+        return self._cascade_adapter
+
+    def _cascade_probabilities(self, image: np.ndarray) -> np.ndarray:
+        """
+        Two-stage inference: the small model decides confident crops, the
+        rest escalate to the full model. Rejection/OK-NG logic runs on the
+        probabilities of whichever stage decided, so semantics are unchanged.
+        """
+        start = time.perf_counter()
+        probabilities = self._stage1_adapter().probabilities(self._preprocess_image(image, self._cascade_input_size()))
+        stage1_time = time.perf_counter() - start
+        
+        uncertainty = self._normalized_uncertainty(probabilities)
+        top1 = float(np.max(probabilities)) if probabilities.size else 0.0
+        escalate = (uncertainty > float(self.config.get("cascade_uncertainty_threshold", 0.3))
+                    or top1 < float(self.config.get("cascade_min_confidence", 0.9))
+                    or len(probabilities) != self._main_adapter().num_classes)
+        if not escalate:
+            self._cascade_stats.record(stage1_time)
+            return probabilities
+        
+        debug_log(f"ClassificationTool: Cascade escalation (uncertainty={uncertainty:.3f}, top1={top1:.3f})", logging.INFO)
+        start = time.perf_counter()
+        probabilities = self._main_adapter().probabilities(self._preprocess_image(image))
+        self._cascade_stats.record(stage1_time, time.perf_counter() - start)
+        return probabilities
+
+    def _result_cache_key(self, image: np.ndarray) -> Optional[Tuple[Any, ...]]:
+        """Cache key: crop fingerprint + model version + preprocessing config + top_k (None = cache off)"""
+        if not bool(self.config.get("result_cache_enabled", True)):
+            return None
+        try:
+            preprocessing = (
+                int(self.config.get("input_width", 448)),
+                int(self.config.get("input_height", 448)),
+                bool(self.config.get("use_rgb", True)),
+                bool(self.config.get("normalize", False)),
+                tuple(self.config.get("mean", [0.485, 0.456, 0.406])),
+                tuple(self.config.get("std", [0.229, 0.224, 0.225])),
+            )
+            cascade = (self._cascade_version, self.config.get("cascade_input_width"),
+                       self.config.get("cascade_input_height"), self.config.get("cascade_uncertainty_threshold"),
+                       self.config.get("cascade_min_confidence")) if self._cascade_active() else None
+            fingerprint = crop_fingerprint(image, quant_bits=int(self.config.get("result_cache_quant_bits", 0)))
+            return fingerprint, self._model_version, preprocessing, cascade, int(self.config.get("top_k", 1))
+        except Exception as e:
+            logger.debug(f"ClassificationTool: Cannot fingerprint crop: {e}")
+            return None
 
     def process(
         self,
@@ -405,34 +528,9 @@ class ClassificationTool(BaseTool):
     ) -> Tuple[np.ndarray, Dict[str, Any]]:
         debug_log(f"ClassificationTool: Starting classification process for image shape {image.shape}", logging.INFO)
         
-        # Auto-detect and convert image format if needed
-        # Most classification models expect RGB, but OpenCV uses BGR
-        # Check context to see what format the image is in
-        input_format = "unknown"
-        if context and "pixel_format" in context:
-            input_format = context["pixel_format"]
-        elif context and "source" in context and "Camera Source" in context["source"]:
-            # Camera Source typically provides BGR format (OpenCV standard)
-            input_format = "BGR888"
-        
-        # Ensure image is in RGB format for classification
-        work_image = image.copy()
-        try:
-            import cv2  # Ensure cv2 is available in local scope
-            if input_format in ["BGR888", "unknown"] and len(image.shape) == 3 and image.shape[2] == 3:
-                # Convert BGR to RGB for classification
-                debug_log(f"ClassificationTool: About to convert BGR to RGB using cv2.cvtColor", logging.INFO)
-                work_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                debug_log(f"ClassificationTool: Converted {input_format} to RGB for classification", logging.INFO)
-            elif input_format == "RGB888":
-                # Already RGB, no conversion needed
-                logger.info(f"ClassificationTool: Image already in RGB format")
-            else:
-                logger.warning(f"ClassificationTool: Unknown format {input_format}, assuming RGB")
-        except Exception as e:
-            logger.error(f"ClassificationTool: Error in format conversion: {e}")
-            # Fallback to original image
-            work_image = image.copy()
+        # Model input is RGB: take the frame from the shared per-frame conversion
+        # cache instead of converting (and copying) it again here
+        work_image = get_frame_as(image, context, LAYOUT_RGB)
         
         if not self._ensure_model():
             logger.error("ClassificationTool: Model not loaded")
@@ -449,13 +547,16 @@ class ClassificationTool(BaseTool):
             
             debug_log(f"ClassificationTool: Config - draw_result={draw}, result_display={result_display}", logging.INFO)
             
-            # Copy image if we are going to draw anything (class text or OK/NG)
-            result_img = image.copy() if (draw or result_display) else image
+            # The frame is returned untouched: labels and the OK/NG badge are
+            # drawn by the camera view as scene items from output["overlay"]
             h, w = work_image.shape[:2]  # Use work_image (RGB) dimensions
 
             use_detection_roi = bool(self.config.get("use_detection_roi", False))
             roi_expand = float(self.config.get("roi_expand", 0.0))
             allowed_classes = set(self.config.get("classify_only_classes", []) or [])
+            once_per_track = bool(self.config.get("classify_once_per_track", True))
+            if not once_per_track and self._track_predictions:
+                self._track_predictions.clear()
 
             all_results: List[Dict[str, Any]] = []
 
@@ -466,9 +567,11 @@ class ClassificationTool(BaseTool):
                     if allowed_classes and det.get("class_name") not in allowed_classes:
                         continue
                     bbox = det.get("bbox")
+                    if not bbox and all(k in det for k in ("x1", "y1", "x2", "y2")):
+                        bbox = [det["x1"], det["y1"], det["x2"], det["y2"]]  # DetectTool format
                     if not bbox or len(bbox) != 4:
                         continue
-                    x1, y1, x2, y2 = bbox
+                    x1, y1, x2, y2 = [int(round(v)) for v in bbox]
 
                     # Expand ROI by ratio
                     if roi_expand > 0.0:
@@ -485,16 +588,23 @@ class ClassificationTool(BaseTool):
                     if crop.size == 0:
                         continue
 
-                    preds = self._classify_image(crop)
-                    all_results.append({
+                    track_id = det.get("track_id")
+                    preds = self._track_predictions.get(track_id) if track_id is not None else None
+                    reused = preds is not None
+                    if reused:
+                        self._track_predictions.move_to_end(track_id)
+                    else:
+                        preds = self._classify_image(crop)
+                        if track_id is not None and preds and once_per_track:
+                            self._remember_track(track_id, preds)
+                    entry = {
                         "bbox": [x1, y1, x2, y2],
                         "predictions": preds,
-                    })
-
-                    if draw and preds:
-                        top1 = preds[0]
-                        label = f"{top1['class_name']} {top1['confidence']:.2f}"
-                        self._draw_label(result_img, label, (x1 + 4, max(y1 - 6, 12)))
+                    }
+                    if track_id is not None:
+                        entry["track_id"] = track_id
+                        entry["reused"] = reused
+                    all_results.append(entry)
             else:
                 # Full-frame classification
                 debug_log("ClassificationTool: Performing full-frame classification", logging.INFO)
@@ -505,15 +615,13 @@ class ClassificationTool(BaseTool):
                     "bbox": None,
                     "predictions": preds,
                 })
-                if draw and preds:
+                if preds:
                     top1 = preds[0]
                     debug_log(f"ClassificationTool: Top prediction - {top1['class_name']} with confidence {top1['confidence']:.3f}", logging.INFO)
-                    label = f"{top1['class_name']} {top1['confidence']:.2f}"
-                    pos = tuple(self.config.get("position", (8, 24)))
-                    self._draw_label(result_img, label, pos)
 
             # Determine OK/NG status if enabled
             ok_flag: Optional[bool] = None
+            verdict: Optional[str] = None
             if result_display:
                 expected = (self.config.get("expected_class_name") or "").strip()
                 confidence_threshold = self.config.get("confidence_threshold", 0.75)
@@ -565,58 +673,34 @@ class ClassificationTool(BaseTool):
                     ok_flag = False
                     logger.info("ClassificationTool: NG - no predictions available")
 
-                # Draw OK/NG badge at corner - always show result if we have predictions
-                if ok_flag is not None:
-                    should_show_result = len(tops) > 0  # Show if we have any predictions (including rejected ones)
-                    debug_log(f"ClassificationTool: Should show OK/NG result: {should_show_result}", logging.INFO)
-                    
-                    if should_show_result:
-                        try:
-                            import cv2
-                            label = "OK" if ok_flag else "NG"
-                            color = (0, 200, 0) if ok_flag else (0, 0, 255)
-                            debug_log(f"ClassificationTool: Drawing {label} badge in {color}", logging.INFO)
-                            
-                            # Badge size and position
-                            pad = 8
-                            rect_w, rect_h = 80, 36
-                            corner = (self.config.get("result_corner") or "top-right").lower()
-                            if corner == "top-left":
-                                x, y = pad, pad
-                            elif corner == "bottom-right":
-                                x, y = w - rect_w - pad, h - rect_h - pad
-                            elif corner == "bottom-left":
-                                x, y = pad, h - rect_h - pad
-                            else:  # top-right default
-                                x, y = w - rect_w - pad, pad
-                            # Draw filled rectangle
-                            cv2.rectangle(result_img, (x, y), (x + rect_w, y + rect_h), color, thickness=-1)
-                            # Draw text centered-ish
-                            font = cv2.FONT_HERSHEY_SIMPLEX
-                            scale = 0.9
-                            thickness = 2
-                            text_size, _ = cv2.getTextSize(label, font, scale, thickness)
-                            tx = x + (rect_w - text_size[0]) // 2
-                            ty = y + (rect_h + text_size[1]) // 2 - 4
-                            cv2.putText(result_img, label, (tx, ty), font, scale, (255, 255, 255), thickness, cv2.LINE_AA)
-                        except Exception as e:
-                            logger.error(f"ClassificationTool: Error drawing OK/NG badge: {e}")
-                    else:
-                        logger.info("ClassificationTool: Not showing OK/NG - confidence too low")
+                # OK/NG badge at corner - always show result if we have predictions
+                if ok_flag is not None and tops:
+                    verdict = "OK" if ok_flag else "NG"
+                    debug_log(f"ClassificationTool: Verdict {verdict}", logging.INFO)
 
             output = {
                 "tool_name": self.display_name,
                 "status": "success",
                 "results": all_results,
                 "result_count": len(all_results),
+                "overlay": {
+                    "labels": draw,
+                    "position": list(self.config.get("position", (8, 24))),
+                    "verdict": verdict,
+                    "corner": (self.config.get("result_corner") or "top-right").lower(),
+                },
             }
+            if bool(self.config.get("result_cache_enabled", True)):
+                output["cache"] = self._result_cache.get_stats()
+            if self._cascade_active():
+                output["cascade"] = self._cascade_stats.get_stats()
             
             debug_log(f"ClassificationTool: Process completed successfully - {len(all_results)} results", logging.INFO)
             if all_results and all_results[0].get("predictions"):
                 top_pred = all_results[0]["predictions"][0]
                 debug_log(f"ClassificationTool: Final result - {top_pred['class_name']} ({top_pred['confidence']:.3f})", logging.INFO)
             
-            return result_img, output
+            return image, output
 
         except Exception as e:
             logger.error(f"ClassificationTool error: {e}")
@@ -626,10 +710,29 @@ class ClassificationTool(BaseTool):
                 "error": str(e),
             }
 
+    def _remember_track(self, track_id: int, preds: List[Dict[str, Any]]) -> None:
+        """Store predictions for a tracked object (bounded, oldest tracks evicted first)"""
+        self._track_predictions[track_id] = preds
+        limit = max(1, int(self.config.get("track_cache_size", 256)))
+        while len(self._track_predictions) > limit:
+            self._track_predictions.popitem(last=False)
+
+    # Config keys whose change makes cached results stale
+    _RESULT_CACHE_KEYS = (
+        "model_name", "model_path", "confidence_threshold", "enable_rejection",
+        "rejection_method", "uncertainty_threshold", "class_thresholds", "top_k",
+    )
+
     def update_config(self, new_config: Dict[str, Any]) -> bool:
+        before = {k: self.config.get(k) for k in self._RESULT_CACHE_KEYS}
         ok = super().update_config(new_config)
         # Reset load flag to allow reloading on next process if model changed
         self._model_loaded = False
+        # Cached per-track predictions belong to the old model/thresholds
+        self._track_predictions.clear()
+        if any(self.config.get(k) != v for k, v in before.items()):
+            self._result_cache.invalidate()
+        self._result_cache.resize(int(self.config.get("result_cache_size", 512)))
         return ok
 
     def get_info(self) -> Dict[str, Any]:
@@ -639,6 +742,8 @@ class ClassificationTool(BaseTool):
             "top_k": self.config.get("top_k"),
             "threshold": self.config.get("threshold"),
             "use_detection_roi": self.config.get("use_detection_roi"),
+            "result_cache": self._result_cache.get_stats(),
+            "cascade": self._cascade_stats.get_stats() if self._cascade_active() else None,
         })
         return info
 
@@ -0,0 +1,150 @@
+"""
+Classifier model adapter
+Decides once, at model load, how to read a classifier's output (input/output
+names, output transform, label array) so per-crop inference is just
+session.run + one vectorized transform + argpartition top-k
+"""
+
+import logging
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnx
+    ONNX_GRAPH_AVAILABLE = True
+except ImportError:
+    ONNX_GRAPH_AVAILABLE = False
+
+TRANSFORM_IDENTITY = 'identity'    # Output already holds probabilities
+TRANSFORM_NORMALIZE = 'normalize'  # Non-negative scores, divide by the sum
+TRANSFORM_SOFTMAX = 'softmax'      # Raw logits
+TRANSFORM_EXP = 'exp'              # LogSoftmax output
+
+# Final graph ops and the transform their output needs
+_OP_TRANSFORMS = {
+    'Softmax': TRANSFORM_IDENTITY,
+    'LogSoftmax': TRANSFORM_EXP,
+    'Sigmoid': TRANSFORM_NORMALIZE,
+}
+
+
+def _graph_transform(model_path: str, output_name: str) -> Optional[str]:
+    """Transform implied by the op producing the output (needs the optional onnx package)"""
+    if not ONNX_GRAPH_AVAILABLE or not model_path:
+        return None
+    try:
+        graph = onnx.load(model_path, load_external_data=False).graph
+        for node in reversed(graph.node):
+            if output_name in node.output:
+                return _OP_TRANSFORMS.get(node.op_type)
+    except Exception as e:
+        logger.debug(f"Classifier graph inspection failed: {e}")
+    return None
+
+
+def _metadata_transform(session: Any) -> Optional[str]:
+    """Ultralytics classify exports end with softmax and say so in their metadata"""
+    try:
+        meta = session.get_modelmeta().custom_metadata_map or {}
+        if str(meta.get('task', '')).lower() == 'classify':
+            return TRANSFORM_IDENTITY
+    except Exception:
+        pass
+    return None
+
+
+def _looks_like_probabilities(scores: np.ndarray) -> bool:
+    return bool(np.all(scores >= 0) and np.all(scores <= 1) and abs(float(scores.sum()) - 1.0) < 1e-4)
+
+
+class ClassifierAdapter:
+    """
+    Fixed view of a loaded classifier
+
+    The output transform comes from the ONNX graph when the onnx package is
+    available, else from model metadata, else from a one-time probe with two
+    synthetic inputs (the same rules the old per-inference heuristic used).
+    """
+
+    def __init__(self, session: Any, labels: Sequence[str], input_size: Tuple[int, int],
+                 model_path: str = "", transform: Optional[str] = None):
+        self.session = session
+        model_input = session.get_inputs()[0]
+        model_output = session.get_outputs()[0]
+        self.input_name = model_input.name
+        self.output_name = model_output.name
+        self.output_names = [self.output_name]
+        self.input_size = (int(input_size[0]), int(input_size[1]))
+        self._probe_width = 0
+
+        self.transform = (transform or _graph_transform(model_path, self.output_name)
+                          or _metadata_transform(session) or self._probe_transform())
+
+        num_classes = self._num_classes(model_output, labels)
+        names = list(labels)[:num_classes]
+        names += [f"class_{i}" for i in range(len(names), num_classes)]
+        self.labels = np.array(names, dtype=object)
+        self.num_classes = num_classes
+
+        logger.info(f"ClassifierAdapter: input={self.input_name} output={self.output_name} "
+                    f"classes={self.num_classes} transform={self.transform}")
+
+    def _num_classes(self, model_output: Any, labels: Sequence[str]) -> int:
+        shape = getattr(model_output, 'shape', None) or []
+        if len(shape) >= 2 and isinstance(shape[-1], int) and shape[-1] > 0:
+            return int(shape[-1])
+        if self._probe_width:
+            return self._probe_width
+        return len(labels)
+
+    def _probe_transform(self) -> str:
+        """Run two synthetic inputs once and classify the raw output range"""
+        width, height = self.input_size
+        probes = [np.full((1, 3, height, width), 0.5, dtype=np.float32),
+                  np.random.RandomState(0).rand(1, 3, height, width).astype(np.float32)]
+        raw = [np.asarray(self.session.run(self.output_names, {self.input_name: p})[0][0]).reshape(-1)
+               for p in probes]
+        self._probe_width = int(raw[0].size)
+
+        if all(_looks_like_probabilities(r) for r in raw):
+            return TRANSFORM_IDENTITY
+        if all(np.all(r >= 0) and np.all(r <= 1) for r in raw):
+            return TRANSFORM_NORMALIZE
+        return TRANSFORM_SOFTMAX
+
+    def probabilities(self, input_tensor: np.ndarray) -> np.ndarray:
+        """Class probabilities for one preprocessed [1, 3, H, W] tensor"""
+        scores = self.session.run(self.output_names, {self.input_name: input_tensor})[0][0]
+        scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+        if self.transform == TRANSFORM_SOFTMAX:
+            scores = np.exp(scores - scores.max())
+            scores /= scores.sum()
+        elif self.transform == TRANSFORM_EXP:
+            scores = np.exp(scores)
+        elif self.transform == TRANSFORM_NORMALIZE:
+            total = scores.sum()
+            if total > 0:
+                scores = scores / total
+        return scores
+
+    @staticmethod
+    def top_k(probabilities: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(top_ids, top_probs) sorted by descending probability, via argpartition"""
+        n = probabilities.shape[0]
+        k = max(1, min(int(k), n))
+        if k < n:
+            ids = np.argpartition(-probabilities, k - 1)[:k]
+        else:
+            ids = np.arange(n)
+        ids = ids[np.argsort(-probabilities[ids], kind='stable')]
+        return ids, probabilities[ids]
+
+    def infer(self, input_tensor: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Lean path: preprocessed tensor -> (top_ids, top_probs)"""
+        return self.top_k(self.probabilities(input_tensor), k)
+
+    def label(self, class_id: int) -> str:
+        return str(self.labels[class_id]) if 0 <= class_id < self.num_classes else f"class_{class_id}"
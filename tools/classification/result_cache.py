@@ -0,0 +1,121 @@
+"""
+LRU cache for classification results
+Maps a fingerprint of the crop (hash of a downsampled copy) plus the model
+version and preprocessing config to the prediction list, so a stopped
+conveyor or a re-inspected trigger frame does not run the model again
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Side of the downsampled crop used for fingerprinting
+FINGERPRINT_SIZE = 32
+
+
+def _digest(data: bytes) -> bytes:
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_digest(data)
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def crop_fingerprint(image: np.ndarray, size: int = FINGERPRINT_SIZE, quant_bits: int = 0) -> bytes:
+    """
+    Fingerprint of a crop
+
+    The crop is area-downsampled to size x size and hashed together with
+    its original shape. quant_bits > 0 drops that many low bits per pixel
+    first, so sensor noise on a static scene still maps to the same key.
+    """
+    h, w = image.shape[:2]
+    small = cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA) if (h, w) != (size, size) else image
+    if quant_bits > 0:
+        small = small >> quant_bits
+    header = np.array(image.shape + (image.dtype.itemsize,), dtype=np.int32).tobytes()
+    return _digest(header + np.ascontiguousarray(small).tobytes())
+
+
+class ClassificationCache:
+    """Bounded LRU of prediction lists with hit/miss statistics"""
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max(1, int(max_size))
+        self._entries: "OrderedDict[Hashable, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Cached predictions (copies, callers may annotate them) or None"""
+        with self._lock:
+            preds = self._entries.get(key)
+            if preds is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return [dict(p) for p in preds]
+
+    def put(self, key: Hashable, preds: List[Dict[str, Any]]) -> None:
+        if not preds:
+            return
+        with self._lock:
+            self._entries[key] = [dict(p) for p in preds]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, max_size: int) -> None:
+        with self._lock:
+            self.max_size = max(1, int(max_size))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop all entries (model or thresholds changed); statistics are kept"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total) if total else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+def model_version(model_path: str) -> Tuple[str, int, int]:
+    """Identity of a model file on disk (path, size, mtime)"""
+    try:
+        st = os.stat(model_path)
+        return model_path, int(st.st_size), int(st.st_mtime_ns)
+    except OSError:
+        return model_path, 0, 0
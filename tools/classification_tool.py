@@ -21,6 +21,8 @@ except Exception:
 
 
 class ClassificationTool(BaseTool):
+    required_layout = _Impl.required_layout if ADV_AVAILABLE else None
+
     def __init__(
         self,
         name: str = "Classification Tool",
@@ -1,18 +1,31 @@
-# Import các hàm và lớp chính từ detection tools
-from .detect_tool import DetectTool, create_detect_tool_from_manager_config
-from .model_manager import ModelManager
-from .visualization import create_detection_display
-from .yolo_inference import create_yolo_inference
-from .ocr_tool import OcrTool
-from .edge_detection import EdgeDetectionTool
+# Các hàm và lớp chính từ detection tools.
+# Import lười (PEP 562): `import tools.detection.model_manager` không kéo theo
+# detect_tool/yolo_inference (onnxruntime) hay ocr_tool lúc khởi động.
+import importlib
+
+_EXPORTS = {
+    'DetectTool': '.detect_tool',
+    'create_detect_tool_from_manager_config': '.detect_tool',
+    'ModelManager': '.model_manager',
+    'create_detection_display': '.visualization',
+    'create_yolo_inference': '.yolo_inference',
+    'batched_nms': '.nms',
+    'OcrTool': '.ocr_tool',
+    'EdgeDetectionTool': '.edge_detection',
+}
 
 # Xuất các lớp và hàm để dễ dàng import
-__all__ = [
-    'DetectTool',
-    'create_detect_tool_from_manager_config',
-    'ModelManager', 
-    'create_detection_display',
-    'create_yolo_inference',
-    'OcrTool',
-    'EdgeDetectionTool'
-]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -11,7 +11,11 @@ import cv2
 from pathlib import Path
 
 from tools.base_tool import BaseTool, ToolConfig
+from tools.pixel_format import LAYOUT_RGB, get_frame_as
 from .model_manager import ModelManager
+from .nms import batched_nms, nms_detections, xywh_to_xyxy
+from .tiling import clip_area, compute_tiles, tile_saliency
+from .tracker import MultiObjectTracker
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +29,8 @@ except ImportError:
 class DetectTool(BaseTool):
     """Detect Tool - Direct ONNX inference for maximum performance"""
     
+    required_layout = LAYOUT_RGB  # YOLO models are trained on RGB
+    
     def __init__(self, name: str = "Detect Tool", config: Optional[Union[Dict[str, Any], ToolConfig]] = None, tool_id: Optional[int] = None):
         super().__init__(name, config)
         self.tool_id = tool_id
@@ -40,7 +46,23 @@ class DetectTool(BaseTool):
         self.imgsz = 640
         self.confidence_threshold = 0.5
         self.nms_threshold = 0.45
+        self.nms_top_k = 1000
+        self.max_detections = 300
+        self.nms_class_agnostic = False
         self.selected_classes = []
+        
+        # Tiled high-resolution mode
+        self.tiled_inference = False
+        self.tile_size = 0  # 0 = imgsz (no downscale inside a tile)
+        self.tile_overlap = 0.2
+        self.tile_grid = None  # Optional (cols, rows)
+        self.tile_saliency_threshold = 4.0
+        self._batch_size = False  # Not read yet; None = dynamic batch axis
+        
+        # Live-mode tracking between keyframe detections
+        self.tracking_enabled = False
+        self.track_low_score = 0.1
+        self.tracker: Optional[MultiObjectTracker] = None
         self.class_thresholds = {}  # Per-class thresholds
         
         # State tracking
@@ -69,8 +91,26 @@ class DetectTool(BaseTool):
         self.config.set_default('class_thresholds', {})
         self.config.set_default('confidence_threshold', 0.5)
         self.config.set_default('nms_threshold', 0.45)
+        self.config.set_default('nms_top_k', 1000)
+        self.config.set_default('max_detections', 300)
+        self.config.set_default('nms_class_agnostic', False)
         self.config.set_default('imgsz', 640)
         
+        # Tiled mode for small defects
+        self.config.set_default('tiled_inference', False)
+        self.config.set_default('tile_size', 0)
+        self.config.set_default('tile_overlap', 0.2)
+        self.config.set_default('tile_grid', None)
+        self.config.set_default('tile_saliency_threshold', 4.0)
+        
+        # Tracking in live mode (full detection only every N frames)
+        self.config.set_default('tracking_enabled', False)
+        self.config.set_default('keyframe_interval', 5)
+        self.config.set_default('track_iou_threshold', 0.3)
+        self.config.set_default('track_min_confidence', 0.3)
+        self.config.set_default('track_low_score', 0.1)
+        self.config.set_default('track_max_age', 15)
+        
         logger.info(f"DetectTool {self.display_name} configuration setup completed")
     
     def _letterbox_fast(self, bgr: np.ndarray, size: int = 640, color=(114, 114, 114), stride: int = 32) -> Tuple[np.ndarray, float, Tuple[int, int]]:
@@ -120,65 +160,29 @@ class DetectTool(BaseTool):
         
         return padded, r, (left, top)
     
-    def _nms_numpy_fast(self, boxes: np.ndarray, scores: np.ndarray, iou_thres: float = 0.45) -> np.ndarray:
+    def _nms_numpy_fast(self, boxes: np.ndarray, scores: np.ndarray, iou_thres: float = 0.45,
+                        class_ids: Optional[np.ndarray] = None) -> np.ndarray:
         """
-        Optimized numpy-based NMS with vectorized operations
+        Class-aware NMS (delegates to the shared tools.detection.nms module)
         
         Args:
             boxes: Nx4 array [x1, y1, x2, y2]
             scores: N array of confidence scores
             iou_thres: IoU threshold for NMS
+            class_ids: Optional N array of class ids (boxes of different classes don't suppress each other)
             
         Returns:
             Array of indices to keep
         """
-        if len(boxes) == 0:
-            return np.array([], dtype=np.int64)
-            
-        # Ensure contiguous arrays for better performance
-        if not boxes.flags['C_CONTIGUOUS']:
-            boxes = np.ascontiguousarray(boxes)
-        if not scores.flags['C_CONTIGUOUS']:
-            scores = np.ascontiguousarray(scores)
-            
-        x1, y1, x2, y2 = boxes.T
-        
-        # Precompute areas using vectorized operations
-        areas = np.multiply(
-            np.maximum(0, x2 - x1),
-            np.maximum(0, y2 - y1)
+        return batched_nms(
+            boxes, scores, class_ids,
+            iou_threshold=iou_thres,
+            pre_nms_top_k=self.nms_top_k,
+            max_detections=self.max_detections,
+            class_agnostic=self.nms_class_agnostic
         )
-        
-        # Get indices sorted by score
-        order = scores.argsort()[::-1]
-        keep = []
-        
-        while order.size > 0:
-            i = order[0]
-            keep.append(i)
-            
-            if order.size == 1:
-                break
-                
-            # Calculate IoU with remaining boxes
-            xx1 = np.maximum(x1[i], x1[order[1:]])
-            yy1 = np.maximum(y1[i], y1[order[1:]])
-            xx2 = np.minimum(x2[i], x2[order[1:]])
-            yy2 = np.minimum(y2[i], y2[order[1:]])
-            
-            w = np.maximum(0, xx2 - xx1)
-            h = np.maximum(0, yy2 - yy1)
-            inter = w * h
-            
-            union = areas[i] + areas[order[1:]] - inter + 1e-6
-            iou = inter / union
-            
-            # Keep boxes with IoU below threshold
-            order = order[1:][iou <= iou_thres]
-        
-        return np.array(keep, dtype=np.int64)
     
-    def _yolo_universal_decode(self, outputs: Any, iou_thres: float = 0.45) -> np.ndarray:
+    def _yolo_universal_decode(self, outputs: Any, iou_thres: float = 0.45, score_thres: float = 0.0) -> np.ndarray:
         """
         Universal YOLO output decoder
         Supports multiple output formats:
@@ -186,6 +190,8 @@ class DetectTool(BaseTool):
         - 4 outputs: [num_dets, boxes, scores, classes]
         - Raw format: (N, 5+C) with NMS
         
+        score_thres drops low-confidence candidates before NMS (raw format only)
+        
         Returns: Nx6 array [x1, y1, x2, y2, score, class_id]
         """
         # Handle multiple outputs
@@ -219,28 +225,34 @@ class DetectTool(BaseTool):
             obj = arr[:, 4].astype(np.float32)
             cls_probs = arr[:, 5:].astype(np.float32)
             
-            cls_id = cls_probs.argmax(1).astype(np.float32)
-            cls_conf = cls_probs.max(1)
+            cls_id = cls_probs.argmax(1)
+            cls_conf = np.take_along_axis(cls_probs, cls_id[:, None], axis=1)[:, 0]
             scores = obj * cls_conf
             
             # Convert center format to corner format
-            x, y, w, h = xywh.T
-            x1 = x - w/2
-            y1 = y - h/2
-            x2 = x + w/2
-            y2 = y + h/2
-            boxes = np.stack([x1, y1, x2, y2], axis=1)
+            boxes = xywh_to_xyxy(xywh)
+            
+            # Drop low-confidence candidates before NMS
+            if score_thres > 0:
+                mask = scores >= score_thres
+                boxes, scores, cls_id = boxes[mask], scores[mask], cls_id[mask]
             
-            # Apply NMS
-            keep = self._nms_numpy_fast(boxes, scores, iou_thres=iou_thres)
+            # Apply class-aware NMS
+            keep = self._nms_numpy_fast(boxes, scores, iou_thres=iou_thres, class_ids=cls_id)
             return np.concatenate([
                 boxes[keep],
                 scores[keep, None],
-                cls_id[keep, None]
+                cls_id[keep, None].astype(np.float32)
             ], axis=1).astype(np.float32)
         
         raise ValueError(f"Unknown output format with shape: {arr.shape}")
     
+    def _min_score_threshold(self) -> float:
+        """Lowest threshold any class can pass with (used to prefilter before NMS)"""
+        thresholds = [self.confidence_threshold]
+        thresholds.extend(float(t) for t in self.class_thresholds.values())
+        return max(0.0, min(thresholds))
+    
     def mark_config_changed(self) -> None:
         """
         Mark that configuration has changed and needs re-initialization.
@@ -267,7 +279,24 @@ class DetectTool(BaseTool):
             self.class_thresholds = self.config.get('class_thresholds', {})
             self.confidence_threshold = self.config.get('confidence_threshold', 0.5)
             self.nms_threshold = self.config.get('nms_threshold', 0.45)
+            self.nms_top_k = self.config.get('nms_top_k', 1000)
+            self.max_detections = self.config.get('max_detections', 300)
+            self.nms_class_agnostic = self.config.get('nms_class_agnostic', False)
             self.imgsz = self.config.get('imgsz', 640)
+            self.tiled_inference = bool(self.config.get('tiled_inference', False))
+            self.tile_size = int(self.config.get('tile_size', 0) or 0)
+            self.tile_overlap = float(self.config.get('tile_overlap', 0.2))
+            self.tile_grid = self.config.get('tile_grid', None)
+            self.tile_saliency_threshold = float(self.config.get('tile_saliency_threshold', 4.0))
+            self.tracking_enabled = bool(self.config.get('tracking_enabled', False))
+            self.track_low_score = float(self.config.get('track_low_score', 0.1))
+            self.tracker = MultiObjectTracker(
+                keyframe_interval=self.config.get('keyframe_interval', 5),
+                iou_threshold=self.config.get('track_iou_threshold', 0.3),
+                high_score=self.confidence_threshold,
+                min_confidence=self.config.get('track_min_confidence', 0.3),
+                max_age=self.config.get('track_max_age', 15)
+            ) if self.tracking_enabled else None
             
             # Validate model path
             if not self.model_path or not Path(self.model_path).exists():
@@ -281,12 +310,15 @@ class DetectTool(BaseTool):
             
             self.session = ort.InferenceSession(self.model_path, providers=providers)
             self.input_name = self.session.get_inputs()[0].name
+            self._batch_size = False
             
             self.is_initialized = True
             logger.info(f"DetectTool {self.display_name} initialized")
             logger.info(f"  Model: {Path(self.model_path).name}")
             logger.info(f"  Classes: {len(self.class_names)} total, {len(self.selected_classes)} selected")
             logger.info(f"  Thresholds: {self.class_thresholds}")  # ✅ Log thresholds
+            if self.tiled_inference:
+                logger.info(f"  Tiled mode: tile={self.tile_size or self.imgsz}, overlap={self.tile_overlap}, grid={self.tile_grid}")
             
             return True
             
@@ -299,7 +331,7 @@ class DetectTool(BaseTool):
         Process image with optimized YOLO detection
         
         Args:
-            image: Input image (BGR format)
+            image: Input image (layout announced in context, BGR by default)
             context: Processing context
             
         Returns:
@@ -329,29 +361,38 @@ class DetectTool(BaseTool):
             
             logger.info("✅ DetectTool initialized, starting detection...")
             
-            # Preprocessing
-            preprocessed, scale, (pad_x, pad_y) = self._letterbox_fast(image, self.imgsz)
-            
-            # Prepare input tensor
-            # IMPORTANT: YOLO model is trained on RGB images
-            # Input arrives as BGR from camera stream, convert to RGB for correct inference
-            # This ensures object detection accuracy matches training data
-            logger.info("DetectTool: Converting BGR input to RGB for YOLO model inference")
-            x = cv2.cvtColor(preprocessed, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
-            x = x.transpose(2, 0, 1)[None]  # [1, 3, H, W]
-            
-            # Run inference
-            inference_start = time.time()
-            outputs = self.session.run(None, {self.input_name: x})
-            inference_time = time.time() - inference_start
-            
-            # Decode outputs
-            detections_raw = self._yolo_universal_decode(outputs, iou_thres=self.nms_threshold)
+            # Tracking only applies to a continuous live stream
+            use_tracking = self.tracker is not None and (context or {}).get('camera_mode') == 'live'
+            if not use_tracking and self.tracker is not None and self.tracker.tracks:
+                self.tracker.reset()
+            
+            tile_stats = None
+            keyframe = True
+            inference_time = 0.0
+            if use_tracking and not self.tracker.needs_detection():
+                # Cheap motion propagation between keyframes: Nx7 rows with track_id
+                keyframe = False
+                detections_raw = self.tracker.propagate()
+            else:
+                # Run detection (full frame or tiled), boxes in original image coordinates
+                # Model input is RGB; conversion is shared with other tools on this frame
+                rgb = get_frame_as(image, context, LAYOUT_RGB)
+                # Tracking keeps low-score boxes for the tracker's second association
+                # stage (they only extend existing tracks and are filtered out below)
+                score_thres = self._min_score_threshold()
+                if use_tracking:
+                    score_thres = min(score_thres, self.track_low_score)
+                if self.tiled_inference:
+                    detections_raw, inference_time, tile_stats = self._detect_tiled(rgb, score_thres)
+                else:
+                    detections_raw, inference_time = self._detect_full(rgb, score_thres)
+                if use_tracking:
+                    detections_raw = self.tracker.update(detections_raw)
             
             # Filter detections
             detections = []
             for detection in detections_raw:
-                x1, y1, x2, y2, score, class_id = detection
+                x1, y1, x2, y2, score, class_id = detection[:6]
                 class_id = int(class_id)
                 
                 # Skip if class not selected
@@ -367,33 +408,25 @@ class DetectTool(BaseTool):
                     if class_id < len(self.class_names) else self.confidence_threshold
                 
                 if score >= threshold:
-                    # Denormalize coordinates
-                    x1_orig = (x1 - pad_x) / scale
-                    y1_orig = (y1 - pad_y) / scale
-                    x2_orig = (x2 - pad_x) / scale
-                    y2_orig = (y2 - pad_y) / scale
-                    
                     detection_dict = {
                         'class_id': class_id,
                         'class_name': self.class_names[class_id] if class_id < len(self.class_names) else f'unknown_{class_id}',
                         'confidence': float(score),
-                        'x1': float(x1_orig),
-                        'y1': float(y1_orig),
-                        'x2': float(x2_orig),
-                        'y2': float(y2_orig),
-                        'width': float(x2_orig - x1_orig),
-                        'height': float(y2_orig - y1_orig)
+                        'x1': float(x1),
+                        'y1': float(y1),
+                        'x2': float(x2),
+                        'y2': float(y2),
+                        'width': float(x2 - x1),
+                        'height': float(y2 - y1)
                     }
+                    if use_tracking:
+                        detection_dict['track_id'] = int(detection[6])
+                        detection_dict['tracked'] = not keyframe
                     detections.append(detection_dict)
             
             # Store last detections
             self.last_detections = detections
             
-            # Draw detections on output image
-            output_image = image.copy()
-            if self.config.get('visualize_results', True):
-                output_image = self._draw_detections(output_image, detections)
-            
             # Calculate execution time
             total_time = time.time() - start_time
             
@@ -416,10 +449,21 @@ class DetectTool(BaseTool):
                 'classes_total': len(self.class_names),
                 'classes_selected': len(self.selected_classes),
                 'class_thresholds': self.class_thresholds,  # ✅ Add thresholds for ResultTool
-                'selected_classes': self.selected_classes    # ✅ Add selected classes for ResultTool
+                'selected_classes': self.selected_classes,   # ✅ Add selected classes for ResultTool
+                # Boxes are drawn by the camera view as scene items, the frame is not copied
+                'overlay': {
+                    'boxes': self.config.get('visualize_results', True),
+                    'class_names': self.config.get('show_class_names', True),
+                    'confidence': self.config.get('show_confidence', True)
+                }
             }
+            if tile_stats is not None:
+                result['tiles'] = tile_stats
+            if use_tracking:
+                result['keyframe'] = keyframe
+                result['tracking'] = self.tracker.get_stats()
             
-            return output_image, result
+            return image, result
             
         except Exception as e:
             logger.error(f"❌ Error in DetectTool process: {e}")
@@ -427,42 +471,109 @@ class DetectTool(BaseTool):
             traceback.print_exc()
             return image, {'detections': [], 'error': str(e)}
     
-    def _draw_detections(self, image: np.ndarray, detections: List[Dict[str, Any]]) -> np.ndarray:
-        """Draw detection results on image"""
-        try:
-            output = image.copy()
-            
-            for detection in detections:
-                x1 = int(detection['x1'])
-                y1 = int(detection['y1'])
-                x2 = int(detection['x2'])
-                y2 = int(detection['y2'])
-                confidence = detection['confidence']
-                class_name = detection['class_name']
-                
-                # Draw bounding box
-                cv2.rectangle(output, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                
-                # Draw label
-                if self.config.get('show_class_names', True):
-                    label_text = class_name
-                    if self.config.get('show_confidence', True):
-                        label_text += f" {confidence:.2f}"
-                    
-                    (text_width, text_height), baseline = cv2.getTextSize(
-                        label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1
-                    )
-                    
-                    cv2.rectangle(output, (x1, y1 - text_height - baseline),
-                                (x1 + text_width, y1), (0, 255, 0), -1)
-                    cv2.putText(output, label_text, (x1, y1 - baseline),
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
-            
-            return output
-            
-        except Exception as e:
-            logger.error(f"Error drawing detections: {e}")
-            return image
+    def _to_input_tensor(self, rgb: np.ndarray) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """Letterbox an RGB image and build a [3, H, W] float tensor"""
+        preprocessed, scale, pads = self._letterbox_fast(rgb, self.imgsz)
+        x = preprocessed.astype(np.float32) / 255.0
+        return x.transpose(2, 0, 1), scale, pads
+    
+    @staticmethod
+    def _unletterbox(detections_raw: np.ndarray, scale: float, pads: Tuple[int, int],
+                     offset: Tuple[int, int] = (0, 0)) -> np.ndarray:
+        """Map Nx6 boxes from model input coordinates back to image coordinates"""
+        if len(detections_raw) == 0:
+            return np.zeros((0, 6), dtype=np.float32)
+        out = np.array(detections_raw, dtype=np.float32, copy=True)
+        out[:, [0, 2]] = (out[:, [0, 2]] - pads[0]) / scale + offset[0]
+        out[:, [1, 3]] = (out[:, [1, 3]] - pads[1]) / scale + offset[1]
+        return out
+    
+    def _detect_full(self, image: np.ndarray, score_thres: float) -> Tuple[np.ndarray, float]:
+        """Single letterboxed pass over the whole frame"""
+        x, scale, pads = self._to_input_tensor(image)
+        
+        inference_start = time.time()
+        outputs = self.session.run(None, {self.input_name: x[None]})  # [1, 3, H, W]
+        inference_time = time.time() - inference_start
+        
+        detections_raw = self._yolo_universal_decode(
+            outputs, iou_thres=self.nms_threshold, score_thres=score_thres
+        )
+        return self._unletterbox(detections_raw, scale, pads), inference_time
+    
+    def _detect_tiled(self, image: np.ndarray, score_thres: float) -> Tuple[np.ndarray, float, Dict[str, Any]]:
+        """
+        Tiled high-resolution pass
+        
+        Splits the detection area (or whole frame) into overlapping tiles,
+        skips low-saliency tiles, runs the rest as one batch and merges the
+        per-tile detections with cross-tile NMS.
+        """
+        h, w = image.shape[:2]
+        area = clip_area(self.config.get('detection_area'), w, h)
+        tiles = compute_tiles(area, self.tile_size or self.imgsz, self.tile_overlap, self.tile_grid)
+        
+        # Cheap saliency pre-check
+        if self.tile_saliency_threshold > 0 and len(tiles) > 1:
+            saliency = tile_saliency(image, tiles)
+            active = [t for t, score in zip(tiles, saliency) if score >= self.tile_saliency_threshold]
+        else:
+            active = tiles
+        
+        stats = {'total': len(tiles), 'processed': len(active), 'skipped': len(tiles) - len(active), 'area': area}
+        if not active:
+            return np.zeros((0, 6), dtype=np.float32), 0.0, stats
+        
+        tensors, transforms = [], []
+        for x1, y1, x2, y2 in active:
+            x, scale, pads = self._to_input_tensor(image[y1:y2, x1:x2])
+            tensors.append(x)
+            transforms.append((scale, pads, (x1, y1)))
+        
+        # One batched run with a dynamic batch axis; a fixed batch N runs the
+        # tiles N at a time, the last group zero-padded (padded outputs discarded)
+        batch = self._input_batch_size()
+        groups = [tensors] if batch is None else [tensors[i:i + batch] for i in range(0, len(tensors), batch)]
+        inference_start = time.time()
+        per_tile = []
+        for group in groups:
+            feed = np.stack(group)
+            if batch is not None and len(group) < batch:
+                feed = np.concatenate([feed, np.zeros((batch - len(group),) + feed.shape[1:], dtype=feed.dtype)])
+            outputs = self.session.run(None, {self.input_name: feed})
+            per_tile.extend([o[i:i + 1] for o in outputs] for i in range(len(group)))
+        inference_time = time.time() - inference_start
+        
+        merged = [
+            self._unletterbox(
+                self._yolo_universal_decode(outputs, iou_thres=self.nms_threshold, score_thres=score_thres),
+                scale, pads, offset
+            )
+            for outputs, (scale, pads, offset) in zip(per_tile, transforms)
+        ]
+        merged = np.concatenate(merged, axis=0) if merged else np.zeros((0, 6), dtype=np.float32)
+        
+        # Cross-tile NMS removes duplicates from overlapping regions
+        if len(merged) > 1:
+            merged, _ = nms_detections(
+                merged, iou_threshold=self.nms_threshold,
+                pre_nms_top_k=self.nms_top_k, max_detections=self.max_detections,
+                class_agnostic=self.nms_class_agnostic
+            )
+        
+        logger.info(f"DetectTool tiled: {stats['processed']}/{stats['total']} tiles processed, "
+                    f"{len(merged)} merged detections")
+        return merged, inference_time, stats
+    
+    def _input_batch_size(self) -> Optional[int]:
+        """Fixed batch size of the ONNX input, None if the batch axis is dynamic"""
+        if self._batch_size is False:
+            try:
+                batch_dim = self.session.get_inputs()[0].shape[0]
+                self._batch_size = None if not isinstance(batch_dim, int) else max(1, batch_dim)
+            except Exception:
+                self._batch_size = 1
+        return self._batch_size
     
     def update_config(self, new_config: Dict[str, Any]) -> bool:
         """Update tool configuration"""
@@ -511,6 +622,7 @@ class DetectTool(BaseTool):
             self.session = None
         
         self.last_detections = []
+        self.tracker = None
         self.is_initialized = False
         logger.info(f"DetectTool {self.display_name} cleaned up")
 
@@ -541,7 +653,22 @@ def create_detect_tool_from_manager_config(manager_config: Dict[str, Any], tool_
         'class_thresholds': manager_config.get('class_thresholds', {}),
         'confidence_threshold': manager_config.get('confidence_threshold', 0.5),
         'nms_threshold': manager_config.get('nms_threshold', 0.45),
+        'nms_top_k': manager_config.get('nms_top_k', 1000),
+        'max_detections': manager_config.get('max_detections', 300),
+        'nms_class_agnostic': manager_config.get('nms_class_agnostic', False),
         'imgsz': manager_config.get('imgsz', 640),
+        'detection_area': manager_config.get('detection_area'),
+        'tiled_inference': manager_config.get('tiled_inference', False),
+        'tile_size': manager_config.get('tile_size', 0),
+        'tile_overlap': manager_config.get('tile_overlap', 0.2),
+        'tile_grid': manager_config.get('tile_grid', None),
+        'tile_saliency_threshold': manager_config.get('tile_saliency_threshold', 4.0),
+        'tracking_enabled': manager_config.get('tracking_enabled', False),
+        'keyframe_interval': manager_config.get('keyframe_interval', 5),
+        'track_iou_threshold': manager_config.get('track_iou_threshold', 0.3),
+        'track_min_confidence': manager_config.get('track_min_confidence', 0.3),
+        'track_low_score': manager_config.get('track_low_score', 0.1),
+        'track_max_age': manager_config.get('track_max_age', 15),
         'visualize_results': manager_config.get('visualize_results', True),
         'show_confidence': manager_config.get('show_confidence', True),
         'show_class_names': manager_config.get('show_class_names', True)
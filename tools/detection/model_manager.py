@@ -1,17 +1,22 @@
 import os
 import json
 import logging
+from importlib.util import find_spec
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
-# Try to import ONNX libraries, handle gracefully if not available
-try:
+# Only check that ONNX libraries exist: they are imported when a model is
+# first inspected, listing models at startup does not need them
+ONNX_AVAILABLE = find_spec('onnx') is not None and find_spec('onnxruntime') is not None
+if not ONNX_AVAILABLE:
+    logging.warning("ONNX or ONNXRuntime not available. Model validation will be limited.")
+
+
+def _onnx_modules():
+    """(onnx, onnxruntime), imported on first use"""
     import onnx
     import onnxruntime as ort
-    ONNX_AVAILABLE = True
-except ImportError:
-    ONNX_AVAILABLE = False
-    logging.warning("ONNX or ONNXRuntime not available. Model validation will be limited.")
+    return onnx, ort
 
 class ModelManager:
     """Manager for YOLO ONNX models and their classes"""
@@ -111,6 +116,7 @@ class ModelManager:
             if ONNX_AVAILABLE:
                 try:
                     # Load model and analyze
+                    onnx, _ = _onnx_modules()
                     model = onnx.load(str(model_path))
                     inputs = model.graph.input
                     outputs = model.graph.output
@@ -278,6 +284,7 @@ class ModelManager:
                 
             # Try to load and check model with ONNX
             try:
+                onnx, ort = _onnx_modules()
                 model = onnx.load(model_path)
                 onnx.checker.check_model(model)
             except Exception as e:
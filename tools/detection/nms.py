@@ -0,0 +1,189 @@
+"""
+Shared Non-Maximum Suppression for detection tools
+Class-aware batched NMS with top-k prefilter, blocked IoU matrix for small N
+and OpenCV native batched NMS for large N
+"""
+
+import logging
+import numpy as np
+from typing import Optional, Tuple
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# Candidate count above which OpenCV's native NMS is faster than the IoU matrix
+NATIVE_NMS_THRESHOLD = 512
+
+# Rows per block when building the IoU matrix (bounds memory to BLOCK_SIZE x N)
+BLOCK_SIZE = 128
+
+# Default number of highest-scoring candidates kept before NMS
+DEFAULT_PRE_NMS_TOP_K = 1000
+
+_HAS_NMS_BATCHED = hasattr(cv2, 'dnn') and hasattr(cv2.dnn, 'NMSBoxesBatched')
+
+
+def xywh_to_xyxy(xywh: np.ndarray) -> np.ndarray:
+    """Convert Nx4 center format [cx, cy, w, h] to corner format [x1, y1, x2, y2]"""
+    xywh = np.asarray(xywh, dtype=np.float32)
+    half = xywh[:, 2:4] * 0.5
+    return np.concatenate([xywh[:, 0:2] - half, xywh[:, 0:2] + half], axis=1)
+
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise IoU between two sets of boxes
+
+    Args:
+        boxes_a: Mx4 array [x1, y1, x2, y2]
+        boxes_b: Nx4 array [x1, y1, x2, y2]
+
+    Returns:
+        MxN IoU matrix
+    """
+    ax1, ay1, ax2, ay2 = (np.ascontiguousarray(boxes_a[:, i]) for i in range(4))
+    bx1, by1, bx2, by2 = (np.ascontiguousarray(boxes_b[:, i]) for i in range(4))
+
+    # 2-D temporaries with in-place ops (much faster than (M, N, 2) broadcasting)
+    inter = np.minimum(ax2[:, None], bx2[None, :])
+    inter -= np.maximum(ax1[:, None], bx1[None, :])
+    np.maximum(inter, 0, out=inter)
+    h = np.minimum(ay2[:, None], by2[None, :])
+    h -= np.maximum(ay1[:, None], by1[None, :])
+    np.maximum(h, 0, out=h)
+    inter *= h
+
+    area_a = np.maximum(0, ax2 - ax1) * np.maximum(0, ay2 - ay1)
+    area_b = np.maximum(0, bx2 - bx1) * np.maximum(0, by2 - by1)
+    union = area_a[:, None] + area_b[None, :]
+    union -= inter
+    union += 1e-6
+
+    inter /= union
+    return inter
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores (unordered), using argpartition"""
+    if k <= 0 or scores.shape[0] <= k:
+        return np.arange(scores.shape[0])
+    return np.argpartition(-scores, k - 1)[:k]
+
+
+def _nms_iou_matrix(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Exact greedy NMS from a blocked IoU matrix
+
+    The boolean overlap matrix is built BLOCK_SIZE rows at a time (upper
+    triangle only) so float temporaries stay bounded. The greedy pass then
+    only touches rows of kept boxes, one vectorized AND per kept box.
+    """
+    order = np.argsort(-scores, kind='stable')
+    sorted_boxes = boxes[order]
+    n = sorted_boxes.shape[0]
+
+    over = np.empty((n, n), dtype=bool)
+    for start in range(0, n, BLOCK_SIZE):
+        end = min(start + BLOCK_SIZE, n)
+        np.greater(box_iou(sorted_boxes[start:end], sorted_boxes[start:]), iou_threshold,
+                   out=over[start:end, start:])
+
+    keep = np.ones(n, dtype=bool)
+    for i in range(n - 1):
+        if keep[i]:
+            keep[i + 1:] &= ~over[i, i + 1:]
+
+    return order[keep]
+
+
+def _nms_opencv(boxes: np.ndarray, scores: np.ndarray, class_ids: Optional[np.ndarray],
+                iou_threshold: float) -> np.ndarray:
+    """NMS through cv2.dnn without converting arrays to Python lists"""
+    xywh = np.empty_like(boxes, dtype=np.float32)
+    xywh[:, :2] = boxes[:, :2]
+    xywh[:, 2:] = boxes[:, 2:] - boxes[:, :2]
+    scores = np.ascontiguousarray(scores, dtype=np.float32)
+
+    if class_ids is not None and _HAS_NMS_BATCHED:
+        indices = cv2.dnn.NMSBoxesBatched(xywh, scores, class_ids.astype(np.int32), 0.0, float(iou_threshold))
+    else:
+        indices = cv2.dnn.NMSBoxes(xywh, scores, 0.0, float(iou_threshold))
+
+    return np.asarray(indices, dtype=np.int64).reshape(-1)
+
+
+def batched_nms(boxes: np.ndarray, scores: np.ndarray, class_ids: Optional[np.ndarray] = None,
+                iou_threshold: float = 0.45, score_threshold: float = 0.0,
+                pre_nms_top_k: int = DEFAULT_PRE_NMS_TOP_K, max_detections: int = 0,
+                class_agnostic: bool = False, method: str = 'auto') -> np.ndarray:
+    """
+    Class-aware Non-Maximum Suppression
+
+    Boxes of different classes never suppress each other: each class is
+    shifted to its own coordinate region (offset = class_id * coordinate span)
+    so a single NMS pass handles all classes at once.
+
+    Args:
+        boxes: Nx4 array [x1, y1, x2, y2]
+        scores: N array of confidence scores
+        class_ids: N array of class ids (None or class_agnostic=True for class-agnostic NMS)
+        iou_threshold: IoU above which a lower-scoring box is suppressed
+        score_threshold: Candidates below this score are dropped before NMS
+        pre_nms_top_k: Keep only the k best candidates before NMS (0 = no limit)
+        max_detections: Maximum number of boxes returned (0 = no limit)
+        class_agnostic: Suppress across classes
+        method: 'auto', 'matrix' or 'opencv'
+
+    Returns:
+        Array of kept indices into the input arrays, sorted by descending score
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+    if boxes.shape[0] == 0:
+        return np.array([], dtype=np.int64)
+
+    # Score filter + top-k prefilter
+    candidates = np.flatnonzero(scores >= score_threshold) if score_threshold > 0 else np.arange(scores.shape[0])
+    if candidates.size == 0:
+        return np.array([], dtype=np.int64)
+    if pre_nms_top_k and candidates.size > pre_nms_top_k:
+        candidates = candidates[top_k_indices(scores[candidates], pre_nms_top_k)]
+
+    cand_boxes = boxes[candidates]
+    cand_scores = scores[candidates]
+    cand_classes = None
+    if class_ids is not None and not class_agnostic:
+        cand_classes = np.asarray(class_ids).reshape(-1)[candidates].astype(np.int64)
+
+    if method == 'auto':
+        method = 'opencv' if candidates.size > NATIVE_NMS_THRESHOLD else 'matrix'
+
+    if method == 'opencv':
+        keep = _nms_opencv(cand_boxes, cand_scores, cand_classes, iou_threshold)
+    else:
+        if cand_classes is not None:
+            # Coordinate offset trick: disjoint region per class
+            span = float(cand_boxes.max() - cand_boxes.min()) + 1.0
+            cand_boxes = cand_boxes + (cand_classes * span).astype(np.float32)[:, None]
+        keep = _nms_iou_matrix(cand_boxes, cand_scores, iou_threshold)
+
+    # Sort by score (OpenCV already does, matrix path does too; keep it explicit)
+    keep = keep[np.argsort(-cand_scores[keep], kind='stable')]
+    if max_detections and keep.size > max_detections:
+        keep = keep[:max_detections]
+
+    return candidates[keep].astype(np.int64)
+
+
+def nms_detections(detections: np.ndarray, iou_threshold: float = 0.45, **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply batched_nms to an Nx6 detection array [x1, y1, x2, y2, score, class_id]
+
+    Returns:
+        Tuple of (filtered Nx6 array, kept indices)
+    """
+    detections = np.asarray(detections, dtype=np.float32).reshape(-1, 6)
+    keep = batched_nms(detections[:, :4], detections[:, 4], detections[:, 5].astype(np.int64),
+                       iou_threshold=iou_threshold, **kwargs)
+    return detections[keep], keep
@@ -12,10 +12,12 @@ class OcrTool(BaseTool):
     def __init__(self, name: str = "OCR", config: Optional[Dict[str, Any]] = None):
         super().__init__(name, config)
         self._ocr_engine = None
-        self._initialize_ocr()
+        # easyocr.Reader nạp model (vài giây trên Pi): khởi tạo ở lần process() đầu tiên
+        self._ocr_initialized = False
         
     def _initialize_ocr(self):
         """Khởi tạo OCR engine"""
+        self._ocr_initialized = True
         try:
             # Thử import easyocr trước
             import easyocr
@@ -169,6 +171,8 @@ class OcrTool(BaseTool):
             Tuple chứa ảnh đã xử lý và kết quả OCR
         """
         try:
+            if not self._ocr_initialized:
+                self._initialize_ocr()
             if self._ocr_engine is None:
                 return image, {"error": "No OCR engine available"}
                 
@@ -0,0 +1,100 @@
+"""
+Tile planning for high-resolution detection
+Splits a frame (or detection area) into overlapping model-sized tiles and
+skips visually empty tiles with a cheap saliency pre-check
+"""
+
+import math
+import logging
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# Downscale factor used for the saliency pre-check
+SALIENCY_DOWNSCALE = 8
+
+
+def _axis_tiles(start: int, length: int, tile: int, count: Optional[int], overlap: float) -> List[Tuple[int, int]]:
+    """Tile (offset, size) pairs along one axis"""
+    if length <= tile and not count:
+        return [(start, length)]
+
+    if count:
+        count = max(1, int(count))
+        # Tile size so that `count` tiles with the given overlap cover `length`
+        tile = int(math.ceil(length / (count - (count - 1) * overlap))) if count > 1 else length
+        tile = min(tile, length)
+    else:
+        step = max(1, int(tile * (1.0 - overlap)))
+        count = int(math.ceil((length - tile) / step)) + 1
+
+    if count == 1:
+        return [(start, length)]
+
+    # Spread tiles evenly; the last tile ends exactly at the area border
+    step = (length - tile) / (count - 1)
+    return [(start + int(round(i * step)), tile) for i in range(count)]
+
+
+def compute_tiles(area: Tuple[int, int, int, int], tile_size: int = 640, overlap: float = 0.2,
+                  grid: Optional[Sequence[int]] = None) -> List[Tuple[int, int, int, int]]:
+    """
+    Plan overlapping tiles over an area
+
+    Args:
+        area: (x1, y1, x2, y2) region to cover, in image pixels
+        tile_size: Tile edge in source pixels when no grid is given (usually imgsz, i.e. no downscale)
+        overlap: Fraction of the tile shared with its neighbour (0..0.9)
+        grid: Optional (cols, rows) tile count; tile size is derived from it
+
+    Returns:
+        List of tiles as (x1, y1, x2, y2)
+    """
+    x1, y1, x2, y2 = [int(v) for v in area]
+    overlap = min(max(float(overlap), 0.0), 0.9)
+    cols, rows = (grid[0], grid[1]) if grid else (None, None)
+
+    xs = _axis_tiles(x1, x2 - x1, tile_size, cols, overlap)
+    ys = _axis_tiles(y1, y2 - y1, tile_size, rows, overlap)
+
+    return [(tx, ty, tx + tw, ty + th) for ty, th in ys for tx, tw in xs]
+
+
+def clip_area(area: Optional[Sequence[float]], width: int, height: int) -> Tuple[int, int, int, int]:
+    """Clip an (x1, y1, x2, y2) area to the image, falling back to the full frame"""
+    if not area or len(area) != 4:
+        return 0, 0, width, height
+    x1, y1, x2, y2 = [int(round(float(v))) for v in area]
+    x1, x2 = sorted((max(0, min(x1, width)), max(0, min(x2, width))))
+    y1, y2 = sorted((max(0, min(y1, height)), max(0, min(y2, height))))
+    if x2 - x1 < 2 or y2 - y1 < 2:
+        return 0, 0, width, height
+    return x1, y1, x2, y2
+
+
+def tile_saliency(image: np.ndarray, tiles: List[Tuple[int, int, int, int]]) -> np.ndarray:
+    """
+    Cheap per-tile saliency score: gray-level standard deviation on a downscaled copy
+
+    A flat belt or empty tray gives a score close to the sensor noise level,
+    anything with edges or texture scores much higher.
+
+    Returns:
+        Array with one score per tile
+    """
+    h, w = image.shape[:2]
+    small = cv2.resize(image, (max(1, w // SALIENCY_DOWNSCALE), max(1, h // SALIENCY_DOWNSCALE)),
+                       interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    scores = np.zeros(len(tiles), dtype=np.float32)
+    for i, (x1, y1, x2, y2) in enumerate(tiles):
+        patch = small[y1 // SALIENCY_DOWNSCALE:max(y1 // SALIENCY_DOWNSCALE + 1, y2 // SALIENCY_DOWNSCALE),
+                      x1 // SALIENCY_DOWNSCALE:max(x1 // SALIENCY_DOWNSCALE + 1, x2 // SALIENCY_DOWNSCALE)]
+        if patch.size:
+            scores[i] = float(patch.std())
+    return scores
@@ -0,0 +1,241 @@
+"""
+Multi-object tracker for live-mode detection
+ByteTrack-style IoU association with a constant-velocity Kalman filter, so
+DetectTool can run the full model only on keyframes and propagate boxes in between
+"""
+
+import itertools
+import logging
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+from .nms import box_iou
+
+logger = logging.getLogger(__name__)
+
+# Process-wide track ids: DetectTool rebuilds its tracker on re-initialization,
+# while ClassificationTool/ResultTool keep caches keyed by track_id. Ids are
+# never reused across tracker instances so a new part cannot inherit them.
+_TRACK_IDS = itertools.count(1)
+
+
+class KalmanBoxFilter:
+    """
+    Constant-velocity Kalman filter over [cx, cy, w, h, vx, vy, vw, vh]
+
+    Parts on a conveyor move at near-constant speed, so a linear model
+    predicts their position well between keyframes.
+    """
+
+    _F = np.eye(8, dtype=np.float64)
+    _F[:4, 4:] = np.eye(4)
+    _H = np.eye(4, 8, dtype=np.float64)
+
+    def __init__(self, box: np.ndarray):
+        x1, y1, x2, y2 = box[:4]
+        w, h = max(x2 - x1, 1.0), max(y2 - y1, 1.0)
+        self.x = np.array([x1 + w / 2, y1 + h / 2, w, h, 0, 0, 0, 0], dtype=np.float64)
+        self.P = np.diag([w, h, w, h, 10 * w, 10 * h, w, h]) ** 2 * 0.01
+        self._std_pos = 1.0 / 20
+        self._std_vel = 1.0 / 160
+
+    def _noise(self) -> Tuple[np.ndarray, np.ndarray]:
+        w, h = self.x[2], self.x[3]
+        q = np.array([w, h, w, h]) * self._std_pos
+        qv = np.array([w, h, w, h]) * self._std_vel
+        return np.diag(np.concatenate([q, qv]) ** 2), np.diag(q ** 2)
+
+    def predict(self) -> np.ndarray:
+        Q, _ = self._noise()
+        self.x = self._F @ self.x
+        self.x[2:4] = np.maximum(self.x[2:4], 1.0)
+        self.P = self._F @ self.P @ self._F.T + Q
+        return self.box()
+
+    def update(self, box: np.ndarray) -> None:
+        x1, y1, x2, y2 = box[:4]
+        z = np.array([(x1 + x2) / 2, (y1 + y2) / 2, max(x2 - x1, 1.0), max(y2 - y1, 1.0)])
+        _, R = self._noise()
+        S = self._H @ self.P @ self._H.T + R
+        K = self.P @ self._H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ (z - self._H @ self.x)
+        self.P = (np.eye(8) - K @ self._H) @ self.P
+
+    def box(self) -> np.ndarray:
+        cx, cy, w, h = self.x[:4]
+        return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], dtype=np.float32)
+
+
+class Track:
+    """One tracked part with a stable id"""
+
+    def __init__(self, track_id: int, detection: np.ndarray):
+        self.track_id = track_id
+        self.kf = KalmanBoxFilter(detection)
+        self.class_id = int(detection[5])
+        self.score = float(detection[4])          # Score from the last real detection
+        self.confidence = float(detection[4])     # Decays while propagated without detection
+        self.hits = 1
+        self.age = 1
+        self.frames_since_update = 0
+
+    def predict(self, decay: float) -> None:
+        self.kf.predict()
+        self.age += 1
+        self.frames_since_update += 1
+        self.confidence *= decay
+
+    def update(self, detection: np.ndarray) -> None:
+        self.kf.update(detection)
+        self.class_id = int(detection[5])
+        self.score = float(detection[4])
+        self.confidence = float(detection[4])
+        self.hits += 1
+        self.frames_since_update = 0
+
+    def to_row(self) -> np.ndarray:
+        # Report the last real detection score; confidence only drives keyframe refresh
+        return np.concatenate([self.kf.box(), [self.score, self.class_id]]).astype(np.float32)
+
+
+def _greedy_match(iou: np.ndarray, threshold: float) -> List[Tuple[int, int]]:
+    """Greedy highest-IoU-first assignment (few parts per frame, no scipy needed)"""
+    matches = []
+    if iou.size == 0:
+        return matches
+    iou = iou.copy()
+    while True:
+        r, c = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[r, c] < threshold:
+            break
+        matches.append((int(r), int(c)))
+        iou[r, :] = -1
+        iou[:, c] = -1
+    return matches
+
+
+class MultiObjectTracker:
+    """
+    ByteTrack-style tracker
+
+    update() associates keyframe detections with existing tracks in two
+    stages (high-score detections first, then low-score ones for tracks
+    left over); propagate() advances all tracks with the Kalman model for
+    frames where detection was skipped.
+    """
+
+    def __init__(self, keyframe_interval: int = 5, iou_threshold: float = 0.3,
+                 high_score: float = 0.5, min_confidence: float = 0.3,
+                 max_age: int = 15, min_hits: int = 1, confidence_decay: float = 0.95):
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.iou_threshold = iou_threshold
+        self.high_score = high_score
+        self.min_confidence = min_confidence
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.confidence_decay = confidence_decay
+
+        self.tracks: List[Track] = []
+        self.tracks_created = 0
+        self._frames_since_keyframe = self.keyframe_interval  # First frame is always a keyframe
+        self.keyframes = 0
+        self.propagated_frames = 0
+
+    def reset(self) -> None:
+        """Drop all tracks (e.g. on mode change or job reload)"""
+        self.tracks = []
+        self._frames_since_keyframe = self.keyframe_interval
+
+    def needs_detection(self) -> bool:
+        """True if the next frame should run the full detector"""
+        if self._frames_since_keyframe + 1 >= self.keyframe_interval:
+            return True
+        # Track confidence dropped: refresh with a real detection
+        return any(t.confidence < self.min_confidence for t in self._visible_tracks())
+
+    def update(self, detections: np.ndarray) -> np.ndarray:
+        """
+        Keyframe step: predict all tracks, associate detections, spawn/retire tracks
+
+        Args:
+            detections: Nx6 array [x1, y1, x2, y2, score, class_id] in image coordinates
+
+        Returns:
+            Mx7 array [x1, y1, x2, y2, score, class_id, track_id] of confirmed tracks
+        """
+        detections = np.asarray(detections, dtype=np.float32).reshape(-1, 6)
+        for track in self.tracks:
+            track.predict(self.confidence_decay)
+
+        high = detections[detections[:, 4] >= self.high_score]
+        low = detections[detections[:, 4] < self.high_score]
+
+        # Stage 1: high-score detections vs all tracks
+        unmatched_tracks = list(range(len(self.tracks)))
+        unmatched_high = self._associate(high, unmatched_tracks)
+
+        # Stage 2: low-score detections only rescue existing tracks
+        self._associate(low, unmatched_tracks)
+
+        # New tracks from unmatched high-score detections
+        for det in unmatched_high:
+            self.tracks.append(Track(next(_TRACK_IDS), det))
+            self.tracks_created += 1
+
+        self.tracks = [t for t in self.tracks if t.frames_since_update <= self.max_age]
+        self._frames_since_keyframe = 0
+        self.keyframes += 1
+        return self._output()
+
+    def propagate(self) -> np.ndarray:
+        """Non-keyframe step: motion-only prediction of all tracks"""
+        for track in self.tracks:
+            track.predict(self.confidence_decay)
+        self.tracks = [t for t in self.tracks if t.frames_since_update <= self.max_age]
+        self._frames_since_keyframe += 1
+        self.propagated_frames += 1
+        return self._output()
+
+    def _associate(self, detections: np.ndarray, unmatched_tracks: List[int]) -> List[np.ndarray]:
+        """Match detections to tracks of the same class; mutates unmatched_tracks"""
+        if len(detections) == 0:
+            return []
+        if not unmatched_tracks:
+            return list(detections)
+
+        track_boxes = np.stack([self.tracks[i].kf.box() for i in unmatched_tracks])
+        iou = box_iou(detections[:, :4], track_boxes)
+        # Different classes never match
+        det_cls = detections[:, 5].astype(int)[:, None]
+        trk_cls = np.array([self.tracks[i].class_id for i in unmatched_tracks])[None, :]
+        iou[det_cls != trk_cls] = 0.0
+
+        matched_dets = set()
+        matched_tracks = set()
+        for d, t in _greedy_match(iou, self.iou_threshold):
+            self.tracks[unmatched_tracks[t]].update(detections[d])
+            matched_dets.add(d)
+            matched_tracks.add(unmatched_tracks[t])
+
+        unmatched_tracks[:] = [i for i in unmatched_tracks if i not in matched_tracks]
+        return [detections[d] for d in range(len(detections)) if d not in matched_dets]
+
+    def _visible_tracks(self) -> List[Track]:
+        """Tracks matched at the last keyframe (lost tracks are kept but not reported)"""
+        return [t for t in self.tracks
+                if t.hits >= self.min_hits and t.frames_since_update <= self._frames_since_keyframe]
+
+    def _output(self) -> np.ndarray:
+        rows = [np.append(t.to_row(), t.track_id) for t in self._visible_tracks()]
+        return np.array(rows, dtype=np.float32).reshape(-1, 7)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tracker statistics for result dicts / UI"""
+        total = self.keyframes + self.propagated_frames
+        return {
+            'active_tracks': len(self.tracks),
+            'keyframes': self.keyframes,
+            'propagated_frames': self.propagated_frames,
+            'detection_ratio': (self.keyframes / total) if total else 1.0,
+            'tracks_created': self.tracks_created,
+        }
@@ -0,0 +1,256 @@
+"""
+NG frame archive - ring buffer of recent frames with deferred saving
+
+Keeps the last pre_frames processed frames together with their OK/NG result.
+When a frame is judged NG, the NG frame plus a window of frames before and
+after it is written to disk; OK frames are only sampled. The pipeline thread
+only copies the frame and enqueues it; a worker thread encodes (downscaled
+first) only the frames that are actually written.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+import cv2
+import numpy as np
+
+from tools.pixel_format import LAYOUT_BGR, LAYOUT_GRAY, convert_layout
+
+logger = logging.getLogger(__name__)
+
+STATUS_NG = 'NG'
+DEFAULT_NG_WAIT_S = 2.0  # Longest push() blocks for an NG frame when only NG frames are queued
+
+_STOP = object()
+
+
+@dataclass
+class ArchivedFrame:
+    """One frame held in the ring (encoded only when written)"""
+    seq: int
+    timestamp: float
+    status: Optional[str]
+    image: Optional[np.ndarray]
+    layout: str
+    persisted: bool = False
+
+
+class NGFrameArchive:
+    """
+    Ring buffer + background writer for NG-triggered frame capture
+
+    All ring/window state is owned by the worker thread, so push() never
+    waits for encoding or disk I/O. If the worker falls behind (more than
+    2 * ring_size frames waiting), new non-NG frames are dropped (and
+    counted). NG frames are never dropped: the oldest waiting non-NG frame
+    is evicted for them, and only if every waiting frame is NG does push()
+    wait (up to ng_wait_s) for the worker.
+    """
+
+    def __init__(self, directory: str, prefix: str = "", image_format: str = "JPG",
+                 ring_size: int = 30, pre_frames: int = 5, post_frames: int = 5,
+                 ok_sample_every: int = 100, scale: float = 1.0, jpeg_quality: int = 90,
+                 ng_wait_s: float = DEFAULT_NG_WAIT_S):
+        self.directory = directory
+        self.prefix = prefix
+        self.image_format = (image_format or "JPG").upper()
+        self.ring_size = max(1, int(ring_size))
+        self.pre_frames = max(0, min(int(pre_frames), self.ring_size - 1))
+        self.post_frames = max(0, int(post_frames))
+        self.ok_sample_every = max(0, int(ok_sample_every))
+        self.scale = float(scale) if scale and 0 < float(scale) <= 1.0 else 1.0
+        self.jpeg_quality = int(jpeg_quality)
+        self.ng_wait_s = max(0.0, float(ng_wait_s))
+
+        # Only frames that can still become pre-trigger frames are kept
+        self._ring: Deque[ArchivedFrame] = deque(maxlen=self.pre_frames)
+        self._post_remaining = 0
+        self._ok_counter = 0
+        self._seq = 0
+
+        self._cond = threading.Condition()
+        self._queue: Deque[Any] = deque()
+        self._queue_size = self.ring_size * 2
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.frames_pushed = 0
+        self.frames_dropped = 0
+        self.ng_dropped = 0
+        self.ng_events = 0
+        self.files_written = 0
+        self.bytes_written = 0
+        self.write_errors = 0
+
+    @property
+    def extension(self) -> str:
+        return 'jpg' if self.image_format in ('JPG', 'JPEG') else self.image_format.lower()
+
+    # ------------------------------------------------------------------
+    # Pipeline side
+    # ------------------------------------------------------------------
+    def push(self, image: np.ndarray, layout: str, status: Optional[str]) -> bool:
+        """
+        Hand one processed frame to the archive (non-blocking)
+
+        Args:
+            image: Frame as it sits in memory
+            layout: Its pixel layout (tools.pixel_format LAYOUT_*)
+            status: 'OK' / 'NG' / None (no judgment)
+        """
+        if self._closed or image is None or image.size == 0:
+            return False
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker_loop, name="NGFrameArchive", daemon=True)
+            self._thread.start()
+        # Copy: camera buffers get reused while the worker is still encoding
+        entry = (np.ascontiguousarray(image).copy(), layout, status, time.time())
+        with self._cond:
+            if self._frames_waiting() >= self._queue_size and not self._make_room(status):
+                if status == STATUS_NG:
+                    self.ng_dropped += 1
+                    logger.error(f"NGFrameArchive: Worker stalled, NG frame not archived "
+                                 f"(NG frames lost so far: {self.ng_dropped})")
+                else:
+                    self.frames_dropped += 1
+                    if self.frames_dropped % 100 == 1:
+                        logger.warning(f"NGFrameArchive: Worker behind, frames dropped so far: {self.frames_dropped}")
+                return False
+            self._queue.append(entry)
+            self._cond.notify_all()
+        self.frames_pushed += 1
+        return True
+
+    def _frames_waiting(self) -> int:
+        return sum(1 for entry in self._queue if isinstance(entry, tuple))
+
+    def _make_room(self, status: Optional[str]) -> bool:
+        """Free a slot for an NG frame (caller holds the lock); other frames get none"""
+        if status != STATUS_NG:
+            return False
+        # Evict the oldest waiting non-NG frame
+        for i, entry in enumerate(self._queue):
+            if isinstance(entry, tuple) and entry[2] != STATUS_NG:
+                del self._queue[i]
+                self.frames_dropped += 1
+                return True
+        # Only NG frames waiting: wait for the worker rather than lose one
+        return self._cond.wait_for(lambda: self._frames_waiting() < self._queue_size, self.ng_wait_s)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every frame pushed so far is handled and any triggered files written"""
+        if self._thread is None:
+            return True
+        event = threading.Event()
+        with self._cond:
+            self._queue.append(event)
+            self._cond.notify_all()
+        return event.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            with self._cond:
+                self._queue.append(_STOP)
+                self._cond.notify_all()
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("NGFrameArchive: Worker did not drain before close")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'buffered': len(self._ring),
+            'pushed': self.frames_pushed,
+            'dropped': self.frames_dropped,
+            'ng_dropped': self.ng_dropped,
+            'ng_events': self.ng_events,
+            'files_written': self.files_written,
+            'bytes_written': self.bytes_written,
+            'write_errors': self.write_errors,
+        }
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue)
+                entry = self._queue.popleft()
+                # A slot is free: wake a push() waiting with an NG frame
+                self._cond.notify_all()
+            if entry is _STOP:
+                break
+            if isinstance(entry, threading.Event):
+                entry.set()
+                continue
+            try:
+                self._handle_frame(*entry)
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"NGFrameArchive: Error archiving frame: {e}", exc_info=True)
+
+    def _encode(self, image: np.ndarray, layout: str) -> bytes:
+        # Downscale first: the layout conversion then touches fewer pixels
+        if self.scale < 1.0:
+            image = cv2.resize(image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        if layout != LAYOUT_GRAY:
+            image = convert_layout(image, layout, LAYOUT_BGR)
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality] if self.extension == 'jpg' else []
+        ok, buf = cv2.imencode('.' + self.extension, image, params)
+        if not ok:
+            raise ValueError(f"Encoding to {self.extension} failed")
+        return buf.tobytes()
+
+    def _handle_frame(self, image: np.ndarray, layout: str, status: Optional[str], timestamp: float) -> None:
+        self._seq += 1
+        # Not encoded here: most OK frames are never written
+        frame = ArchivedFrame(self._seq, timestamp, status, image, layout)
+
+        if status == STATUS_NG:
+            # NG: the frames before it in the ring, itself, then the next post_frames
+            self.ng_events += 1
+            for previous in list(self._ring):
+                self._persist(previous, 'pre')
+            self._persist(frame, 'NG')
+            self._post_remaining = self.post_frames
+        elif self._post_remaining > 0:
+            self._post_remaining -= 1
+            self._persist(frame, 'post')
+        elif self.ok_sample_every:
+            self._ok_counter += 1
+            if self._ok_counter >= self.ok_sample_every:
+                self._ok_counter = 0
+                self._persist(frame, status or 'sample')
+
+        self._ring.append(frame)
+
+    def _persist(self, frame: ArchivedFrame, tag: str) -> None:
+        if frame.persisted:
+            return
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(frame.timestamp))
+        millis = int((frame.timestamp % 1) * 1000)
+        name = f"{stamp}-{millis:03d}_{frame.seq:07d}_{tag}.{self.extension}"
+        if self.prefix:
+            name = f"{self.prefix}_{name}"
+        path = os.path.join(self.directory, name)
+        try:
+            data = self._encode(frame.image, frame.layout)
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+            frame.persisted = True
+            frame.image = None  # Written, never needed again
+            self.files_written += 1
+            self.bytes_written += len(data)
+            logger.debug(f"NGFrameArchive: Wrote {path}")
+        except OSError as e:
+            self.write_errors += 1
+            logger.error(f"NGFrameArchive: Failed to write {path}: {e}")
@@ -0,0 +1,152 @@
+"""
+Pixel-format negotiation cho pipeline
+Mỗi frame mang theo layout bộ nhớ thực tế (BGR/RGB/BGRA/RGBA/GRAY), mỗi tool
+khai báo layout nó cần, và việc chuyển đổi chỉ chạy một lần cho mỗi layout trên
+mỗi frame (kết quả được cache trong FrameFormats)
+"""
+
+import logging
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_BGR = 'BGR'
+LAYOUT_RGB = 'RGB'
+LAYOUT_BGRA = 'BGRA'
+LAYOUT_RGBA = 'RGBA'
+LAYOUT_GRAY = 'GRAY'
+
+# Context keys used by Job.run and the tools
+CONTEXT_FRAME_FORMATS = 'frame_formats'
+CONTEXT_FRAME_LAYOUT = 'frame_layout'
+
+_CONVERSIONS: Dict[Tuple[str, str], int] = {
+    (LAYOUT_BGR, LAYOUT_RGB): cv2.COLOR_BGR2RGB,
+    (LAYOUT_BGR, LAYOUT_GRAY): cv2.COLOR_BGR2GRAY,
+    (LAYOUT_BGR, LAYOUT_BGRA): cv2.COLOR_BGR2BGRA,
+    (LAYOUT_RGB, LAYOUT_BGR): cv2.COLOR_RGB2BGR,
+    (LAYOUT_RGB, LAYOUT_GRAY): cv2.COLOR_RGB2GRAY,
+    (LAYOUT_RGB, LAYOUT_RGBA): cv2.COLOR_RGB2RGBA,
+    (LAYOUT_BGRA, LAYOUT_BGR): cv2.COLOR_BGRA2BGR,
+    (LAYOUT_BGRA, LAYOUT_RGB): cv2.COLOR_BGRA2RGB,
+    (LAYOUT_BGRA, LAYOUT_GRAY): cv2.COLOR_BGRA2GRAY,
+    (LAYOUT_RGBA, LAYOUT_RGB): cv2.COLOR_RGBA2RGB,
+    (LAYOUT_RGBA, LAYOUT_BGR): cv2.COLOR_RGBA2BGR,
+    (LAYOUT_RGBA, LAYOUT_GRAY): cv2.COLOR_RGBA2GRAY,
+    (LAYOUT_GRAY, LAYOUT_BGR): cv2.COLOR_GRAY2BGR,
+    (LAYOUT_GRAY, LAYOUT_RGB): cv2.COLOR_GRAY2RGB,
+}
+
+# Layout names a tool or the UI may pass in, mapped to canonical layouts
+_ALIASES = {
+    'BGR': LAYOUT_BGR, 'RGB': LAYOUT_RGB, 'BGRA': LAYOUT_BGRA, 'RGBA': LAYOUT_RGBA,
+    'GRAY': LAYOUT_GRAY, 'GREY': LAYOUT_GRAY, 'MONO': LAYOUT_GRAY,
+}
+
+
+def normalize_layout(layout: Optional[str]) -> Optional[str]:
+    """Canonical layout name, or None if unknown"""
+    if not layout:
+        return None
+    return _ALIASES.get(str(layout).upper())
+
+
+def memory_layout(image: np.ndarray, pixel_format: Optional[str] = None) -> str:
+    """
+    Byte order of a camera frame as it sits in memory
+
+    Picamera2 names formats after the little-endian word, so the bytes are
+    reversed: 'RGB888' and 'BGR888' both arrive as BGR for 3 channels, and
+    XRGB8888/XBGR8888 arrive as BGRA (same rule as CameraDisplayWorker).
+    A plain layout name ('RGB', 'BGR', ...) in pixel_format is taken as-is.
+    """
+    explicit = normalize_layout(pixel_format)
+    channels = 1 if image.ndim == 2 else image.shape[2]
+
+    if explicit is not None:
+        expected = {LAYOUT_GRAY: 1, LAYOUT_BGR: 3, LAYOUT_RGB: 3, LAYOUT_BGRA: 4, LAYOUT_RGBA: 4}[explicit]
+        if expected == channels:
+            return explicit
+
+    if channels == 1:
+        return LAYOUT_GRAY
+    if channels == 4:
+        return LAYOUT_BGRA
+    return LAYOUT_BGR
+
+
+def convert_layout(image: np.ndarray, src: str, dst: str) -> np.ndarray:
+    """Convert between two layouts (returns the input itself when they match)"""
+    if src == dst:
+        return image
+    if src == LAYOUT_GRAY and image.ndim == 3:
+        image = image[:, :, 0]
+    code = _CONVERSIONS.get((src, dst))
+    if code is None:
+        raise ValueError(f"Unsupported pixel layout conversion {src} -> {dst}")
+    return cv2.cvtColor(image, code)
+
+
+class FrameFormats:
+    """
+    Per-frame conversion cache
+
+    Holds the source frame with its actual layout and converts on demand,
+    at most once per requested layout. Returned arrays are shared between
+    tools and must be treated as read-only.
+    """
+
+    def __init__(self, image: np.ndarray, layout: Optional[str] = None, pixel_format: Optional[str] = None):
+        self.source = image
+        self.layout = normalize_layout(layout) or memory_layout(image, pixel_format)
+        self._views: Dict[str, np.ndarray] = {self.layout: image}
+        self.conversions = 0
+
+    def get(self, layout: str) -> np.ndarray:
+        """Frame in the requested layout (cached)"""
+        layout = normalize_layout(layout) or self.layout
+        view = self._views.get(layout)
+        if view is None:
+            view = convert_layout(self.source, self.layout, layout)
+            self._views[layout] = view
+            self.conversions += 1
+        return view
+
+    def layout_of(self, image: np.ndarray) -> Optional[str]:
+        """Layout of an array owned by this cache (identity match), else None"""
+        for layout, view in self._views.items():
+            if view is image:
+                return layout
+        return None
+
+    def owns(self, image: np.ndarray) -> bool:
+        return self.layout_of(image) is not None
+
+
+def frame_formats_for(image: np.ndarray, context: Optional[Dict[str, Any]] = None) -> FrameFormats:
+    """
+    FrameFormats for an image: the one already in context when it owns the
+    image, otherwise a new cache using the layout announced in context
+    """
+    context = context or {}
+    cached = context.get(CONTEXT_FRAME_FORMATS)
+    if isinstance(cached, FrameFormats):
+        layout = cached.layout_of(image)
+        if layout == cached.layout:
+            return cached
+        if layout is not None:
+            # Tool got one of the converted views as its input
+            return FrameFormats(image, layout)
+    return FrameFormats(image, context.get(CONTEXT_FRAME_LAYOUT), context.get('pixel_format'))
+
+
+def get_frame_as(image: np.ndarray, context: Optional[Dict[str, Any]], layout: str) -> np.ndarray:
+    """Image in the requested layout, reusing conversions cached in context"""
+    try:
+        return frame_formats_for(image, context).get(layout)
+    except Exception as e:
+        logger.error(f"Pixel format conversion to {layout} failed: {e}")
+        return image
@@ -322,6 +322,11 @@ class ResultTool(BaseTool):
         result['ng_ok_similarity'] = similarity
         result['ng_ok_reason'] = reason
         
+        # Tracked objects (live tracking mode)
+        track_ids = [d['track_id'] for d in detections if d.get('track_id') is not None]
+        if track_ids:
+            result['track_ids'] = track_ids
+        
         # Debug output
         if self.config.get('enable_debug', False):
             logger.debug(f"ResultTool: {ng_ok_status} - {reason}")
@@ -5,6 +5,8 @@ import numpy as np
 import logging
 from typing import Dict, Any, Optional, Tuple, Union
 from tools.base_tool import BaseTool, ToolConfig
+from tools.ng_archive import NGFrameArchive
+from tools.pixel_format import frame_formats_for
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,12 @@ class SaveImageTool(BaseTool):
     Tool for saving images.
     Given a directory, a structure file prefix, and a chosen image format,
     this class provides functionality to save an image with a filename that includes a running number.
+
+    With auto_save (or force_save in context) every frame is saved. Otherwise,
+    when ng_archive_enabled, frames go to an NGFrameArchive: NG frames are
+    saved with pre/post-trigger neighbours and OK frames are only sampled.
+    The OK/NG judgment is read from context['ng_ok_result'], so place this
+    tool after the Result Tool.
     """
 
     def __init__(self, name: str = "Save Image", config: Optional[Union[Dict[str, Any], ToolConfig]] = None, tool_id: Optional[int] = None):
@@ -57,6 +65,16 @@ class SaveImageTool(BaseTool):
         self.config.set_default("structure_file", "")
         self.config.set_default("image_format", "JPG")
         self.config.set_default("auto_save", False)
+        # NG archive (ring buffer, deferred saving)
+        self.config.set_default("ng_archive_enabled", True)
+        self.config.set_default("archive_ring_size", 30)
+        self.config.set_default("archive_pre_frames", 5)
+        self.config.set_default("archive_post_frames", 5)
+        self.config.set_default("archive_ok_sample_every", 100)  # 1 of N OK frames, 0 = none
+        self.config.set_default("archive_scale", 1.0)
+        self.config.set_default("archive_jpeg_quality", 90)
+        self._archive: Optional[NGFrameArchive] = None
+        self._archive_key = None
 
         # Initialize properties from config
         self.directory = self.config.get("directory", "")
@@ -83,6 +101,35 @@ class SaveImageTool(BaseTool):
             self.auto_save = self.config.get("auto_save", False)
         return result
 
+    def _archive_settings(self) -> Dict[str, Any]:
+        return {
+            'ring_size': max(1, int(self.config.get("archive_ring_size", 30))),
+            'pre_frames': max(0, int(self.config.get("archive_pre_frames", 5))),
+            'post_frames': max(0, int(self.config.get("archive_post_frames", 5))),
+            'ok_sample_every': max(0, int(self.config.get("archive_ok_sample_every", 100))),
+            'scale': float(self.config.get("archive_scale", 1.0)),
+            'jpeg_quality': int(self.config.get("archive_jpeg_quality", 90)),
+        }
+
+    def _get_archive(self) -> NGFrameArchive:
+        """Current archive, rebuilt when the directory/format/archive settings change"""
+        settings = self._archive_settings()
+        key = (self.directory, self.structure_file, self.image_format, tuple(sorted(settings.items())))
+        if self._archive is None or self._archive_key != key:
+            if self._archive is not None:
+                self._archive.close()
+            self._archive = NGFrameArchive(self.directory, self.structure_file, self.image_format, **settings)
+            self._archive_key = key
+            logger.info(f"SaveImageTool: NG archive -> {self.directory} {settings}")
+        return self._archive
+
+    def cleanup(self) -> None:
+        """Write out pending archive files and stop its worker"""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        super().cleanup()
+
     def get_next_filename(self):
         """Generate the next filename with incremental numbering"""
         if not self.directory:
@@ -143,6 +190,14 @@ class SaveImageTool(BaseTool):
 
             # Respect auto_save flag unless explicitly forced via context
             if not self.auto_save and not (context and context.get('force_save')):
+                if self.config.get("ng_archive_enabled", True) and self.directory:
+                    archive = self._get_archive()
+                    formats = frame_formats_for(image, context)
+                    layout = formats.layout_of(image) or formats.layout
+                    status = context.get('ng_ok_result') if context else None
+                    result["archived"] = archive.push(image, layout, status)
+                    result["archive"] = archive.get_stats()
+                    return image, result
                 logger.info(f"⏭️  SaveImageTool: auto_save={self.auto_save}, force_save={context.get('force_save') if context else 'N/A'} - SKIPPING SAVE")
                 return image, result
             
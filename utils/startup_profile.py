@@ -0,0 +1,116 @@
+"""
+Startup profile - Import-time breakdown and startup milestones
+
+Purpose:
+  - `python main.py --profile-startup` enables the profiler before PyQt5,
+    OpenCV or any tool module is imported
+  - Every absolute import made on the main thread is timed; the self time
+    (excluding nested imports of other modules) is summed per top-level
+    package, so the report shows what the startup time is spent on
+  - Milestones (window built, event loop running, first camera frame) are
+    marked with the elapsed time since profiling started
+  - Disabled (the default), mark() and the other hooks cost a flag check
+"""
+
+import builtins
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_PACKAGES = 15
+
+
+class StartupProfiler:
+    """Import timer + milestones (one instance: startup_profiler)"""
+
+    def __init__(self):
+        self.enabled = False
+        self._t0 = 0.0
+        self._original_import = None
+        self._main_thread = None
+        self._stack: List[float] = []
+        self.import_self_s: Dict[str, float] = defaultdict(float)
+        self.import_count: Dict[str, int] = defaultdict(int)
+        self.milestones: List[Tuple[str, float]] = []
+        self._reported = False
+
+    def start(self, track_imports: bool = True) -> None:
+        if self.enabled:
+            return
+        self.enabled = True
+        self._t0 = time.perf_counter()
+        self._main_thread = threading.get_ident()
+        if track_imports:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def stop_import_tracking(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0 if self.enabled else 0.0
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level or name in sys.modules or threading.get_ident() != self._main_thread:
+            return original(name, globals, locals, fromlist, level)
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += total
+            package = name.partition('.')[0]
+            self.import_self_s[package] += max(0.0, total - nested)
+            self.import_count[package] += 1
+
+    def mark(self, label: str) -> None:
+        """Record a milestone (no-op unless profiling)"""
+        if not self.enabled:
+            return
+        elapsed = self.elapsed()
+        self.milestones.append((label, elapsed))
+        logger.info(f"Startup: {label} at {elapsed:.3f}s")
+        if self._reported:
+            # Milestones after the report (e.g. first frame) are printed as they happen
+            print(f"[startup] {label}: {elapsed:.3f}s", file=sys.stderr)
+
+    def mark_once(self, label: str) -> None:
+        if self.enabled and all(existing != label for existing, _ in self.milestones):
+            self.mark(label)
+
+    def report(self, top: int = DEFAULT_TOP_PACKAGES) -> Optional[str]:
+        """Import breakdown + milestones so far (printed to stderr and logged)"""
+        if not self.enabled:
+            return None
+        self.stop_import_tracking()
+        total_imports = sum(self.import_self_s.values())
+        lines = [f"Startup profile ({self.elapsed():.3f}s since start)",
+                 f"  Imports: {total_imports:.3f}s total, by top-level package (self time):"]
+        ranked = sorted(self.import_self_s.items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in ranked[:top]:
+            lines.append(f"    {seconds * 1000:8.1f} ms  {package} ({self.import_count[package]} imports)")
+        if len(ranked) > top:
+            rest = sum(seconds for _, seconds in ranked[top:])
+            lines.append(f"    {rest * 1000:8.1f} ms  ({len(ranked) - top} other packages)")
+        lines.append("  Milestones:")
+        for label, elapsed in self.milestones:
+            lines.append(f"    {elapsed:8.3f} s   {label}")
+        text = "\n".join(lines)
+        print(text, file=sys.stderr)
+        logger.info(text)
+        self._reported = True
+        return text
+
+
+startup_profiler = StartupProfiler()